@@ -33,7 +33,39 @@ from app.spotify_electron.login import login_controller
 from app.spotify_electron.playlist import playlist_controller
 from app.spotify_electron.search import search_controller
 from app.spotify_electron.song import song_controller
+from app.spotify_electron.song.blob.providers.song_collection_provider import (
+    init_blob_song_content_collection,
+)
+from app.spotify_electron.song.blob.providers.song_data_cache_provider import (
+    SongDataCacheProvider,
+)
+from app.spotify_electron.song.blob.providers.song_prefetch_provider import (
+    SongPrefetchProvider,
+)
+from app.spotify_electron.song.blob.providers.song_transcoding_provider import (
+    SongTranscodingProvider,
+)
+from app.spotify_electron.song.providers.song_analysis_provider import (
+    SongAnalysisProvider,
+)
+from app.spotify_electron.song.providers.song_ingest_provider import SongIngestProvider
 from app.spotify_electron.song.providers.song_service_provider import SongServiceProvider
+from app.spotify_electron.song.providers.song_single_flight_provider import (
+    SongSingleFlightProvider,
+)
+from app.spotify_electron.song.providers.song_streams_buffer_provider import (
+    SongStreamsBufferProvider,
+)
+from app.spotify_electron.song.providers.song_upload_provider import SongUploadProvider
+from app.spotify_electron.song.serverless.providers.song_serverless_client_provider import (
+    SongServerlessClientProvider,
+)
+from app.spotify_electron.song.serverless.providers.song_streaming_url_cache_provider import (
+    SongStreamingUrlCacheProvider,
+)
+from app.spotify_electron.song.serverless.providers.song_streaming_url_provider import (
+    SongStreamingUrlProvider,
+)
 from app.spotify_electron.stream import stream_controller
 from app.spotify_electron.user import base_user_controller
 from app.spotify_electron.user.artist import artist_controller
@@ -62,7 +94,19 @@ async def lifespan_handler(app: FastAPI) -> AsyncGenerator[None, Any]:
     await DatabaseConnectionManager.init_database_connection(
         environment=environment, connection_uri=connection_uri
     )
+    await init_blob_song_content_collection()
     SongServiceProvider.init_service()
+    SongServerlessClientProvider.init_client()
+    SongStreamingUrlCacheProvider.init_cache()
+    SongStreamingUrlProvider.init_streaming_urls()
+    SongDataCacheProvider.init_cache()
+    SongSingleFlightProvider.init_single_flights()
+    SongPrefetchProvider.init_scheduler()
+    SongStreamsBufferProvider.init_buffer()
+    SongAnalysisProvider.init_pool()
+    SongTranscodingProvider.init_transcoding()
+    await SongIngestProvider.init_queue()
+    await SongUploadProvider.init_uploads()
 
     app.include_router(playlist_controller.router)
     app.include_router(song_controller.router)
@@ -76,6 +120,14 @@ async def lifespan_handler(app: FastAPI) -> AsyncGenerator[None, Any]:
 
     main_logger.info("Spotify Electron Backend Started")
     yield
+    await SongUploadProvider.close_uploads()
+    await SongIngestProvider.close_queue()
+    await SongPrefetchProvider.close_scheduler()
+    await SongTranscodingProvider.close_transcoding()
+    SongAnalysisProvider.close_pool()
+    await SongStreamsBufferProvider.close_buffer()
+    await SongServerlessClientProvider.close_client()
+    SongDataCacheProvider.close_cache()
     DatabaseConnectionManager.close_database_connection()
     main_logger.info("Spotify Electron Backend Stopped")
 
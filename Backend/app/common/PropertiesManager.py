@@ -27,7 +27,18 @@ class _PropertiesManager:
         properties_manager_logger.info("Initializing PropertiesManager")
         load_dotenv()
         self.current_directory = os.getcwd()
-        self.config_sections = [AppConfig.APP_INI_SECTION]
+        self.config_sections = [
+            AppConfig.APP_INI_SECTION,
+            AppConfig.SONG_CACHE_INI_SECTION,
+            AppConfig.SONG_STREAMS_INI_SECTION,
+            AppConfig.SONG_TRANSCODING_INI_SECTION,
+            AppConfig.SONG_ANALYSIS_INI_SECTION,
+            AppConfig.SONG_SINGLE_FLIGHT_INI_SECTION,
+            AppConfig.SONG_PREFETCH_INI_SECTION,
+            AppConfig.SONG_INGEST_INI_SECTION,
+            AppConfig.SONG_UPLOAD_INI_SECTION,
+            AppConfig.SONG_SERVERLESS_INI_SECTION,
+        ]
         self.env_variables = [
             AppEnvironment.MONGO_URI_ENV_NAME,
             AppEnvironment.SECRET_KEY_SIGN_ENV_NAME,
@@ -34,6 +34,63 @@ class AppConfig:
     HOST_INI_KEY = "host"
     PORT_INI_KEY = "port"
     WORKERS = "workers"
+    # song cache
+    SONG_CACHE_INI_SECTION = "song_cache"
+    SONG_DATA_CACHE_MAX_BYTES = "song_data_cache_max_bytes"
+    SONG_DATA_CACHE_MAX_ENTRY_BYTES = "song_data_cache_max_entry_bytes"
+    SONG_DISK_CACHE_DIRECTORY = "song_disk_cache_directory"
+    SONG_DISK_CACHE_MAX_BYTES = "song_disk_cache_max_bytes"
+    SONG_DISK_CACHE_MAX_ENTRY_BYTES = "song_disk_cache_max_entry_bytes"
+    # song streams
+    SONG_STREAMS_INI_SECTION = "song_streams"
+    SONG_STREAMS_FLUSH_INTERVAL_SECONDS = "song_streams_flush_interval_seconds"
+    SONG_STREAMS_FLUSH_MAX_PENDING = "song_streams_flush_max_pending"
+    # song transcoding
+    SONG_TRANSCODING_INI_SECTION = "song_transcoding"
+    SONG_HLS_SEGMENT_SECONDS = "song_hls_segment_seconds"
+    # song analysis
+    SONG_ANALYSIS_INI_SECTION = "song_analysis"
+    SONG_ANALYSIS_WORKERS = "song_analysis_workers"
+    SONG_ANALYSIS_MAX_QUEUED = "song_analysis_max_queued"
+    # song single flight
+    SONG_SINGLE_FLIGHT_INI_SECTION = "song_single_flight"
+    SONG_SINGLE_FLIGHT_TIMEOUT_SECONDS = "song_single_flight_timeout_seconds"
+    # song prefetch
+    SONG_PREFETCH_INI_SECTION = "song_prefetch"
+    SONG_PREFETCH_SONGS = "song_prefetch_songs"
+    SONG_PREFETCH_MAX_USERS = "song_prefetch_max_users"
+    # song ingest
+    SONG_INGEST_INI_SECTION = "song_ingest"
+    SONG_INGEST_WORKERS = "song_ingest_workers"
+    SONG_INGEST_MAX_PENDING = "song_ingest_max_pending"
+    SONG_INGEST_JOB_EXPIRATION_SECONDS = "song_ingest_job_expiration_seconds"
+    # song upload
+    SONG_UPLOAD_INI_SECTION = "song_upload"
+    SONG_UPLOAD_DIRECTORY = "song_upload_directory"
+    SONG_UPLOAD_MAX_BYTES = "song_upload_max_bytes"
+    SONG_UPLOAD_EXPIRATION_SECONDS = "song_upload_expiration_seconds"
+    SONG_UPLOAD_CLEANUP_INTERVAL_SECONDS = "song_upload_cleanup_interval_seconds"
+    # song serverless
+    SONG_SERVERLESS_INI_SECTION = "song_serverless"
+    SONG_SERVERLESS_TIMEOUT_SECONDS = "song_serverless_timeout_seconds"
+    SONG_SERVERLESS_CONNECT_TIMEOUT_SECONDS = "song_serverless_connect_timeout_seconds"
+    SONG_SERVERLESS_MAX_CONNECTIONS = "song_serverless_max_connections"
+    SONG_SERVERLESS_MAX_KEEPALIVE_CONNECTIONS = "song_serverless_max_keepalive_connections"
+    SONG_SERVERLESS_RETRIES = "song_serverless_retries"
+    SONG_SERVERLESS_RETRY_BACKOFF_SECONDS = "song_serverless_retry_backoff_seconds"
+    SONG_SERVERLESS_UPLOAD_MAX_BODY_BYTES = "song_serverless_upload_max_body_bytes"
+    SONG_SERVERLESS_UPLOAD_PART_BYTES = "song_serverless_upload_part_bytes"
+    SONG_SERVERLESS_UPLOAD_CONCURRENCY = "song_serverless_upload_concurrency"
+    SONG_SERVERLESS_URL_BATCH_SIZE = "song_serverless_url_batch_size"
+    SONG_SERVERLESS_URL_CACHE_MAX_BYTES = "song_serverless_url_cache_max_bytes"
+    SONG_SERVERLESS_URL_CACHE_TTL_SECONDS = "song_serverless_url_cache_ttl_seconds"
+    SONG_SERVERLESS_STREAMING_DOMAIN = "song_serverless_streaming_domain"
+    SONG_SERVERLESS_STREAMING_BASE_PATH = "song_serverless_streaming_base_path"
+    SONG_SERVERLESS_STREAMING_KEY_PAIR_ID = "song_serverless_streaming_key_pair_id"
+    SONG_SERVERLESS_STREAMING_PRIVATE_KEY_FILE = "song_serverless_streaming_private_key_file"
+    SONG_SERVERLESS_STREAMING_URL_EXPIRATION_SECONDS = (
+        "song_serverless_streaming_url_expiration_seconds"
+    )
 
 
 class AppEnvironmentMode(StrEnum):
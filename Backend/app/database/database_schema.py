@@ -27,6 +27,16 @@ class DatabaseCollection(StrEnum):
     SONG_STREAMING = "songs.streaming"
     SONG_BLOB_FILE = "songs.files"
     SONG_BLOB_DATA = "songs"
+    SONG_BLOB_CHUNKS = "songs.chunks"
+    SONG_BLOB_CONTENT = "songs.contents"
+    SONG_UPLOAD = "songs.uploads"
+    SONG_JOB = "songs.jobs"
+    SONG_BLOB_RENDITION_FILE = "songs.renditions.files"
+    SONG_BLOB_RENDITION_DATA = "songs.renditions"
+    SONG_BLOB_RENDITION_CHUNKS = "songs.renditions.chunks"
+    SONG_BLOB_HLS_FILE = "songs.hls.files"
+    SONG_BLOB_HLS_DATA = "songs.hls"
+    SONG_BLOB_HLS_CHUNKS = "songs.hls.chunks"
 
 
 class BaseDatabaseConnection:
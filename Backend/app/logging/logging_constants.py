@@ -38,11 +38,28 @@ LOGGING_BASE_SONG_REPOSITORY = "BASE_SONG_REPOSITORY"
 
 LOGGING_SONG_SERVERLESS_REPOSITORY = "SONG_SERVERLESS_REPOSITORY"
 LOGGING_SONG_SERVERLESS_SERVICE = "SONG_SERVERLESS_SERVICE"
+LOGGING_SONG_SERVERLESS_API = "SONG_SERVERLESS_API"
+LOGGING_SONG_SERVERLESS_CLIENT_PROVIDER = "SONG_SERVERLESS_CLIENT_PROVIDER"
+LOGGING_SONG_STREAMING_URL_CACHE_PROVIDER = "SONG_STREAMING_URL_CACHE_PROVIDER"
+LOGGING_SONG_STREAMING_URL_PROVIDER = "SONG_STREAMING_URL_PROVIDER"
 LOGGING_SONG_SERVERLESS_SERVICE_VALIDATIONS = "SONG_SERVERLESS_SERVICE_VALIDATIONS"
 
 LOGGING_SONG_BLOB_REPOSITORY = "SONG_BLOB_REPOSITORY"
 LOGGING_SONG_BLOB_SERVICE = "SONG_BLOB_SERVICE"
 LOGGING_SONG_BLOB_SERVICE_VALIDATIONS = "SONG_BLOB_SERVICE_VALIDATIONS"
+LOGGING_SONG_DATA_CACHE_PROVIDER = "SONG_DATA_CACHE_PROVIDER"
+LOGGING_SONG_STREAMS_BUFFER_PROVIDER = "SONG_STREAMS_BUFFER_PROVIDER"
+LOGGING_SONG_TRANSCODING_PROVIDER = "SONG_TRANSCODING_PROVIDER"
+LOGGING_SONG_ANALYSIS_PROVIDER = "SONG_ANALYSIS_PROVIDER"
+LOGGING_SONG_SINGLE_FLIGHT_PROVIDER = "SONG_SINGLE_FLIGHT_PROVIDER"
+LOGGING_SONG_PREFETCH_PROVIDER = "SONG_PREFETCH_PROVIDER"
+LOGGING_SONG_INGEST_PROVIDER = "SONG_INGEST_PROVIDER"
+LOGGING_SONG_INGEST_SERVICE = "SONG_INGEST_SERVICE"
+LOGGING_SONG_JOB_REPOSITORY = "SONG_JOB_REPOSITORY"
+LOGGING_SONG_ALBUM_SERVICE = "SONG_ALBUM_SERVICE"
+LOGGING_SONG_UPLOAD_PROVIDER = "SONG_UPLOAD_PROVIDER"
+LOGGING_SONG_UPLOAD_SERVICE = "SONG_UPLOAD_SERVICE"
+LOGGING_SONG_UPLOAD_REPOSITORY = "SONG_UPLOAD_REPOSITORY"
 
 # Stream
 LOGGING_STREAM_SERVICE = "STREAM_SERVICE"
@@ -73,3 +90,10 @@ LOGGING_ARTIST_SERVICE = "ARTIST_SERVICE"
 
 # Utilities
 LOGGING_AUDIO_MANAGEMENT_UTILS = "AUDIO_MANAGEMENT_UTILS"
+LOGGING_HLS_UTILS = "HLS_UTILS"
+LOGGING_DISK_CACHE_UTILS = "DISK_CACHE_UTILS"
+LOGGING_SINGLE_FLIGHT_UTILS = "SINGLE_FLIGHT_UTILS"
+LOGGING_PREFETCH_UTILS = "PREFETCH_UTILS"
+LOGGING_COUNTER_BUFFER_UTILS = "COUNTER_BUFFER_UTILS"
+LOGGING_JOB_QUEUE_UTILS = "JOB_QUEUE_UTILS"
+LOGGING_PROCESS_POOL_UTILS = "PROCESS_POOL_UTILS"
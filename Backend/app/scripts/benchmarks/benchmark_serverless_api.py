@@ -0,0 +1,145 @@
+"""Benchmark concurrent requests to the serverless function that handles song files
+
+Starts a local stub of the serverless function that answers streaming url requests\
+after a delay and gets the streaming url of songs concurrently, first with blocking\
+requests sent from coroutines as the serverless song service used to do and then with\
+the pooled client of the serverless song service. Reports the time taken by each round\
+and the connections opened with the stub
+
+Steps:
+    1. Go to Backend/
+    2. Run `ENV_VALUE=TEST python -m app.scripts.benchmarks.benchmark_serverless_api \
+[requests] [response_milliseconds]`
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+import app.spotify_electron.song.serverless.song_service as song_service
+from app.common.app_schema import AppEnvironment
+from app.common.PropertiesManager import PropertiesManager
+from app.spotify_electron.song.serverless.providers.song_serverless_client_provider import (
+    SongServerlessClientProvider,
+)
+
+DEFAULT_REQUESTS = 50
+DEFAULT_RESPONSE_MILLISECONDS = 50
+ROUNDS = 2
+
+
+class ServerlessStubHandler(BaseHTTPRequestHandler):
+    """Answers streaming url requests after a delay keeping connections open"""
+
+    protocol_version = "HTTP/1.1"
+    response_seconds = DEFAULT_RESPONSE_MILLISECONDS / 1000
+    connections = 0
+    connections_lock = threading.Lock()
+
+    def setup(self) -> None:
+        """Count the new connection"""
+        super().setup()
+        with ServerlessStubHandler.connections_lock:
+            ServerlessStubHandler.connections += 1
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Answer the streaming url of the requested song"""
+        time.sleep(self.response_seconds)
+        name = parse_qs(urlparse(self.path).query)["nombre"][0]
+        body = json.dumps({"url": f"https://cdn.stub/{name}"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        """Don't log requests"""
+
+
+async def get_streaming_url_blocking(url: str, name: str) -> str:
+    """Get song streaming url with a blocking request from a coroutine
+
+    Args:
+        url: serverless function url
+        name: song name
+
+    Returns:
+        the streaming url
+    """
+    return requests.get(url, params={"nombre": name}, timeout=30).json()["url"]  # noqa: ASYNC210
+
+
+async def measure_round(requests_count: int, *, blocking: bool, url: str) -> tuple[float, int]:
+    """Get the streaming url of songs concurrently
+
+    Args:
+        requests_count: number of songs
+        blocking: whether to use blocking requests instead of the pooled client
+        url: serverless function url
+
+    Returns:
+        the seconds taken and the connections opened
+    """
+    connections = ServerlessStubHandler.connections
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            get_streaming_url_blocking(url, f"song-{number}")
+            if blocking
+            else song_service.get_song_streaming_url(f"song-{number}")
+            for number in range(requests_count)
+        )
+    )
+    return time.perf_counter() - start, ServerlessStubHandler.connections - connections
+
+
+async def benchmark_serverless_api(requests_count: int, response_milliseconds: int) -> None:
+    """Print the time taken by concurrent streaming url requests with blocking requests\
+        and with the pooled client
+
+    Args:
+        requests_count: concurrent requests per round
+        response_milliseconds: stub response delay
+    """
+    ServerlessStubHandler.response_seconds = response_milliseconds / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ServerlessStubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    setattr(PropertiesManager, AppEnvironment.SERVERLESS_URL_ENV_NAME, url)
+    print(
+        f"> {requests_count} concurrent requests, stub answers in {response_milliseconds} ms"
+    )
+
+    try:
+        for label, blocking in (("Blocking requests", True), ("Pooled client", False)):
+            SongServerlessClientProvider.init_client()
+            try:
+                for round_number in range(1, ROUNDS + 1):
+                    seconds, connections = await measure_round(
+                        requests_count, blocking=blocking, url=url
+                    )
+                    print(
+                        f"> {label} round {round_number}: {seconds * 1000:.0f} ms, "
+                        f"{connections} connections opened"
+                    )
+            finally:
+                await SongServerlessClientProvider.close_client()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    requests_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_REQUESTS
+    response_milliseconds = (
+        int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_RESPONSE_MILLISECONDS  # noqa: PLR2004
+    )
+    asyncio.run(benchmark_serverless_api(requests_count, response_milliseconds))
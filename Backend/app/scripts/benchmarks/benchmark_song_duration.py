@@ -0,0 +1,124 @@
+"""Benchmark song duration computation
+
+Compares decoding the whole song with librosa against reading the duration from\
+the song headers and frames as done on upload. Reports the median latency and the\
+peak memory allocated by each path
+
+Steps:
+    1. Go to Backend/
+    2. Run `python -m app.scripts.benchmarks.benchmark_song_duration \
+[iterations] [song_paths...]`
+"""
+
+import asyncio
+import io
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+import librosa
+
+from app.spotify_electron.utils.audio_management.audio_management_utils import (
+    FILE_CHUNK_SIZE,
+    SongFileDigest,
+)
+
+DEFAULT_ITERATIONS = 5
+DEFAULT_SONGS_DIRECTORY = "tests/assets"
+
+
+def get_decoded_duration(file: bytes) -> float:
+    """Get song duration decoding the whole song
+
+    Args:
+        file: song file
+
+    Returns:
+        the duration in seconds, 0 if not a song file
+    """
+    try:
+        audio_data, sample_rate = librosa.load(io.BytesIO(file), sr=None)
+        return librosa.get_duration(y=audio_data, sr=sample_rate)
+    except Exception:
+        return 0
+
+
+def get_digest_duration(file: bytes) -> float:
+    """Get song duration from its headers and frames reading it by chunks
+
+    Args:
+        file: song file
+
+    Returns:
+        the duration in seconds, 0 if not a song file
+    """
+    return asyncio.run(get_song_file_digest_duration(file))
+
+
+async def get_song_file_digest_duration(file: bytes) -> float:
+    """Get song duration with a song file digest running the analysis in this thread
+
+    Args:
+        file: song file
+
+    Returns:
+        the duration in seconds, 0 if not a song file
+    """
+    song_file_digest = SongFileDigest("benchmark-song", io.BytesIO(file))
+    for start in range(0, len(file), FILE_CHUNK_SIZE):
+        await song_file_digest.update(file[start : start + FILE_CHUNK_SIZE])
+    return await song_file_digest.get_duration_seconds()
+
+
+def measure(get_duration: Callable[[bytes], float], file: bytes, iterations: int) -> str:
+    """Measure a duration computation
+
+    Args:
+        get_duration: duration computation
+        file: song file
+        iterations: number of measured computations
+
+    Returns:
+        the computed duration, median latency and peak memory
+    """
+    latencies: list[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        duration = get_duration(file)
+        latencies.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    get_duration(file)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return (
+        f"duration {duration:.2f} s, "
+        f"latency median {statistics.median(latencies) * 1000:.2f} ms, "
+        f"peak memory {peak_memory / 1024:.0f} KiB"
+    )
+
+
+def benchmark_song_duration(iterations: int, song_paths: list[str]) -> None:
+    """Compute the duration of each song with both paths and print their measures
+
+    Args:
+        iterations: number of computations of each song and path
+        song_paths: song files
+    """
+    for song_path in song_paths:
+        file = Path(song_path).read_bytes()
+        print(f"> {song_path} ({len(file)} bytes)")
+        print(f">   decode:  {measure(get_decoded_duration, file, iterations)}")
+        print(f">   headers: {measure(get_digest_duration, file, iterations)}")
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITERATIONS
+    song_paths = sys.argv[2:] or sorted(
+        str(song_path) for song_path in Path(DEFAULT_SONGS_DIRECTORY).iterdir()
+    )
+    benchmark_song_duration(iterations, song_paths)
@@ -0,0 +1,111 @@
+"""Benchmark song renditions upload-to-available latency
+
+Measures the time since a song upload starts until the upload request finishes\
+and until each rendition can be streamed
+
+Steps:
+    1. Go to Backend/
+    2. Run `ENV_VALUE=TEST python -m app.scripts.benchmarks.benchmark_song_renditions \
+[iterations] [song_path]`
+"""
+
+import asyncio
+import io
+import statistics
+import sys
+import time
+from typing import Any
+
+import anyio
+
+import app.spotify_electron.song.blob.song_repository as song_repository
+import app.spotify_electron.song.blob.song_service as song_service
+import app.spotify_electron.user.artist.artist_service as artist_service
+import app.spotify_electron.user.base_user_service as base_user_service
+from app.__main__ import app, lifespan_handler
+from app.auth.auth_schema import TokenData
+from app.spotify_electron.genre.genre_schema import Genre
+from app.spotify_electron.song.blob.providers.song_transcoding_provider import (
+    SongTranscodingProvider,
+)
+from app.spotify_electron.song.blob.song_schema import SongQuality
+from app.spotify_electron.user.user.user_schema import UserType
+
+DEFAULT_ITERATIONS = 5
+DEFAULT_SONG_PATH = "tests/assets/song_4_seconds.mp3"
+RENDITIONS_TIMEOUT_SECONDS = 120
+ARTIST_NAME = "benchmark-artist"
+
+
+async def wait_song_renditions(name: str, song_file_id: Any) -> dict[SongQuality, int]:
+    """Wait until the song transcoding finishes
+
+    Args:
+        name: song name
+        song_file_id: GridFS file id of the song data
+
+    Returns:
+        the size in bytes of each stored rendition
+    """
+    if SongTranscodingProvider.tasks:
+        await asyncio.wait(
+            set(SongTranscodingProvider.tasks), timeout=RENDITIONS_TIMEOUT_SECONDS
+        )
+
+    renditions: dict[SongQuality, int] = {}
+    for quality in SongQuality:
+        rendition = await song_repository.get_song_rendition_data_file(
+            name, song_file_id, quality
+        )
+        if rendition is not None:
+            renditions[quality] = rendition.length
+    return renditions
+
+
+async def benchmark_song_renditions(iterations: int, song_path: str) -> None:
+    """Upload a song several times and print upload and renditions latencies
+
+    Args:
+        iterations: number of uploads
+        song_path: song file to upload
+    """
+    song_file = await anyio.Path(song_path).read_bytes()
+    token = TokenData(username=ARTIST_NAME, role=UserType.ARTIST, token_type="bearer")
+    upload_latencies: list[float] = []
+    available_latencies: list[float] = []
+
+    async with lifespan_handler(app):
+        await artist_service.create_artist(ARTIST_NAME, "", "password")
+        try:
+            for iteration in range(iterations):
+                name = f"benchmark-song-{iteration}"
+                start = time.perf_counter()
+                await song_service.create_song(
+                    name, Genre.POP, "", io.BytesIO(song_file), token
+                )
+                upload_latencies.append(time.perf_counter() - start)
+
+                song_data_file = await song_repository.get_song_data_file(name)
+                renditions = await wait_song_renditions(name, song_data_file.file_id)
+                available_latencies.append(time.perf_counter() - start)
+                rendition_sizes = {str(quality): size for quality, size in renditions.items()}
+                print(
+                    f"> {name}: upload {upload_latencies[-1] * 1000:.1f} ms, "
+                    f"renditions available {available_latencies[-1] * 1000:.1f} ms, "
+                    f"sizes {rendition_sizes} original {len(song_file)}"
+                )
+                await song_service.delete_song(name)
+        finally:
+            await base_user_service.delete_user(ARTIST_NAME)
+
+    print(
+        f"> Upload latency median {statistics.median(upload_latencies) * 1000:.1f} ms\n"
+        f"> Upload-to-available latency median "
+        f"{statistics.median(available_latencies) * 1000:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITERATIONS
+    song_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_SONG_PATH  # noqa: PLR2004
+    asyncio.run(benchmark_song_renditions(iterations, song_path))
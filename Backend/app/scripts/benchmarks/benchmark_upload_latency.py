@@ -0,0 +1,196 @@
+"""Benchmark unrelated request latency while songs are uploaded
+
+Requests the health endpoint in a loop while songs are uploaded concurrently through\
+`POST /songs/` and reports its latency percentiles without uploads, with the song\
+analysis running in threads and with the song analysis process pool. The default song\
+is made of the audio frames of the test song repeated, so its duration is measured by\
+reading every frame
+
+Steps:
+    1. Go to Backend/
+    2. Run `ENV_VALUE=TEST python -m app.scripts.benchmarks.benchmark_upload_latency \
+[uploads] [concurrency] [song_path]`
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from typing import Any, cast
+
+import anyio
+from httpx import ASGITransport, AsyncClient
+
+import app.spotify_electron.user.artist.artist_service as artist_service
+import app.spotify_electron.user.base_user_service as base_user_service
+from app.__main__ import app, lifespan_handler
+from app.auth.auth_service import login_user
+from app.common.app_schema import AppConfig
+from app.common.PropertiesManager import PropertiesManager
+from app.spotify_electron.song.providers.song_service_provider import get_song_service
+from app.spotify_electron.utils.audio_management.mp3_utils import (
+    is_mp3_info_frame,
+    iterate_mp3_frames,
+)
+
+DEFAULT_UPLOADS = 16
+DEFAULT_CONCURRENCY = 4
+DEFAULT_SONG_PATH = "tests/assets/song_4_seconds.mp3"
+DEFAULT_SONG_COPIES = 50
+REQUEST_INTERVAL_SECONDS = 0.01
+IDLE_SECONDS = 2
+ARTIST_NAME = "benchmark-artist"
+ARTIST_PASSWORD = "benchmark-password"  # noqa: S105
+
+
+async def get_benchmark_song(song_path: str | None) -> bytes:
+    """Get the song to upload
+
+    Args:
+        song_path: song file, None for the audio frames of the test song repeated
+
+    Returns:
+        the song file
+    """
+    if song_path is not None:
+        return await anyio.Path(song_path).read_bytes()
+    song = await anyio.Path(DEFAULT_SONG_PATH).read_bytes()
+    return DEFAULT_SONG_COPIES * b"".join(
+        song[frame.offset : frame.offset + frame.length]
+        for frame in iterate_mp3_frames(song)
+        if not is_mp3_info_frame(song, frame)
+    )
+
+
+async def request_in_loop(client: AsyncClient, stop: asyncio.Event) -> list[float]:
+    """Request the health endpoint until stopped
+
+    Args:
+        client: API client
+        stop: stops the requests once set
+
+    Returns:
+        the latency of each request
+    """
+    latencies: list[float] = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/health/")
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(REQUEST_INTERVAL_SECONDS)
+    return latencies
+
+
+async def upload_songs(
+    client: AsyncClient, token: str, song_file: bytes, uploads: int, concurrency: int
+) -> None:
+    """Upload songs with a bounded number of concurrent uploads
+
+    Args:
+        client: API client
+        token: artist token
+        song_file: song file
+        uploads: number of uploads
+        concurrency: max concurrent uploads
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async def upload_song(number: int) -> None:
+        async with semaphore:
+            response = await client.post(
+                f"/songs/?name=benchmark-song-{number}&genre=Pop&photo=",
+                files={"file": ("song.mp3", song_file, "audio/mpeg")},
+                headers=headers,
+            )
+            response.raise_for_status()
+
+    await asyncio.gather(*(upload_song(number) for number in range(uploads)))
+
+
+async def measure_latencies(
+    analysis_workers: int, song_file: bytes, uploads: int, concurrency: int
+) -> tuple[list[float], float]:
+    """Measure the health endpoint latency while songs are uploaded
+
+    Args:
+        analysis_workers: song analysis processes, 0 runs the analysis in threads
+        song_file: song file
+        uploads: number of uploads, 0 measures the idle latency
+        concurrency: max concurrent uploads
+
+    Returns:
+        the latency of each request and the time taken by the uploads
+    """
+    setattr(PropertiesManager, AppConfig.SONG_ANALYSIS_WORKERS, str(analysis_workers))
+    async with lifespan_handler(app):
+        await artist_service.create_artist(ARTIST_NAME, "", ARTIST_PASSWORD)
+        try:
+            token = await login_user(ARTIST_NAME, ARTIST_PASSWORD)
+            # httpx types ASGI messages as dicts while Starlette types them as mappings
+            transport = ASGITransport(app=cast(Any, app))
+            async with AsyncClient(transport=transport, base_url="http://benchmark") as client:
+                stop = asyncio.Event()
+                requests = asyncio.create_task(request_in_loop(client, stop))
+                start = time.perf_counter()
+                if uploads:
+                    await upload_songs(client, token, song_file, uploads, concurrency)
+                else:
+                    await asyncio.sleep(IDLE_SECONDS)
+                uploads_seconds = time.perf_counter() - start
+                stop.set()
+                latencies = await requests
+        finally:
+            for number in range(uploads):
+                await get_song_service().delete_song(f"benchmark-song-{number}")
+            await base_user_service.delete_user(ARTIST_NAME)
+    return latencies, uploads_seconds
+
+
+def format_latencies(latencies: list[float]) -> str:
+    """Format latency percentiles
+
+    Args:
+        latencies: request latencies
+
+    Returns:
+        the median, p99 and max latencies
+    """
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return (
+        f"{len(latencies)} requests, p50 {statistics.median(latencies) * 1000:.2f} ms, "
+        f"p99 {percentiles[98] * 1000:.2f} ms, max {max(latencies) * 1000:.2f} ms"
+    )
+
+
+async def benchmark_upload_latency(
+    uploads: int, concurrency: int, song_path: str | None
+) -> None:
+    """Print the health endpoint latency without uploads and while uploading songs\
+        with the analysis in threads and in the process pool
+
+    Args:
+        uploads: number of uploads
+        concurrency: max concurrent uploads
+        song_path: song file, None for the audio frames of the test song repeated
+    """
+    song_file = await get_benchmark_song(song_path)
+    analysis_workers = int(getattr(PropertiesManager, AppConfig.SONG_ANALYSIS_WORKERS) or 0)
+    print(f"> {uploads} uploads of {len(song_file)} bytes, {concurrency} at once")
+
+    latencies, _ = await measure_latencies(0, song_file, 0, concurrency)
+    print(f"> Idle: {format_latencies(latencies)}")
+    for label, workers in (("Threads", 0), ("Process pool", max(analysis_workers, 1))):
+        latencies, uploads_seconds = await measure_latencies(
+            workers, song_file, uploads, concurrency
+        )
+        print(
+            f"> {label}: {format_latencies(latencies)}, uploads took {uploads_seconds:.2f} s"
+        )
+
+
+if __name__ == "__main__":
+    uploads = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_UPLOADS
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_CONCURRENCY  # noqa: PLR2004
+    song_path = sys.argv[3] if len(sys.argv) > 3 else None  # noqa: PLR2004
+    asyncio.run(benchmark_upload_latency(uploads, concurrency, song_path))
@@ -0,0 +1,125 @@
+"""
+Migrate song.files collection to include the loudness measures of the songs.
+
+The song data of every song without a loudness gain is read and analyzed in a process pool\
+and the following fields are included in the metadata field:
+
+"loudness_lufs",
+"peak_dbfs",
+"gain_db"
+
+Along with the song waveform peaks. Songs are migrated in batches so the migration can be\
+stopped and run again, already migrated songs are skipped. Songs whose data cannot be\
+decoded are migrated with null measures
+"""
+
+import asyncio
+import os
+from typing import Any
+
+from pymongo import UpdateOne
+
+import app.spotify_electron.song.blob.song_repository as song_repository
+from app.database.database_schema import DatabaseCollection
+from app.database.DatabaseConnectionManager import DatabaseConnectionManager
+from app.scripts.migrations.base_migration import BaseMigration
+from app.spotify_electron.song.blob.song_schema import SongDataNotFoundError
+from app.spotify_electron.utils.audio_management.audio_management_utils import analyze_song
+from app.spotify_electron.utils.process_pool.process_pool_utils import BoundedProcessPool
+
+BATCH_SIZE = 32
+
+
+class Migration(BaseMigration):
+    """Migrate songs collection to include loudness measures"""
+
+    def __init__(self) -> None:
+        super().__init__()
+
+    async def up(self) -> None:
+        """Analyze the songs without loudness measures and store them"""
+        self._collection = DatabaseConnectionManager.get_collection_connection(
+            collection_name=DatabaseCollection.SONG_BLOB_FILE
+        )
+        workers = os.cpu_count() or 1
+        analysis_pool = BoundedProcessPool(max_workers=workers, max_queued=workers)
+
+        try:
+            last_id = None
+            while True:
+                query: dict[str, Any] = {"metadata.gain_db": {"$exists": False}}
+                if last_id is not None:
+                    query["_id"] = {"$gt": last_id}
+                songs = (
+                    await self._collection.find(query, {"filename": 1})
+                    .sort("_id", 1)
+                    .limit(BATCH_SIZE)
+                    .to_list(length=BATCH_SIZE)
+                )
+                if not songs:
+                    break
+                last_id = songs[-1]["_id"]
+
+                updates = await asyncio.gather(
+                    *(self._get_song_update(song, analysis_pool) for song in songs)
+                )
+                updates = [update for update in updates if update is not None]
+                if updates:
+                    await self._collection.bulk_write(updates, ordered=False)
+                self._log.info(f"Migrated {len(updates)} songs up to {last_id}")
+        finally:
+            analysis_pool.close()
+
+    async def down(self) -> None:
+        """Remove loudness measures and waveforms"""
+        self._collection = DatabaseConnectionManager.get_collection_connection(
+            collection_name=DatabaseCollection.SONG_BLOB_FILE
+        )
+
+        await self._collection.update_many(
+            {},
+            {
+                "$unset": {
+                    "metadata.loudness_lufs": "",
+                    "metadata.peak_dbfs": "",
+                    "metadata.gain_db": "",
+                    "waveform": "",
+                }
+            },
+        )
+
+    async def _get_song_update(
+        self, song: dict[str, Any], analysis_pool: BoundedProcessPool
+    ) -> UpdateOne | None:
+        """Analyze a song and get the update that stores its analysis
+
+        Args:
+            song: song document with its id and name
+            analysis_pool: process pool for analyzing the song
+
+        Returns:
+            the song update, None if the song has no data
+        """
+        name = song["filename"]
+        try:
+            song_data = await song_repository.get_song_data(name)
+        except SongDataNotFoundError:
+            self._log.warning(f"Song {name} has no data, skipping it")
+            return None
+
+        song_analysis = await analysis_pool.run(analyze_song, name, song_data)
+        loudness = song_analysis.loudness
+        song_update: dict[str, Any] = {
+            "metadata.loudness_lufs": loudness.integrated_lufs if loudness else None,
+            "metadata.peak_dbfs": loudness.peak_dbfs if loudness else None,
+            "metadata.gain_db": loudness.gain_db if loudness else None,
+        }
+        if song_analysis.waveform:
+            song_update["waveform"] = song_analysis.waveform
+        return UpdateOne({"_id": song["_id"]}, {"$set": song_update})
+
+
+# Analysis workers import the main module when they start, so they must not run the migration
+if __name__ == "__main__":
+    migration = Migration()
+    asyncio.run(migration.execute_migration())
@@ -4,6 +4,15 @@ from fastapi import APIRouter
 from fastapi.responses import Response
 from starlette.status import HTTP_200_OK
 
+import app.spotify_electron.utils.json_converter.json_converter_utils as json_converter_utils
+from app.spotify_electron.song.blob.providers.song_data_cache_provider import (
+    get_song_data_cache,
+    get_song_data_disk_cache,
+)
+from app.spotify_electron.song.serverless.providers.song_streaming_url_cache_provider import (
+    get_song_streaming_url_cache,
+)
+
 router = APIRouter(prefix="/health", tags=["health"])
 
 
@@ -16,3 +25,20 @@ def get_health() -> Response:
         Response 200 OK
     """
     return Response(status_code=HTTP_200_OK, content="OK", media_type="text/plain")
+
+
+@router.get("/cache", summary="Cache Statistics Endpoint")
+def get_cache_stats() -> Response:
+    """Get hit, miss and eviction counters and hit rates of the current worker caches
+
+    Returns
+    -------
+        Response 200 OK with the stats of each cache
+    """
+    cache_stats = {
+        "song_data": get_song_data_cache().get_stats(),
+        "song_data_disk": get_song_data_disk_cache().get_stats(),
+        "song_streaming_url": get_song_streaming_url_cache().get_stats(),
+    }
+    cache_stats_json = json_converter_utils.get_json_from_model(cache_stats)
+    return Response(cache_stats_json, media_type="application/json", status_code=HTTP_200_OK)
@@ -2,6 +2,10 @@
 The repository will only handle Song metadata
 """
 
+from typing import Any
+
+from pymongo import UpdateOne
+
 import app.spotify_electron.song.providers.song_collection_provider as provider
 from app.logging.logging_constants import (
     LOGGING_BASE_SONG_REPOSITORY,
@@ -13,6 +17,7 @@ from app.spotify_electron.song.base_song_schema import (
     SongMetadataDAO,
     SongNotFoundError,
     SongRepositoryError,
+    SongWaveformNotFoundError,
     get_song_metadata_dao_from_document,
 )
 from app.spotify_electron.song.providers.song_collection_provider import (
@@ -21,6 +26,10 @@ from app.spotify_electron.song.providers.song_collection_provider import (
 from app.spotify_electron.song.validations.base_song_repository_validations import (
     validate_song_delete_count,
     validate_song_exists,
+    validate_song_waveform_exists,
+)
+from app.spotify_electron.utils.audio_management.audio_management_utils import (
+    SongAnalysis,
 )
 
 song_repository_logger = SpotifyElectronLogger(LOGGING_BASE_SONG_REPOSITORY).get_logger()
@@ -65,7 +74,7 @@ async def get_song_metadata(name: str) -> SongMetadataDAO:
     """
     try:
         collection = provider.get_song_collection()
-        song = await collection.find_one({"filename": name})
+        song = await collection.find_one({"filename": name}, {"filename": 1, "metadata": 1})
 
         validate_song_exists(song)
         assert song
@@ -86,6 +95,45 @@ async def get_song_metadata(name: str) -> SongMetadataDAO:
         return song_dao
 
 
+async def get_songs_metadata_by_names(
+    names: list[str],
+) -> tuple[list[SongMetadataDAO], list[str]]:
+    """Get metadata of many songs from database in a single query
+
+    Args:
+        names: song names
+
+    Raises:
+        SongRepositoryError: unexpected error getting songs metadata
+
+    Returns:
+        the metadata of the found songs in the order of the names and the names\
+            of the songs not found
+    """
+    try:
+        collection = provider.get_song_collection()
+        cursor = collection.find(
+            {"filename": {"$in": list(set(names))}}, {"_id": 0, "filename": 1, "metadata": 1}
+        )
+        songs_by_name = {
+            song["filename"]: get_song_metadata_dao_from_document(
+                song_name=song["filename"], document=song["metadata"]
+            )
+            async for song in cursor
+        }
+    except Exception as exception:
+        song_repository_logger.exception(f"Error getting Songs metadata {names} from database")
+        raise SongRepositoryError from exception
+    else:
+        songs_dao = [songs_by_name[name] for name in names if name in songs_by_name]
+        missing_names = [name for name in names if name not in songs_by_name]
+        song_repository_logger.info(
+            f"Get Songs metadata by names returned {len(songs_dao)} songs, "
+            f"missing {missing_names}"
+        )
+        return songs_dao, missing_names
+
+
 async def delete_song(name: str) -> None:
     """Deletes a song
 
@@ -124,41 +172,113 @@ async def get_artist_from_song(name: str) -> str:
     """
     try:
         collection = provider.get_song_collection()
-        document = await collection.find_one({"filename": name})
+        document = await collection.find_one(
+            {"filename": name}, {"_id": 0, "metadata.artist": 1}
+        )
 
         validate_song_exists(document)
         assert document
-
-        song_metadata = get_song_metadata_dao_from_document(
-            song_name=name,
-            document=document["metadata"],
-        )
     except SongRepositoryError as exception:
         song_repository_logger.exception(
             f"Unexpected error getting artist from song {name} in database"
         )
         raise SongRepositoryError from exception
     else:
-        return song_metadata.artist
+        return document["metadata"]["artist"]
 
 
-async def increase_song_streams(name: str) -> None:
-    """Increase number of song streams
+async def get_song_waveform(name: str) -> bytes:
+    """Get song waveform peaks
 
     Args:
         name: song name
 
     Raises:
-        SongRepositoryError: while increasing song streams
+        SongNotFoundError: song doesn't exists
+        SongWaveformNotFoundError: song has no waveform
+        SongRepositoryError: unexpected error getting song waveform
+
+    Returns:
+        the song waveform peaks
     """
     try:
         collection = provider.get_song_collection()
-        await collection.update_one({"filename": name}, {"$inc": {"metadata.streams": 1}})
-    except SongRepositoryError as exception:
+        document = await collection.find_one({"filename": name}, {"_id": 0, "waveform": 1})
+
+        validate_song_exists(document)
+        assert document
+        validate_song_waveform_exists(document)
+        waveform = document.get("waveform")
+        assert waveform
+
+    except SongNotFoundError as exception:
+        raise SongNotFoundError from exception
+    except SongWaveformNotFoundError as exception:
+        raise SongWaveformNotFoundError from exception
+    except Exception as exception:
+        song_repository_logger.exception(f"Error getting Song {name} waveform from database")
+        raise SongRepositoryError from exception
+    else:
+        song_repository_logger.debug(f"Get Song {name} waveform")
+        return waveform
+
+
+async def update_song_analysis(name: str, song_analysis: SongAnalysis) -> None:
+    """Update song waveform peaks and loudness measures
+
+    Args:
+        name: song name
+        song_analysis: song analysis
+
+    Raises:
+        SongRepositoryError: unexpected error updating song analysis
+    """
+    loudness = song_analysis.loudness
+    song_update: dict[str, Any] = {
+        "metadata.loudness_lufs": loudness.integrated_lufs if loudness else None,
+        "metadata.peak_dbfs": loudness.peak_dbfs if loudness else None,
+        "metadata.gain_db": loudness.gain_db if loudness else None,
+    }
+    if song_analysis.waveform:
+        song_update["waveform"] = song_analysis.waveform
+    try:
+        collection = provider.get_song_collection()
+        await collection.update_one({"filename": name}, {"$set": song_update})
+    except Exception as exception:
+        song_repository_logger.exception(f"Error updating Song {name} analysis in database")
+        raise SongRepositoryError from exception
+    else:
+        song_repository_logger.info(f"Song {name} analysis updated: {loudness}")
+
+
+async def increase_songs_streams(songs_streams: dict[str, int]) -> None:
+    """Increase number of streams of multiple songs in a single write
+
+    Args:
+        songs_streams: streams to add to each song name
+
+    Raises:
+        SongRepositoryError: while increasing songs streams
+    """
+    if not songs_streams:
+        return
+    try:
+        collection = provider.get_song_collection()
+        await collection.bulk_write(
+            [
+                UpdateOne({"filename": name}, {"$inc": {"metadata.streams": streams}})
+                for name, streams in songs_streams.items()
+            ],
+            ordered=False,
+        )
+    except Exception as exception:
         song_repository_logger.exception(
-            f"Unexpected error increasing stream count for artist {name} in database"
+            f"Unexpected error increasing stream count for songs {list(songs_streams)} "
+            "in database"
         )
         raise SongRepositoryError from exception
+    else:
+        song_repository_logger.debug(f"Streams of {len(songs_streams)} songs increased")
 
 
 async def get_artist_total_streams(artist_name: str) -> int:
@@ -234,7 +354,7 @@ async def get_songs_metadata_by_genre(genre: Genre) -> list[SongMetadataDAO]:
     """
     collection = provider.get_song_collection()
     genre_str = Genre.get_genre_string_value(genre)
-    cursor = collection.find({"metadata.genre": genre_str})
+    cursor = collection.find({"metadata.genre": genre_str}, {"filename": 1, "metadata": 1})
     try:
         return [
             get_song_metadata_dao_from_document(
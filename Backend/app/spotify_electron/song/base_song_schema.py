@@ -3,12 +3,15 @@ It contains Base DAO/DTO objects both for Metadata and Song containing
 the song resource.
 """
 
+import hashlib
 from abc import ABC
 from dataclasses import dataclass
-from typing import TypedDict
+from datetime import UTC, datetime
+from typing import BinaryIO, NotRequired, TypedDict
 
 from app.exceptions.base_exceptions_schema import SpotifyElectronError
 from app.spotify_electron.genre.genre_schema import Genre
+from app.spotify_electron.utils.job_queue.job_queue_utils import JobStatus
 
 
 class BaseSongMetadataDocument(TypedDict):
@@ -19,6 +22,9 @@ class BaseSongMetadataDocument(TypedDict):
     seconds_duration: int
     genre: str
     streams: int
+    loudness_lufs: NotRequired[float | None]
+    peak_dbfs: NotRequired[float | None]
+    gain_db: NotRequired[float | None]
 
 
 class BaseSongDocument(TypedDict):
@@ -26,6 +32,8 @@ class BaseSongDocument(TypedDict):
 
     filename: str
     metadata: BaseSongMetadataDocument
+    waveform: NotRequired[bytes]
+    """Waveform peaks, stored apart from the metadata so they're only read when needed"""
 
 
 @dataclass
@@ -56,11 +64,20 @@ class BaseSongDTO(ABC):
 class SongMetadataDAO(BaseSongDAO):
     """Represents Song metadata in the persistence transfering layer"""
 
+    gain_db: float | None = None
+    """Gain in dB that normalizes the song loudness, None if not analyzed yet"""
+
 
 @dataclass
 class SongMetadataDTO(BaseSongDTO):
     """Represents Song metadata in the endpoints transfering layer"""
 
+    gain_db: float | None = None
+    """Gain in dB that normalizes the song loudness, None if not analyzed yet"""
+    url: str | None = None
+    """Streaming url of the song, None if the architecture streams songs through\
+        the stream endpoint"""
+
 
 def get_song_metadata_dao_from_document(
     song_name: str, document: BaseSongMetadataDocument
@@ -83,6 +100,7 @@ def get_song_metadata_dao_from_document(
         seconds_duration=document["seconds_duration"],
         genre=Genre(document["genre"]),
         streams=document["streams"],
+        gain_db=document.get("gain_db"),
     )
 
 
@@ -102,6 +120,240 @@ def get_song_metadata_dto_from_dao(song_dao: SongMetadataDAO) -> SongMetadataDTO
         seconds_duration=song_dao.seconds_duration,
         genre=song_dao.genre,
         streams=song_dao.streams,
+        gain_db=song_dao.gain_db,
+    )
+
+
+class SongJobDocument(TypedDict):
+    """Represents the background processing job of an uploaded song in the persistence\
+        layer
+    """
+
+    _id: str
+    owner: str
+    name: str
+    status: str
+    progress: float
+    error: str | None
+    expires_at: datetime
+
+
+@dataclass
+class SongJobDAO:
+    """Represents the background processing job of an uploaded song in the persistence\
+        transfering layer
+    """
+
+    id: str
+    owner: str
+    name: str
+    status: JobStatus
+    progress: float
+    error: str | None
+    expires_at: datetime
+
+
+@dataclass
+class SongJobDTO:
+    """Represents the background processing job of an uploaded song in the endpoints\
+        transfering layer
+    """
+
+    id: str
+    name: str
+    status: JobStatus
+    progress: float
+    error: str | None
+
+
+def get_song_job_dao_from_document(document: SongJobDocument) -> SongJobDAO:
+    """Get song job from document
+
+    Args:
+        document: song job document
+
+    Returns:
+        the song job
+    """
+    return SongJobDAO(
+        id=document["_id"],
+        owner=document["owner"],
+        name=document["name"],
+        status=JobStatus(document["status"]),
+        progress=document["progress"],
+        error=document["error"],
+        expires_at=document["expires_at"],
+    )
+
+
+def get_song_job_dto_from_dao(song_job_dao: SongJobDAO) -> SongJobDTO:
+    """Get song job from dao
+
+    Args:
+        song_job_dao: song job dao
+
+    Returns:
+        the song job
+    """
+    return SongJobDTO(
+        id=song_job_dao.id,
+        name=song_job_dao.name,
+        status=song_job_dao.status,
+        progress=song_job_dao.progress,
+        error=song_job_dao.error,
+    )
+
+
+SONG_WAVEFORM_CACHE_CONTROL = "public, max-age=604800"
+"""Cache control of song waveforms, they only change if the song is uploaded again"""
+
+
+def get_song_waveform_entity_tag(waveform: bytes) -> str:
+    """Get strong entity tag of a song waveform
+
+    Args:
+        waveform: song waveform peaks
+
+    Returns:
+        the quoted entity tag
+    """
+    return f'"{hashlib.sha256(waveform).hexdigest()[:32]}"'
+
+
+SONG_ALBUM_MAX_TRACKS = 50
+"""Max tracks uploaded at once in a song album"""
+SONG_ALBUM_MAX_CONCURRENT_TRACKS = 4
+"""Max tracks of a song album stored at once"""
+
+
+@dataclass
+class SongAlbumTrack:
+    """Represents a track of an uploaded song album"""
+
+    name: str
+    genre: Genre
+    photo: str
+    file: BinaryIO
+
+
+@dataclass
+class SongAlbumTrackDTO:
+    """Represents the creation result of a song album track in the endpoints\
+        transfering layer
+    """
+
+    name: str
+    created: bool
+    error: str | None
+
+
+def get_song_album_tracks(
+    names: list[str], genres: list[Genre], photos: list[str], files: list[BinaryIO]
+) -> list[SongAlbumTrack]:
+    """Get song album tracks from the metadata and files of each track
+
+    Args:
+        names: song name of each track
+        genres: song genre of each track
+        photos: song photo of each track
+        files: song file of each track
+
+    Raises:
+        SongAlbumBadTracksError: tracks are missing metadata or files
+
+    Returns:
+        the song album tracks
+    """
+    if not len(names) == len(genres) == len(photos) == len(files):
+        raise SongAlbumBadTracksError
+    return [
+        SongAlbumTrack(name=name, genre=genre, photo=photo, file=file)
+        for name, genre, photo, file in zip(names, genres, photos, files, strict=True)
+    ]
+
+
+class SongUploadDocument(TypedDict):
+    """Represents a resumable song upload in the persistence layer"""
+
+    _id: str
+    owner: str
+    name: str
+    genre: str
+    photo: str
+    size: int
+    offset: int
+    parts: list[str]
+    """Files of the received chunks in upload order"""
+    finalizing: bool
+    expires_at: datetime
+
+
+@dataclass
+class SongUploadDAO:
+    """Represents a resumable song upload in the persistence transfering layer"""
+
+    id: str
+    owner: str
+    name: str
+    genre: Genre
+    photo: str
+    size: int
+    offset: int
+    parts: list[str]
+    finalizing: bool
+    expires_at: datetime
+
+
+@dataclass
+class SongUploadDTO:
+    """Represents a resumable song upload in the endpoints transfering layer"""
+
+    id: str
+    name: str
+    size: int
+    offset: int
+    """Bytes received, the next chunk has to start at this offset"""
+    expires_at: str
+
+
+def get_song_upload_dao_from_document(document: SongUploadDocument) -> SongUploadDAO:
+    """Get song upload from document
+
+    Args:
+        document: song upload document
+
+    Returns:
+        the song upload
+    """
+    return SongUploadDAO(
+        id=document["_id"],
+        owner=document["owner"],
+        name=document["name"],
+        genre=Genre(document["genre"]),
+        photo=document["photo"],
+        size=document["size"],
+        offset=document["offset"],
+        parts=document["parts"],
+        finalizing=document["finalizing"],
+        expires_at=document["expires_at"],
+    )
+
+
+def get_song_upload_dto_from_dao(song_upload_dao: SongUploadDAO) -> SongUploadDTO:
+    """Get song upload from dao
+
+    Args:
+        song_upload_dao: song upload dao
+
+    Returns:
+        the song upload
+    """
+    return SongUploadDTO(
+        id=song_upload_dao.id,
+        name=song_upload_dao.name,
+        size=song_upload_dao.size,
+        offset=song_upload_dao.offset,
+        expires_at=song_upload_dao.expires_at.replace(tzinfo=UTC).isoformat(),
     )
 
 
@@ -175,3 +427,77 @@ class SongBadNameError(SpotifyElectronError):
 
     def __init__(self):
         super().__init__(self.ERROR)
+
+
+class SongJobNotFoundError(SpotifyElectronError):
+    """Song job not found"""
+
+    ERROR = "Song job not found"
+
+    def __init__(self):
+        super().__init__(self.ERROR)
+
+
+class SongIngestQueueFullError(SpotifyElectronError):
+    """Too many songs waiting for background processing"""
+
+    ERROR = "Song ingest queue is full"
+
+    def __init__(self):
+        super().__init__(self.ERROR)
+
+
+class SongAlbumBadTracksError(SpotifyElectronError):
+    """Bad song album tracks"""
+
+    ERROR = "Bad tracks provided for song album"
+
+    def __init__(self):
+        super().__init__(self.ERROR)
+
+
+class SongWaveformNotFoundError(SpotifyElectronError):
+    """Song waveform not found"""
+
+    ERROR = "Song waveform not found"
+
+    def __init__(self):
+        super().__init__(self.ERROR)
+
+
+class SongUploadNotFoundError(SpotifyElectronError):
+    """Song upload not found"""
+
+    ERROR = "Song upload not found"
+
+    def __init__(self):
+        super().__init__(self.ERROR)
+
+
+class SongUploadBadSizeError(SpotifyElectronError):
+    """Song upload size is not allowed or a chunk exceeds it"""
+
+    ERROR = "Bad size provided for Song upload"
+
+    def __init__(self):
+        super().__init__(self.ERROR)
+
+
+class SongUploadConflictError(SpotifyElectronError):
+    """Song upload chunk doesn't start at the upload offset or the upload is being\
+        finalized
+    """
+
+    ERROR = "Song upload offset doesn't match or the upload is being finalized"
+
+    def __init__(self):
+        super().__init__(self.ERROR)
+
+
+class SongUploadIncompleteError(SpotifyElectronError):
+    """Song upload finalized before receiving the whole song"""
+
+    ERROR = "Song upload is not complete"
+
+    def __init__(self):
+        super().__init__(self.ERROR)
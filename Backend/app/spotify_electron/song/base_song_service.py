@@ -4,8 +4,6 @@ Handles common methods between all song architectures
 Redirects to the specific architecture service in case the method is not common
 """
 
-from asyncio import gather
-
 import app.spotify_electron.song.base_song_repository as base_song_repository
 from app.logging.logging_constants import LOGGING_BASE_SONG_SERVICE
 from app.logging.logging_schema import SpotifyElectronLogger
@@ -16,12 +14,18 @@ from app.spotify_electron.song.base_song_schema import (
     SongNotFoundError,
     SongRepositoryError,
     SongServiceError,
+    SongWaveformNotFoundError,
     get_song_metadata_dto_from_dao,
 )
 from app.spotify_electron.song.providers.song_service_provider import get_song_service
+from app.spotify_electron.song.providers.song_single_flight_provider import (
+    get_song_metadata_single_flight,
+)
+from app.spotify_electron.song.providers.song_streams_buffer_provider import (
+    get_song_streams_buffer,
+)
 from app.spotify_electron.song.validations.base_song_service_validations import (
     validate_song_name_parameter,
-    validate_song_should_exists,
 )
 
 base_song_service_logger = SpotifyElectronLogger(LOGGING_BASE_SONG_SERVICE).get_logger()
@@ -56,8 +60,11 @@ async def get_song_metadata(name: str) -> SongMetadataDTO:
     try:
         validate_song_name_parameter(name)
 
-        song_metadata_dao = await base_song_repository.get_song_metadata(name)
+        song_metadata_dao = await get_song_metadata_single_flight().do(
+            name, lambda: base_song_repository.get_song_metadata(name)
+        )
         song_dto = get_song_metadata_dto_from_dao(song_metadata_dao)
+        song_dto.streams += get_song_streams_buffer().get_pending(name)
 
     except SongBadNameError as exception:
         base_song_service_logger.exception(f"Bad Song Name Parameter: {name}")
@@ -80,6 +87,48 @@ async def get_song_metadata(name: str) -> SongMetadataDTO:
         return song_dto
 
 
+async def get_song_waveform(name: str) -> bytes:
+    """Get song waveform peaks, pairs of signed bytes with the min and max sample\
+        of each part of the song
+
+    Args:
+        name: song name
+
+    Raises:
+        SongBadNameError: name
+        SongNotFoundError: song doesn't exists
+        SongWaveformNotFoundError: song waveform doesn't exists or isn't created yet
+        SongServiceError: unexpected error getting song waveform
+
+    Returns:
+        the song waveform peaks
+    """
+    try:
+        validate_song_name_parameter(name)
+        waveform = await base_song_repository.get_song_waveform(name)
+    except SongBadNameError as exception:
+        base_song_service_logger.exception(f"Bad Song Name Parameter: {name}")
+        raise SongBadNameError from exception
+    except SongNotFoundError as exception:
+        base_song_service_logger.exception(f"Song not found: {name}")
+        raise SongNotFoundError from exception
+    except SongWaveformNotFoundError as exception:
+        base_song_service_logger.exception(f"Song waveform not found: {name}")
+        raise SongWaveformNotFoundError from exception
+    except SongRepositoryError as exception:
+        base_song_service_logger.exception(
+            f"Unexpected error in Song Repository getting song waveform: {name}"
+        )
+        raise SongServiceError from exception
+    except Exception as exception:
+        base_song_service_logger.exception(
+            f"Unexpected error in Song Service getting song waveform: {name}"
+        )
+        raise SongServiceError from exception
+    else:
+        return waveform
+
+
 async def delete_song(name: str) -> None:
     """Delete song
 
@@ -87,23 +136,25 @@ async def delete_song(name: str) -> None:
         name: song name
     """
     await get_song_service().delete_song(name)
+    get_song_streams_buffer().discard(name)
 
 
 async def get_songs_metadata(song_names: list[str]) -> list[SongMetadataDTO]:
-    """Get multiple songs metadata
+    """Get multiple songs metadata with a single database query
 
     Args:
         song_names: list of song names
 
     Raises:
-        SongServiceError: getting song metadata
+        SongServiceError: some song doesn't exists or unexpected error getting\
+            songs metadata
 
     Returns:
-        list of songs metadata
+        list of songs metadata in the order of the song names
     """
     try:
-        songs_metadata = await gather(
-            *[get_song_metadata(song_name) for song_name in song_names]
+        songs_dao, missing_song_names = await base_song_repository.get_songs_metadata_by_names(
+            song_names
         )
     except SongRepositoryError as exception:
         base_song_service_logger.exception(
@@ -115,12 +166,31 @@ async def get_songs_metadata(song_names: list[str]) -> list[SongMetadataDTO]:
             f"Unexpected error in Song Service getting songs metadata for: {song_names}"
         )
         raise SongServiceError from exception
+
+    if missing_song_names:
+        base_song_service_logger.error(
+            f"Songs not found getting songs metadata: {missing_song_names}"
+        )
+        raise SongServiceError
+
+    try:
+        song_streams_buffer = get_song_streams_buffer()
+        songs_metadata = [get_song_metadata_dto_from_dao(song_dao) for song_dao in songs_dao]
+        for song_metadata in songs_metadata:
+            song_metadata.streams += song_streams_buffer.get_pending(song_metadata.name)
+        await _add_songs_streaming_urls(songs_metadata)
+    except Exception as exception:
+        base_song_service_logger.exception(
+            f"Unexpected error in Song Service getting songs metadata for: {song_names}"
+        )
+        raise SongServiceError from exception
     else:
         return songs_metadata
 
 
 async def increase_song_streams(name: str) -> None:
-    """Increase by one the streams of a song
+    """Increase by one the streams of a song. The stream is buffered and written\
+        to database later together with other songs streams
 
     Args:
         name: song name
@@ -130,8 +200,8 @@ async def increase_song_streams(name: str) -> None:
         SongServiceError: unexpected error increasing song streams
     """
     try:
-        await validate_song_should_exists(name)
-        await base_song_repository.increase_song_streams(name)
+        artist_name = await base_song_repository.get_artist_from_song(name)
+        await get_song_streams_buffer().add(name, artist_name)
     except SongNotFoundError as exception:
         base_song_service_logger.exception(f"Song not found: {name}")
         raise SongNotFoundError from exception
@@ -177,7 +247,11 @@ async def get_songs_by_genre(genre: Genre) -> list[SongMetadataDTO]:
     """
     try:
         songs_dao = await base_song_repository.get_songs_metadata_by_genre(genre)
-        return [get_song_metadata_dto_from_dao(song_dao) for song_dao in songs_dao]
+        song_streams_buffer = get_song_streams_buffer()
+        for song_dao in songs_dao:
+            song_dao.streams += song_streams_buffer.get_pending(song_dao.name)
+        songs_metadata = [get_song_metadata_dto_from_dao(song_dao) for song_dao in songs_dao]
+        await _add_songs_streaming_urls(songs_metadata)
     except GenreNotValidError as exception:
         base_song_service_logger.exception(f"Bad genre provided {genre}")
         raise GenreNotValidError from exception
@@ -191,6 +265,8 @@ async def get_songs_by_genre(genre: Genre) -> list[SongMetadataDTO]:
             f"Unexpected error in Song Service getting songs by genre: {genre}"
         )
         raise SongServiceError from exception
+    else:
+        return songs_metadata
 
 
 async def get_artist_total_streams(artist_name: str) -> int:
@@ -206,7 +282,9 @@ async def get_artist_total_streams(artist_name: str) -> int:
         total streams of artist songs
     """
     try:
-        total_streams = await base_song_repository.get_artist_total_streams(artist_name)
+        total_streams = await base_song_repository.get_artist_total_streams(
+            artist_name
+        ) + get_song_streams_buffer().get_pending_by_group(artist_name)
     except SongRepositoryError as exception:
         base_song_service_logger.exception(
             f"Unexpected error in Song Repository getting total streams"
@@ -221,3 +299,22 @@ async def get_artist_total_streams(artist_name: str) -> int:
     else:
         base_song_service_logger.info(f"Artist {artist_name} total streams: {total_streams}")
         return total_streams
+
+
+async def _add_songs_streaming_urls(songs_metadata: list[SongMetadataDTO]) -> None:
+    """Add the streaming url of the songs obtained at once if the current architecture\
+        streams songs from urls. Songs are still returned without url if they can't\
+        be obtained, the url of each song can be requested on its own later
+
+    Args:
+        songs_metadata: songs metadata
+    """
+    try:
+        streaming_urls = await get_song_service().get_songs_streaming_urls(
+            [song_metadata.name for song_metadata in songs_metadata]
+        )
+    except Exception:
+        base_song_service_logger.exception("Unexpected error getting songs streaming urls")
+        return
+    for song_metadata in songs_metadata:
+        song_metadata.url = streaming_urls.get(song_metadata.name)
@@ -4,9 +4,11 @@ Song collections provider
 
 from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorGridFSBucket
 
+from app.common.app_schema import AppArchitecture, AppEnvironment
+from app.common.PropertiesManager import PropertiesManager
 from app.database.database_schema import DatabaseCollection
 from app.database.DatabaseConnectionManager import DatabaseConnectionManager
-from app.spotify_electron.song.blob.song_schema import SongDocument
+from app.spotify_electron.song.blob.song_schema import SongContentDocument, SongDocument
 
 
 def get_gridfs_song_collection() -> AsyncIOMotorGridFSBucket:
@@ -29,3 +31,102 @@ def get_blob_song_collection() -> AsyncIOMotorCollection[SongDocument]:
     return DatabaseConnectionManager.get_collection_connection(
         DatabaseCollection.SONG_BLOB_FILE
     )
+
+
+def get_blob_song_chunks_collection() -> AsyncIOMotorCollection:
+    """Get BLOB architecture song chunks collection
+
+    Returns:
+        AsyncIOMotorCollection: song GridFS chunks collection
+    """
+    return DatabaseConnectionManager.get_collection_connection(
+        DatabaseCollection.SONG_BLOB_CHUNKS
+    )
+
+
+def get_blob_song_content_collection() -> AsyncIOMotorCollection[SongContentDocument]:
+    """Get BLOB architecture song contents collection
+
+    Returns:
+        AsyncIOMotorCollection[SongContentDocument]: song data shared by songs\
+            with the same content
+    """
+    return DatabaseConnectionManager.get_collection_connection(
+        DatabaseCollection.SONG_BLOB_CONTENT
+    )
+
+
+async def init_blob_song_content_collection() -> None:
+    """Create the unique index of song contents by hash, so songs with the same\
+        content always share a single copy of their data. Only BLOB architecture\
+        stores song contents"""
+    architecture_type = getattr(PropertiesManager, AppEnvironment.ARCHITECTURE_ENV_NAME)
+    if architecture_type != AppArchitecture.ARCH_BLOB:
+        return
+    await get_blob_song_content_collection().create_index("sha256", unique=True)
+
+
+def get_gridfs_song_rendition_collection() -> AsyncIOMotorGridFSBucket:
+    """Get gridfs collection for managing song renditions files
+
+    Returns:
+        AsyncIOMotorGridFSBucket: the GridFS song renditions collection
+    """
+    return DatabaseConnectionManager.get_gridfs_collection_connection(
+        DatabaseCollection.SONG_BLOB_RENDITION_DATA
+    )
+
+
+def get_blob_song_rendition_collection() -> AsyncIOMotorCollection:
+    """Get BLOB architecture song renditions collection
+
+    Returns:
+        AsyncIOMotorCollection: song renditions GridFS files collection
+    """
+    return DatabaseConnectionManager.get_collection_connection(
+        DatabaseCollection.SONG_BLOB_RENDITION_FILE
+    )
+
+
+def get_blob_song_rendition_chunks_collection() -> AsyncIOMotorCollection:
+    """Get BLOB architecture song renditions chunks collection
+
+    Returns:
+        AsyncIOMotorCollection: song renditions GridFS chunks collection
+    """
+    return DatabaseConnectionManager.get_collection_connection(
+        DatabaseCollection.SONG_BLOB_RENDITION_CHUNKS
+    )
+
+
+def get_gridfs_song_hls_collection() -> AsyncIOMotorGridFSBucket:
+    """Get gridfs collection for managing song HLS playlists and segments files
+
+    Returns:
+        AsyncIOMotorGridFSBucket: the GridFS song HLS collection
+    """
+    return DatabaseConnectionManager.get_gridfs_collection_connection(
+        DatabaseCollection.SONG_BLOB_HLS_DATA
+    )
+
+
+def get_blob_song_hls_collection() -> AsyncIOMotorCollection:
+    """Get BLOB architecture song HLS collection
+
+    Returns:
+        AsyncIOMotorCollection: song HLS GridFS files collection
+    """
+    return DatabaseConnectionManager.get_collection_connection(
+        DatabaseCollection.SONG_BLOB_HLS_FILE
+    )
+
+
+def get_blob_song_hls_chunks_collection() -> AsyncIOMotorCollection:
+    """Get BLOB architecture song HLS chunks collection
+
+    Returns:
+        AsyncIOMotorCollection: song HLS GridFS chunks collection
+    """
+    return DatabaseConnectionManager.get_collection_connection(
+        DatabaseCollection.SONG_BLOB_HLS_CHUNKS
+    )
@@ -0,0 +1,93 @@
+"""Song data cache provider. Stores the data of the most played songs in memory\
+    and in a second tier on local disk so streaming them doesn't hit the database
+"""
+
+from app.common.app_schema import AppConfig
+from app.common.PropertiesManager import PropertiesManager
+from app.logging.logging_constants import LOGGING_SONG_DATA_CACHE_PROVIDER
+from app.logging.logging_schema import SpotifyElectronLogger
+from app.spotify_electron.song.blob.song_schema import CachedSongData
+from app.spotify_electron.utils.cache.cache_utils import LRUCache
+from app.spotify_electron.utils.cache.disk_cache_utils import DiskCache
+
+
+def _get_cached_song_data_size(cached_song_data: CachedSongData) -> int:
+    """Get the size in bytes of a cached song data
+
+    Args:
+        cached_song_data: cached song data
+
+    Returns:
+        the size in bytes
+    """
+    return len(cached_song_data.data)
+
+
+class SongDataCacheProvider:
+    """Provides the song data memory and disk caches of the current worker"""
+
+    song_data_cache: LRUCache[CachedSongData] = LRUCache(
+        max_bytes=0, max_entry_bytes=0, get_size=_get_cached_song_data_size
+    )
+    """Song data cache, disabled until initialized"""
+    song_data_disk_cache: DiskCache = DiskCache(directory=None, max_bytes=0, max_entry_bytes=0)
+    """Song data disk cache, disabled until initialized"""
+
+    @classmethod
+    def init_cache(cls) -> None:
+        """Init song data memory and disk caches with the configured budgets"""
+        logger = SpotifyElectronLogger(LOGGING_SONG_DATA_CACHE_PROVIDER).get_logger()
+        max_bytes = int(getattr(PropertiesManager, AppConfig.SONG_DATA_CACHE_MAX_BYTES) or 0)
+        max_entry_bytes = int(
+            getattr(PropertiesManager, AppConfig.SONG_DATA_CACHE_MAX_ENTRY_BYTES) or 0
+        )
+        cls.song_data_cache = LRUCache(
+            max_bytes=max_bytes,
+            max_entry_bytes=max_entry_bytes,
+            get_size=_get_cached_song_data_size,
+        )
+        logger.info(
+            f"Song data cache initialized with {max_bytes} bytes "
+            f"and {max_entry_bytes} bytes per song"
+        )
+
+        disk_directory = getattr(PropertiesManager, AppConfig.SONG_DISK_CACHE_DIRECTORY)
+        disk_max_bytes = int(
+            getattr(PropertiesManager, AppConfig.SONG_DISK_CACHE_MAX_BYTES) or 0
+        )
+        disk_max_entry_bytes = int(
+            getattr(PropertiesManager, AppConfig.SONG_DISK_CACHE_MAX_ENTRY_BYTES) or 0
+        )
+        cls.song_data_disk_cache = DiskCache(
+            directory=disk_directory,
+            max_bytes=disk_max_bytes,
+            max_entry_bytes=disk_max_entry_bytes,
+        )
+        cls.song_data_disk_cache.init_directory()
+        logger.info(
+            f"Song data disk cache initialized in {disk_directory} with {disk_max_bytes} "
+            f"bytes and {disk_max_entry_bytes} bytes per song"
+        )
+
+    @classmethod
+    def close_cache(cls) -> None:
+        """Close song data disk cache releasing the directory of the current worker"""
+        cls.song_data_disk_cache.close()
+
+
+def get_song_data_cache() -> LRUCache[CachedSongData]:
+    """Get song data cache
+
+    Returns:
+        the song data cache
+    """
+    return SongDataCacheProvider.song_data_cache
+
+
+def get_song_data_disk_cache() -> DiskCache:
+    """Get song data disk cache
+
+    Returns:
+        the song data disk cache
+    """
+    return SongDataCacheProvider.song_data_disk_cache
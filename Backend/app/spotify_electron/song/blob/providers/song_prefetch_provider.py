@@ -0,0 +1,55 @@
+"""Song prefetch provider. Loads the upcoming songs of the playlist a user is listening to\
+    into the song data caches so the next track starts without hitting the database
+"""
+
+from app.common.app_schema import AppConfig
+from app.common.PropertiesManager import PropertiesManager
+from app.logging.logging_constants import LOGGING_SONG_PREFETCH_PROVIDER
+from app.logging.logging_schema import SpotifyElectronLogger
+from app.spotify_electron.utils.prefetch.prefetch_utils import PrefetchScheduler
+
+
+class SongPrefetchProvider:
+    """Provides the song prefetch scheduler of the current worker"""
+
+    song_prefetch_scheduler: PrefetchScheduler = PrefetchScheduler(max_running=0)
+    """Song prefetch scheduler, disabled until initialized"""
+    prefetch_songs: int = 0
+    """Upcoming songs prefetched per user, 0 if prefetching is disabled"""
+
+    @classmethod
+    def init_scheduler(cls) -> None:
+        """Init song prefetch scheduler with the configured number of songs and users"""
+        logger = SpotifyElectronLogger(LOGGING_SONG_PREFETCH_PROVIDER).get_logger()
+        cls.prefetch_songs = int(
+            getattr(PropertiesManager, AppConfig.SONG_PREFETCH_SONGS) or 0
+        )
+        max_users = int(getattr(PropertiesManager, AppConfig.SONG_PREFETCH_MAX_USERS) or 0)
+        cls.song_prefetch_scheduler = PrefetchScheduler(max_running=max_users)
+        logger.info(
+            f"Song prefetch initialized with {cls.prefetch_songs} songs "
+            f"for {max_users} users at once"
+        )
+
+    @classmethod
+    async def close_scheduler(cls) -> None:
+        """Cancel running song prefetches"""
+        await cls.song_prefetch_scheduler.close()
+
+
+def get_song_prefetch_scheduler() -> PrefetchScheduler:
+    """Get song prefetch scheduler
+
+    Returns:
+        the song prefetch scheduler
+    """
+    return SongPrefetchProvider.song_prefetch_scheduler
+
+
+def get_song_prefetch_songs() -> int:
+    """Get number of upcoming songs prefetched per user
+
+    Returns:
+        the number of upcoming songs, 0 if prefetching is disabled
+    """
+    return SongPrefetchProvider.prefetch_songs
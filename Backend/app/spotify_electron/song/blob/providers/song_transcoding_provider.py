@@ -0,0 +1,67 @@
+"""Song transcoding provider. Keeps track of the background tasks transcoding songs\
+    into renditions and their HLS packaging, the transcoding runs in the song\
+    analysis process pool
+"""
+
+import asyncio
+from collections.abc import Coroutine
+from typing import Any
+
+from app.common.app_schema import AppConfig
+from app.common.PropertiesManager import PropertiesManager
+from app.logging.logging_constants import LOGGING_SONG_TRANSCODING_PROVIDER
+from app.logging.logging_schema import SpotifyElectronLogger
+
+
+class SongTranscodingProvider:
+    """Provides the song transcoding tasks of the current worker"""
+
+    tasks: set[asyncio.Task] = set()
+    """Running transcoding tasks"""
+    hls_segment_seconds: float = 0
+    """Duration of HLS segments, 0 if HLS packaging is disabled"""
+
+    @classmethod
+    def init_transcoding(cls) -> None:
+        """Init song transcoding with the configured HLS segments duration"""
+        logger = SpotifyElectronLogger(LOGGING_SONG_TRANSCODING_PROVIDER).get_logger()
+        cls.hls_segment_seconds = float(
+            getattr(PropertiesManager, AppConfig.SONG_HLS_SEGMENT_SECONDS) or 0
+        )
+        logger.info(f"Song HLS packaging with {cls.hls_segment_seconds} seconds segments")
+
+    @classmethod
+    async def close_transcoding(cls) -> None:
+        """Cancel running transcoding tasks"""
+        for task in cls.tasks:
+            task.cancel()
+        await asyncio.gather(*cls.tasks, return_exceptions=True)
+
+    @classmethod
+    def add_task(cls, coroutine: Coroutine[Any, Any, None]) -> None:
+        """Run a transcoding coroutine in background keeping a reference until done
+
+        Args:
+            coroutine: transcoding coroutine
+        """
+        task = asyncio.create_task(coroutine)
+        cls.tasks.add(task)
+        task.add_done_callback(cls.tasks.discard)
+
+
+def add_song_transcoding_task(coroutine: Coroutine[Any, Any, None]) -> None:
+    """Run a song transcoding coroutine in background
+
+    Args:
+        coroutine: transcoding coroutine
+    """
+    SongTranscodingProvider.add_task(coroutine)
+
+
+def get_song_hls_segment_seconds() -> float:
+    """Get song HLS segments duration
+
+    Returns:
+        the HLS segments duration in seconds, 0 if HLS packaging is disabled
+    """
+    return SongTranscodingProvider.hls_segment_seconds
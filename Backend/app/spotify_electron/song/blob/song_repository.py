@@ -6,9 +6,16 @@ Song files are stored as BLOBs in a separated collection from the metadata
 When the song file is not needed, and only the metadata is required use base song services
 """
 
-from motor.motor_asyncio import AsyncIOMotorGridOut
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import suppress
+from typing import Any, BinaryIO
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
 import app.spotify_electron.song.blob.providers.song_collection_provider as provider
+from app.database.database_schema import DatabaseCollection
 from app.logging.logging_constants import LOGGING_SONG_BLOB_REPOSITORY
 from app.logging.logging_schema import SpotifyElectronLogger
 from app.spotify_electron.genre.genre_schema import Genre
@@ -19,9 +26,16 @@ from app.spotify_electron.song.base_song_schema import (
 )
 from app.spotify_electron.song.blob.song_schema import (
     SongDAO,
+    SongDataFileDAO,
     SongDataNotFoundError,
+    SongHlsMetadataDocument,
     SongMetadataDocument,
+    SongQuality,
+    SongRenditionMetadataDocument,
     get_song_dao_from_document,
+    get_song_data_file_dao_from_document,
+    get_song_hls_playlist_filename,
+    get_song_hls_segment_filename,
 )
 from app.spotify_electron.song.blob.validations.song_repository_validations import (
     validate_song_data_exists,
@@ -29,9 +43,16 @@ from app.spotify_electron.song.blob.validations.song_repository_validations impo
 from app.spotify_electron.song.blob.validations.song_service_validations import (
     validate_song_create,
 )
+from app.spotify_electron.song.providers.song_analysis_provider import (
+    get_song_analysis_pool,
+)
 from app.spotify_electron.song.validations.base_song_repository_validations import (
     validate_song_exists,
 )
+from app.spotify_electron.utils.audio_management.audio_management_utils import (
+    SongFileDigest,
+    iterate_file_chunks,
+)
 
 song_repository_logger = SpotifyElectronLogger(LOGGING_SONG_BLOB_REPOSITORY).get_logger()
 
@@ -72,48 +93,75 @@ async def get_song(name: str) -> SongDAO:
         return song_dao
 
 
-async def create_song(  # noqa: PLR0917
-    name: str, artist: str, seconds_duration: int, genre: Genre, photo: str, file: bytes
-) -> None:
-    """Creates song
+async def create_song(
+    name: str,
+    artist: str,
+    genre: Genre,
+    photo: str,
+    file: BinaryIO,
+    *,
+    on_progress: Callable[[int], Awaitable[None]] | None = None,
+) -> Any:
+    """Creates song streaming its file into GridFS chunk by chunk. The song duration\
+        and hash are computed while the chunks are written, so the file is read once\
+        and never loaded whole in memory. If a song with the same content is already\
+        stored the chunks written are dropped and the song shares the stored data
 
     Args:
         name: song name
         artist: song artist
-        seconds_duration: song duration in seconds
         genre: song genre
         photo: song photo
-        file: song content
+        file: song file
+        on_progress: called with the bytes stored after each chunk is written
 
     Raises:
         SongRepositoryError: creating song
+
+    Returns:
+        the GridFS file id the song data is stored in
     """
+    grid_in = None
     try:
         gridfs_collection = provider.get_gridfs_song_collection()
+        song_file_digest = SongFileDigest(name, file, get_song_analysis_pool())
+
+        grid_in = gridfs_collection.open_upload_stream(filename=name)
+        async for chunk in iterate_file_chunks(file):
+            await song_file_digest.update(chunk)
+            await grid_in.write(chunk)
+            if on_progress is not None:
+                await on_progress(song_file_digest.size)
 
         song = SongMetadataDocument(
             artist=artist,
-            seconds_duration=seconds_duration,
+            seconds_duration=await song_file_digest.get_duration_seconds(),
             genre=str(genre.value),
             photo=photo,
             streams=0,
             url=f"/stream/{name}",
+            sha256=song_file_digest.sha256,
+            data_file_id=grid_in._id,
         )
-        result = await gridfs_collection.upload_from_stream(
-            filename=name, source=file, metadata=song
-        )
-        validate_song_create(str(result))
+        await grid_in.set("metadata", song)
+        await grid_in.close()
+        validate_song_create(str(grid_in._id))
+        result = await _reference_song_content(name, grid_in._id, song_file_digest.sha256)
     except SongCreateError as exception:
         song_repository_logger.exception(f"Error inserting Song {name} in database")
         raise SongRepositoryError from exception
-    except SongRepositoryError as exception:
-        song_repository_logger.exception(f"Unexpected error inserting song {song} in database")
+    except Exception as exception:
+        song_repository_logger.exception(f"Unexpected error inserting song {name} in database")
+        if grid_in is not None and not grid_in.closed:
+            with suppress(Exception):
+                await grid_in.abort()
         raise SongRepositoryError from exception
     else:
         song_repository_logger.info(f"Song added to repository: {song}")
+        return result
 
 
-async def get_song_data(name: str) -> AsyncIOMotorGridOut:
+async def get_song_data(name: str) -> bytes:
     """Get song data
 
     Args:
@@ -127,12 +175,17 @@ async def get_song_data(name: str) -> AsyncIOMotorGridOut:
         song data
     """
     try:
-        file_collection = provider.get_gridfs_song_collection()
-        song_data = await file_collection.open_download_stream_by_name(name)
-
-        validate_song_data_exists(song_data)
+        song_data_file = await get_song_data_file(name)
+        last_chunk = (song_data_file.length - 1) // song_data_file.chunk_size
+        song_data = b"".join(
+            [
+                chunk
+                async for chunk in get_song_data_chunks(song_data_file.file_id, 0, last_chunk)
+            ]
+        )
+        validate_song_data_exists(song_data, song_data_file.length)
 
-    except SongDataNotFoundError as exception:
+    except (SongNotFoundError, SongDataNotFoundError) as exception:
         song_repository_logger.exception(f"Song data not found: {name}")
         raise SongDataNotFoundError from exception
     except Exception as exception:
@@ -141,3 +194,395 @@ async def get_song_data(name: str) -> AsyncIOMotorGridOut:
     else:
         song_repository_logger.info("Song data obtained")
         return song_data
+
+
+async def delete_song_data(name: str) -> Any | None:
+    """Release the song data of a song that is going to be deleted. Song data shared\
+        with other songs is only deleted along with the last song referencing it
+
+    Args:
+        name: song name
+
+    Raises:
+        SongNotFoundError: song doesn't exists
+        SongRepositoryError: unexpected error deleting song data
+
+    Returns:
+        the GridFS file id of the deleted song data or None if other songs still\
+            reference it
+    """
+    try:
+        metadata_collection = provider.get_blob_song_collection()
+        content_collection = provider.get_blob_song_content_collection()
+        document = await metadata_collection.find_one(
+            {"filename": name},
+            {"_id": 1, "metadata.sha256": 1, "metadata.data_file_id": 1},
+        )
+
+        validate_song_exists(document)
+        assert document
+
+        metadata = document.get("metadata", {})
+        file_id = metadata.get("data_file_id", document["_id"])
+        content_filter = {"sha256": metadata.get("sha256"), "file_id": file_id}
+        content = await content_collection.find_one_and_update(
+            content_filter,
+            {"$inc": {"references": -1}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if content is not None and content["references"] > 0:
+            song_repository_logger.info(
+                f"Song {name} data kept, referenced by {content['references']} songs"
+            )
+            return None
+        if content is not None:
+            result = await content_collection.delete_one(
+                {**content_filter, "references": {"$lte": 0}}
+            )
+            if not result.deleted_count:
+                song_repository_logger.info(f"Song {name} data referenced again, kept")
+                return None
+
+        await provider.get_blob_song_chunks_collection().delete_many({"files_id": file_id})
+    except SongNotFoundError as exception:
+        song_repository_logger.exception(f"Song not found: {name}")
+        raise SongNotFoundError from exception
+    except Exception as exception:
+        song_repository_logger.exception(f"Error deleting Song {name} data from database")
+        raise SongRepositoryError from exception
+    else:
+        song_repository_logger.info(f"Song {name} data {file_id} deleted")
+        return file_id
+
+
+async def get_song_data_file(name: str) -> SongDataFileDAO:
+    """Get song GridFS file entry without downloading its data
+
+    Args:
+        name: song name
+
+    Raises:
+        SongNotFoundError: song doesn't exists
+        SongRepositoryError: unexpected error getting song data file
+
+    Returns:
+        the song data file
+    """
+    try:
+        metadata_collection = provider.get_blob_song_collection()
+        document = await metadata_collection.find_one(
+            {"filename": name},
+            {
+                "_id": 1,
+                "filename": 1,
+                "length": 1,
+                "chunkSize": 1,
+                "uploadDate": 1,
+                "metadata.data_file_id": 1,
+            },
+            sort=[("uploadDate", -1)],
+        )
+
+        validate_song_exists(document)
+        assert document
+
+        song_data_file = get_song_data_file_dao_from_document(document)  # type: ignore
+    except SongNotFoundError as exception:
+        song_repository_logger.exception(f"Song not found: {name}")
+        raise SongNotFoundError from exception
+    except Exception as exception:
+        song_repository_logger.exception(f"Error getting Song {name} data file from database")
+        raise SongRepositoryError from exception
+    else:
+        song_repository_logger.debug(f"Get Song data file by name returned {song_data_file}")
+        return song_data_file
+
+
+async def get_song_data_chunks(
+    file_id: Any,
+    first_chunk: int,
+    last_chunk: int,
+    bucket: DatabaseCollection = DatabaseCollection.SONG_BLOB_DATA,
+) -> AsyncGenerator[bytes, None]:
+    """Get song data chunks between first and last chunk numbers, both included.\
+        Chunks are fetched one by one so only a single chunk is held in memory
+
+    Args:
+        file_id: GridFS file id
+        first_chunk: first chunk number
+        last_chunk: last chunk number
+        bucket: GridFS bucket the file is stored in
+
+    Raises:
+        SongRepositoryError: unexpected error getting song data chunks
+
+    Yields:
+        the chunks data in order
+    """
+    try:
+        chunks_collection = _get_chunks_collection(bucket)
+        cursor = chunks_collection.find(
+            {"files_id": file_id, "n": {"$gte": first_chunk, "$lte": last_chunk}},
+            {"_id": 0, "data": 1},
+            sort=[("n", 1)],
+            batch_size=1,
+        )
+        async for chunk in cursor:
+            yield chunk["data"]
+    except Exception as exception:
+        song_repository_logger.exception(
+            f"Error getting Song data chunks {first_chunk}-{last_chunk} of file {file_id}"
+        )
+        raise SongRepositoryError from exception
+
+
+async def create_song_rendition(
+    name: str, song_file_id: Any, quality: SongQuality, file: bytes
+) -> None:
+    """Creates song rendition linked to the song data it was transcoded from
+
+    Args:
+        name: song name
+        song_file_id: GridFS file id of the song data
+        quality: rendition quality
+        file: rendition content
+
+    Raises:
+        SongRepositoryError: creating song rendition
+    """
+    try:
+        gridfs_collection = provider.get_gridfs_song_rendition_collection()
+        rendition = SongRenditionMetadataDocument(
+            song_file_id=song_file_id, quality=str(quality.value)
+        )
+        await gridfs_collection.upload_from_stream(
+            filename=name, source=file, metadata=rendition
+        )
+    except Exception as exception:
+        song_repository_logger.exception(
+            f"Error inserting Song {name} rendition {quality} in database"
+        )
+        raise SongRepositoryError from exception
+    else:
+        song_repository_logger.info(f"Song {name} rendition {quality} added to repository")
+
+
+async def get_song_rendition_data_file(
+    name: str, song_file_id: Any, quality: SongQuality
+) -> SongDataFileDAO | None:
+    """Get song rendition GridFS file entry without downloading its data
+
+    Args:
+        name: song name
+        song_file_id: GridFS file id of the song data the rendition was transcoded from
+        quality: rendition quality
+
+    Raises:
+        SongRepositoryError: unexpected error getting song rendition data file
+
+    Returns:
+        the song rendition data file or None if the rendition doesn't exists
+    """
+    try:
+        rendition_collection = provider.get_blob_song_rendition_collection()
+        document = await rendition_collection.find_one(
+            {
+                "filename": name,
+                "metadata.song_file_id": song_file_id,
+                "metadata.quality": str(quality.value),
+            },
+            {"_id": 1, "filename": 1, "length": 1, "chunkSize": 1, "uploadDate": 1},
+        )
+    except Exception as exception:
+        song_repository_logger.exception(
+            f"Error getting Song {name} rendition {quality} data file from database"
+        )
+        raise SongRepositoryError from exception
+    else:
+        if document is None:
+            return None
+        return get_song_data_file_dao_from_document(  # type: ignore
+            document, quality, DatabaseCollection.SONG_BLOB_RENDITION_DATA
+        )
+
+
+async def delete_song_renditions(name: str) -> None:
+    """Delete all song renditions
+
+    Args:
+        name: song name
+
+    Raises:
+        SongRepositoryError: unexpected error deleting song renditions
+    """
+    try:
+        rendition_collection = provider.get_blob_song_rendition_collection()
+        gridfs_collection = provider.get_gridfs_song_rendition_collection()
+        async for rendition in rendition_collection.find({"filename": name}, {"_id": 1}):
+            await gridfs_collection.delete(rendition["_id"])
+    except Exception as exception:
+        song_repository_logger.exception(
+            f"Error deleting Song {name} renditions from database"
+        )
+        raise SongRepositoryError from exception
+    else:
+        song_repository_logger.info(f"Song {name} renditions deleted")
+
+
+async def create_song_hls(
+    name: str, song_file_id: Any, playlist: bytes, segments: list[bytes]
+) -> None:
+    """Creates song HLS playlist and segments linked to the song data they were\
+        packaged from. The playlist is stored last so it's only found once\
+        all its segments are stored
+
+    Args:
+        name: song name
+        song_file_id: GridFS file id of the song data
+        playlist: M3U8 playlist content
+        segments: segments content
+
+    Raises:
+        SongRepositoryError: creating song HLS playlist and segments
+    """
+    try:
+        gridfs_collection = provider.get_gridfs_song_hls_collection()
+        hls_metadata = SongHlsMetadataDocument(song_name=name, song_file_id=song_file_id)
+        for segment_number, segment in enumerate(segments):
+            await gridfs_collection.upload_from_stream(
+                filename=get_song_hls_segment_filename(name, segment_number),
+                source=segment,
+                metadata=hls_metadata,
+            )
+        await gridfs_collection.upload_from_stream(
+            filename=get_song_hls_playlist_filename(name),
+            source=playlist,
+            metadata=hls_metadata,
+        )
+    except Exception as exception:
+        song_repository_logger.exception(f"Error inserting Song {name} HLS files in database")
+        raise SongRepositoryError from exception
+    else:
+        song_repository_logger.info(
+            f"Song {name} HLS playlist and {len(segments)} segments added to repository"
+        )
+
+
+async def get_song_hls_data_file(filename: str, song_file_id: Any) -> SongDataFileDAO | None:
+    """Get song HLS playlist or segment GridFS file entry without downloading its data
+
+    Args:
+        filename: HLS playlist or segment file name
+        song_file_id: GridFS file id of the song data the file was packaged from
+
+    Raises:
+        SongRepositoryError: unexpected error getting song HLS data file
+
+    Returns:
+        the song HLS data file or None if it doesn't exists
+    """
+    try:
+        hls_collection = provider.get_blob_song_hls_collection()
+        document = await hls_collection.find_one(
+            {"filename": filename, "metadata.song_file_id": song_file_id},
+            {"_id": 1, "filename": 1, "length": 1, "chunkSize": 1, "uploadDate": 1},
+        )
+    except Exception as exception:
+        song_repository_logger.exception(
+            f"Error getting Song HLS data file {filename} from database"
+        )
+        raise SongRepositoryError from exception
+    else:
+        if document is None:
+            return None
+        return get_song_data_file_dao_from_document(  # type: ignore
+            document, bucket=DatabaseCollection.SONG_BLOB_HLS_DATA
+        )
+
+
+async def delete_song_hls(name: str) -> list[Any]:
+    """Delete song HLS playlist and segments
+
+    Args:
+        name: song name
+
+    Raises:
+        SongRepositoryError: unexpected error deleting song HLS files
+
+    Returns:
+        the GridFS file ids of the deleted files
+    """
+    try:
+        hls_collection = provider.get_blob_song_hls_collection()
+        gridfs_collection = provider.get_gridfs_song_hls_collection()
+        file_ids: list[Any] = []
+        async for hls_file in hls_collection.find({"metadata.song_name": name}, {"_id": 1}):
+            await gridfs_collection.delete(hls_file["_id"])
+            file_ids.append(hls_file["_id"])
+    except Exception as exception:
+        song_repository_logger.exception(f"Error deleting Song {name} HLS files from database")
+        raise SongRepositoryError from exception
+    else:
+        song_repository_logger.info(f"Song {name} HLS files deleted")
+        return file_ids
+
+
+async def _reference_song_content(name: str, file_id: Any, sha256: str) -> Any:
+    """Add a reference to the song data stored with the same content hash. If there's\
+        none the song data just stored becomes the shared data of its hash, otherwise\
+        the song references the shared data and its own chunks are dropped
+
+    Args:
+        name: song name
+        file_id: GridFS file id of the song data just stored
+        sha256: song content hash
+
+    Returns:
+        the GridFS file id the song data is stored in
+    """
+    content_collection = provider.get_blob_song_content_collection()
+    content_update = {"$inc": {"references": 1}, "$setOnInsert": {"file_id": file_id}}
+    try:
+        content = await content_collection.find_one_and_update(
+            {"sha256": sha256},
+            content_update,
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+    except DuplicateKeyError:
+        # Concurrent upload of the same content inserted it first
+        content = await content_collection.find_one_and_update(
+            {"sha256": sha256},
+            content_update,
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+    assert content
+
+    if content["file_id"] == file_id:
+        return file_id
+
+    await provider.get_blob_song_collection().update_one(
+        {"_id": file_id}, {"$set": {"metadata.data_file_id": content["file_id"]}}
+    )
+    await provider.get_blob_song_chunks_collection().delete_many({"files_id": file_id})
+    song_repository_logger.info(
+        f"Song {name} shares the data {content['file_id']} of {content['references']} songs"
+    )
+    return content["file_id"]
+
+
+def _get_chunks_collection(bucket: DatabaseCollection) -> AsyncIOMotorCollection:
+    """Get GridFS chunks collection of a bucket
+
+    Args:
+        bucket: GridFS bucket
+
+    Returns:
+        the chunks collection
+    """
+    if bucket == DatabaseCollection.SONG_BLOB_RENDITION_DATA:
+        return provider.get_blob_song_rendition_chunks_collection()
+    if bucket == DatabaseCollection.SONG_BLOB_HLS_DATA:
+        return provider.get_blob_song_hls_chunks_collection()
+    return provider.get_blob_song_chunks_collection()
@@ -1,7 +1,11 @@
 """Song schema for domain model"""
 
 from dataclasses import dataclass
+from datetime import datetime
+from enum import StrEnum
+from typing import Any, NotRequired, TypedDict
 
+from app.database.database_schema import DatabaseCollection
 from app.exceptions.base_exceptions_schema import SpotifyElectronError
 from app.spotify_electron.genre.genre_schema import Genre
 from app.spotify_electron.song.base_song_schema import (
@@ -16,11 +20,26 @@ class SongMetadataDocument(BaseSongMetadataDocument):
     """Represents song metadata in the persistence layer"""
 
     url: str
+    sha256: str
+    data_file_id: NotRequired[Any]
+    """GridFS file id the song data is stored in, shared by the songs with the same\
+        content. Songs without it store their data in their own GridFS file"""
+
+
+class SongContentDocument(TypedDict):
+    """Represents the song data shared by the songs with the same content\
+        in the persistence layer"""
+
+    sha256: str
+    file_id: Any
+    references: int
 
 
 class SongDocument(BaseSongDocument):
     """Represents song data in the persistence layer"""
 
+    _id: Any
+    """GridFS file id the song data was uploaded to"""
     metadata: SongMetadataDocument
 
 
@@ -40,6 +59,77 @@ class SongDTO(BaseSongDTO):
     """The streaming url of the song"""
 
 
+class SongQuality(StrEnum):
+    """Song renditions qualities"""
+
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+
+
+SONG_RENDITIONS_COMPRESSION_LEVELS: dict[SongQuality, float] = {
+    SongQuality.LOW: 0.9,
+    SongQuality.MEDIUM: 0.65,
+    SongQuality.HIGH: 0.35,
+}
+"""MP3 compression level of each song quality, higher levels produce lower bitrates"""
+
+
+class SongRenditionMetadataDocument(TypedDict):
+    """Represents song rendition metadata in the persistence layer"""
+
+    song_file_id: Any
+    quality: str
+
+
+class SongHlsMetadataDocument(TypedDict):
+    """Represents song HLS playlist or segment metadata in the persistence layer"""
+
+    song_name: str
+    song_file_id: Any
+
+
+class SongDataFileDocument(TypedDict):
+    """Represents the GridFS file entry of a song in the persistence layer"""
+
+    _id: Any
+    filename: str
+    length: int
+    chunkSize: int
+    uploadDate: datetime
+    metadata: NotRequired[dict[str, Any]]
+
+
+@dataclass
+class SongDataFileDAO:
+    """Represents the GridFS file entry of a song in the internal processing layer"""
+
+    name: str
+    """Song name"""
+    file_id: Any
+    """GridFS file id"""
+    length: int
+    """Song data size in bytes"""
+    chunk_size: int
+    """Size in bytes of each stored GridFS chunk"""
+    upload_date: datetime
+    """Date the song data was uploaded"""
+    quality: SongQuality | None = None
+    """Rendition quality, None for the song data uploaded by the artist"""
+    bucket: DatabaseCollection = DatabaseCollection.SONG_BLOB_DATA
+    """GridFS bucket the file is stored in"""
+
+
+@dataclass
+class CachedSongData:
+    """Song data stored in the song data cache"""
+
+    file_id: Any
+    """GridFS file id the data was read from"""
+    data: bytes
+    """Song data"""
+
+
 def get_song_dao_from_document(song_name: str, document: SongMetadataDocument) -> SongDAO:
     """Get SongDAO from document
 
@@ -84,6 +174,58 @@ def get_song_dto_from_dao(song_dao: SongDAO, url: str) -> SongDTO:
     )
 
 
+def get_song_data_file_dao_from_document(
+    document: SongDataFileDocument,
+    quality: SongQuality | None = None,
+    bucket: DatabaseCollection = DatabaseCollection.SONG_BLOB_DATA,
+) -> SongDataFileDAO:
+    """Get SongDataFileDAO from document. Songs sharing their data with other songs\
+        are read from the GridFS file referenced by their metadata
+
+    Args:
+        document: GridFS file document
+        quality: rendition quality, None for the song data uploaded by the artist
+        bucket: GridFS bucket the file is stored in
+
+    Returns:
+        SongDataFileDAO Object
+    """
+    return SongDataFileDAO(
+        name=document["filename"],
+        file_id=document.get("metadata", {}).get("data_file_id", document["_id"]),
+        length=document["length"],
+        chunk_size=document["chunkSize"],
+        upload_date=document["uploadDate"],
+        quality=quality,
+        bucket=bucket,
+    )
+
+
+def get_song_hls_playlist_filename(name: str) -> str:
+    """Get the file name of the song HLS playlist
+
+    Args:
+        name: song name
+
+    Returns:
+        the playlist file name
+    """
+    return f"{name}/index.m3u8"
+
+
+def get_song_hls_segment_filename(name: str, segment: int) -> str:
+    """Get the file name of a song HLS segment
+
+    Args:
+        name: song name
+        segment: segment number
+
+    Returns:
+        the segment file name
+    """
+    return f"{name}/seg/{segment}"
+
+
 class SongDataNotFoundError(SpotifyElectronError):
     """Exception for getting Song data"""
 
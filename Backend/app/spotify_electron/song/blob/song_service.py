@@ -1,5 +1,10 @@
 """Song service for handling business logic"""
 
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import suppress
+from mmap import mmap
+from typing import Any, BinaryIO
+
 import app.spotify_electron.song.base_song_repository as base_song_repository
 import app.spotify_electron.song.blob.song_repository as song_repository
 import app.spotify_electron.user.artist.artist_service as artist_service
@@ -18,10 +23,34 @@ from app.spotify_electron.song.base_song_schema import (
     SongRepositoryError,
     SongServiceError,
 )
+from app.spotify_electron.song.blob.providers.song_data_cache_provider import (
+    get_song_data_cache,
+    get_song_data_disk_cache,
+)
+from app.spotify_electron.song.blob.providers.song_transcoding_provider import (
+    add_song_transcoding_task,
+    get_song_hls_segment_seconds,
+)
 from app.spotify_electron.song.blob.song_schema import (
+    SONG_RENDITIONS_COMPRESSION_LEVELS,
+    CachedSongData,
+    SongDataFileDAO,
     SongDataNotFoundError,
     SongDTO,
+    SongQuality,
     get_song_dto_from_dao,
+    get_song_hls_playlist_filename,
+    get_song_hls_segment_filename,
+)
+from app.spotify_electron.song.providers.song_analysis_provider import (
+    get_song_analysis_pool,
+)
+from app.spotify_electron.song.providers.song_single_flight_provider import (
+    get_song_data_file_single_flight,
+    get_song_data_single_flight,
+)
+from app.spotify_electron.song.providers.song_streams_buffer_provider import (
+    get_song_streams_buffer,
 )
 from app.spotify_electron.song.serverless.song_schema import (
     SongGetUrlStreamingError,
@@ -41,7 +70,12 @@ from app.spotify_electron.user.user.user_schema import (
 )
 from app.spotify_electron.utils.audio_management.audio_management_utils import (
     EncodingFileError,
-    get_song_duration_seconds,
+    SongAnalysis,
+    process_song,
+)
+from app.spotify_electron.utils.audio_management.hls_utils import (
+    HlsSegment,
+    get_hls_playlist,
 )
 
 song_service_logger = SpotifyElectronLogger(LOGGING_SONG_BLOB_SERVICE).get_logger()
@@ -65,6 +99,7 @@ async def get_song(name: str) -> SongDTO:
         validate_song_name_parameter(name)
 
         song_dao = await song_repository.get_song(name)
+        song_dao.streams += get_song_streams_buffer().get_pending(name)
         song_dto = get_song_dto_from_dao(song_dao, song_dao.url)
 
     except SongBadNameError as exception:
@@ -89,8 +124,27 @@ async def get_song(name: str) -> SongDTO:
         return song_dto
 
 
+async def get_songs_streaming_urls(names: list[str]) -> dict[str, str]:
+    """Get streaming url of many songs. Blob songs are streamed through the stream\
+        endpoint so they don't have a streaming url
+
+    Args:
+        names: song names
+
+    Returns:
+        an empty mapping
+    """
+    return {}
+
+
 async def create_song(  # noqa: C901
-    name: str, genre: Genre, photo: str, file: bytes, token: TokenData
+    name: str,
+    genre: Genre,
+    photo: str,
+    file: BinaryIO,
+    token: TokenData,
+    *,
+    on_progress: Callable[[int], Awaitable[None]] | None = None,
 ) -> None:
     """Create song
 
@@ -100,6 +154,7 @@ async def create_song(  # noqa: C901
         photo: song photo
         file: song file
         token: user token
+        on_progress: called with the bytes of the song file processed so far
 
     Raises:
         GenreNotValidError:
@@ -118,18 +173,9 @@ async def create_song(  # noqa: C901
         await base_user_service_validations.validate_user_name_parameter(artist)
         Genre.validate_genre(genre.value)
 
-        await validate_song_should_not_exists(name)
         await validate_user_should_be_artist(artist)
 
-        song_duration = get_song_duration_seconds(name, file)
-        await song_repository.create_song(
-            name=name,
-            artist=artist,
-            photo=photo,
-            seconds_duration=song_duration,
-            genre=genre,
-            file=file,
-        )
+        await store_song(name, genre, photo, file, artist, on_progress=on_progress)
         await artist_service.add_song_to_artist(artist, name)
     except GenreNotValidError as exception:
         song_service_logger.exception(f"Bad genre provided {genre}")
@@ -159,15 +205,69 @@ async def create_song(  # noqa: C901
             f"Unexpected error in User Service while creating song: {name}"
         )
         raise SongServiceError from exception
+    except Exception as exception:
+        song_service_logger.exception(
+            f"Unexpected error in Song Service creating song: {name}"
+        )
+        raise SongServiceError from exception
+
+
+async def store_song(  # noqa: PLR0913
+    name: str,
+    genre: Genre,
+    photo: str,
+    file: BinaryIO,
+    artist: str,
+    *,
+    on_progress: Callable[[int], Awaitable[None]] | None = None,
+) -> None:
+    """Store song of an already validated artist without adding it to the artist songs
+
+    Args:
+        name: song name
+        genre: song genre
+        photo: song photo
+        file: song file
+        artist: song artist
+        on_progress: called with the bytes of the song file processed so far
+
+    Raises:
+        GenreNotValidError:
+        SongBadNameError: song bad name
+        SongAlreadyExistsError: song already exists
+        SongServiceError: unexpected error while storing song
+    """
+    try:
+        validate_song_name_parameter(name)
+        Genre.validate_genre(genre.value)
+
+        await validate_song_should_not_exists(name)
+
+        song_file_id = await song_repository.create_song(
+            name=name,
+            artist=artist,
+            photo=photo,
+            genre=genre,
+            file=file,
+            on_progress=on_progress,
+        )
+        _process_song_in_background(name, song_file_id)
+    except GenreNotValidError as exception:
+        song_service_logger.exception(f"Bad genre provided {genre}")
+        raise GenreNotValidError from exception
+    except SongBadNameError as exception:
+        song_service_logger.exception(f"Bad Song Name Parameter: {name}")
+        raise SongBadNameError from exception
+    except SongAlreadyExistsError as exception:
+        song_service_logger.exception(f"Song already exists: {name}")
+        raise SongAlreadyExistsError from exception
     except SongRepositoryError as exception:
         song_service_logger.exception(
             f"Unexpected error in Song Repository creating song: {name}"
         )
         raise SongServiceError from exception
     except Exception as exception:
-        song_service_logger.exception(
-            f"Unexpected error in Song Service creating song: {name}"
-        )
+        song_service_logger.exception(f"Unexpected error in Song Service storing song: {name}")
         raise SongServiceError from exception
 
 
@@ -194,7 +294,17 @@ async def delete_song(name: str) -> None:
             artist_name,
             name,
         )
+        deleted_song_file_id = await song_repository.delete_song_data(name)
         await base_song_repository.delete_song(name)
+        await song_repository.delete_song_renditions(name)
+        hls_file_ids = await song_repository.delete_song_hls(name)
+        cache_keys = [_get_song_rendition_cache_key(name, quality) for quality in SongQuality]
+        cache_keys.extend(_get_song_content_cache_key(file_id) for file_id in hls_file_ids)
+        if deleted_song_file_id is not None:
+            cache_keys.append(_get_song_content_cache_key(deleted_song_file_id))
+        for cache_key in cache_keys:
+            get_song_data_cache().invalidate(cache_key)
+            await get_song_data_disk_cache().invalidate(cache_key)
 
     except SongBadNameError as exception:
         song_service_logger.exception(f"Bad Song Name Parameter: {name}")
@@ -241,8 +351,7 @@ async def get_song_data(name: str) -> bytes:
         validate_song_name_parameter(name)
         await validate_song_should_exists(name)
 
-        song_data = await song_repository.get_song_data(name)
-        read_song_data = await song_data.read()
+        read_song_data = await song_repository.get_song_data(name)
     except SongBadNameError as exception:
         song_service_logger.exception(f"Bad Song Name Parameter: {name}")
         raise SongBadNameError from exception
@@ -264,3 +373,497 @@ async def get_song_data(name: str) -> bytes:
         raise SongServiceError from exception
     else:
         return read_song_data
+
+
+async def get_song_data_file(name: str, quality: SongQuality | None = None) -> SongDataFileDAO:
+    """Get song data file entry without reading its data. If a quality is requested\
+        its rendition is returned, falling back to the song data uploaded by the artist\
+        when the rendition doesn't exists. Concurrent requests of the same song share\
+        a single database query
+
+    Args:
+        name: song name
+        quality: rendition quality, None for the song data uploaded by the artist
+
+    Raises:
+        SongBadNameError: name
+        SongNotFoundError: song not found
+        SongServiceError: unexpected error getting song data file
+
+    Returns:
+        the song data file
+    """
+    try:
+        validate_song_name_parameter(name)
+
+        song_data_file = await get_song_data_file_single_flight().do(
+            name, lambda: song_repository.get_song_data_file(name)
+        )
+        if quality is not None:
+            song_rendition_data_file = await song_repository.get_song_rendition_data_file(
+                name, song_data_file.file_id, quality
+            )
+            if song_rendition_data_file is not None:
+                song_data_file = song_rendition_data_file
+    except SongBadNameError as exception:
+        song_service_logger.exception(f"Bad Song Name Parameter: {name}")
+        raise SongBadNameError from exception
+    except SongNotFoundError as exception:
+        song_service_logger.exception(f"Song not found: {name}")
+        raise SongNotFoundError from exception
+    except SongRepositoryError as exception:
+        song_service_logger.exception(
+            f"Unexpected error in Song Repository getting song data file: {name}"
+        )
+        raise SongServiceError from exception
+    except Exception as exception:
+        song_service_logger.exception(
+            f"Unexpected error in Song Service getting song data file: {name}"
+        )
+        raise SongServiceError from exception
+    else:
+        return song_data_file
+
+
+async def get_song_hls_data_file(
+    name: str, segment: int | None = None, version: str | None = None
+) -> SongDataFileDAO:
+    """Get song HLS playlist or segment file entry without reading its data
+
+    Args:
+        name: song name
+        segment: segment number, None for the playlist
+        version: song data file id the segment was packaged from,\
+            None for the current song data
+
+    Raises:
+        SongBadNameError: name
+        SongNotFoundError: song not found
+        SongDataNotFoundError: song has no HLS playlist or segment for the version
+        SongServiceError: unexpected error getting song HLS data file
+
+    Returns:
+        the song HLS data file
+    """
+    try:
+        validate_song_name_parameter(name)
+
+        song_data_file = await get_song_data_file_single_flight().do(
+            name, lambda: song_repository.get_song_data_file(name)
+        )
+        if version is not None and version != str(song_data_file.file_id):
+            raise SongDataNotFoundError  # noqa: TRY301
+
+        filename = (
+            get_song_hls_playlist_filename(name)
+            if segment is None
+            else get_song_hls_segment_filename(name, segment)
+        )
+        song_hls_data_file = await song_repository.get_song_hls_data_file(
+            filename, song_data_file.file_id
+        )
+        if song_hls_data_file is None:
+            raise SongDataNotFoundError  # noqa: TRY301
+    except SongBadNameError as exception:
+        song_service_logger.exception(f"Bad Song Name Parameter: {name}")
+        raise SongBadNameError from exception
+    except SongNotFoundError as exception:
+        song_service_logger.exception(f"Song not found: {name}")
+        raise SongNotFoundError from exception
+    except SongDataNotFoundError as exception:
+        song_service_logger.exception(f"Song HLS data not found: {name}")
+        raise SongDataNotFoundError from exception
+    except SongRepositoryError as exception:
+        song_service_logger.exception(
+            f"Unexpected error in Song Repository getting song HLS data file: {name}"
+        )
+        raise SongServiceError from exception
+    except Exception as exception:
+        song_service_logger.exception(
+            f"Unexpected error in Song Service getting song HLS data file: {name}"
+        )
+        raise SongServiceError from exception
+    else:
+        return song_hls_data_file
+
+
+async def prefetch_song_data(name: str, quality: SongQuality | None = None) -> bool:
+    """Load song data into the song data caches ahead of its streaming
+
+    Args:
+        name: song name
+        quality: rendition quality, None for the song data uploaded by the artist
+
+    Raises:
+        SongBadNameError: name
+        SongNotFoundError: song not found
+        SongServiceError: unexpected error prefetching song data
+
+    Returns:
+        if the song data is cached, songs that don't fit in the caches are not prefetched
+    """
+    try:
+        song_data_file = await get_song_data_file(name, quality)
+        cached_song_data = await _get_cached_song_data(song_data_file)
+    except SongBadNameError as exception:
+        raise SongBadNameError from exception
+    except SongNotFoundError as exception:
+        raise SongNotFoundError from exception
+    except SongServiceError as exception:
+        raise SongServiceError from exception
+    except SongRepositoryError as exception:
+        song_service_logger.exception(
+            f"Unexpected error in Song Repository prefetching song data: {name}"
+        )
+        raise SongServiceError from exception
+    except Exception as exception:
+        song_service_logger.exception(
+            f"Unexpected error in Song Service prefetching song data: {name}"
+        )
+        raise SongServiceError from exception
+    else:
+        if cached_song_data is None:
+            return False
+        _release_cached_song_data(cached_song_data)
+        song_service_logger.debug(f"Song {name} data prefetched")
+        return True
+
+
+async def get_song_data_range(
+    song_data_file: SongDataFileDAO, start: int, end: int
+) -> AsyncGenerator[memoryview, None]:
+    """Get song data from start to end bytes, both included.\
+        Data is served from the song data memory cache or a memory map of the disk cache\
+        when the song fits in them, otherwise only the GridFS chunks overlapping the range\
+        are read from database
+
+    Args:
+        song_data_file: song data file
+        start: start byte
+        end: end byte
+
+    Raises:
+        SongServiceError: unexpected error getting song data range
+
+    Yields:
+        song data from the requested range, split on GridFS chunk boundaries
+    """
+    chunk_size = song_data_file.chunk_size
+    effective_end = min(end, song_data_file.length - 1)
+    if start > effective_end:
+        return
+
+    try:
+        cached_song_data = await _get_cached_song_data(song_data_file)
+        if cached_song_data is not None:
+            try:
+                yield memoryview(cached_song_data)[start : effective_end + 1]
+            finally:
+                _release_cached_song_data(cached_song_data)
+            return
+
+        first_chunk = start // chunk_size
+        last_chunk = effective_end // chunk_size
+        chunk_number = first_chunk
+        async for chunk in song_repository.get_song_data_chunks(
+            song_data_file.file_id,
+            first_chunk,
+            last_chunk,
+            bucket=song_data_file.bucket,
+        ):
+            chunk_start = chunk_number * chunk_size
+            lower = max(start - chunk_start, 0)
+            upper = min(effective_end - chunk_start + 1, len(chunk))
+            yield memoryview(chunk)[lower:upper]
+            chunk_number += 1
+    except SongRepositoryError as exception:
+        song_service_logger.exception(
+            f"Unexpected error in Song Repository getting song {song_data_file.name} "
+            f"data range {start}-{end}"
+        )
+        raise SongServiceError from exception
+
+
+async def _get_cached_song_data(song_data_file: SongDataFileDAO) -> bytes | mmap | None:
+    """Get the whole song data from the song data caches. The memory cache is looked up\
+        first, then the disk cache. On a miss the song data is loaded from database into\
+        the caches it fits in, concurrent misses of the same song share a single load
+
+    Args:
+        song_data_file: song data file
+
+    Returns:
+        the song data, a memory map of the disk cached song data or None\
+            if the song cannot be cached
+    """
+    song_data_cache = get_song_data_cache()
+    song_data_disk_cache = get_song_data_disk_cache()
+    fits_memory_cache = song_data_cache.fits(song_data_file.length)
+    fits_disk_cache = song_data_disk_cache.fits(song_data_file.length)
+    file_tag = str(song_data_file.file_id)
+    cache_key = _get_song_data_cache_key(song_data_file)
+
+    if fits_memory_cache:
+        cached_song_data = song_data_cache.get(cache_key)
+        if cached_song_data is not None and cached_song_data.file_id == song_data_file.file_id:
+            return cached_song_data.data
+
+    if fits_disk_cache:
+        song_data_mmap = await song_data_disk_cache.open(cache_key, file_tag)
+        if song_data_mmap is not None:
+            return song_data_mmap
+
+    if not fits_memory_cache and not fits_disk_cache:
+        return None
+
+    song_data = await get_song_data_single_flight().do(
+        f"{cache_key}/{file_tag}",
+        lambda: _load_song_data_into_caches(
+            song_data_file, cache_key, fits_memory_cache, fits_disk_cache
+        ),
+    )
+    if song_data is None:
+        return await song_data_disk_cache.open(cache_key, file_tag)
+    return song_data
+
+
+async def _load_song_data_into_caches(
+    song_data_file: SongDataFileDAO,
+    cache_key: str,
+    fits_memory_cache: bool,
+    fits_disk_cache: bool,
+) -> bytes | None:
+    """Load the whole song data from database into the song data caches it fits in
+
+    Args:
+        song_data_file: song data file
+        cache_key: song data caches key
+        fits_memory_cache: if the song data fits in the memory cache
+        fits_disk_cache: if the song data fits in the disk cache
+
+    Returns:
+        the song data if it fits in the memory cache, None if it's only stored on disk
+    """
+    file_tag = str(song_data_file.file_id)
+    last_chunk = (song_data_file.length - 1) // song_data_file.chunk_size
+    song_data_chunks = song_repository.get_song_data_chunks(
+        song_data_file.file_id,
+        0,
+        last_chunk,
+        bucket=song_data_file.bucket,
+    )
+
+    if not fits_memory_cache:
+        await get_song_data_disk_cache().put(cache_key, file_tag, song_data_chunks)
+        return None
+
+    song_data = b"".join([chunk async for chunk in song_data_chunks])
+    get_song_data_cache().put(
+        cache_key, CachedSongData(file_id=song_data_file.file_id, data=song_data)
+    )
+    if fits_disk_cache:
+        await get_song_data_disk_cache().put(cache_key, file_tag, _iterate(song_data))
+    return song_data
+
+
+def _get_song_data_cache_key(song_data_file: SongDataFileDAO) -> str:
+    """Get the song data caches key of a song or one of its renditions. Songs with the\
+        same content share their data so they share its cache entry too
+
+    Args:
+        song_data_file: song data file
+
+    Returns:
+        the cache key
+    """
+    if song_data_file.quality is None:
+        return _get_song_content_cache_key(song_data_file.file_id)
+    return _get_song_rendition_cache_key(song_data_file.name, song_data_file.quality)
+
+
+def _get_song_content_cache_key(song_file_id: Any) -> str:
+    """Get the song data caches key of the song data uploaded by the artist
+
+    Args:
+        song_file_id: GridFS file id the song data is stored in
+
+    Returns:
+        the cache key
+    """
+    return f"content/{song_file_id}"
+
+
+def _get_song_rendition_cache_key(name: str, quality: SongQuality) -> str:
+    """Get the song data caches key of a song rendition
+
+    Args:
+        name: song name
+        quality: rendition quality
+
+    Returns:
+        the cache key
+    """
+    return f"{name}/{quality.value}"
+
+
+def _process_song_in_background(name: str, song_file_id: Any) -> None:
+    """Analyze song in background, along with the creation of its renditions and HLS\
+        segments if song transcoding and HLS packaging are enabled
+
+    Args:
+        name: song name
+        song_file_id: GridFS file id of the song data
+    """
+    create_renditions = get_song_analysis_pool().enabled
+    create_hls = get_song_hls_segment_seconds() > 0
+    add_song_transcoding_task(_process_song(name, song_file_id, create_renditions, create_hls))
+
+
+async def _process_song(
+    name: str, song_file_id: Any, create_renditions: bool, create_hls: bool
+) -> None:
+    """Read the song data stored in the database once and process it in a single call\
+        to the analysis process pool that decodes it once to analyze it and create its\
+        renditions and HLS segments. The data is read when processing starts instead of\
+        keeping the uploaded file in memory while waiting for the analysis process pool.\
+        The results are discarded if the song was deleted or uploaded again meanwhile.\
+        Errors are logged since no request is waiting for the processing
+
+    Args:
+        name: song name
+        song_file_id: GridFS file id of the song data
+        create_renditions: whether to create the song renditions
+        create_hls: whether to create the song HLS segments
+    """
+    try:
+        song_data_file = await song_repository.get_song_data_file(name)
+        if song_data_file.file_id != song_file_id:
+            song_service_logger.info(f"Song {name} changed, skipping its processing")
+            return
+        file = await song_repository.get_song_data(name)
+    except (SongNotFoundError, SongDataNotFoundError):
+        song_service_logger.info(f"Song {name} deleted, skipping its processing")
+        return
+    except Exception:
+        song_service_logger.exception(f"Unexpected error reading song {name} for processing")
+        return
+
+    compression_levels = {}
+    if create_renditions:
+        compression_levels = {
+            str(quality.value): compression_level
+            for quality, compression_level in SONG_RENDITIONS_COMPRESSION_LEVELS.items()
+        }
+    try:
+        song_processing = await get_song_analysis_pool().run(
+            process_song,
+            name,
+            file,
+            compression_levels,
+            get_song_hls_segment_seconds() if create_hls else 0,
+            background=True,
+        )
+
+        song_data_file = await song_repository.get_song_data_file(name)
+        if song_data_file.file_id != song_file_id:
+            song_service_logger.info(f"Song {name} changed, discarding its processing")
+            return
+    except (SongNotFoundError, SongDataNotFoundError):
+        song_service_logger.info(f"Song {name} deleted, discarding its processing")
+        return
+    except Exception:
+        song_service_logger.exception(f"Unexpected error processing song {name}")
+        return
+
+    await _store_song_analysis(name, song_processing.analysis)
+    if create_renditions:
+        await _store_song_renditions(name, song_file_id, song_processing.renditions)
+    if create_hls:
+        await _store_song_hls(name, song_file_id, song_processing.hls_segments)
+
+
+async def _store_song_analysis(name: str, song_analysis: SongAnalysis) -> None:
+    """Store song waveform peaks and loudness
+
+    Args:
+        name: song name
+        song_analysis: song analysis
+    """
+    try:
+        await base_song_repository.update_song_analysis(name, song_analysis)
+    except SongNotFoundError:
+        song_service_logger.info(f"Song {name} deleted, discarding its analysis")
+    except Exception:
+        song_service_logger.exception(f"Unexpected error storing song {name} analysis")
+
+
+async def _store_song_renditions(
+    name: str, song_file_id: Any, renditions: dict[str, bytes]
+) -> None:
+    """Store song renditions
+
+    Args:
+        name: song name
+        song_file_id: GridFS file id of the song data
+        renditions: encoded renditions by quality
+    """
+    try:
+        for quality, rendition in renditions.items():
+            await song_repository.create_song_rendition(
+                name, song_file_id, SongQuality(quality), rendition
+            )
+    except Exception:
+        song_service_logger.exception(f"Unexpected error storing song {name} renditions")
+    else:
+        song_service_logger.info(f"Song {name} renditions {list(renditions)} created")
+
+
+async def _store_song_hls(name: str, song_file_id: Any, segments: list[HlsSegment]) -> None:
+    """Store song HLS segments with their playlist. Segment URIs carry the song data\
+        file id as version so a segment URI always refers to the same content and can be\
+        cached forever. Songs that are not MP3 files have no segments and are not packaged
+
+    Args:
+        name: song name
+        song_file_id: GridFS file id of the song data
+        segments: HLS segments
+    """
+    if not segments:
+        song_service_logger.info(f"Song {name} is not an MP3 file, skipping HLS")
+        return
+    try:
+        playlist = get_hls_playlist(
+            [segment.duration for segment in segments],
+            [f"seg/{number}?version={song_file_id}" for number in range(len(segments))],
+        )
+        await song_repository.create_song_hls(
+            name, song_file_id, playlist.encode(), [segment.data for segment in segments]
+        )
+    except Exception:
+        song_service_logger.exception(f"Unexpected error storing song {name} HLS segments")
+    else:
+        song_service_logger.info(f"Song {name} HLS playlist with {len(segments)} segments")
+
+
+async def _iterate(data: bytes) -> AsyncGenerator[bytes, None]:
+    """Get an async iterator over data
+
+    Args:
+        data: data
+
+    Yields:
+        the data
+    """
+    yield data
+
+
+def _release_cached_song_data(cached_song_data: bytes | mmap) -> None:
+    """Release song data obtained from the song data caches. Memory maps that still\
+        have exported slices are closed once they are garbage collected
+
+    Args:
+        cached_song_data: cached song data
+    """
+    if isinstance(cached_song_data, mmap):
+        with suppress(BufferError):
+            cached_song_data.close()
@@ -1,18 +1,17 @@
 """Validations for song repository"""
 
-from motor.motor_asyncio import AsyncIOMotorGridOut
-
 from app.spotify_electron.song.blob.song_schema import SongDataNotFoundError
 
 
-def validate_song_data_exists(song_file: AsyncIOMotorGridOut | None) -> None:
+def validate_song_data_exists(song_data: bytes, length: int) -> None:
     """Validate song data exists
 
     Args:
-        song_file: song data
+        song_data: song data read from its chunks
+        length: song data size in bytes
 
     Raises:
         SongDataNotFoundError: song data doesn't exists
     """
-    if song_file is None:
+    if len(song_data) != length:
         raise SongDataNotFoundError
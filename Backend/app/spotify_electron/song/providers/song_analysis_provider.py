@@ -0,0 +1,45 @@
+"""Song analysis provider. Runs the CPU bound analysis and transcoding of songs in a\
+    shared pool of worker processes so it doesn't block the event loop serving requests
+"""
+
+from app.common.app_schema import AppConfig
+from app.common.PropertiesManager import PropertiesManager
+from app.logging.logging_constants import LOGGING_SONG_ANALYSIS_PROVIDER
+from app.logging.logging_schema import SpotifyElectronLogger
+from app.spotify_electron.utils.process_pool.process_pool_utils import BoundedProcessPool
+
+
+class SongAnalysisProvider:
+    """Provides the song analysis process pool of the current worker"""
+
+    song_analysis_pool: BoundedProcessPool = BoundedProcessPool(max_workers=0, max_queued=0)
+    """Song analysis process pool, runs the analysis in threads until initialized"""
+
+    @classmethod
+    def init_pool(cls) -> None:
+        """Init song analysis process pool with the configured processes and queue size"""
+        logger = SpotifyElectronLogger(LOGGING_SONG_ANALYSIS_PROVIDER).get_logger()
+        workers = int(getattr(PropertiesManager, AppConfig.SONG_ANALYSIS_WORKERS) or 0)
+        max_queued = int(getattr(PropertiesManager, AppConfig.SONG_ANALYSIS_MAX_QUEUED) or 0)
+        cls.song_analysis_pool = BoundedProcessPool(max_workers=workers, max_queued=max_queued)
+        if workers <= 0:
+            logger.info("Song analysis running in threads, song transcoding disabled")
+            return
+        logger.info(
+            f"Song analysis initialized with {workers} processes and {max_queued} queued calls"
+        )
+
+    @classmethod
+    def close_pool(cls) -> None:
+        """Stop the song analysis process pool"""
+        cls.song_analysis_pool.close()
+        cls.song_analysis_pool = BoundedProcessPool(max_workers=0, max_queued=0)
+
+
+def get_song_analysis_pool() -> BoundedProcessPool:
+    """Get song analysis process pool
+
+    Returns:
+        the song analysis process pool
+    """
+    return SongAnalysisProvider.song_analysis_pool
@@ -6,7 +6,11 @@ from app.common.app_schema import AppArchitecture, AppEnvironment
 from app.common.PropertiesManager import PropertiesManager
 from app.database.database_schema import DatabaseCollection
 from app.database.DatabaseConnectionManager import DatabaseConnectionManager
-from app.spotify_electron.song.base_song_schema import BaseSongDocument
+from app.spotify_electron.song.base_song_schema import (
+    BaseSongDocument,
+    SongJobDocument,
+    SongUploadDocument,
+)
 
 
 def get_song_collection() -> AsyncIOMotorCollection[BaseSongDocument]:
@@ -36,3 +40,34 @@ def get_gridfs_song_collection() -> AsyncIOMotorGridFSBucket:
     return DatabaseConnectionManager.get_gridfs_collection_connection(
         DatabaseCollection.SONG_BLOB_DATA
     )
+
+
+def get_song_upload_collection() -> AsyncIOMotorCollection[SongUploadDocument]:
+    """Get song upload collection
+
+    Returns:
+        the resumable song uploads collection, shared by every architecture
+    """
+    return DatabaseConnectionManager.get_collection_connection(DatabaseCollection.SONG_UPLOAD)
+
+
+async def init_song_upload_collection() -> None:
+    """Create the index of song uploads by expiration date, so expired uploads are\
+        found without reading the others"""
+    await get_song_upload_collection().create_index("expires_at")
+
+
+def get_song_job_collection() -> AsyncIOMotorCollection[SongJobDocument]:
+    """Get song job collection
+
+    Returns:
+        the uploaded songs background processing jobs collection, shared by every\
+            architecture
+    """
+    return DatabaseConnectionManager.get_collection_connection(DatabaseCollection.SONG_JOB)
+
+
+async def init_song_job_collection() -> None:
+    """Create the TTL index of song jobs by expiration date, so the database deletes\
+        the expired jobs"""
+    await get_song_job_collection().create_index("expires_at", expireAfterSeconds=0)
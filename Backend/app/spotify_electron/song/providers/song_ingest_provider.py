@@ -0,0 +1,60 @@
+"""Song ingest provider. Processes uploaded songs in background with a bounded number\
+    of workers so long uploads don't hold request workers until they are stored
+"""
+
+from app.common.app_schema import AppConfig
+from app.common.PropertiesManager import PropertiesManager
+from app.logging.logging_constants import LOGGING_SONG_INGEST_PROVIDER
+from app.logging.logging_schema import SpotifyElectronLogger
+from app.spotify_electron.song.providers.song_collection_provider import (
+    init_song_job_collection,
+)
+from app.spotify_electron.utils.job_queue.job_queue_utils import JobQueue
+
+
+class SongIngestProvider:
+    """Provides the song ingest job queue of the current worker"""
+
+    song_ingest_queue: JobQueue = JobQueue(max_running=0, max_pending=0)
+    """Song ingest job queue, disabled until initialized"""
+    job_expiration_seconds: float = 0
+    """Seconds the status of a finished job is kept"""
+
+    @classmethod
+    async def init_queue(cls) -> None:
+        """Init song ingest job queue with the configured workers and limits"""
+        logger = SpotifyElectronLogger(LOGGING_SONG_INGEST_PROVIDER).get_logger()
+        workers = int(getattr(PropertiesManager, AppConfig.SONG_INGEST_WORKERS) or 0)
+        max_pending = int(getattr(PropertiesManager, AppConfig.SONG_INGEST_MAX_PENDING) or 0)
+        cls.job_expiration_seconds = float(
+            getattr(PropertiesManager, AppConfig.SONG_INGEST_JOB_EXPIRATION_SECONDS) or 0
+        )
+        await init_song_job_collection()
+        cls.song_ingest_queue = JobQueue(max_running=workers, max_pending=max_pending)
+        logger.info(
+            f"Song ingest initialized with {workers} workers, {max_pending} pending songs "
+            f"and jobs expiring {cls.job_expiration_seconds} seconds after their last update"
+        )
+
+    @classmethod
+    async def close_queue(cls) -> None:
+        """Discard pending song ingest jobs and cancel running ones"""
+        await cls.song_ingest_queue.close()
+
+
+def get_song_ingest_queue() -> JobQueue:
+    """Get song ingest job queue
+
+    Returns:
+        the song ingest job queue
+    """
+    return SongIngestProvider.song_ingest_queue
+
+
+def get_song_job_expiration_seconds() -> float:
+    """Get seconds the status of a song job is kept after its last update
+
+    Returns:
+        the seconds the status of a song job is kept
+    """
+    return SongIngestProvider.job_expiration_seconds
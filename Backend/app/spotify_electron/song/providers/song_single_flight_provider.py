@@ -0,0 +1,77 @@
+"""Song single flight provider. Coalesces concurrent database loads of the same song\
+    so a burst of requests for a new release reads it from database only once
+"""
+
+from app.common.app_schema import AppConfig
+from app.common.PropertiesManager import PropertiesManager
+from app.logging.logging_constants import LOGGING_SONG_SINGLE_FLIGHT_PROVIDER
+from app.logging.logging_schema import SpotifyElectronLogger
+from app.spotify_electron.song.base_song_schema import SongMetadataDAO
+from app.spotify_electron.song.blob.song_schema import SongDataFileDAO
+from app.spotify_electron.utils.single_flight.single_flight_utils import SingleFlight
+
+
+class SongSingleFlightProvider:
+    """Provides the song loads single flights of the current worker"""
+
+    song_exists_single_flight: SingleFlight[bool] = SingleFlight(timeout_seconds=None)
+    """Single flight of song existence checks"""
+    song_metadata_single_flight: SingleFlight[SongMetadataDAO] = SingleFlight(
+        timeout_seconds=None
+    )
+    """Single flight of song metadata loads"""
+    song_data_file_single_flight: SingleFlight[SongDataFileDAO] = SingleFlight(
+        timeout_seconds=None
+    )
+    """Single flight of song data file entry loads"""
+    song_data_single_flight: SingleFlight[bytes | None] = SingleFlight(timeout_seconds=None)
+    """Single flight of song data loads into the song data caches"""
+
+    @classmethod
+    def init_single_flights(cls) -> None:
+        """Init song single flights with the configured timeout"""
+        logger = SpotifyElectronLogger(LOGGING_SONG_SINGLE_FLIGHT_PROVIDER).get_logger()
+        timeout_seconds = float(
+            getattr(PropertiesManager, AppConfig.SONG_SINGLE_FLIGHT_TIMEOUT_SECONDS) or 0
+        )
+        cls.song_exists_single_flight = SingleFlight(timeout_seconds=timeout_seconds)
+        cls.song_metadata_single_flight = SingleFlight(timeout_seconds=timeout_seconds)
+        cls.song_data_file_single_flight = SingleFlight(timeout_seconds=timeout_seconds)
+        cls.song_data_single_flight = SingleFlight(timeout_seconds=timeout_seconds)
+        logger.info(f"Song single flights initialized with {timeout_seconds} seconds timeout")
+
+
+def get_song_exists_single_flight() -> SingleFlight[bool]:
+    """Get song existence checks single flight
+
+    Returns:
+        the song existence checks single flight
+    """
+    return SongSingleFlightProvider.song_exists_single_flight
+
+
+def get_song_metadata_single_flight() -> SingleFlight[SongMetadataDAO]:
+    """Get song metadata loads single flight
+
+    Returns:
+        the song metadata loads single flight
+    """
+    return SongSingleFlightProvider.song_metadata_single_flight
+
+
+def get_song_data_file_single_flight() -> SingleFlight[SongDataFileDAO]:
+    """Get song data file entry loads single flight
+
+    Returns:
+        the song data file entry loads single flight
+    """
+    return SongSingleFlightProvider.song_data_file_single_flight
+
+
+def get_song_data_single_flight() -> SingleFlight[bytes | None]:
+    """Get song data loads single flight
+
+    Returns:
+        the song data loads single flight
+    """
+    return SongSingleFlightProvider.song_data_single_flight
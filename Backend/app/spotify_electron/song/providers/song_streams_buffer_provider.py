@@ -0,0 +1,58 @@
+"""Song streams buffer provider. Collects song streams in memory and writes them\
+    to database in batches so popular songs don't write their document on every play
+"""
+
+import app.spotify_electron.song.base_song_repository as base_song_repository
+from app.common.app_schema import AppConfig
+from app.common.PropertiesManager import PropertiesManager
+from app.logging.logging_constants import LOGGING_SONG_STREAMS_BUFFER_PROVIDER
+from app.logging.logging_schema import SpotifyElectronLogger
+from app.spotify_electron.utils.buffer.counter_buffer_utils import CounterBuffer
+
+
+class SongStreamsBufferProvider:
+    """Provides the song streams buffer of the current worker"""
+
+    song_streams_buffer: CounterBuffer = CounterBuffer(
+        flush_interval_seconds=0,
+        max_pending=0,
+        flush_counts=base_song_repository.increase_songs_streams,
+    )
+    """Song streams buffer, writes every stream until initialized"""
+
+    @classmethod
+    def init_buffer(cls) -> None:
+        """Init song streams buffer with the configured flush interval and threshold\
+            and start flushing it periodically
+        """
+        logger = SpotifyElectronLogger(LOGGING_SONG_STREAMS_BUFFER_PROVIDER).get_logger()
+        flush_interval_seconds = float(
+            getattr(PropertiesManager, AppConfig.SONG_STREAMS_FLUSH_INTERVAL_SECONDS) or 0
+        )
+        max_pending = int(
+            getattr(PropertiesManager, AppConfig.SONG_STREAMS_FLUSH_MAX_PENDING) or 0
+        )
+        cls.song_streams_buffer = CounterBuffer(
+            flush_interval_seconds=flush_interval_seconds,
+            max_pending=max_pending if flush_interval_seconds > 0 else 0,
+            flush_counts=base_song_repository.increase_songs_streams,
+        )
+        cls.song_streams_buffer.start()
+        logger.info(
+            f"Song streams buffer initialized flushing every {flush_interval_seconds} "
+            f"seconds or {max_pending} streams"
+        )
+
+    @classmethod
+    async def close_buffer(cls) -> None:
+        """Stop song streams buffer and write the buffered streams"""
+        await cls.song_streams_buffer.close()
+
+
+def get_song_streams_buffer() -> CounterBuffer:
+    """Get song streams buffer
+
+    Returns:
+        the song streams buffer
+    """
+    return SongStreamsBufferProvider.song_streams_buffer
@@ -0,0 +1,125 @@
+"""Song upload provider. Keeps the directory where the chunks of resumable song uploads\
+    are stored and periodically deletes the uploads that stopped receiving chunks
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+from contextlib import suppress
+
+import app.spotify_electron.song.song_upload_repository as song_upload_repository
+from app.common.app_schema import AppConfig
+from app.common.PropertiesManager import PropertiesManager
+from app.logging.logging_constants import LOGGING_SONG_UPLOAD_PROVIDER
+from app.logging.logging_schema import SpotifyElectronLogger
+from app.spotify_electron.song.providers.song_collection_provider import (
+    init_song_upload_collection,
+)
+
+SONG_UPLOAD_DEFAULT_DIRECTORY = "spotify-electron-uploads"
+"""Directory inside the system temporary directory used if none is configured"""
+
+
+class SongUploadProvider:
+    """Provides the resumable song uploads settings of the current worker"""
+
+    directory: str = os.path.join(tempfile.gettempdir(), SONG_UPLOAD_DEFAULT_DIRECTORY)
+    """Directory with a subdirectory of received chunks per upload"""
+    max_bytes: int = 0
+    """Max bytes of an uploaded song, 0 until initialized"""
+    expiration_seconds: float = 0
+    """Seconds an upload is kept without receiving chunks"""
+    cleanup_task: asyncio.Task | None = None
+    """Task deleting expired uploads periodically"""
+
+    @classmethod
+    async def init_uploads(cls) -> None:
+        """Init resumable song uploads with the configured directory and limits and start\
+            deleting expired uploads periodically
+        """
+        logger = SpotifyElectronLogger(LOGGING_SONG_UPLOAD_PROVIDER).get_logger()
+        cls.directory = getattr(PropertiesManager, AppConfig.SONG_UPLOAD_DIRECTORY) or (
+            os.path.join(tempfile.gettempdir(), SONG_UPLOAD_DEFAULT_DIRECTORY)
+        )
+        cls.max_bytes = int(getattr(PropertiesManager, AppConfig.SONG_UPLOAD_MAX_BYTES) or 0)
+        cls.expiration_seconds = float(
+            getattr(PropertiesManager, AppConfig.SONG_UPLOAD_EXPIRATION_SECONDS) or 0
+        )
+        cleanup_interval_seconds = float(
+            getattr(PropertiesManager, AppConfig.SONG_UPLOAD_CLEANUP_INTERVAL_SECONDS) or 0
+        )
+        os.makedirs(cls.directory, exist_ok=True)
+        await init_song_upload_collection()
+        if cleanup_interval_seconds > 0:
+            cls.cleanup_task = asyncio.create_task(
+                cls._cleanup_periodically(cleanup_interval_seconds)
+            )
+        logger.info(
+            f"Song uploads initialized in {cls.directory} with {cls.max_bytes} bytes, "
+            f"expiring after {cls.expiration_seconds} seconds and cleaned up every "
+            f"{cleanup_interval_seconds} seconds"
+        )
+
+    @classmethod
+    async def close_uploads(cls) -> None:
+        """Stop deleting expired uploads"""
+        if cls.cleanup_task is not None:
+            cls.cleanup_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await cls.cleanup_task
+            cls.cleanup_task = None
+
+    @classmethod
+    async def cleanup(cls) -> None:
+        """Delete expired uploads along with their received chunks"""
+        logger = SpotifyElectronLogger(LOGGING_SONG_UPLOAD_PROVIDER).get_logger()
+        try:
+            upload_ids = await song_upload_repository.delete_expired_song_uploads()
+            for upload_id in upload_ids:
+                await asyncio.to_thread(
+                    shutil.rmtree, get_song_upload_directory(upload_id), ignore_errors=True
+                )
+        except Exception:
+            logger.exception("Unexpected error deleting expired song uploads")
+
+    @classmethod
+    async def _cleanup_periodically(cls, cleanup_interval_seconds: float) -> None:
+        """Delete expired uploads every interval
+
+        Args:
+            cleanup_interval_seconds: seconds between cleanups
+        """
+        while True:
+            await asyncio.sleep(cleanup_interval_seconds)
+            await cls.cleanup()
+
+
+def get_song_upload_directory(upload_id: str) -> str:
+    """Get the directory of the received chunks of an upload
+
+    Args:
+        upload_id: song upload id
+
+    Returns:
+        the upload directory
+    """
+    return os.path.join(SongUploadProvider.directory, upload_id)
+
+
+def get_song_upload_max_bytes() -> int:
+    """Get max bytes of an uploaded song
+
+    Returns:
+        the max bytes of an uploaded song
+    """
+    return SongUploadProvider.max_bytes
+
+
+def get_song_upload_expiration_seconds() -> float:
+    """Get seconds an upload is kept without receiving chunks
+
+    Returns:
+        the upload expiration seconds
+    """
+    return SongUploadProvider.expiration_seconds
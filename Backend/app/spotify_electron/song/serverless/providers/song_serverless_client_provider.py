@@ -0,0 +1,153 @@
+"""Song serverless client provider. Keeps a pool of connections with the serverless\
+    function that handles song files, so requests reuse open connections instead of\
+    establishing a new one each time
+"""
+
+from httpx import AsyncClient, AsyncHTTPTransport, Limits, Timeout
+
+from app.common.app_schema import AppConfig, AppEnvironment
+from app.common.PropertiesManager import PropertiesManager
+from app.logging.logging_constants import LOGGING_SONG_SERVERLESS_CLIENT_PROVIDER
+from app.logging.logging_schema import SpotifyElectronLogger
+
+
+class SongServerlessClientProvider:
+    """Provides the serverless function HTTP client of the current worker"""
+
+    client: AsyncClient = AsyncClient()
+    """Serverless function HTTP client, without base url until initialized"""
+    retries: int = 0
+    """Times a failed request that can be repeated safely is retried"""
+    retry_backoff_seconds: float = 0
+    """Seconds waited before the first retry, doubled on every retry"""
+    upload_max_body_bytes: int = 0
+    """Max bytes of a song sent in the body of a single request"""
+    upload_part_bytes: int = 0
+    """Bytes of each part of songs uploaded directly to the bucket"""
+    upload_concurrency: int = 1
+    """Parts of a song uploaded at once"""
+    url_batch_size: int = 1
+    """Max songs whose streaming urls are requested at once"""
+
+    @classmethod
+    def init_client(cls) -> None:
+        """Init serverless function HTTP client with the configured timeouts,\
+            connection limits and retries
+        """
+        logger = SpotifyElectronLogger(LOGGING_SONG_SERVERLESS_CLIENT_PROVIDER).get_logger()
+        serverless_url = getattr(
+            PropertiesManager, AppEnvironment.SERVERLESS_URL_ENV_NAME, None
+        )
+        timeout_seconds = float(
+            getattr(PropertiesManager, AppConfig.SONG_SERVERLESS_TIMEOUT_SECONDS) or 0
+        )
+        connect_timeout_seconds = float(
+            getattr(PropertiesManager, AppConfig.SONG_SERVERLESS_CONNECT_TIMEOUT_SECONDS) or 0
+        )
+        max_connections = int(
+            getattr(PropertiesManager, AppConfig.SONG_SERVERLESS_MAX_CONNECTIONS) or 0
+        )
+        max_keepalive_connections = int(
+            getattr(PropertiesManager, AppConfig.SONG_SERVERLESS_MAX_KEEPALIVE_CONNECTIONS)
+            or 0
+        )
+        cls.retries = int(getattr(PropertiesManager, AppConfig.SONG_SERVERLESS_RETRIES) or 0)
+        cls.retry_backoff_seconds = float(
+            getattr(PropertiesManager, AppConfig.SONG_SERVERLESS_RETRY_BACKOFF_SECONDS) or 0
+        )
+        cls.upload_max_body_bytes = int(
+            getattr(PropertiesManager, AppConfig.SONG_SERVERLESS_UPLOAD_MAX_BODY_BYTES) or 0
+        )
+        cls.upload_part_bytes = int(
+            getattr(PropertiesManager, AppConfig.SONG_SERVERLESS_UPLOAD_PART_BYTES) or 0
+        )
+        cls.upload_concurrency = max(
+            int(getattr(PropertiesManager, AppConfig.SONG_SERVERLESS_UPLOAD_CONCURRENCY) or 0),
+            1,
+        )
+        cls.url_batch_size = max(
+            int(getattr(PropertiesManager, AppConfig.SONG_SERVERLESS_URL_BATCH_SIZE) or 0), 1
+        )
+
+        # Connection failures are always retried by the transport since the request
+        # was not sent, failures after sending are only retried for safe requests
+        transport = AsyncHTTPTransport(
+            limits=Limits(
+                max_connections=max_connections or None,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            retries=cls.retries,
+        )
+        cls.client = AsyncClient(
+            base_url=serverless_url or "",
+            timeout=Timeout(timeout_seconds or None, connect=connect_timeout_seconds or None),
+            transport=transport,
+        )
+        logger.info(
+            f"Song serverless client initialized with {max_connections} connections, "
+            f"{timeout_seconds} seconds timeout and {cls.retries} retries, uploading songs "
+            f"bigger than {cls.upload_max_body_bytes} bytes in parts of "
+            f"{cls.upload_part_bytes} bytes"
+        )
+
+    @classmethod
+    async def close_client(cls) -> None:
+        """Close the open connections with the serverless function"""
+        await cls.client.aclose()
+
+
+def get_song_serverless_client() -> AsyncClient:
+    """Get serverless function HTTP client
+
+    Returns:
+        the serverless function HTTP client
+    """
+    return SongServerlessClientProvider.client
+
+
+def get_song_serverless_retries() -> tuple[int, float]:
+    """Get the retries of failed requests that can be repeated safely
+
+    Returns:
+        the times a request is retried and the seconds waited before the first retry
+    """
+    return (
+        SongServerlessClientProvider.retries,
+        SongServerlessClientProvider.retry_backoff_seconds,
+    )
+
+
+def get_song_serverless_upload_max_body_bytes() -> int:
+    """Get max bytes of a song sent in the body of a single request
+
+    Returns:
+        the max bytes of a song sent in a request body
+    """
+    return SongServerlessClientProvider.upload_max_body_bytes
+
+
+def get_song_serverless_upload_part_bytes() -> int:
+    """Get bytes of each part of songs uploaded directly to the bucket
+
+    Returns:
+        the bytes of each part
+    """
+    return SongServerlessClientProvider.upload_part_bytes
+
+
+def get_song_serverless_upload_concurrency() -> int:
+    """Get parts of a song uploaded at once
+
+    Returns:
+        the parts of a song uploaded at once
+    """
+    return SongServerlessClientProvider.upload_concurrency
+
+
+def get_song_serverless_url_batch_size() -> int:
+    """Get max songs whose streaming urls are requested at once
+
+    Returns:
+        the max songs per streaming urls request
+    """
+    return SongServerlessClientProvider.url_batch_size
@@ -0,0 +1,48 @@
+"""Song streaming url cache provider. Stores the streaming urls returned by the serverless\
+    function so getting a song doesn't invoke the function every time
+"""
+
+from app.common.app_schema import AppConfig
+from app.common.PropertiesManager import PropertiesManager
+from app.logging.logging_constants import LOGGING_SONG_STREAMING_URL_CACHE_PROVIDER
+from app.logging.logging_schema import SpotifyElectronLogger
+from app.spotify_electron.utils.cache.cache_utils import LRUCache
+
+
+class SongStreamingUrlCacheProvider:
+    """Provides the song streaming url cache of the current worker"""
+
+    song_streaming_url_cache: LRUCache[str] = LRUCache(
+        max_bytes=0, max_entry_bytes=0, get_size=len
+    )
+    """Song streaming url cache, disabled until initialized"""
+
+    @classmethod
+    def init_cache(cls) -> None:
+        """Init song streaming url cache with the configured budget and time to live"""
+        logger = SpotifyElectronLogger(LOGGING_SONG_STREAMING_URL_CACHE_PROVIDER).get_logger()
+        max_bytes = int(
+            getattr(PropertiesManager, AppConfig.SONG_SERVERLESS_URL_CACHE_MAX_BYTES) or 0
+        )
+        ttl_seconds = float(
+            getattr(PropertiesManager, AppConfig.SONG_SERVERLESS_URL_CACHE_TTL_SECONDS) or 0
+        )
+        cls.song_streaming_url_cache = LRUCache(
+            max_bytes=max_bytes,
+            max_entry_bytes=max_bytes,
+            get_size=len,
+            ttl_seconds=ttl_seconds,
+        )
+        logger.info(
+            f"Song streaming url cache initialized with {max_bytes} bytes "
+            f"and urls expiring after {ttl_seconds} seconds"
+        )
+
+
+def get_song_streaming_url_cache() -> LRUCache[str]:
+    """Get song streaming url cache
+
+    Returns:
+        the song streaming url cache
+    """
+    return SongStreamingUrlCacheProvider.song_streaming_url_cache
@@ -0,0 +1,96 @@
+"""Song streaming url provider. Keeps the CloudFront distribution settings used to build\
+    and sign the streaming urls of songs without calling the serverless function
+"""
+
+from app.common.app_schema import AppConfig
+from app.common.PropertiesManager import PropertiesManager
+from app.logging.logging_constants import LOGGING_SONG_STREAMING_URL_PROVIDER
+from app.logging.logging_schema import SpotifyElectronLogger
+from app.spotify_electron.utils.cloudfront.cloudfront_utils import (
+    CloudFrontUrlSigner,
+    load_cloudfront_private_key,
+)
+
+
+class SongStreamingUrlProvider:
+    """Provides the CloudFront distribution settings of the song streaming urls"""
+
+    domain: str | None = None
+    """Domain of the distribution serving the song files, None asks the serverless\
+        function for the streaming urls"""
+    base_path: str = ""
+    """Path of the song files inside the distribution"""
+    signer: CloudFrontUrlSigner | None = None
+    """Key used to sign streaming urls, None doesn't sign them"""
+
+    @classmethod
+    def init_streaming_urls(cls) -> None:
+        """Init song streaming urls with the configured distribution and signing key.\
+            Signed urls stay valid for the configured expiration after being served\
+            from the streaming url cache
+        """
+        logger = SpotifyElectronLogger(LOGGING_SONG_STREAMING_URL_PROVIDER).get_logger()
+        cls.domain = (
+            getattr(PropertiesManager, AppConfig.SONG_SERVERLESS_STREAMING_DOMAIN) or None
+        )
+        cls.base_path = (
+            getattr(PropertiesManager, AppConfig.SONG_SERVERLESS_STREAMING_BASE_PATH) or ""
+        )
+        key_pair_id = getattr(
+            PropertiesManager, AppConfig.SONG_SERVERLESS_STREAMING_KEY_PAIR_ID
+        )
+        private_key_file = getattr(
+            PropertiesManager, AppConfig.SONG_SERVERLESS_STREAMING_PRIVATE_KEY_FILE
+        )
+        cls.signer = None
+        if cls.domain and key_pair_id and private_key_file:
+            expiration_seconds = int(
+                getattr(
+                    PropertiesManager,
+                    AppConfig.SONG_SERVERLESS_STREAMING_URL_EXPIRATION_SECONDS,
+                )
+                or 0
+            )
+            url_cache_ttl_seconds = int(
+                float(
+                    getattr(PropertiesManager, AppConfig.SONG_SERVERLESS_URL_CACHE_TTL_SECONDS)
+                    or 0
+                )
+            )
+            cls.signer = CloudFrontUrlSigner(
+                key_pair_id=key_pair_id,
+                private_key=load_cloudfront_private_key(private_key_file),
+                expiration_seconds=expiration_seconds + url_cache_ttl_seconds,
+            )
+        logger.info(
+            f"Song streaming urls built from distribution {cls.domain} "
+            f"with base path {cls.base_path} and signed: {cls.signer is not None}"
+        )
+
+
+def get_song_streaming_domain() -> str | None:
+    """Get domain of the distribution serving the song files
+
+    Returns:
+        the distribution domain or None if streaming urls are obtained from\
+            the serverless function
+    """
+    return SongStreamingUrlProvider.domain
+
+
+def get_song_streaming_base_path() -> str:
+    """Get path of the song files inside the distribution
+
+    Returns:
+        the base path of the song files
+    """
+    return SongStreamingUrlProvider.base_path
+
+
+def get_song_streaming_url_signer() -> CloudFrontUrlSigner | None:
+    """Get key used to sign streaming urls
+
+    Returns:
+        the streaming url signer or None if streaming urls are not signed
+    """
+    return SongStreamingUrlProvider.signer
@@ -24,6 +24,10 @@ class SongDocument(BaseSongDocument):
     pass
 
 
+SONG_STREAMING_FILE_EXTENSION = ".mp3"
+"""Extension of the song files stored by the serverless function"""
+
+
 @dataclass
 class SongDAO(BaseSongDAO):
     """Represents song data in the internal processing layer"""
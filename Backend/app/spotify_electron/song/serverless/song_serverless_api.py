@@ -1,12 +1,31 @@
-"""API to comunicate with Serverless function that handles song files in Cloud"""
+"""API to comunicate with Serverless function that handles song files in Cloud
 
-from requests import Response, delete, get, post
+Requests are sent with the pooled client of the song serverless client provider\
+so they don't block the event loop and reuse open connections. Song files are sent\
+as raw bytes, files that don't fit in a request are uploaded directly to the bucket\
+in parts with a multipart upload started and completed by the serverless function
+"""
 
-from app.common.app_schema import AppEnvironment
-from app.common.PropertiesManager import PropertiesManager
+import asyncio
+import json
+from typing import Any
 
+from httpx import Response, TransportError
+from starlette.status import HTTP_500_INTERNAL_SERVER_ERROR
 
-def get_song(song_name: str) -> Response:
+from app.logging.logging_constants import LOGGING_SONG_SERVERLESS_API
+from app.logging.logging_schema import SpotifyElectronLogger
+from app.spotify_electron.song.serverless.providers.song_serverless_client_provider import (
+    get_song_serverless_client,
+    get_song_serverless_retries,
+)
+
+song_serverless_api_logger = SpotifyElectronLogger(LOGGING_SONG_SERVERLESS_API).get_logger()
+
+SONG_FILE_CONTENT_TYPE = "application/octet-stream"
+
+
+async def get_song(song_name: str) -> Response:
     """Get song from cloud
 
     Args:
@@ -15,49 +34,156 @@ def get_song(song_name: str) -> Response:
     Returns:
         request response
     """
-    response = get(
-        f"{getattr(PropertiesManager, AppEnvironment.SERVERLESS_URL_ENV_NAME)}",
-        params={
-            "nombre": song_name,
-        },
-    )
-    return response
+    return await _send_safe_request("GET", {"nombre": song_name})
 
 
-def create_song(song_name: str, encoded_bytes: str) -> Response:
-    """Create song in cloud
+async def get_songs(song_names: list[str]) -> Response:
+    """Get many songs from cloud in a single request
+
+    Args:
+        song_names: song names
+
+    Returns:
+        request response with the streaming url of each song
+    """
+    return await _send_safe_request("GET", {"nombres": json.dumps(song_names)})
+
+
+async def create_song(song_name: str, file: bytes) -> Response:
+    """Create song in cloud sending the file in the request body. The request\
+        is not retried once sent
 
     Args:
         song_name: song name
-        encoded_bytes: encoded bytes of song
+        file: song file
 
     Returns:
         request response
     """
-    request_data_body = {
-        "file": encoded_bytes,
-    }
-    response = post(
-        f"{getattr(PropertiesManager, AppEnvironment.SERVERLESS_URL_ENV_NAME)}",
-        json=request_data_body,
+    response = await get_song_serverless_client().post(
+        "",
+        content=file,
         params={"nombre": song_name},
+        headers={"content-type": SONG_FILE_CONTENT_TYPE},
     )
     return response
 
 
-def delete_song(song_name: str) -> Response:
-    """Delete song from cloud
+async def create_song_upload(song_name: str, parts: int) -> Response:
+    """Start a multipart upload of a song in cloud. The request is not retried\
+        once sent
+
+    Args:
+        song_name: song name
+        parts: number of parts of the song file
+
+    Returns:
+        request response with the upload id and the url each part is uploaded to
+    """
+    response = await get_song_serverless_client().post(
+        "", params={"nombre": song_name, "parts": parts}
+    )
+    return response
+
+
+async def upload_song_part(url: str, part: bytes) -> Response:
+    """Upload a part of a song file directly to the bucket
+
+    Args:
+        url: presigned url of the part
+        part: part bytes
+
+    Returns:
+        request response with the entity tag of the part
+    """
+    return await _send_safe_request("PUT", url=url, content=part)
+
+
+async def complete_song_upload(song_name: str, upload_id: str, etags: list[str]) -> Response:
+    """Complete a multipart upload of a song in cloud. The request is not retried\
+        once sent
 
     Args:
         song_name: song name
+        upload_id: multipart upload id
+        etags: entity tag of each uploaded part in order
 
     Returns:
         request response
     """
-    response = delete(
-        f"{getattr(PropertiesManager, AppEnvironment.SERVERLESS_URL_ENV_NAME)}",
-        params={
-            "nombre": song_name,
-        },
+    response = await get_song_serverless_client().post(
+        "", params={"nombre": song_name, "uploadId": upload_id}, json={"etags": etags}
     )
     return response
+
+
+async def abort_song_upload(song_name: str, upload_id: str) -> Response:
+    """Abort a multipart upload of a song in cloud deleting its uploaded parts
+
+    Args:
+        song_name: song name
+        upload_id: multipart upload id
+
+    Returns:
+        request response
+    """
+    return await _send_safe_request("DELETE", {"nombre": song_name, "uploadId": upload_id})
+
+
+async def delete_song(song_name: str) -> Response:
+    """Delete song from cloud
+
+    Args:
+        song_name: song name
+
+    Returns:
+        request response
+    """
+    return await _send_safe_request("DELETE", {"nombre": song_name})
+
+
+async def _send_safe_request(
+    method: str,
+    params: dict[str, Any] | None = None,
+    *,
+    url: str = "",
+    content: bytes | None = None,
+) -> Response:
+    """Send a request that can be repeated safely, retrying it with exponential backoff\
+        if it fails or the serverless function answers with a server error
+
+    Args:
+        method: HTTP method
+        params: query params
+        url: request url, the serverless function url if empty
+        content: request body
+
+    Raises:
+        TransportError: the last retry failed
+
+    Returns:
+        the response of the first successful try or of the last retry
+    """
+    retries, retry_backoff_seconds = get_song_serverless_retries()
+    retry = 0
+    while True:
+        try:
+            response = await get_song_serverless_client().request(
+                method, url, params=params, content=content
+            )
+        except TransportError:
+            if retry == retries:
+                raise
+            song_serverless_api_logger.warning(
+                f"Request {method} {params} to serverless function failed, retrying",
+                exc_info=True,
+            )
+        else:
+            if response.status_code < HTTP_500_INTERNAL_SERVER_ERROR or retry == retries:
+                return response
+            song_serverless_api_logger.warning(
+                f"Request {method} {params} to serverless function answered "
+                f"{response.status_code}, retrying"
+            )
+        await asyncio.sleep(retry_backoff_seconds * 2**retry)
+        retry += 1
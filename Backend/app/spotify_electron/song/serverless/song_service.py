@@ -1,9 +1,15 @@
 """Song service for handling business logic"""
 
+from asyncio import Semaphore, gather
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from typing import BinaryIO
+
 import app.spotify_electron.song.base_song_repository as base_song_repository
 import app.spotify_electron.song.serverless.song_repository as song_repository
 import app.spotify_electron.user.artist.artist_service as artist_service
 import app.spotify_electron.user.validations.base_user_service_validations as base_user_service_validations  # noqa: E501
+import app.spotify_electron.utils.cloudfront.cloudfront_utils as cloudfront_utils
 from app.auth.auth_schema import (
     TokenData,
     UserUnauthorizedError,
@@ -18,8 +24,29 @@ from app.spotify_electron.song.base_song_schema import (
     SongRepositoryError,
     SongServiceError,
 )
+from app.spotify_electron.song.providers.song_analysis_provider import (
+    get_song_analysis_pool,
+)
+from app.spotify_electron.song.providers.song_streams_buffer_provider import (
+    get_song_streams_buffer,
+)
 from app.spotify_electron.song.serverless import song_serverless_api
+from app.spotify_electron.song.serverless.providers.song_serverless_client_provider import (
+    get_song_serverless_upload_concurrency,
+    get_song_serverless_upload_max_body_bytes,
+    get_song_serverless_upload_part_bytes,
+    get_song_serverless_url_batch_size,
+)
+from app.spotify_electron.song.serverless.providers.song_streaming_url_cache_provider import (
+    get_song_streaming_url_cache,
+)
+from app.spotify_electron.song.serverless.providers.song_streaming_url_provider import (
+    get_song_streaming_base_path,
+    get_song_streaming_domain,
+    get_song_streaming_url_signer,
+)
 from app.spotify_electron.song.serverless.song_schema import (
+    SONG_STREAMING_FILE_EXTENSION,
     SongCreateSongStreamingError,
     SongDeleteSongStreamingError,
     SongDTO,
@@ -30,6 +57,8 @@ from app.spotify_electron.song.serverless.validations.song_service_validations i
     validate_get_song_url_streaming_response,
     validate_song_creating_streaming_response,
     validate_song_deleting_streaming_response,
+    validate_song_part_uploading_streaming_response,
+    validate_song_upload_creating_streaming_response,
 )
 from app.spotify_electron.song.validations.base_song_service_validations import (
     validate_song_name_parameter,
@@ -45,16 +74,18 @@ from app.spotify_electron.user.user.user_schema import (
     UserServiceError,
 )
 from app.spotify_electron.utils.audio_management.audio_management_utils import (
-    EncodingFileError,
-    encode_file,
-    get_song_duration_seconds,
+    SongFileDigest,
+    analyze_song,
+    iterate_file_chunks,
 )
 
 song_service_logger = SpotifyElectronLogger(LOGGING_SONG_SERVERLESS_SERVICE).get_logger()
 
 
-def get_song_streaming_url(name: str) -> str:
-    """Get song streaming url
+async def get_song_streaming_url(name: str) -> str:
+    """Get song streaming url, recently obtained urls are served from cache. Urls are\
+        built locally when the distribution serving the songs is configured and\
+        obtained from the serverless function otherwise
 
     Args:
         name: song name
@@ -65,21 +96,149 @@ def get_song_streaming_url(name: str) -> str:
     Returns:
         the streaming url
     """
-    try:
-        response_get_url_streaming_request = song_serverless_api.get_song(name)
-        validate_get_song_url_streaming_response(
-            name,
-            response_get_url_streaming_request,
-        )
+    song_streaming_url_cache = get_song_streaming_url_cache()
+    cached_streaming_url = song_streaming_url_cache.get(name)
+    if cached_streaming_url is not None:
+        song_service_logger.debug(f"Streaming url for song {name} served from cache")
+        return cached_streaming_url
 
-        response_json = response_get_url_streaming_request.json()
-        streaming_url = response_json["url"]
+    try:
+        streaming_url = _get_song_local_streaming_url(name)
+        if streaming_url is None:
+            streaming_url = await _get_song_serverless_streaming_url(name)
     except (SongGetUrlStreamingError, Exception) as exception:
         song_service_logger.exception(f"Unexpected error getting song {name} streaming url")
         raise SongGetUrlStreamingError from exception
     else:
         song_service_logger.debug(f"Obtained Streaming url for song {name}")
+        song_streaming_url_cache.put(name, streaming_url)
+        return streaming_url
+
+
+async def get_songs_streaming_urls(names: list[str]) -> dict[str, str]:
+    """Get streaming url of many songs. Cached urls are reused and the rest are built\
+        locally when the distribution serving the songs is configured or obtained from\
+        the serverless function in batches otherwise
+
+    Args:
+        names: song names
+
+    Raises:
+        SongGetUrlStreamingError: getting songs streaming urls
+
+    Returns:
+        the streaming url of each song by name
+    """
+    song_streaming_url_cache = get_song_streaming_url_cache()
+    streaming_urls: dict[str, str] = {}
+    missing_names: list[str] = []
+    for name in dict.fromkeys(names):
+        cached_streaming_url = song_streaming_url_cache.get(name)
+        if cached_streaming_url is None:
+            missing_names.append(name)
+        else:
+            streaming_urls[name] = cached_streaming_url
+
+    try:
+        local_streaming_urls = {
+            name: _get_song_local_streaming_url(name) for name in missing_names
+        }
+        obtained_streaming_urls = {
+            name: streaming_url
+            for name, streaming_url in local_streaming_urls.items()
+            if streaming_url is not None
+        }
+        serverless_names = [
+            name
+            for name, streaming_url in local_streaming_urls.items()
+            if streaming_url is None
+        ]
+        batch_size = get_song_serverless_url_batch_size()
+        batches_streaming_urls = await gather(
+            *(
+                _get_songs_serverless_streaming_urls(
+                    serverless_names[start : start + batch_size]
+                )
+                for start in range(0, len(serverless_names), batch_size)
+            )
+        )
+        for batch_streaming_urls in batches_streaming_urls:
+            obtained_streaming_urls.update(batch_streaming_urls)
+    except (SongGetUrlStreamingError, Exception) as exception:
+        song_service_logger.exception(
+            f"Unexpected error getting songs {missing_names} streaming urls"
+        )
+        raise SongGetUrlStreamingError from exception
+    else:
+        for name in missing_names:
+            streaming_url = obtained_streaming_urls[name]
+            song_streaming_url_cache.put(name, streaming_url)
+            streaming_urls[name] = streaming_url
+        song_service_logger.debug(
+            f"Obtained Streaming urls for {len(streaming_urls)} songs, "
+            f"{len(missing_names)} not cached"
+        )
+        return streaming_urls
+
+
+async def _get_songs_serverless_streaming_urls(names: list[str]) -> dict[str, str]:
+    """Get streaming url of many songs from the serverless function in a single request
+
+    Args:
+        names: song names
+
+    Returns:
+        the streaming url of each song by name
+    """
+    response_get_urls_streaming_request = await song_serverless_api.get_songs(names)
+    validate_get_song_url_streaming_response(
+        ", ".join(names),
+        response_get_urls_streaming_request,
+    )
+
+    response_json = response_get_urls_streaming_request.json()
+    return response_json["urls"]
+
+
+async def _get_song_serverless_streaming_url(name: str) -> str:
+    """Get song streaming url from the serverless function
+
+    Args:
+        name: song name
+
+    Returns:
+        the streaming url
+    """
+    response_get_url_streaming_request = await song_serverless_api.get_song(name)
+    validate_get_song_url_streaming_response(
+        name,
+        response_get_url_streaming_request,
+    )
+
+    response_json = response_get_url_streaming_request.json()
+    return response_json["url"]
+
+
+def _get_song_local_streaming_url(name: str) -> str | None:
+    """Build song streaming url with the configured distribution, signing it\
+        if a signing key is configured
+
+    Args:
+        name: song name
+
+    Returns:
+        the streaming url or None if no distribution is configured
+    """
+    domain = get_song_streaming_domain()
+    if domain is None:
+        return None
+    streaming_url = cloudfront_utils.get_cloudfront_url(
+        domain, f"{get_song_streaming_base_path()}{name}{SONG_STREAMING_FILE_EXTENSION}"
+    )
+    signer = get_song_streaming_url_signer()
+    if signer is None:
         return streaming_url
+    return cloudfront_utils.sign_cloudfront_url(streaming_url, signer)
 
 
 async def get_song(name: str) -> SongDTO:
@@ -100,7 +259,8 @@ async def get_song(name: str) -> SongDTO:
         validate_song_name_parameter(name)
 
         song_dao = await song_repository.get_song(name)
-        streaming_url = get_song_streaming_url(name)
+        song_dao.streams += get_song_streams_buffer().get_pending(name)
+        streaming_url = await get_song_streaming_url(name)
 
         song_dto = get_song_dto_from_dao(song_dao, streaming_url)
 
@@ -127,9 +287,16 @@ async def get_song(name: str) -> SongDTO:
 
 
 async def create_song(  # noqa: C901
-    name: str, genre: Genre, photo: str, file: bytes, token: TokenData
+    name: str,
+    genre: Genre,
+    photo: str,
+    file: BinaryIO,
+    token: TokenData,
+    *,
+    on_progress: Callable[[int], Awaitable[None]] | None = None,
 ) -> None:
-    """Create song
+    """Create song. The whole file is loaded in memory since it's analyzed once\
+        uploaded to the streaming service
 
     Args:
         name: song name
@@ -137,12 +304,12 @@ async def create_song(  # noqa: C901
         photo: song photo
         file: song file
         token: user token
+        on_progress: called with the bytes of the song file processed so far
 
     Raises:
         GenreNotValidError:
         UserBadNameError: invalid user name
         UserNotFoundError: user doesn't exists
-        EncodingFileError: error encoding file
         SongBadNameError: song bad name
         SongAlreadyExistsError: song already exists
          UserUnauthorizedError: unauthorized user for creating song
@@ -155,24 +322,9 @@ async def create_song(  # noqa: C901
         await base_user_service_validations.validate_user_name_parameter(artist)
         Genre.validate_genre(genre.value)
 
-        await validate_song_should_not_exists(name)
         await validate_user_should_be_artist(artist)
 
-        song_duration = get_song_duration_seconds(name, file)
-        encoded_bytes = encode_file(name, file)
-
-        response_create_song_request = song_serverless_api.create_song(
-            song_name=name, encoded_bytes=encoded_bytes
-        )
-        validate_song_creating_streaming_response(name, response_create_song_request)
-
-        await song_repository.create_song(
-            name=name,
-            artist=artist,
-            photo=photo,
-            seconds_duration=song_duration,
-            genre=genre,
-        )
+        await store_song(name, genre, photo, file, artist, on_progress=on_progress)
         await artist_service.add_song_to_artist(artist, name)
     except GenreNotValidError as exception:
         song_service_logger.exception(f"Bad genre provided {genre}")
@@ -183,9 +335,6 @@ async def create_song(  # noqa: C901
     except UserNotFoundError as exception:
         song_service_logger.exception(f"Artist {artist} not found")
         raise UserNotFoundError from exception
-    except EncodingFileError as exception:
-        song_service_logger.exception(f"Error encoding file with name {name}")
-        raise EncodingFileError from exception
     except SongBadNameError as exception:
         song_service_logger.exception(f"Bad Song Name Parameter: {name}")
         raise SongBadNameError from exception
@@ -197,23 +346,84 @@ async def create_song(  # noqa: C901
             f"User {artist} cannot create song {name} because hes not artist"
         )
         raise UserUnauthorizedError from exception
-    except SongCreateSongStreamingError as exception:
-        song_service_logger.exception(f"Error creating song streaming: {name}")
-        raise SongServiceError from exception
     except UserServiceError as exception:
         song_service_logger.exception(
             f"Unexpected error in User Service while creating song: {name}"
         )
         raise SongServiceError from exception
+    except Exception as exception:
+        song_service_logger.exception(
+            f"Unexpected error in Song Service creating song: {name}"
+        )
+        raise SongServiceError from exception
+
+
+async def store_song(  # noqa: PLR0913
+    name: str,
+    genre: Genre,
+    photo: str,
+    file: BinaryIO,
+    artist: str,
+    *,
+    on_progress: Callable[[int], Awaitable[None]] | None = None,
+) -> None:
+    """Store song of an already validated artist without adding it to the artist songs
+
+    Args:
+        name: song name
+        genre: song genre
+        photo: song photo
+        file: song file
+        artist: song artist
+        on_progress: called with the bytes of the song file processed so far
+
+    Raises:
+        GenreNotValidError:
+        SongBadNameError: song bad name
+        SongAlreadyExistsError: song already exists
+        SongServiceError: unexpected error storing song
+    """
+    try:
+        validate_song_name_parameter(name)
+        Genre.validate_genre(genre.value)
+
+        await validate_song_should_not_exists(name)
+
+        file_bytes, song_duration = await _read_song_file(name, file)
+        if on_progress is not None:
+            await on_progress(len(file_bytes))
+
+        await _upload_song_file(name, file_bytes)
+        get_song_streaming_url_cache().invalidate(name)
+
+        await song_repository.create_song(
+            name=name,
+            artist=artist,
+            photo=photo,
+            seconds_duration=song_duration,
+            genre=genre,
+        )
+        song_analysis = await get_song_analysis_pool().run(analyze_song, name, file_bytes)
+        await base_song_repository.update_song_analysis(name, song_analysis)
+    except GenreNotValidError as exception:
+        song_service_logger.exception(f"Bad genre provided {genre}")
+        raise GenreNotValidError from exception
+    except SongBadNameError as exception:
+        song_service_logger.exception(f"Bad Song Name Parameter: {name}")
+        raise SongBadNameError from exception
+    except SongAlreadyExistsError as exception:
+        song_service_logger.exception(f"Song already exists: {name}")
+        raise SongAlreadyExistsError from exception
+    except SongCreateSongStreamingError as exception:
+        song_service_logger.exception(f"Error creating song streaming: {name}")
+        raise SongServiceError from exception
     except SongRepositoryError as exception:
         song_service_logger.exception(
             f"Unexpected error in Song Repository creating song: {name}"
         )
         raise SongServiceError from exception
     except Exception as exception:
-        song_service_logger.exception(
-            f"Unexpected error in Song Service creating song: {name}"
-        )
+        song_service_logger.exception(f"Unexpected error in Song Service storing song: {name}")
         raise SongServiceError from exception
 
 
@@ -232,8 +442,9 @@ async def delete_song(name: str) -> None:
     try:
         validate_song_name_parameter(name)
         await validate_song_should_exists(name)
-        delete_song_streaming_response = song_serverless_api.delete_song(name)
+        delete_song_streaming_response = await song_serverless_api.delete_song(name)
         validate_song_deleting_streaming_response(name, delete_song_streaming_response)
+        get_song_streaming_url_cache().invalidate(name)
 
         artist_name = await base_song_repository.get_artist_from_song(name=name)
 
@@ -272,3 +483,84 @@ async def delete_song(name: str) -> None:
             f"Unexpected error in Song Service deleting song: {name}"
         )
         raise SongServiceError from exception
+
+
+async def _upload_song_file(name: str, file_bytes: bytes) -> None:
+    """Upload song file to cloud as raw bytes. Files that don't fit in a request\
+        are uploaded directly to the bucket in parts, the upload is aborted if any\
+        part fails
+
+    Args:
+        name: song name
+        file_bytes: song file bytes
+
+    Raises:
+        SongCreateSongStreamingError: uploading the song file failed
+    """
+    if len(file_bytes) <= get_song_serverless_upload_max_body_bytes():
+        response_create_song_request = await song_serverless_api.create_song(name, file_bytes)
+        validate_song_creating_streaming_response(name, response_create_song_request)
+        return
+
+    part_bytes = get_song_serverless_upload_part_bytes()
+    part_offsets = range(0, len(file_bytes), part_bytes)
+    response_create_upload_request = await song_serverless_api.create_song_upload(
+        name, len(part_offsets)
+    )
+    validate_song_upload_creating_streaming_response(name, response_create_upload_request)
+    song_upload = response_create_upload_request.json()
+    upload_id = song_upload["uploadId"]
+
+    semaphore = Semaphore(get_song_serverless_upload_concurrency())
+
+    async def upload_part(url: str, offset: int) -> str:
+        async with semaphore:
+            response_upload_part_request = await song_serverless_api.upload_song_part(
+                url, file_bytes[offset : offset + part_bytes]
+            )
+        validate_song_part_uploading_streaming_response(name, response_upload_part_request)
+        return response_upload_part_request.headers["etag"]
+
+    etags = await gather(
+        *(
+            upload_part(url, offset)
+            for url, offset in zip(song_upload["urls"], part_offsets, strict=True)
+        ),
+        return_exceptions=True,
+    )
+    upload_error = next((etag for etag in etags if isinstance(etag, BaseException)), None)
+    if upload_error is None:
+        try:
+            response_complete_upload_request = await song_serverless_api.complete_song_upload(
+                name, upload_id, [str(etag) for etag in etags]
+            )
+            validate_song_creating_streaming_response(name, response_complete_upload_request)
+        except Exception as exception:
+            upload_error = exception
+        else:
+            song_service_logger.info(f"Song {name} uploaded in {len(etags)} parts")
+            return
+
+    song_service_logger.error(f"Error uploading song {name} in parts, aborting upload")
+    with suppress(Exception):
+        await song_serverless_api.abort_song_upload(name, upload_id)
+    raise SongCreateSongStreamingError from upload_error
+
+
+async def _read_song_file(name: str, file: BinaryIO) -> tuple[bytes, int]:
+    """Read song file by chunks computing its duration in the same pass
+
+    Args:
+        name: song name
+        file: song file
+
+    Returns:
+        the song file bytes and its duration in seconds
+    """
+    song_file_digest = SongFileDigest(name, file, get_song_analysis_pool())
+    file_chunks: list[bytes] = []
+    async for chunk in iterate_file_chunks(file):
+        await song_file_digest.update(chunk)
+        file_chunks.append(chunk)
+    song_duration = await song_file_digest.get_duration_seconds()
+    return b"".join(file_chunks), song_duration
@@ -1,6 +1,6 @@
 """Validations for Serverless function Song service"""
 
-from requests import Response
+from httpx import Response
 from starlette.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_202_ACCEPTED
 
 from app.logging.logging_constants import (
@@ -36,6 +36,42 @@ def validate_song_creating_streaming_response(name: str, response: Response) ->
         raise SongCreateSongStreamingError
 
 
+def validate_song_upload_creating_streaming_response(name: str, response: Response) -> None:
+    """Validate start of streaming song multipart upload
+
+    Args:
+        name: song name
+        response: incoming response
+
+    Raises:
+        SongCreateSongStreamingError: request failed
+    """
+    if response.status_code != HTTP_200_OK:
+        song_service_logger.error(
+            f"Error starting Streaming upload for song {name}\n"
+            f"Request Status {response.status_code} with Content {response.content}"
+        )
+        raise SongCreateSongStreamingError
+
+
+def validate_song_part_uploading_streaming_response(name: str, response: Response) -> None:
+    """Validate upload of a streaming song part
+
+    Args:
+        name: song name
+        response: incoming response
+
+    Raises:
+        SongCreateSongStreamingError: request failed or without entity tag
+    """
+    if response.status_code != HTTP_200_OK or "etag" not in response.headers:
+        song_service_logger.error(
+            f"Error uploading Streaming part for song {name}\n"
+            f"Request Status {response.status_code} with Content {response.content}"
+        )
+        raise SongCreateSongStreamingError
+
+
 def validate_get_song_url_streaming_response(name: str, response: Response) -> None:
     """Validate get url streaming song response
 
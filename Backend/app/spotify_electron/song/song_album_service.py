@@ -0,0 +1,215 @@
+"""Song album service for uploading the tracks of an album at once
+
+The artist is validated once for the whole album, tracks are stored concurrently by\
+the song service of the selected architecture and the created songs are added to the\
+artist in a single update. A track that cannot be created doesn't stop the others.\
+If the created songs cannot be added to the artist they are deleted and reported as\
+not created, so no song is left without artist
+"""
+
+from asyncio import Semaphore, gather
+
+import app.spotify_electron.user.artist.artist_service as artist_service
+import app.spotify_electron.user.validations.base_user_service_validations as base_user_service_validations  # noqa: E501
+from app.auth.auth_schema import TokenData, UserUnauthorizedError
+from app.exceptions.base_exceptions_schema import SpotifyElectronError
+from app.logging.logging_constants import LOGGING_SONG_ALBUM_SERVICE
+from app.logging.logging_schema import SpotifyElectronLogger
+from app.spotify_electron.song.base_song_schema import (
+    SONG_ALBUM_MAX_CONCURRENT_TRACKS,
+    SongAlbumBadTracksError,
+    SongAlbumTrack,
+    SongAlbumTrackDTO,
+    SongAlreadyExistsError,
+    SongServiceError,
+)
+from app.spotify_electron.song.providers.song_service_provider import get_song_service
+from app.spotify_electron.song.validations.base_song_service_validations import (
+    validate_song_album_tracks,
+)
+from app.spotify_electron.user.artist.artist_schema import ArtistServiceError
+from app.spotify_electron.user.artist.validations.artist_service_validations import (
+    validate_user_should_be_artist,
+)
+from app.spotify_electron.user.base_user_schema import (
+    BaseUserBadNameError,
+    BaseUserServiceError,
+)
+from app.spotify_electron.user.user.user_schema import UserBadNameError
+
+song_album_service_logger = SpotifyElectronLogger(LOGGING_SONG_ALBUM_SERVICE).get_logger()
+
+
+async def create_album_songs(
+    tracks: list[SongAlbumTrack], token: TokenData
+) -> list[SongAlbumTrackDTO]:
+    """Create the songs of an album
+
+    Args:
+        tracks: album tracks
+        token: user token
+
+    Raises:
+        SongAlbumBadTracksError: no tracks or too many tracks
+        UserBadNameError: invalid user name
+        UserUnauthorizedError: unauthorized user for creating songs
+        SongServiceError: unexpected error while creating the album songs
+
+    Returns:
+        the creation result of each track in the same order as the tracks
+    """
+    artist = token.username
+
+    try:
+        validate_song_album_tracks(tracks)
+        await base_user_service_validations.validate_user_name_parameter(artist)
+        await validate_user_should_be_artist(artist)
+
+        semaphore = Semaphore(SONG_ALBUM_MAX_CONCURRENT_TRACKS)
+        repeated_tracks = _get_repeated_tracks(tracks)
+        created_tracks = iter(
+            await gather(
+                *(
+                    _create_album_song(track, artist, semaphore)
+                    for index, track in enumerate(tracks)
+                    if index not in repeated_tracks
+                )
+            )
+        )
+        results = [
+            _get_track_error(track, SongAlreadyExistsError())
+            if index in repeated_tracks
+            else next(created_tracks)
+            for index, track in enumerate(tracks)
+        ]
+        results = await _add_album_songs_to_artist(artist, tracks, results)
+    except SongAlbumBadTracksError as exception:
+        song_album_service_logger.exception(f"Bad number of album tracks: {len(tracks)}")
+        raise SongAlbumBadTracksError from exception
+    except BaseUserBadNameError as exception:
+        song_album_service_logger.exception(f"Bad Artist Name Parameter: {artist}")
+        raise UserBadNameError from exception
+    except UserUnauthorizedError as exception:
+        song_album_service_logger.exception(
+            f"User {artist} cannot create album songs because hes not artist"
+        )
+        raise UserUnauthorizedError from exception
+    except BaseUserServiceError as exception:
+        song_album_service_logger.exception(
+            f"Unexpected error in User Service while creating album songs of {artist}"
+        )
+        raise SongServiceError from exception
+    except Exception as exception:
+        song_album_service_logger.exception(
+            f"Unexpected error in Song Album Service creating album songs of {artist}"
+        )
+        raise SongServiceError from exception
+    else:
+        created_names = [result.name for result in results if result.created]
+        song_album_service_logger.info(
+            f"Album of {artist} created with songs {created_names} out of {len(tracks)} tracks"
+        )
+        return results
+
+
+async def _create_album_song(
+    track: SongAlbumTrack, artist: str, semaphore: Semaphore
+) -> SongAlbumTrackDTO:
+    """Store the song of an album track once there's room for it
+
+    Args:
+        track: album track
+        artist: album artist, already validated
+        semaphore: limits the tracks stored at once
+
+    Returns:
+        the creation result of the track
+    """
+    async with semaphore:
+        try:
+            await get_song_service().store_song(
+                track.name, track.genre, track.photo, track.file, artist
+            )
+        except Exception as exception:
+            song_album_service_logger.exception(f"Album track {track.name} not created")
+            return _get_track_error(track, exception)
+    return SongAlbumTrackDTO(name=track.name, created=True, error=None)
+
+
+async def _add_album_songs_to_artist(
+    artist: str, tracks: list[SongAlbumTrack], results: list[SongAlbumTrackDTO]
+) -> list[SongAlbumTrackDTO]:
+    """Add the created songs of an album to its artist in a single update. If the update\
+        fails the created songs are deleted and their tracks reported as not created
+
+    Args:
+        artist: album artist, already validated
+        tracks: album tracks
+        results: creation result of each track
+
+    Returns:
+        the creation result of each track
+    """
+    created_names = [result.name for result in results if result.created]
+    if not created_names:
+        return results
+    try:
+        await artist_service.add_songs_to_artist(artist, created_names)
+    except ArtistServiceError:
+        song_album_service_logger.exception(
+            f"Album songs {created_names} not added to artist {artist}, deleting them"
+        )
+        for song_name in created_names:
+            await _delete_album_song(song_name)
+        return [
+            _get_track_error(track, SongServiceError()) if result.created else result
+            for track, result in zip(tracks, results, strict=True)
+        ]
+    return results
+
+
+async def _delete_album_song(name: str) -> None:
+    """Delete an album song that couldn't be added to its artist. Errors are logged\
+        so the other songs are deleted too
+
+    Args:
+        name: song name
+    """
+    try:
+        await get_song_service().delete_song(name)
+    except Exception:
+        song_album_service_logger.exception(f"Album song {name} not deleted")
+
+
+def _get_track_error(track: SongAlbumTrack, exception: Exception) -> SongAlbumTrackDTO:
+    """Get the creation result of a track that wasn't created
+
+    Args:
+        track: album track
+        exception: error that stopped the track creation
+
+    Returns:
+        the creation result of the track
+    """
+    error = str(exception) if isinstance(exception, SpotifyElectronError) else None
+    return SongAlbumTrackDTO(
+        name=track.name, created=False, error=error or SongServiceError.ERROR
+    )
+
+
+def _get_repeated_tracks(tracks: list[SongAlbumTrack]) -> set[int]:
+    """Get the tracks that repeat the song name of a previous track
+
+    Args:
+        tracks: album tracks
+
+    Returns:
+        the index of each track with a repeated song name
+    """
+    names: set[str] = set()
+    repeated_tracks: set[int] = set()
+    for index, track in enumerate(tracks):
+        if track.name in names:
+            repeated_tracks.add(index)
+        names.add(track.name)
+    return repeated_tracks
@@ -2,21 +2,31 @@
 It uses the base_song_service for handling logic for different song architectures
 """
 
-from fastapi import APIRouter, UploadFile
+import io
+from typing import Annotated
+
+from fastapi import APIRouter, File, Form, Header, Request, UploadFile
 from fastapi.responses import Response
 from starlette.status import (
     HTTP_200_OK,
     HTTP_201_CREATED,
     HTTP_202_ACCEPTED,
     HTTP_204_NO_CONTENT,
+    HTTP_207_MULTI_STATUS,
+    HTTP_304_NOT_MODIFIED,
     HTTP_400_BAD_REQUEST,
     HTTP_401_UNAUTHORIZED,
     HTTP_403_FORBIDDEN,
     HTTP_404_NOT_FOUND,
+    HTTP_409_CONFLICT,
     HTTP_500_INTERNAL_SERVER_ERROR,
+    HTTP_503_SERVICE_UNAVAILABLE,
 )
 
 import app.spotify_electron.song.base_song_service as base_song_service
+import app.spotify_electron.song.song_album_service as song_album_service
+import app.spotify_electron.song.song_ingest_service as song_ingest_service
+import app.spotify_electron.song.song_upload_service as song_upload_service
 import app.spotify_electron.utils.json_converter.json_converter_utils as json_converter_utils
 from app.auth.auth_schema import (
     BadJWTTokenProvidedError,
@@ -27,12 +37,24 @@ from app.common.PropertiesMessagesManager import PropertiesMessagesManager
 from app.exceptions.base_exceptions_schema import JsonEncodeError
 from app.spotify_electron.genre.genre_schema import Genre, GenreNotValidError
 from app.spotify_electron.song.base_song_schema import (
+    SONG_WAVEFORM_CACHE_CONTROL,
+    SongAlbumBadTracksError,
     SongAlreadyExistsError,
     SongBadNameError,
+    SongIngestQueueFullError,
+    SongJobNotFoundError,
     SongNotFoundError,
     SongServiceError,
+    SongUploadBadSizeError,
+    SongUploadConflictError,
+    SongUploadIncompleteError,
+    SongUploadNotFoundError,
+    SongWaveformNotFoundError,
+    get_song_album_tracks,
+    get_song_waveform_entity_tag,
 )
 from app.spotify_electron.song.providers.song_service_provider import get_song_service
+from app.spotify_electron.stream.stream_service import is_entity_tag_matched
 from app.spotify_electron.user.user.user_schema import (
     UserBadNameError,
     UserNotFoundError,
@@ -87,14 +109,17 @@ async def get_song(
 
 
 @router.post("/")
-async def create_song(
+async def create_song(  # noqa: C901
     name: str,
     genre: Genre,
     photo: str,
     file: UploadFile,
     token: Token,
+    *,
+    background: bool = False,
 ) -> Response:
-    """Create song
+    """Create song. The uploaded file is already spooled into a temporary file\
+        and it's read by chunks so it's never loaded whole in memory
 
     Args:
         name: song name
@@ -102,12 +127,25 @@ async def create_song(
         photo: photo
         file: song file
         token: JWT info
+        background: whether to return once the upload is validated and create the song\
+            in background. The returned job can be queried from any worker until\
+            the song is created
     """
-    read_file = await file.read()
-
     try:
+        if background:
+            # The job takes the spooled file so it's not closed once the request finishes
+            song_file = file.file
+            file.file = io.BytesIO()
+            song_job = await song_ingest_service.create_song_job(
+                name, genre, photo, song_file, token
+            )
+            song_job_json = json_converter_utils.get_json_from_model(song_job)
+            return Response(
+                song_job_json, media_type="application/json", status_code=HTTP_202_ACCEPTED
+            )
+
         song_service = get_song_service()
-        await song_service.create_song(name, genre, photo, read_file, token)
+        await song_service.create_song(name, genre, photo, file.file, token)
         return Response(None, HTTP_201_CREATED)
     except GenreNotValidError:
         return Response(
@@ -150,6 +188,378 @@ async def create_song(
             status_code=HTTP_404_NOT_FOUND,
             content=PropertiesMessagesManager.userNotFound,
         )
+    except SongIngestQueueFullError:
+        return Response(
+            status_code=HTTP_503_SERVICE_UNAVAILABLE,
+            content=PropertiesMessagesManager.songIngestQueueFull,
+        )
+    except JsonEncodeError:
+        return Response(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            content=PropertiesMessagesManager.commonEncodingError,
+        )
+    except (Exception, SongServiceError):
+        return Response(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            content=PropertiesMessagesManager.commonInternalServerError,
+        )
+
+
+@router.post("/album")
+async def create_album_songs(  # noqa: PLR0913
+    token: Token,
+    names: Annotated[list[str], Form()],
+    genres: Annotated[list[Genre], Form()],
+    photos: Annotated[list[str], Form()],
+    files: Annotated[list[UploadFile], File()],
+) -> Response:
+    """Create the songs of an album at once. Each track is described by the name,\
+        genre, photo and file at its position
+
+    Args:
+        token: JWT info
+        names: song name of each track
+        genres: song genre of each track
+        photos: song photo of each track
+        files: song file of each track
+    """
+    try:
+        tracks = get_song_album_tracks(names, genres, photos, [file.file for file in files])
+        album_songs = await song_album_service.create_album_songs(tracks, token)
+        album_songs_json = json_converter_utils.get_json_with_iterable_field_from_model(
+            album_songs, "tracks"
+        )
+        status_code = (
+            HTTP_201_CREATED
+            if all(album_song.created for album_song in album_songs)
+            else HTTP_207_MULTI_STATUS
+        )
+        return Response(
+            album_songs_json, media_type="application/json", status_code=status_code
+        )
+    except SongAlbumBadTracksError:
+        return Response(
+            status_code=HTTP_400_BAD_REQUEST,
+            content=PropertiesMessagesManager.songAlbumBadTracks,
+        )
+    except UserBadNameError:
+        return Response(
+            status_code=HTTP_400_BAD_REQUEST,
+            content=PropertiesMessagesManager.userBadName,
+        )
+    except BadJWTTokenProvidedError:
+        return Response(
+            status_code=HTTP_401_UNAUTHORIZED,
+            content=PropertiesMessagesManager.tokenInvalidCredentials,
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    except UserUnauthorizedError:
+        return Response(
+            status_code=HTTP_403_FORBIDDEN,
+            content=PropertiesMessagesManager.songCreateUnauthorizedUser,
+        )
+    except JsonEncodeError:
+        return Response(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            content=PropertiesMessagesManager.commonEncodingError,
+        )
+    except (Exception, SongServiceError):
+        return Response(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            content=PropertiesMessagesManager.commonInternalServerError,
+        )
+
+
+@router.get("/jobs/{job_id}")
+async def get_song_job(
+    job_id: str,
+    token: Token,
+) -> Response:
+    """Get the background creation job of an uploaded song
+
+    Args:
+        job_id: job id
+        token: JWT info
+    """
+    try:
+        song_job = await song_ingest_service.get_song_job(job_id, token)
+        song_job_json = json_converter_utils.get_json_from_model(song_job)
+        return Response(song_job_json, media_type="application/json", status_code=HTTP_200_OK)
+    except SongJobNotFoundError:
+        return Response(
+            status_code=HTTP_404_NOT_FOUND,
+            content=PropertiesMessagesManager.songJobNotFound,
+        )
+    except JsonEncodeError:
+        return Response(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            content=PropertiesMessagesManager.commonEncodingError,
+        )
+    except (Exception, SongServiceError):
+        return Response(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            content=PropertiesMessagesManager.commonInternalServerError,
+        )
+
+
+@router.post("/uploads")
+async def create_song_upload(  # noqa: C901
+    name: str,
+    genre: Genre,
+    photo: str,
+    size: int,
+    token: Token,
+) -> Response:
+    """Create a resumable upload for a song file. The file is sent in chunks\
+        with `PATCH /songs/uploads/{upload_id}` and the song is created with\
+        `POST /songs/uploads/{upload_id}/finalize`
+
+    Args:
+        name: song name
+        genre: genre
+        photo: photo
+        size: song file size in bytes
+        token: JWT info
+    """
+    try:
+        song_upload = await song_upload_service.create_song_upload(
+            name, genre, photo, size, token
+        )
+        song_upload_json = json_converter_utils.get_json_from_model(song_upload)
+        return Response(
+            song_upload_json,
+            media_type="application/json",
+            status_code=HTTP_201_CREATED,
+            headers={"Upload-Offset": str(song_upload.offset)},
+        )
+    except GenreNotValidError:
+        return Response(
+            status_code=HTTP_400_BAD_REQUEST,
+            content=PropertiesMessagesManager.genreNotValid,
+        )
+    except UserBadNameError:
+        return Response(
+            status_code=HTTP_400_BAD_REQUEST,
+            content=PropertiesMessagesManager.userBadName,
+        )
+    except SongBadNameError:
+        return Response(
+            status_code=HTTP_400_BAD_REQUEST,
+            content=PropertiesMessagesManager.songBadName,
+        )
+    except SongUploadBadSizeError:
+        return Response(
+            status_code=HTTP_400_BAD_REQUEST,
+            content=PropertiesMessagesManager.songUploadBadSize,
+        )
+    except SongAlreadyExistsError:
+        return Response(
+            status_code=HTTP_400_BAD_REQUEST,
+            content=PropertiesMessagesManager.songAlreadyExists,
+        )
+    except BadJWTTokenProvidedError:
+        return Response(
+            status_code=HTTP_401_UNAUTHORIZED,
+            content=PropertiesMessagesManager.tokenInvalidCredentials,
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    except UserUnauthorizedError:
+        return Response(
+            status_code=HTTP_403_FORBIDDEN,
+            content=PropertiesMessagesManager.songCreateUnauthorizedUser,
+        )
+    except UserNotFoundError:
+        return Response(
+            status_code=HTTP_404_NOT_FOUND,
+            content=PropertiesMessagesManager.userNotFound,
+        )
+    except JsonEncodeError:
+        return Response(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            content=PropertiesMessagesManager.commonEncodingError,
+        )
+    except (Exception, SongServiceError):
+        return Response(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            content=PropertiesMessagesManager.commonInternalServerError,
+        )
+
+
+@router.get("/uploads/{upload_id}")
+async def get_song_upload(
+    upload_id: str,
+    token: Token,
+) -> Response:
+    """Get a resumable song upload, its offset is where the next chunk has to start
+
+    Args:
+        upload_id: song upload id
+        token: JWT info
+    """
+    try:
+        song_upload = await song_upload_service.get_song_upload(upload_id, token)
+        song_upload_json = json_converter_utils.get_json_from_model(song_upload)
+        return Response(
+            song_upload_json,
+            media_type="application/json",
+            status_code=HTTP_200_OK,
+            headers={"Upload-Offset": str(song_upload.offset)},
+        )
+    except SongUploadNotFoundError:
+        return Response(
+            status_code=HTTP_404_NOT_FOUND,
+            content=PropertiesMessagesManager.songUploadNotFound,
+        )
+    except JsonEncodeError:
+        return Response(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            content=PropertiesMessagesManager.commonEncodingError,
+        )
+    except (Exception, SongServiceError):
+        return Response(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            content=PropertiesMessagesManager.commonInternalServerError,
+        )
+
+
+@router.patch("/uploads/{upload_id}")
+async def upload_song_chunk(
+    upload_id: str,
+    upload_offset: Annotated[int, Header()],
+    request: Request,
+    token: Token,
+) -> Response:
+    """Upload the next chunk of a resumable song upload. The chunk is the raw request\
+        body and it's stored as it's received, if it's interrupted the received bytes\
+        are kept and the upload offset tells where to resume from
+
+    Args:
+        upload_id: song upload id
+        upload_offset: offset the chunk starts at, it has to be the upload offset
+        request: request with the chunk as body
+        token: JWT info
+    """
+    try:
+        offset = await song_upload_service.upload_song_chunk(
+            upload_id, upload_offset, request.stream(), token
+        )
+        return Response(
+            status_code=HTTP_204_NO_CONTENT, headers={"Upload-Offset": str(offset)}
+        )
+    except SongUploadBadSizeError:
+        return Response(
+            status_code=HTTP_400_BAD_REQUEST,
+            content=PropertiesMessagesManager.songUploadBadSize,
+        )
+    except SongUploadNotFoundError:
+        return Response(
+            status_code=HTTP_404_NOT_FOUND,
+            content=PropertiesMessagesManager.songUploadNotFound,
+        )
+    except SongUploadConflictError:
+        return Response(
+            status_code=HTTP_409_CONFLICT,
+            content=PropertiesMessagesManager.songUploadConflict,
+        )
+    except (Exception, SongServiceError):
+        return Response(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            content=PropertiesMessagesManager.commonInternalServerError,
+        )
+
+
+@router.post("/uploads/{upload_id}/finalize")
+async def finalize_song_upload(  # noqa: C901, PLR0912
+    upload_id: str,
+    token: Token,
+    *,
+    background: bool = False,
+) -> Response:
+    """Create the song of a resumable upload once the whole file is received
+
+    Args:
+        upload_id: song upload id
+        token: JWT info
+        background: whether to return once the upload is validated and create the song\
+            in background. The returned job can be queried from any worker until\
+            the song is created
+    """
+    try:
+        song_job = await song_upload_service.finalize_song_upload(
+            upload_id, token, background=background
+        )
+        if song_job is not None:
+            song_job_json = json_converter_utils.get_json_from_model(song_job)
+            return Response(
+                song_job_json, media_type="application/json", status_code=HTTP_202_ACCEPTED
+            )
+        return Response(None, HTTP_201_CREATED)
+    except GenreNotValidError:
+        return Response(
+            status_code=HTTP_400_BAD_REQUEST,
+            content=PropertiesMessagesManager.genreNotValid,
+        )
+    except UserBadNameError:
+        return Response(
+            status_code=HTTP_400_BAD_REQUEST,
+            content=PropertiesMessagesManager.userBadName,
+        )
+    except SongBadNameError:
+        return Response(
+            status_code=HTTP_400_BAD_REQUEST,
+            content=PropertiesMessagesManager.songBadName,
+        )
+    except SongAlreadyExistsError:
+        return Response(
+            status_code=HTTP_400_BAD_REQUEST,
+            content=PropertiesMessagesManager.songAlreadyExists,
+        )
+    except EncodingFileError:
+        return Response(
+            status_code=HTTP_400_BAD_REQUEST,
+            content=PropertiesMessagesManager.songBadFile,
+        )
+    except BadJWTTokenProvidedError:
+        return Response(
+            status_code=HTTP_401_UNAUTHORIZED,
+            content=PropertiesMessagesManager.tokenInvalidCredentials,
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    except UserUnauthorizedError:
+        return Response(
+            status_code=HTTP_403_FORBIDDEN,
+            content=PropertiesMessagesManager.songCreateUnauthorizedUser,
+        )
+    except UserNotFoundError:
+        return Response(
+            status_code=HTTP_404_NOT_FOUND,
+            content=PropertiesMessagesManager.userNotFound,
+        )
+    except SongUploadNotFoundError:
+        return Response(
+            status_code=HTTP_404_NOT_FOUND,
+            content=PropertiesMessagesManager.songUploadNotFound,
+        )
+    except SongUploadIncompleteError:
+        return Response(
+            status_code=HTTP_409_CONFLICT,
+            content=PropertiesMessagesManager.songUploadIncomplete,
+        )
+    except SongUploadConflictError:
+        return Response(
+            status_code=HTTP_409_CONFLICT,
+            content=PropertiesMessagesManager.songUploadConflict,
+        )
+    except SongIngestQueueFullError:
+        return Response(
+            status_code=HTTP_503_SERVICE_UNAVAILABLE,
+            content=PropertiesMessagesManager.songIngestQueueFull,
+        )
+    except JsonEncodeError:
+        return Response(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            content=PropertiesMessagesManager.commonEncodingError,
+        )
     except (Exception, SongServiceError):
         return Response(
             status_code=HTTP_500_INTERNAL_SERVER_ERROR,
@@ -218,6 +628,58 @@ async def get_song_metadata(
     return Response(song_json, media_type="application/json", status_code=HTTP_200_OK)
 
 
+@router.get("/{name}/waveform")
+async def get_song_waveform(
+    name: str,
+    request: Request,
+    token: Token,
+) -> Response:
+    """Get song waveform peaks, pairs of signed bytes with the min and max sample\
+        of each part of the song. Supports conditional requests through If-None-Match
+
+    Args:
+        name: song name
+        request: incoming request
+        token: JWT info
+    """
+    try:
+        waveform = await base_song_service.get_song_waveform(name)
+    except SongBadNameError:
+        return Response(
+            status_code=HTTP_400_BAD_REQUEST,
+            content=PropertiesMessagesManager.songBadName,
+        )
+    except SongNotFoundError:
+        return Response(
+            status_code=HTTP_404_NOT_FOUND,
+            content=PropertiesMessagesManager.songNotFound,
+        )
+    except SongWaveformNotFoundError:
+        return Response(
+            status_code=HTTP_404_NOT_FOUND,
+            content=PropertiesMessagesManager.songWaveformNotFound,
+        )
+    except (Exception, SongServiceError):
+        return Response(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            content=PropertiesMessagesManager.commonInternalServerError,
+        )
+
+    entity_tag = get_song_waveform_entity_tag(waveform)
+    headers = {"cache-control": SONG_WAVEFORM_CACHE_CONTROL, "etag": entity_tag}
+    if_none_match_header = request.headers.get("if-none-match")
+    if if_none_match_header is not None and is_entity_tag_matched(
+        if_none_match_header, entity_tag
+    ):
+        return Response(status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(
+        waveform,
+        media_type="application/octet-stream",
+        headers=headers,
+        status_code=HTTP_200_OK,
+    )
+
+
 @router.patch("/{name}/streams")
 async def increase_song_streams(
     name: str,
@@ -0,0 +1,300 @@
+"""Song ingest service for processing uploaded songs in background
+
+Uploads are validated before the request returns and their spooled file is owned by\
+the job, the song is created by the song service of the selected architecture once a\
+worker of the current process is free. The song is only visible once it's stored.\
+Job statuses are stored in the database so they can be queried from any worker
+"""
+
+import os
+import uuid
+from asyncio import to_thread
+from datetime import UTC, datetime, timedelta
+from typing import BinaryIO
+
+import app.spotify_electron.song.song_job_repository as song_job_repository
+import app.spotify_electron.user.validations.base_user_service_validations as base_user_service_validations  # noqa: E501
+from app.auth.auth_schema import TokenData, UserUnauthorizedError
+from app.logging.logging_constants import LOGGING_SONG_INGEST_SERVICE
+from app.logging.logging_schema import SpotifyElectronLogger
+from app.spotify_electron.genre.genre_schema import Genre, GenreNotValidError
+from app.spotify_electron.song.base_song_schema import (
+    SongAlreadyExistsError,
+    SongBadNameError,
+    SongIngestQueueFullError,
+    SongJobDAO,
+    SongJobDTO,
+    SongJobNotFoundError,
+    SongRepositoryError,
+    SongServiceError,
+    get_song_job_dto_from_dao,
+)
+from app.spotify_electron.song.providers.song_ingest_provider import (
+    get_song_ingest_queue,
+    get_song_job_expiration_seconds,
+)
+from app.spotify_electron.song.providers.song_service_provider import get_song_service
+from app.spotify_electron.song.validations.base_song_service_validations import (
+    validate_song_name_parameter,
+    validate_song_should_not_exists,
+)
+from app.spotify_electron.user.artist.validations.artist_service_validations import (
+    validate_user_should_be_artist,
+)
+from app.spotify_electron.user.user.user_schema import (
+    UserBadNameError,
+    UserNotFoundError,
+    UserServiceError,
+)
+from app.spotify_electron.utils.job_queue.job_queue_utils import (
+    Job,
+    JobQueueFullError,
+    JobStatus,
+)
+
+song_ingest_service_logger = SpotifyElectronLogger(LOGGING_SONG_INGEST_SERVICE).get_logger()
+
+SONG_JOB_PROGRESS_STEP = 0.05
+"""Min progress between the progress updates of a song job stored in the database"""
+
+
+async def create_song_job(  # noqa: C901
+    name: str, genre: Genre, photo: str, file: BinaryIO, token: TokenData
+) -> SongJobDTO:
+    """Validate a song upload and create the song in background
+
+    Args:
+        name: song name
+        genre: song genre
+        photo: song photo
+        file: song file, the job owns it and closes it once finished. It's closed\
+            before returning if the job cannot be created
+        token: user token
+
+    Raises:
+        GenreNotValidError: invalid genre
+        UserBadNameError: invalid user name
+        UserNotFoundError: user doesn't exists
+        SongBadNameError: song bad name
+        UserUnauthorizedError: unauthorized user for creating song
+        SongAlreadyExistsError: song already exists
+        SongIngestQueueFullError: too many songs waiting for processing
+        SongServiceError: unexpected error while creating song job
+
+    Returns:
+        the song job
+    """
+    artist = token.username
+    song_job: SongJobDAO | None = None
+
+    try:
+        validate_song_name_parameter(name)
+        await base_user_service_validations.validate_user_name_parameter(artist)
+        Genre.validate_genre(genre.value)
+
+        await validate_song_should_not_exists(name)
+        await validate_user_should_be_artist(artist)
+
+        file_size = await to_thread(_get_song_file_size, file)
+        song_job = await _submit_song_job(name, genre, photo, file, file_size, token)
+    except GenreNotValidError as exception:
+        song_ingest_service_logger.exception(f"Bad genre provided {genre}")
+        raise GenreNotValidError from exception
+    except UserBadNameError as exception:
+        song_ingest_service_logger.exception(f"Bad Artist Name Parameter: {artist}")
+        raise UserBadNameError from exception
+    except UserNotFoundError as exception:
+        song_ingest_service_logger.exception(f"Artist {artist} not found")
+        raise UserNotFoundError from exception
+    except SongBadNameError as exception:
+        song_ingest_service_logger.exception(f"Bad Song Name Parameter: {name}")
+        raise SongBadNameError from exception
+    except SongAlreadyExistsError as exception:
+        song_ingest_service_logger.exception(f"Song already exists: {name}")
+        raise SongAlreadyExistsError from exception
+    except UserUnauthorizedError as exception:
+        song_ingest_service_logger.exception(
+            f"User {artist} cannot create song {name} because hes not artist"
+        )
+        raise UserUnauthorizedError from exception
+    except JobQueueFullError as exception:
+        song_ingest_service_logger.exception(f"Song ingest queue full, rejecting song {name}")
+        raise SongIngestQueueFullError from exception
+    except UserServiceError as exception:
+        song_ingest_service_logger.exception(
+            f"Unexpected error in User Service while creating song job: {name}"
+        )
+        raise SongServiceError from exception
+    except Exception as exception:
+        song_ingest_service_logger.exception(
+            f"Unexpected error in Song Ingest Service creating song job: {name}"
+        )
+        raise SongServiceError from exception
+    else:
+        song_ingest_service_logger.info(
+            f"Song {name} queued for processing in job {song_job.id}"
+        )
+        return get_song_job_dto_from_dao(song_job)
+    finally:
+        if song_job is None:
+            await to_thread(file.close)
+
+
+async def get_song_job(job_id: str, token: TokenData) -> SongJobDTO:
+    """Get song job. Users can only get the jobs they created
+
+    Args:
+        job_id: job id
+        token: user token
+
+    Raises:
+        SongJobNotFoundError: job doesn't exists or belongs to another user
+        SongServiceError: unexpected error getting song job
+
+    Returns:
+        the song job
+    """
+    try:
+        song_job = await song_job_repository.get_song_job(job_id)
+    except SongJobNotFoundError as exception:
+        song_ingest_service_logger.info(f"Song job {job_id} not found")
+        raise SongJobNotFoundError from exception
+    except SongRepositoryError as exception:
+        song_ingest_service_logger.exception(
+            f"Unexpected error in Song Job Repository getting song job: {job_id}"
+        )
+        raise SongServiceError from exception
+
+    if song_job.owner != token.username:
+        song_ingest_service_logger.info(f"Song job {job_id} not found for {token.username}")
+        raise SongJobNotFoundError
+    return get_song_job_dto_from_dao(song_job)
+
+
+async def _submit_song_job(  # noqa: PLR0913, PLR0917
+    name: str,
+    genre: Genre,
+    photo: str,
+    song_file: BinaryIO,
+    song_file_size: int,
+    token: TokenData,
+) -> SongJobDAO:
+    """Store the song ingest job and submit it. The job is stored before it's submitted\
+        so its status updates always find it. The song file is closed once the job\
+        is rejected or finished, including when it's discarded by the queue shutdown
+
+    Args:
+        name: song name
+        genre: song genre
+        photo: song photo
+        song_file: song file
+        song_file_size: song file size in bytes
+        token: user token
+
+    Raises:
+        JobQueueFullError: the song ingest queue cannot accept more jobs
+
+    Returns:
+        the stored song job
+    """
+    song_job = SongJobDAO(
+        id=uuid.uuid4().hex,
+        owner=token.username,
+        name=name,
+        status=JobStatus.PENDING,
+        progress=0,
+        error=None,
+        expires_at=_get_song_job_expiration_date(),
+    )
+    await song_job_repository.create_song_job(song_job)
+    try:
+        get_song_ingest_queue().submit(
+            token.username,
+            name,
+            lambda job: _ingest_song(
+                job,
+                name=name,
+                genre=genre,
+                photo=photo,
+                song_file=song_file,
+                song_file_size=song_file_size,
+                token=token,
+            ),
+            cleanup=song_file.close,
+            listener=_update_song_job,
+            job_id=song_job.id,
+        )
+    except JobQueueFullError:
+        await song_job_repository.delete_song_job(song_job.id)
+        raise
+    return song_job
+
+
+async def _ingest_song(  # noqa: PLR0913
+    job: Job,
+    *,
+    name: str,
+    genre: Genre,
+    photo: str,
+    song_file: BinaryIO,
+    song_file_size: int,
+    token: TokenData,
+) -> None:
+    """Create the song of a job reporting the stored fraction of its file as progress.\
+        Progress is stored every time it advances a step so polls from other workers\
+        see it without writing every chunk to the database
+
+    Args:
+        job: song ingest job
+        name: song name
+        genre: song genre
+        photo: song photo
+        song_file: song file
+        song_file_size: song file size in bytes
+        token: user token
+    """
+    stored_progress = 0.0
+
+    async def on_progress(processed_bytes: int) -> None:
+        nonlocal stored_progress
+        job.progress = processed_bytes / song_file_size if song_file_size else 0
+        if job.progress - stored_progress >= SONG_JOB_PROGRESS_STEP:
+            stored_progress = job.progress
+            await song_job_repository.update_song_job_progress(job.id, job.progress)
+
+    await get_song_service().create_song(
+        name, genre, photo, song_file, token, on_progress=on_progress
+    )
+
+
+async def _update_song_job(job: Job) -> None:
+    """Store the status of a song ingest job, extending its expiration
+
+    Args:
+        job: song ingest job
+    """
+    await song_job_repository.update_song_job(
+        job.id, job.status, job.progress, job.error, _get_song_job_expiration_date()
+    )
+
+
+def _get_song_job_expiration_date() -> datetime:
+    """Get the expiration date of a song job updated now
+
+    Returns:
+        the expiration date
+    """
+    return datetime.now(UTC) + timedelta(seconds=get_song_job_expiration_seconds())
+
+
+def _get_song_file_size(file: BinaryIO) -> int:
+    """Get the size of a song file
+
+    Args:
+        file: song file
+
+    Returns:
+        the song file size in bytes
+    """
+    file.seek(0, os.SEEK_END)
+    return file.tell()
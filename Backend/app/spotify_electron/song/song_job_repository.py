@@ -0,0 +1,164 @@
+"""Song job repository for managing the background processing jobs of uploaded songs\
+    regardless of the current architecture. Jobs are shared by every worker, so the\
+    status of a job can be queried from any of them while the worker that runs it\
+    updates it
+"""
+
+from datetime import UTC, datetime
+
+import app.spotify_electron.song.providers.song_collection_provider as provider
+from app.logging.logging_constants import LOGGING_SONG_JOB_REPOSITORY
+from app.logging.logging_schema import SpotifyElectronLogger
+from app.spotify_electron.song.base_song_schema import (
+    SongJobDAO,
+    SongJobDocument,
+    SongJobNotFoundError,
+    SongRepositoryError,
+    get_song_job_dao_from_document,
+)
+from app.spotify_electron.song.validations.base_song_repository_validations import (
+    validate_song_job_exists,
+)
+from app.spotify_electron.utils.job_queue.job_queue_utils import JobStatus
+
+song_job_repository_logger = SpotifyElectronLogger(LOGGING_SONG_JOB_REPOSITORY).get_logger()
+
+
+async def create_song_job(song_job: SongJobDAO) -> None:
+    """Create song job
+
+    Args:
+        song_job: song job
+
+    Raises:
+        SongRepositoryError: unexpected error creating song job
+    """
+    try:
+        collection = provider.get_song_job_collection()
+        document = SongJobDocument(
+            _id=song_job.id,
+            owner=song_job.owner,
+            name=song_job.name,
+            status=str(song_job.status.value),
+            progress=song_job.progress,
+            error=song_job.error,
+            expires_at=song_job.expires_at,
+        )
+        await collection.insert_one(document)
+    except Exception as exception:
+        song_job_repository_logger.exception(
+            f"Error inserting Song job {song_job.id} in database"
+        )
+        raise SongRepositoryError from exception
+    else:
+        song_job_repository_logger.info(f"Song job added to repository: {song_job}")
+
+
+async def get_song_job(job_id: str) -> SongJobDAO:
+    """Get song job, expired jobs are not found
+
+    Args:
+        job_id: song job id
+
+    Raises:
+        SongJobNotFoundError: doesn't exists or expired
+        SongRepositoryError: unexpected error getting song job
+
+    Returns:
+        the song job
+    """
+    try:
+        collection = provider.get_song_job_collection()
+        document = await collection.find_one(
+            {"_id": job_id, "expires_at": {"$gt": datetime.now(UTC)}}
+        )
+        validate_song_job_exists(document)
+        assert document
+    except SongJobNotFoundError as exception:
+        song_job_repository_logger.info(f"Song job {job_id} not found")
+        raise SongJobNotFoundError from exception
+    except Exception as exception:
+        song_job_repository_logger.exception(f"Error getting Song job {job_id} from database")
+        raise SongRepositoryError from exception
+    else:
+        song_job_repository_logger.debug(f"Get Song job by id returned {document}")
+        return get_song_job_dao_from_document(document)
+
+
+async def update_song_job(  # noqa: PLR0913, PLR0917
+    job_id: str,
+    status: JobStatus,
+    progress: float,
+    error: str | None,
+    expires_at: datetime,
+) -> None:
+    """Update the status of a song job
+
+    Args:
+        job_id: song job id
+        status: job status
+        progress: completed fraction of the job between 0 and 1
+        error: error of a failed job
+        expires_at: new expiration date of the job
+
+    Raises:
+        SongRepositoryError: unexpected error updating song job
+    """
+    try:
+        collection = provider.get_song_job_collection()
+        await collection.update_one(
+            {"_id": job_id},
+            {
+                "$set": {
+                    "status": str(status.value),
+                    "progress": progress,
+                    "error": error,
+                    "expires_at": expires_at,
+                }
+            },
+        )
+    except Exception as exception:
+        song_job_repository_logger.exception(f"Error updating Song job {job_id} in database")
+        raise SongRepositoryError from exception
+    else:
+        song_job_repository_logger.debug(f"Song job {job_id} updated to {status}")
+
+
+async def update_song_job_progress(job_id: str, progress: float) -> None:
+    """Update the progress of a song job. Progress only moves forward so updates\
+        can be applied in any order
+
+    Args:
+        job_id: song job id
+        progress: completed fraction of the job between 0 and 1
+
+    Raises:
+        SongRepositoryError: unexpected error updating song job progress
+    """
+    try:
+        collection = provider.get_song_job_collection()
+        await collection.update_one({"_id": job_id}, {"$max": {"progress": progress}})
+    except Exception as exception:
+        song_job_repository_logger.exception(
+            f"Error updating Song job {job_id} progress in database"
+        )
+        raise SongRepositoryError from exception
+
+
+async def delete_song_job(job_id: str) -> None:
+    """Delete song job
+
+    Args:
+        job_id: song job id
+
+    Raises:
+        SongRepositoryError: unexpected error deleting song job
+    """
+    try:
+        collection = provider.get_song_job_collection()
+        await collection.delete_one({"_id": job_id})
+    except Exception as exception:
+        song_job_repository_logger.exception(f"Error deleting Song job {job_id} from database")
+        raise SongRepositoryError from exception
+    else:
+        song_job_repository_logger.info(f"Song job {job_id} deleted")
@@ -0,0 +1,216 @@
+"""Song upload repository for managing the resumable uploads of songs regardless\
+    of the current architecture. Uploads are shared by every worker, the offset of an\
+    upload only moves forward once the chunk is stored so concurrent or retried chunks\
+    can't corrupt it
+"""
+
+from datetime import UTC, datetime
+
+import app.spotify_electron.song.providers.song_collection_provider as provider
+from app.logging.logging_constants import LOGGING_SONG_UPLOAD_REPOSITORY
+from app.logging.logging_schema import SpotifyElectronLogger
+from app.spotify_electron.song.base_song_schema import (
+    SongRepositoryError,
+    SongUploadDAO,
+    SongUploadDocument,
+    SongUploadNotFoundError,
+    get_song_upload_dao_from_document,
+)
+from app.spotify_electron.song.validations.base_song_repository_validations import (
+    validate_song_upload_exists,
+)
+
+song_upload_repository_logger = SpotifyElectronLogger(
+    LOGGING_SONG_UPLOAD_REPOSITORY
+).get_logger()
+
+
+async def create_song_upload(song_upload: SongUploadDAO) -> None:
+    """Create song upload
+
+    Args:
+        song_upload: song upload
+
+    Raises:
+        SongRepositoryError: unexpected error creating song upload
+    """
+    try:
+        collection = provider.get_song_upload_collection()
+        document = SongUploadDocument(
+            _id=song_upload.id,
+            owner=song_upload.owner,
+            name=song_upload.name,
+            genre=str(song_upload.genre.value),
+            photo=song_upload.photo,
+            size=song_upload.size,
+            offset=song_upload.offset,
+            parts=song_upload.parts,
+            finalizing=song_upload.finalizing,
+            expires_at=song_upload.expires_at,
+        )
+        await collection.insert_one(document)
+    except Exception as exception:
+        song_upload_repository_logger.exception(
+            f"Error inserting Song upload {song_upload.id} in database"
+        )
+        raise SongRepositoryError from exception
+    else:
+        song_upload_repository_logger.info(f"Song upload added to repository: {song_upload}")
+
+
+async def get_song_upload(upload_id: str) -> SongUploadDAO:
+    """Get song upload, expired uploads are not found
+
+    Args:
+        upload_id: song upload id
+
+    Raises:
+        SongUploadNotFoundError: doesn't exists or expired
+        SongRepositoryError: unexpected error getting song upload
+
+    Returns:
+        the song upload
+    """
+    try:
+        collection = provider.get_song_upload_collection()
+        document = await collection.find_one(
+            {"_id": upload_id, "expires_at": {"$gt": datetime.now(UTC)}}
+        )
+        validate_song_upload_exists(document)
+        assert document
+    except SongUploadNotFoundError as exception:
+        song_upload_repository_logger.info(f"Song upload {upload_id} not found")
+        raise SongUploadNotFoundError from exception
+    except Exception as exception:
+        song_upload_repository_logger.exception(
+            f"Error getting Song upload {upload_id} from database"
+        )
+        raise SongRepositoryError from exception
+    else:
+        song_upload_repository_logger.debug(f"Get Song upload by id returned {document}")
+        return get_song_upload_dao_from_document(document)
+
+
+async def add_song_upload_part(
+    upload_id: str, offset: int, part: str, part_size: int, expires_at: datetime
+) -> bool:
+    """Add a received chunk to a song upload if the upload offset is still the one\
+        the chunk starts at and the upload is not being finalized
+
+    Args:
+        upload_id: song upload id
+        offset: offset the chunk starts at
+        part: file of the chunk
+        part_size: chunk size in bytes
+        expires_at: new expiration date of the upload
+
+    Raises:
+        SongRepositoryError: unexpected error adding song upload part
+
+    Returns:
+        whether the chunk was added
+    """
+    try:
+        collection = provider.get_song_upload_collection()
+        result = await collection.update_one(
+            {"_id": upload_id, "offset": offset, "finalizing": False},
+            {
+                "$inc": {"offset": part_size},
+                "$push": {"parts": part},
+                "$set": {"expires_at": expires_at},
+            },
+        )
+    except Exception as exception:
+        song_upload_repository_logger.exception(
+            f"Error adding part to Song upload {upload_id} in database"
+        )
+        raise SongRepositoryError from exception
+    else:
+        added = result.modified_count > 0
+        song_upload_repository_logger.debug(
+            f"Song upload {upload_id} part of {part_size} bytes at {offset} added: {added}"
+        )
+        return added
+
+
+async def update_song_upload_finalizing(upload_id: str, finalizing: bool) -> bool:
+    """Mark song upload as being finalized or not. An upload can only be marked\
+        as being finalized by one caller at once
+
+    Args:
+        upload_id: song upload id
+        finalizing: whether the upload is being finalized
+
+    Raises:
+        SongRepositoryError: unexpected error updating song upload
+
+    Returns:
+        whether the upload was updated
+    """
+    try:
+        collection = provider.get_song_upload_collection()
+        result = await collection.update_one(
+            {"_id": upload_id, "finalizing": not finalizing},
+            {"$set": {"finalizing": finalizing}},
+        )
+    except Exception as exception:
+        song_upload_repository_logger.exception(
+            f"Error updating Song upload {upload_id} finalizing in database"
+        )
+        raise SongRepositoryError from exception
+    else:
+        return result.modified_count > 0
+
+
+async def delete_song_upload(upload_id: str) -> None:
+    """Delete song upload
+
+    Args:
+        upload_id: song upload id
+
+    Raises:
+        SongRepositoryError: unexpected error deleting song upload
+    """
+    try:
+        collection = provider.get_song_upload_collection()
+        await collection.delete_one({"_id": upload_id})
+    except Exception as exception:
+        song_upload_repository_logger.exception(
+            f"Error deleting Song upload {upload_id} from database"
+        )
+        raise SongRepositoryError from exception
+    else:
+        song_upload_repository_logger.info(f"Song upload {upload_id} deleted")
+
+
+async def delete_expired_song_uploads() -> list[str]:
+    """Delete expired song uploads. Each upload is only deleted by one caller even if\
+        several workers delete expired uploads at once
+
+    Raises:
+        SongRepositoryError: unexpected error deleting expired song uploads
+
+    Returns:
+        the ids of the deleted uploads
+    """
+    try:
+        collection = provider.get_song_upload_collection()
+        now = datetime.now(UTC)
+        documents = await collection.find({"expires_at": {"$lte": now}}, {"_id": 1}).to_list(
+            length=None
+        )
+        deleted_ids = []
+        for document in documents:
+            result = await collection.delete_one(
+                {"_id": document["_id"], "expires_at": {"$lte": now}}
+            )
+            if result.deleted_count > 0:
+                deleted_ids.append(document["_id"])
+    except Exception as exception:
+        song_upload_repository_logger.exception(
+            "Error deleting expired Song uploads from database"
+        )
+        raise SongRepositoryError from exception
+    else:
+        song_upload_repository_logger.info(f"Expired Song uploads deleted: {deleted_ids}")
+        return deleted_ids
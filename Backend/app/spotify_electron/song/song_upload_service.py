@@ -0,0 +1,468 @@
+"""Song upload service for uploading big songs in chunks that can be resumed
+
+An upload is created with the song metadata and size, then its chunks are sent in\
+order starting at the upload offset and the upload is finalized once the whole song\
+is received. Each chunk is stored in its own file of a directory shared by every worker\
+and the offset only moves forward once the chunk is stored, so an interrupted chunk can\
+be resent from the offset where it stopped. Chunks are joined when the upload is\
+finalized and the song is created by the song service of the selected architecture.\
+Uploads that stop receiving chunks expire and are deleted by the song upload provider
+"""
+
+import os
+import shutil
+import tempfile
+import uuid
+from asyncio import to_thread
+from collections.abc import AsyncIterator
+from contextlib import suppress
+from datetime import UTC, datetime, timedelta
+from typing import BinaryIO
+
+import app.spotify_electron.song.song_ingest_service as song_ingest_service
+import app.spotify_electron.song.song_upload_repository as song_upload_repository
+import app.spotify_electron.user.validations.base_user_service_validations as base_user_service_validations  # noqa: E501
+from app.auth.auth_schema import TokenData, UserUnauthorizedError
+from app.logging.logging_constants import LOGGING_SONG_UPLOAD_SERVICE
+from app.logging.logging_schema import SpotifyElectronLogger
+from app.spotify_electron.genre.genre_schema import Genre, GenreNotValidError
+from app.spotify_electron.song.base_song_schema import (
+    SongAlreadyExistsError,
+    SongBadNameError,
+    SongIngestQueueFullError,
+    SongJobDTO,
+    SongServiceError,
+    SongUploadBadSizeError,
+    SongUploadConflictError,
+    SongUploadDAO,
+    SongUploadDTO,
+    SongUploadIncompleteError,
+    SongUploadNotFoundError,
+    get_song_upload_dto_from_dao,
+)
+from app.spotify_electron.song.providers.song_service_provider import get_song_service
+from app.spotify_electron.song.providers.song_upload_provider import (
+    get_song_upload_directory,
+    get_song_upload_expiration_seconds,
+)
+from app.spotify_electron.song.validations.base_song_service_validations import (
+    validate_song_name_parameter,
+    validate_song_should_not_exists,
+    validate_song_upload_chunk,
+    validate_song_upload_complete,
+    validate_song_upload_offset,
+    validate_song_upload_size,
+    validate_song_upload_updated,
+)
+from app.spotify_electron.user.artist.validations.artist_service_validations import (
+    validate_user_should_be_artist,
+)
+from app.spotify_electron.user.user.user_schema import (
+    UserBadNameError,
+    UserNotFoundError,
+    UserServiceError,
+)
+from app.spotify_electron.utils.audio_management.audio_management_utils import (
+    FILE_CHUNK_SIZE,
+    EncodingFileError,
+)
+
+song_upload_service_logger = SpotifyElectronLogger(LOGGING_SONG_UPLOAD_SERVICE).get_logger()
+
+
+async def create_song_upload(  # noqa: C901
+    name: str, genre: Genre, photo: str, size: int, token: TokenData
+) -> SongUploadDTO:
+    """Validate the song metadata and create a resumable upload for its file
+
+    Args:
+        name: song name
+        genre: song genre
+        photo: song photo
+        size: song file size in bytes
+        token: user token
+
+    Raises:
+        GenreNotValidError: invalid genre
+        UserBadNameError: invalid user name
+        UserNotFoundError: user doesn't exists
+        SongBadNameError: song bad name
+        SongUploadBadSizeError: song file size is not allowed
+        UserUnauthorizedError: unauthorized user for creating song
+        SongAlreadyExistsError: song already exists
+        SongServiceError: unexpected error while creating song upload
+
+    Returns:
+        the song upload
+    """
+    artist = token.username
+
+    try:
+        validate_song_name_parameter(name)
+        await base_user_service_validations.validate_user_name_parameter(artist)
+        Genre.validate_genre(genre.value)
+        validate_song_upload_size(size)
+
+        await validate_song_should_not_exists(name)
+        await validate_user_should_be_artist(artist)
+
+        song_upload = SongUploadDAO(
+            id=uuid.uuid4().hex,
+            owner=artist,
+            name=name,
+            genre=genre,
+            photo=photo,
+            size=size,
+            offset=0,
+            parts=[],
+            finalizing=False,
+            expires_at=_get_song_upload_expiration_date(),
+        )
+        await to_thread(os.makedirs, get_song_upload_directory(song_upload.id))
+        await song_upload_repository.create_song_upload(song_upload)
+    except GenreNotValidError as exception:
+        song_upload_service_logger.exception(f"Bad genre provided {genre}")
+        raise GenreNotValidError from exception
+    except UserBadNameError as exception:
+        song_upload_service_logger.exception(f"Bad Artist Name Parameter: {artist}")
+        raise UserBadNameError from exception
+    except UserNotFoundError as exception:
+        song_upload_service_logger.exception(f"Artist {artist} not found")
+        raise UserNotFoundError from exception
+    except SongBadNameError as exception:
+        song_upload_service_logger.exception(f"Bad Song Name Parameter: {name}")
+        raise SongBadNameError from exception
+    except SongUploadBadSizeError as exception:
+        song_upload_service_logger.exception(f"Bad Song upload size: {size}")
+        raise SongUploadBadSizeError from exception
+    except SongAlreadyExistsError as exception:
+        song_upload_service_logger.exception(f"Song already exists: {name}")
+        raise SongAlreadyExistsError from exception
+    except UserUnauthorizedError as exception:
+        song_upload_service_logger.exception(
+            f"User {artist} cannot upload song {name} because hes not artist"
+        )
+        raise UserUnauthorizedError from exception
+    except UserServiceError as exception:
+        song_upload_service_logger.exception(
+            f"Unexpected error in User Service while creating song upload: {name}"
+        )
+        raise SongServiceError from exception
+    except Exception as exception:
+        song_upload_service_logger.exception(
+            f"Unexpected error in Song Upload Service creating song upload: {name}"
+        )
+        raise SongServiceError from exception
+    else:
+        song_upload_service_logger.info(f"Song {name} upload created: {song_upload.id}")
+        return get_song_upload_dto_from_dao(song_upload)
+
+
+async def get_song_upload(upload_id: str, token: TokenData) -> SongUploadDTO:
+    """Get song upload. Users can only get the uploads they created
+
+    Args:
+        upload_id: song upload id
+        token: user token
+
+    Raises:
+        SongUploadNotFoundError: upload doesn't exists, expired or belongs to another user
+        SongServiceError: unexpected error while getting song upload
+
+    Returns:
+        the song upload
+    """
+    try:
+        song_upload = await _get_user_song_upload(upload_id, token)
+    except SongUploadNotFoundError as exception:
+        raise SongUploadNotFoundError from exception
+    except Exception as exception:
+        song_upload_service_logger.exception(
+            f"Unexpected error in Song Upload Service getting song upload: {upload_id}"
+        )
+        raise SongServiceError from exception
+    else:
+        return get_song_upload_dto_from_dao(song_upload)
+
+
+async def upload_song_chunk(
+    upload_id: str, offset: int, chunks: AsyncIterator[bytes], token: TokenData
+) -> int:
+    """Store a chunk of a song upload as it's received. If the chunk is interrupted\
+        the bytes received until then are kept, so it can be resent from there
+
+    Args:
+        upload_id: song upload id
+        offset: offset the chunk starts at
+        chunks: chunk content as it's received
+        token: user token
+
+    Raises:
+        SongUploadNotFoundError: upload doesn't exists, expired or belongs to another user
+        SongUploadConflictError: the offset is not the upload offset or the upload is\
+            being finalized
+        SongUploadBadSizeError: the chunk exceeds the song size
+        SongServiceError: unexpected error while storing the chunk
+
+    Returns:
+        the upload offset after the chunk
+    """
+    try:
+        song_upload = await _get_user_song_upload(upload_id, token)
+        validate_song_upload_offset(song_upload, offset)
+
+        part, part_size = await _receive_song_upload_part(song_upload, offset, chunks)
+        if part_size > 0:
+            added = await song_upload_repository.add_song_upload_part(
+                upload_id, offset, part, part_size, _get_song_upload_expiration_date()
+            )
+            if not added:
+                await to_thread(_remove_song_upload_part, upload_id, part)
+            validate_song_upload_updated(added)
+    except SongUploadNotFoundError as exception:
+        raise SongUploadNotFoundError from exception
+    except SongUploadConflictError as exception:
+        song_upload_service_logger.info(f"Song upload {upload_id} chunk conflict at {offset}")
+        raise SongUploadConflictError from exception
+    except SongUploadBadSizeError as exception:
+        song_upload_service_logger.exception(
+            f"Song upload {upload_id} chunk at {offset} exceeds the song size"
+        )
+        raise SongUploadBadSizeError from exception
+    except Exception as exception:
+        song_upload_service_logger.exception(
+            f"Unexpected error in Song Upload Service storing chunk of upload: {upload_id}"
+        )
+        raise SongServiceError from exception
+    else:
+        song_upload_service_logger.debug(
+            f"Song upload {upload_id} received {part_size} bytes at {offset}"
+        )
+        return offset + part_size
+
+
+async def finalize_song_upload(  # noqa: C901
+    upload_id: str, token: TokenData, *, background: bool = False
+) -> SongJobDTO | None:
+    """Create the song of a complete upload and delete the upload. The upload is kept\
+        if the song cannot be created, so it can be finalized again
+
+    Args:
+        upload_id: song upload id
+        token: user token
+        background: whether to create the song in background and return its job
+
+    Raises:
+        SongUploadNotFoundError: upload doesn't exists, expired or belongs to another user
+        SongUploadIncompleteError: the whole song was not received yet
+        SongUploadConflictError: the upload is already being finalized
+        GenreNotValidError: invalid genre
+        UserBadNameError: invalid user name
+        UserNotFoundError: user doesn't exists
+        SongBadNameError: song bad name
+        UserUnauthorizedError: unauthorized user for creating song
+        SongAlreadyExistsError: song already exists
+        EncodingFileError: the song file cannot be read
+        SongIngestQueueFullError: too many songs waiting for processing
+        SongServiceError: unexpected error while creating the song
+
+    Returns:
+        the song job if the song is created in background
+    """
+    try:
+        song_upload = await _get_user_song_upload(upload_id, token)
+        validate_song_upload_complete(song_upload)
+        validate_song_upload_updated(
+            await song_upload_repository.update_song_upload_finalizing(upload_id, True)
+        )
+
+        try:
+            song_job = await _create_song_from_upload(song_upload, token, background)
+        except BaseException:
+            await song_upload_repository.update_song_upload_finalizing(upload_id, False)
+            raise
+
+        await song_upload_repository.delete_song_upload(upload_id)
+        await to_thread(shutil.rmtree, get_song_upload_directory(upload_id), True)
+    except (
+        SongUploadNotFoundError,
+        SongUploadIncompleteError,
+        SongUploadConflictError,
+        GenreNotValidError,
+        UserBadNameError,
+        UserNotFoundError,
+        SongBadNameError,
+        UserUnauthorizedError,
+        SongAlreadyExistsError,
+        EncodingFileError,
+        SongIngestQueueFullError,
+        SongServiceError,
+    ):
+        song_upload_service_logger.exception(f"Song upload {upload_id} not finalized")
+        raise
+    except Exception as exception:
+        song_upload_service_logger.exception(
+            f"Unexpected error in Song Upload Service finalizing upload: {upload_id}"
+        )
+        raise SongServiceError from exception
+    else:
+        song_upload_service_logger.info(
+            f"Song upload {upload_id} finalized into song {song_upload.name}"
+        )
+        return song_job
+
+
+async def _get_user_song_upload(upload_id: str, token: TokenData) -> SongUploadDAO:
+    """Get a song upload of the user
+
+    Args:
+        upload_id: song upload id
+        token: user token
+
+    Raises:
+        SongUploadNotFoundError: upload doesn't exists, expired or belongs to another user
+
+    Returns:
+        the song upload
+    """
+    song_upload = await song_upload_repository.get_song_upload(upload_id)
+    if song_upload.owner != token.username:
+        song_upload_service_logger.info(
+            f"Song upload {upload_id} not found for {token.username}"
+        )
+        raise SongUploadNotFoundError
+    return song_upload
+
+
+async def _receive_song_upload_part(
+    song_upload: SongUploadDAO, offset: int, chunks: AsyncIterator[bytes]
+) -> tuple[str, int]:
+    """Write a chunk into a new part file of the upload as it's received
+
+    Args:
+        song_upload: song upload
+        offset: offset the chunk starts at
+        chunks: chunk content as it's received
+
+    Raises:
+        SongUploadNotFoundError: the upload was deleted meanwhile
+        SongUploadBadSizeError: the chunk exceeds the song size, the part is removed
+
+    Returns:
+        the part file name and its size in bytes, the part is removed if it's empty
+    """
+    part = f"{offset:020d}-{uuid.uuid4().hex}.part"
+    try:
+        part_file = await to_thread(
+            open, os.path.join(get_song_upload_directory(song_upload.id), part), "wb"
+        )
+    except FileNotFoundError as exception:
+        raise SongUploadNotFoundError from exception
+
+    part_size = 0
+    try:
+        async for chunk in chunks:
+            validate_song_upload_chunk(song_upload, offset + part_size + len(chunk))
+            await to_thread(part_file.write, chunk)
+            part_size += len(chunk)
+    except SongUploadBadSizeError:
+        await to_thread(part_file.close)
+        await to_thread(_remove_song_upload_part, song_upload.id, part)
+        raise
+    except Exception:
+        if part_size == 0:
+            await to_thread(part_file.close)
+            await to_thread(_remove_song_upload_part, song_upload.id, part)
+            raise
+        song_upload_service_logger.exception(
+            f"Song upload {song_upload.id} chunk at {offset} interrupted, "
+            f"keeping {part_size} received bytes"
+        )
+
+    await to_thread(_close_song_upload_part, part_file, part_size)
+    if part_size == 0:
+        await to_thread(_remove_song_upload_part, song_upload.id, part)
+    return part, part_size
+
+
+async def _create_song_from_upload(
+    song_upload: SongUploadDAO, token: TokenData, background: bool
+) -> SongJobDTO | None:
+    """Create the song of a complete upload
+
+    Args:
+        song_upload: song upload
+        token: user token
+        background: whether to create the song in background and return its job
+
+    Returns:
+        the song job if the song is created in background
+    """
+    song_file = await to_thread(_join_song_upload_parts, song_upload)
+    if background:
+        return await song_ingest_service.create_song_job(
+            song_upload.name, song_upload.genre, song_upload.photo, song_file, token
+        )
+    try:
+        await get_song_service().create_song(
+            song_upload.name, song_upload.genre, song_upload.photo, song_file, token
+        )
+        return None
+    finally:
+        await to_thread(song_file.close)
+
+
+def _get_song_upload_expiration_date() -> datetime:
+    """Get the expiration date of an upload that receives a chunk now
+
+    Returns:
+        the expiration date
+    """
+    return datetime.now(UTC) + timedelta(seconds=get_song_upload_expiration_seconds())
+
+
+def _close_song_upload_part(part_file: BinaryIO, part_size: int) -> None:
+    """Close a part file making sure its received bytes are stored on disk
+
+    Args:
+        part_file: part file
+        part_size: bytes received
+    """
+    with part_file:
+        part_file.truncate(part_size)
+        part_file.flush()
+        os.fsync(part_file.fileno())
+
+
+def _remove_song_upload_part(upload_id: str, part: str) -> None:
+    """Remove a part file that is not part of the upload
+
+    Args:
+        upload_id: song upload id
+        part: part file name
+    """
+    with suppress(FileNotFoundError):
+        os.remove(os.path.join(get_song_upload_directory(upload_id), part))
+
+
+def _join_song_upload_parts(song_upload: SongUploadDAO) -> BinaryIO:
+    """Join the parts of an upload by chunks into an anonymous temporary file removed\
+        when closed
+
+    Args:
+        song_upload: song upload
+
+    Returns:
+        the song file
+    """
+    directory = get_song_upload_directory(song_upload.id)
+    song_file = tempfile.TemporaryFile(dir=directory)  # noqa: SIM115
+    try:
+        for part in song_upload.parts:
+            with open(os.path.join(directory, part), "rb") as part_file:
+                shutil.copyfileobj(part_file, song_file, FILE_CHUNK_SIZE)
+        song_file.seek(0)
+    except Exception:
+        song_file.close()
+        raise
+    return song_file
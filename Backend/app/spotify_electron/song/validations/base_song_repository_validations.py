@@ -8,7 +8,10 @@ from pymongo.results import DeleteResult, InsertOneResult
 from app.spotify_electron.song.base_song_schema import (
     SongCreateError,
     SongDeleteError,
+    SongJobNotFoundError,
     SongNotFoundError,
+    SongUploadNotFoundError,
+    SongWaveformNotFoundError,
 )
 
 
@@ -27,6 +30,51 @@ def validate_song_exists(song: Mapping[str, Any] | None) -> None:
         raise SongNotFoundError
 
 
+def validate_song_waveform_exists(song: Mapping[str, Any]) -> None:
+    """Raises an exception if song has no waveform
+
+    Args:
+    ----
+        song: the song
+
+    Raises:
+    ------
+        SongWaveformNotFoundError: if the song has no waveform
+    """
+    if not song.get("waveform"):
+        raise SongWaveformNotFoundError
+
+
+def validate_song_upload_exists(song_upload: Mapping[str, Any] | None) -> None:
+    """Raises an exception if song upload doesn't exists
+
+    Args:
+    ----
+        song_upload: the song upload
+
+    Raises:
+    ------
+        SongUploadNotFoundError: if the song upload doesn't exists
+    """
+    if song_upload is None:
+        raise SongUploadNotFoundError
+
+
+def validate_song_job_exists(song_job: Mapping[str, Any] | None) -> None:
+    """Raises an exception if song job doesn't exists
+
+    Args:
+    ----
+        song_job: the song job
+
+    Raises:
+    ------
+        SongJobNotFoundError: if the song job doesn't exists
+    """
+    if song_job is None:
+        raise SongJobNotFoundError
+
+
 def validate_base_song_create(result: InsertOneResult) -> None:
     """Raises an exception if song insertion was not done
 
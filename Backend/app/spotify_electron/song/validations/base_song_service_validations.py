@@ -3,9 +3,22 @@
 from app.exceptions.base_exceptions_schema import BadParameterError
 from app.spotify_electron.song.base_song_repository import check_song_exists
 from app.spotify_electron.song.base_song_schema import (
+    SONG_ALBUM_MAX_TRACKS,
+    SongAlbumBadTracksError,
+    SongAlbumTrack,
     SongAlreadyExistsError,
     SongBadNameError,
     SongNotFoundError,
+    SongUploadBadSizeError,
+    SongUploadConflictError,
+    SongUploadDAO,
+    SongUploadIncompleteError,
+)
+from app.spotify_electron.song.providers.song_single_flight_provider import (
+    get_song_exists_single_flight,
+)
+from app.spotify_electron.song.providers.song_upload_provider import (
+    get_song_upload_max_bytes,
 )
 from app.spotify_electron.utils.validations.validation_utils import validate_parameter
 
@@ -26,7 +39,8 @@ def validate_song_name_parameter(name: str) -> None:
 
 
 async def validate_song_should_exists(name: str) -> None:
-    """Raises an exception if song doesn't exists
+    """Raises an exception if song doesn't exists. Concurrent checks of the same song\
+        share a single database query
 
     Args:
     ----
@@ -36,7 +50,9 @@ async def validate_song_should_exists(name: str) -> None:
     ------
         SongNotFoundError: if song doesn't exists
     """
-    does_song_exists = await check_song_exists(name)
+    does_song_exists = await get_song_exists_single_flight().do(
+        name, lambda: check_song_exists(name)
+    )
     if not does_song_exists:
         raise SongNotFoundError
 
@@ -55,3 +71,85 @@ async def validate_song_should_not_exists(name: str) -> None:
     does_song_exists = await check_song_exists(name)
     if does_song_exists:
         raise SongAlreadyExistsError
+
+
+def validate_song_album_tracks(tracks: list[SongAlbumTrack]) -> None:
+    """Raises an exception if a song album has no tracks or too many tracks
+
+    Args:
+        tracks: album tracks
+
+    Raises:
+        SongAlbumBadTracksError: no tracks or too many tracks
+    """
+    if not 0 < len(tracks) <= SONG_ALBUM_MAX_TRACKS:
+        raise SongAlbumBadTracksError
+
+
+def validate_song_upload_size(size: int) -> None:
+    """Raises an exception if a song upload size is not allowed
+
+    Args:
+        size: song file size in bytes
+
+    Raises:
+        SongUploadBadSizeError: empty or bigger than the max upload size
+    """
+    if not 0 < size <= get_song_upload_max_bytes():
+        raise SongUploadBadSizeError
+
+
+def validate_song_upload_chunk(song_upload: SongUploadDAO, chunk_end: int) -> None:
+    """Raises an exception if a chunk exceeds the song upload size
+
+    Args:
+        song_upload: song upload
+        chunk_end: offset where the chunk received so far ends
+
+    Raises:
+        SongUploadBadSizeError: the chunk exceeds the song upload size
+    """
+    if chunk_end > song_upload.size:
+        raise SongUploadBadSizeError
+
+
+def validate_song_upload_offset(song_upload: SongUploadDAO, offset: int) -> None:
+    """Raises an exception if a chunk cannot be added to a song upload at an offset
+
+    Args:
+        song_upload: song upload
+        offset: offset the chunk starts at
+
+    Raises:
+        SongUploadConflictError: the offset is not the upload offset or the upload\
+            is being finalized
+    """
+    if offset != song_upload.offset or song_upload.finalizing:
+        raise SongUploadConflictError
+
+
+def validate_song_upload_updated(updated: bool) -> None:
+    """Raises an exception if a song upload was changed by another request before\
+        updating it
+
+    Args:
+        updated: whether the song upload was updated
+
+    Raises:
+        SongUploadConflictError: the song upload was changed by another request
+    """
+    if not updated:
+        raise SongUploadConflictError
+
+
+def validate_song_upload_complete(song_upload: SongUploadDAO) -> None:
+    """Raises an exception if a song upload has not received the whole song
+
+    Args:
+        song_upload: song upload
+
+    Raises:
+        SongUploadIncompleteError: the song upload is not complete
+    """
+    if song_upload.offset < song_upload.size:
+        raise SongUploadIncompleteError
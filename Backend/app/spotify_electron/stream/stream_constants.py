@@ -1,3 +1,12 @@
 """Constants for Stream service"""
 
 SONG_STREAMING_BUFFER_SIZE = 64_000
+STREAMING_CONTENT_TYPE = "audio/mp3"
+MAX_STREAMING_RANGES = 16
+"""Max number of byte ranges accepted in a single request"""
+MULTIPART_LINE_BREAK = b"\r\n"
+HLS_SEGMENT_CONTENT_TYPE = "audio/mpeg"
+HLS_IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+"""Cache control of versioned HLS segments, their content never changes"""
+HLS_REVALIDATE_CACHE_CONTROL = "no-cache"
+"""Cache control of HLS playlists and unversioned segments, they change with the song"""
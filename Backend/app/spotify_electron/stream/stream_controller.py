@@ -3,7 +3,7 @@
 from fastapi import APIRouter, Request, Response
 from fastapi.responses import StreamingResponse
 from starlette.status import (
-    HTTP_206_PARTIAL_CONTENT,
+    HTTP_304_NOT_MODIFIED,
     HTTP_400_BAD_REQUEST,
     HTTP_404_NOT_FOUND,
     HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
@@ -17,9 +17,10 @@ from app.spotify_electron.song.base_song_schema import (
     SongBadNameError,
     SongNotFoundError,
 )
-from app.spotify_electron.song.blob.song_schema import SongDataNotFoundError
+from app.spotify_electron.song.blob.song_schema import SongDataNotFoundError, SongQuality
 from app.spotify_electron.stream.stream_schema import (
     InvalidContentRangeStreamError,
+    StreamAudioContent,
     StreamServiceError,
 )
 
@@ -31,9 +32,68 @@ router = APIRouter(
 
 @router.get("/{name}", response_model=None)
 async def stream_song(
+    name: str,
+    request: Request,
+    token: Token,
+    quality: SongQuality | None = None,
+    playlist: str | None = None,
+) -> StreamingResponse | Response:
+    """Streams song audio. Supports single and multiple byte ranges and\
+        conditional requests through If-None-Match and If-Range headers
+
+    Args:
+        name: song name
+        request: incoming request
+        token: JWT info
+        quality: rendition quality, the song uploaded by the artist is streamed\
+            if not provided or the rendition is not available
+        playlist: playlist the song is streamed from, its upcoming songs are loaded\
+            in advance so they start faster
+    """
+    try:
+        stream_audio_content = await stream_service.get_stream_audio_data(
+            range_header=request.headers.get("range"),
+            name=name,
+            if_none_match_header=request.headers.get("if-none-match"),
+            if_range_header=request.headers.get("if-range"),
+            quality=quality,
+            user_name=token.username,
+            playlist=playlist,
+        )
+        return _get_stream_response(stream_audio_content)
+    except SongBadNameError:
+        return Response(
+            status_code=HTTP_400_BAD_REQUEST,
+            content=PropertiesMessagesManager.songBadName,
+        )
+    except SongNotFoundError:
+        return Response(
+            status_code=HTTP_404_NOT_FOUND,
+            content=PropertiesMessagesManager.songNotFound,
+        )
+    except SongDataNotFoundError:
+        return Response(
+            status_code=HTTP_404_NOT_FOUND,
+            content=PropertiesMessagesManager.songDataNotFound,
+        )
+    except InvalidContentRangeStreamError:
+        return Response(
+            status_code=HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            content=PropertiesMessagesManager.streamInvalidRangeHeader,
+        )
+    except (Exception, StreamServiceError):
+        return Response(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            content=PropertiesMessagesManager.commonInternalServerError,
+        )
+
+
+@router.get("/{name}/index.m3u8", response_model=None)
+async def stream_song_hls_playlist(
     name: str, request: Request, token: Token
 ) -> StreamingResponse | Response:
-    """Streams song audio
+    """Get song HLS media playlist. Songs are split into segments when uploaded,\
+        the playlist is not available until the segments are created
 
     Args:
         name: song name
@@ -41,19 +101,64 @@ async def stream_song(
         token: JWT info
     """
     try:
-        range_header = request.headers.get("range")
+        stream_audio_content = await stream_service.get_stream_hls_data(
+            range_header=request.headers.get("range"),
+            name=name,
+            if_none_match_header=request.headers.get("if-none-match"),
+            if_range_header=request.headers.get("if-range"),
+        )
+        return _get_stream_response(stream_audio_content)
+    except SongBadNameError:
+        return Response(
+            status_code=HTTP_400_BAD_REQUEST,
+            content=PropertiesMessagesManager.songBadName,
+        )
+    except SongNotFoundError:
+        return Response(
+            status_code=HTTP_404_NOT_FOUND,
+            content=PropertiesMessagesManager.songNotFound,
+        )
+    except SongDataNotFoundError:
+        return Response(
+            status_code=HTTP_404_NOT_FOUND,
+            content=PropertiesMessagesManager.songDataNotFound,
+        )
+    except InvalidContentRangeStreamError:
+        return Response(
+            status_code=HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            content=PropertiesMessagesManager.streamInvalidRangeHeader,
+        )
+    except (Exception, StreamServiceError):
+        return Response(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            content=PropertiesMessagesManager.commonInternalServerError,
+        )
 
-        stream_audio_content = await stream_service.get_stream_audio_data(range_header, name)
 
-        return StreamingResponse(
-            stream_service.stream_audio(
-                song_data=stream_audio_content.song_data,
-                start=stream_audio_content.start,
-                end=stream_audio_content.end,
-            ),
-            headers=stream_audio_content.headers,
-            status_code=HTTP_206_PARTIAL_CONTENT,
+@router.get("/{name}/seg/{segment}", response_model=None)
+async def stream_song_hls_segment(
+    name: str, segment: int, request: Request, token: Token, version: str | None = None
+) -> StreamingResponse | Response:
+    """Streams song HLS segment. Segments requested with a version are immutable\
+        and can be cached forever
+
+    Args:
+        name: song name
+        segment: segment number
+        request: incoming request
+        token: JWT info
+        version: version of the song the segment belongs to, as linked from the playlist
+    """
+    try:
+        stream_audio_content = await stream_service.get_stream_hls_data(
+            range_header=request.headers.get("range"),
+            name=name,
+            segment=segment,
+            version=version,
+            if_none_match_header=request.headers.get("if-none-match"),
+            if_range_header=request.headers.get("if-range"),
         )
+        return _get_stream_response(stream_audio_content)
     except SongBadNameError:
         return Response(
             status_code=HTTP_400_BAD_REQUEST,
@@ -79,3 +184,26 @@ async def stream_song(
             status_code=HTTP_500_INTERNAL_SERVER_ERROR,
             content=PropertiesMessagesManager.commonInternalServerError,
         )
+
+
+def _get_stream_response(
+    stream_audio_content: StreamAudioContent,
+) -> StreamingResponse | Response:
+    """Get the response for a stream content
+
+    Args:
+        stream_audio_content: stream content
+
+    Returns:
+        an empty response if the content was not modified, otherwise the streaming response
+    """
+    if stream_audio_content.status_code == HTTP_304_NOT_MODIFIED:
+        return Response(
+            status_code=HTTP_304_NOT_MODIFIED, headers=stream_audio_content.headers
+        )
+
+    return StreamingResponse(
+        stream_service.stream_audio_content(stream_audio_content),
+        headers=stream_audio_content.headers,
+        status_code=stream_audio_content.status_code,
+    )
@@ -3,20 +3,26 @@
 from dataclasses import dataclass
 
 from app.exceptions.base_exceptions_schema import SpotifyElectronError
+from app.spotify_electron.song.blob.song_schema import SongDataFileDAO
+from app.spotify_electron.stream.stream_constants import STREAMING_CONTENT_TYPE
 
 
 @dataclass
 class StreamAudioContent:
     """Content data for streaming audio"""
 
-    start: int
-    """Request start byte"""
-    end: int
-    """Request end byte"""
+    ranges: list[tuple[int, int]]
+    """Requested start and end bytes of each range"""
     headers: dict[str, str]
     """Response headers"""
-    song_data: bytes
-    """Song data from start-end bytes"""
+    song_data_file: SongDataFileDAO
+    """Song data file to read the ranges from"""
+    status_code: int
+    """Response status code"""
+    boundary: str | None = None
+    """Multipart boundary when several ranges are requested"""
+    content_type: str = STREAMING_CONTENT_TYPE
+    """Content type of the streamed file"""
 
 
 class StreamServiceError(SpotifyElectronError):
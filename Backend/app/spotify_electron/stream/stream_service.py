@@ -3,79 +3,271 @@
 Based on: https://github.com/fastapi/fastapi/issues/1240#issuecomment-1312294359
 """
 
+import secrets
 from collections.abc import AsyncGenerator
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
 
+from starlette.status import HTTP_200_OK, HTTP_206_PARTIAL_CONTENT, HTTP_304_NOT_MODIFIED
+
+import app.spotify_electron.playlist.playlist_service as playlist_service
 import app.spotify_electron.song.blob.song_service as song_service
+import app.spotify_electron.user.base_user_service as base_user_service
 from app.logging.logging_constants import LOGGING_STREAM_SERVICE
 from app.logging.logging_schema import SpotifyElectronLogger
 from app.spotify_electron.song.base_song_schema import (
     SongBadNameError,
     SongNotFoundError,
     SongRepositoryError,
+    SongServiceError,
+)
+from app.spotify_electron.song.blob.providers.song_prefetch_provider import (
+    get_song_prefetch_scheduler,
+    get_song_prefetch_songs,
+)
+from app.spotify_electron.song.blob.song_schema import (
+    SongDataFileDAO,
+    SongDataNotFoundError,
+    SongQuality,
+)
+from app.spotify_electron.stream.stream_constants import (
+    HLS_IMMUTABLE_CACHE_CONTROL,
+    HLS_REVALIDATE_CACHE_CONTROL,
+    HLS_SEGMENT_CONTENT_TYPE,
+    MAX_STREAMING_RANGES,
+    MULTIPART_LINE_BREAK,
+    SONG_STREAMING_BUFFER_SIZE,
+    STREAMING_CONTENT_TYPE,
 )
-from app.spotify_electron.song.blob.song_schema import SongDataNotFoundError
-from app.spotify_electron.stream.stream_constants import SONG_STREAMING_BUFFER_SIZE
 from app.spotify_electron.stream.stream_schema import (
     InvalidContentRangeStreamError,
     StreamAudioContent,
     StreamServiceError,
 )
+from app.spotify_electron.utils.audio_management.hls_utils import HLS_PLAYLIST_CONTENT_TYPE
 
 stream_service_logger = SpotifyElectronLogger(LOGGING_STREAM_SERVICE).get_logger()
 
 
-async def stream_audio(song_data: bytes, start: int, end: int) -> AsyncGenerator[bytes, None]:
-    """Yield chunks of song data from start to end
+async def stream_audio(
+    song_data_file: SongDataFileDAO, start: int, end: int
+) -> AsyncGenerator[memoryview, None]:
+    """Yield chunks of song data from start to end. Song data is read from cache or\
+        database on demand so memory usage is bounded by the buffer and GridFS chunk sizes.\
+        Chunks are views over the song data so no bytes are copied while streaming
 
     Args:
-        song_data: song data
+        song_data_file: song data file
         start: start byte
         end: end byte
 
     Yields:
         yield chunk bytes from requested range
     """
-    # Ensure we don't exceed the end limit
-    effective_end = min(end, len(song_data))
+    async for data in song_service.get_song_data_range(song_data_file, start, end):
+        for i in range(0, len(data), SONG_STREAMING_BUFFER_SIZE):
+            yield data[i : i + SONG_STREAMING_BUFFER_SIZE]
+
+
+async def stream_audio_content(
+    stream_audio_content: StreamAudioContent,
+) -> AsyncGenerator[bytes | memoryview, None]:
+    """Yield the response body of the stream audio content. A single range is streamed\
+        as is, several ranges are streamed as a multipart/byteranges body
+
+    Args:
+        stream_audio_content: stream audio content
+
+    Yields:
+        yield chunk bytes of the response body
+    """
+    song_data_file = stream_audio_content.song_data_file
+    boundary = stream_audio_content.boundary
+
+    for start, end in stream_audio_content.ranges:
+        if boundary is not None:
+            yield _get_multipart_part_header(
+                boundary, start, end, song_data_file.length, stream_audio_content.content_type
+            )
+        async for chunk in stream_audio(song_data_file=song_data_file, start=start, end=end):
+            yield chunk
+        if boundary is not None:
+            yield MULTIPART_LINE_BREAK
 
-    for i in range(start, effective_end, SONG_STREAMING_BUFFER_SIZE):
-        yield song_data[i : i + SONG_STREAMING_BUFFER_SIZE]
+    if boundary is not None:
+        yield _get_multipart_end(boundary)
 
 
-def _get_range_header(range_header: str | None, file_size: int) -> tuple[int, int]:
-    """Get range headers
+def _get_ranges(range_header: str, file_size: int) -> list[tuple[int, int]]:
+    """Get byte ranges from range header
 
     Args:
-        range_header: range content header [bytes 1000-1499/1500]
+        range_header: range content header [bytes=1000-1499, bytes=0-99,200-299, bytes=-500]
         file_size: file size
 
     Raises:
         InvalidContentRangeStreamError: range for streaming
 
     Returns:
-        start, end byte position
+        list of start, end byte positions
     """
+    unit, _, ranges_value = range_header.partition("=")
+    range_values = ranges_value.split(",")
+    if unit.strip() != "bytes" or len(range_values) > MAX_STREAMING_RANGES:
+        raise InvalidContentRangeStreamError
+
+    ranges: list[tuple[int, int]] = []
     try:
-        if range_header is None:
-            raise InvalidContentRangeStreamError
-        h = range_header.replace("bytes=", "").split("-")
-        start = int(h[0]) if h[0] != "" else 0
-        end = int(h[1]) if h[1] != "" else file_size - 1
+        for range_value in range_values:
+            h = range_value.strip().split("-")
+            if len(h) != 2:  # noqa: PLR2004
+                raise InvalidContentRangeStreamError  # noqa: TRY301
+            if h[0] == "":
+                # Suffix range, last N bytes of the file
+                start = max(file_size - int(h[1]), 0)
+                end = file_size - 1
+            else:
+                start = int(h[0])
+                end = int(h[1]) if h[1] != "" else file_size - 1
+
+            if start > end or start < 0 or end > file_size - 1:
+                raise InvalidContentRangeStreamError  # noqa: TRY301
+            ranges.append((start, end))
     except ValueError as exception:
         raise InvalidContentRangeStreamError from exception
 
-    if start > end or start < 0 or end > file_size - 1:
-        raise InvalidContentRangeStreamError
-    return start, end
+    return ranges
+
+
+def _get_entity_tag(song_data_file: SongDataFileDAO) -> str:
+    """Get strong entity tag of the song data. Each upload of a song has a new\
+        GridFS file id and date so the tag changes whenever the song data changes
+
+    Args:
+        song_data_file: song data file
+
+    Returns:
+        the quoted entity tag
+    """
+    upload_timestamp = int(_get_upload_date(song_data_file).timestamp() * 1000)
+    return f'"{song_data_file.file_id}-{upload_timestamp}"'
+
+
+def _get_upload_date(song_data_file: SongDataFileDAO) -> datetime:
+    """Get song data upload date in UTC
+
+    Args:
+        song_data_file: song data file
+
+    Returns:
+        the upload date in UTC
+    """
+    upload_date = song_data_file.upload_date
+    if upload_date.tzinfo is None:
+        # Dates are stored in UTC but returned without timezone by the database driver
+        upload_date = upload_date.replace(tzinfo=UTC)
+    return upload_date
+
+
+def is_entity_tag_matched(if_none_match_header: str, entity_tag: str) -> bool:
+    """Check if the entity tag is matched by an If-None-Match header using weak comparison
+
+    Args:
+        if_none_match_header: If-None-Match header
+        entity_tag: current entity tag
+
+    Returns:
+        if the entity tag is matched
+    """
+    if if_none_match_header.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == entity_tag for tag in if_none_match_header.split(",")
+    )
+
+
+def _is_if_range_satisfied(
+    if_range_header: str, entity_tag: str, song_data_file: SongDataFileDAO
+) -> bool:
+    """Check if an If-Range header matches the current song data using strong comparison
+
+    Args:
+        if_range_header: If-Range header, either an entity tag or an HTTP date
+        entity_tag: current entity tag
+        song_data_file: song data file
+
+    Returns:
+        if the range can be served
+    """
+    if_range_value = if_range_header.strip()
+    if if_range_value.startswith(('"', "W/")):
+        return if_range_value == entity_tag
+    try:
+        if_range_date = parsedate_to_datetime(if_range_value)
+    except (TypeError, ValueError):
+        return False
+    upload_date = _get_upload_date(song_data_file).replace(microsecond=0)
+    return if_range_date == upload_date
+
+
+def _get_multipart_part_header(
+    boundary: str, start: int, end: int, file_size: int, content_type: str
+) -> bytes:
+    """Get the header of a multipart/byteranges body part
+
+    Args:
+        boundary: multipart boundary
+        start: part start byte
+        end: part end byte
+        file_size: file size
+        content_type: content type of the file
+
+    Returns:
+        the part header
+    """
+    return (
+        f"--{boundary}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Range: bytes {start}-{end}/{file_size}\r\n"
+        "\r\n"
+    ).encode("latin-1")
 
 
-async def get_stream_audio_data(range_header: str | None, name: str) -> StreamAudioContent:
-    """Gets stream audio data
+def _get_multipart_end(boundary: str) -> bytes:
+    """Get the closing delimiter of a multipart/byteranges body
 
     Args:
-        range_header: range content header [bytes 1000-1499/1500]\
+        boundary: multipart boundary
+
+    Returns:
+        the closing delimiter
+    """
+    return f"--{boundary}--\r\n".encode("latin-1")
+
+
+async def get_stream_audio_data(  # noqa: PLR0913
+    range_header: str | None,
+    name: str,
+    if_none_match_header: str | None = None,
+    if_range_header: str | None = None,
+    quality: SongQuality | None = None,
+    *,
+    user_name: str | None = None,
+    playlist: str | None = None,
+) -> StreamAudioContent:
+    """Gets stream audio data. When the song is streamed from a playlist the upcoming\
+        songs of the playlist are prefetched in background, streaming a song\
+        outside the playlist cancels the prefetch
+
+    Args:
+        range_header: range content header [bytes=1000-1499]\
          https://developer.mozilla.org/en-US/docs/Web/HTTP/Range_requests
         name: song name
+        if_none_match_header: If-None-Match header, the song is not sent if it matches
+        if_range_header: If-Range header, the range is ignored if it doesn't match
+        quality: rendition quality, None for the song data uploaded by the artist
+        user_name: name of the user streaming the song
+        playlist: name of the playlist the song is streamed from
 
     Raises:
         SongBadNameError: name
@@ -88,25 +280,16 @@ async def get_stream_audio_data(range_header: str | None, name: str) -> StreamAu
         the needed audio data for streaming
     """
     try:
-        song_data = await song_service.get_song_data(name)
-        file_size = len(song_data)
-        stream_service_logger.info(f"Streaming song {name}")
-
-        headers = {
-            "content-type": "audio/mp3",
-            "accept-ranges": "bytes",
-            "content-encoding": "identity",
-            "access-control-expose-headers": (
-                "Content-type, Accept-ranges, Content-length, Content-range, Content-encoding"
-            ),
-        }
-
-        start, end = _get_range_header(range_header, file_size)
-        size = end - start + 1
-        headers["Content-length"] = str(size)
-        headers["Content-range"] = f"bytes {start}-{end}/{file_size}"
-
-        return StreamAudioContent(song_data=song_data, headers=headers, start=start, end=end)
+        song_data_file = await song_service.get_song_data_file(name, quality)
+        if user_name is not None:
+            _prefetch_upcoming_songs_in_background(user_name, playlist, name, quality)
+        return _get_stream_content(
+            song_data_file,
+            range_header,
+            if_none_match_header,
+            if_range_header,
+            content_type=STREAMING_CONTENT_TYPE,
+        )
     except SongBadNameError as exception:
         stream_service_logger.exception(f"Bad Song Name Parameter: {name}")
         raise SongBadNameError from exception
@@ -121,9 +304,9 @@ async def get_stream_audio_data(range_header: str | None, name: str) -> StreamAu
             f"Invalid content range {range_header} for song {name}"
         )
         raise InvalidContentRangeStreamError from exception
-    except SongRepositoryError as exception:
+    except (SongRepositoryError, SongServiceError) as exception:
         stream_service_logger.exception(
-            f"Unexpected error in Song Repository getting song data: {name}"
+            f"Unexpected error in Song Service getting song data: {name}"
         )
         raise StreamServiceError from exception
     except Exception as exception:
@@ -131,3 +314,275 @@ async def get_stream_audio_data(range_header: str | None, name: str) -> StreamAu
             f"Unexpected error in Stream Service streaming song: {name}"
         )
         raise StreamServiceError from exception
+
+
+async def get_stream_hls_data(  # noqa: PLR0913
+    range_header: str | None,
+    name: str,
+    *,
+    segment: int | None = None,
+    version: str | None = None,
+    if_none_match_header: str | None = None,
+    if_range_header: str | None = None,
+) -> StreamAudioContent:
+    """Gets stream data of a song HLS playlist or segment. Segments requested with\
+        the version linked from the playlist never change and are cached forever,\
+        the playlist and unversioned segments are revalidated on every use
+
+    Args:
+        range_header: range content header [bytes=1000-1499]\
+         https://developer.mozilla.org/en-US/docs/Web/HTTP/Range_requests
+        name: song name
+        segment: segment number, None for the playlist
+        version: song data file id the segment was packaged from
+        if_none_match_header: If-None-Match header, the file is not sent if it matches
+        if_range_header: If-Range header, the range is ignored if it doesn't match
+
+    Raises:
+        SongBadNameError: name
+        SongNotFoundError: song not found
+        SongDataNotFoundError: song HLS playlist or segment doesn't exists
+        InvalidContentRangeStreamError: invalid content range for streaming
+        StreamServiceError: unexpected error while getting stream HLS data
+
+    Returns:
+        the needed HLS data for streaming
+    """
+    try:
+        song_hls_data_file = await song_service.get_song_hls_data_file(name, segment, version)
+        content_type = (
+            HLS_PLAYLIST_CONTENT_TYPE if segment is None else HLS_SEGMENT_CONTENT_TYPE
+        )
+        cache_control = (
+            HLS_IMMUTABLE_CACHE_CONTROL
+            if segment is not None and version is not None
+            else HLS_REVALIDATE_CACHE_CONTROL
+        )
+        return _get_stream_content(
+            song_hls_data_file,
+            range_header,
+            if_none_match_header,
+            if_range_header,
+            content_type=content_type,
+            cache_control=cache_control,
+        )
+    except SongBadNameError as exception:
+        stream_service_logger.exception(f"Bad Song Name Parameter: {name}")
+        raise SongBadNameError from exception
+    except SongNotFoundError as exception:
+        stream_service_logger.exception(f"Song not found: {name}")
+        raise SongNotFoundError from exception
+    except SongDataNotFoundError as exception:
+        stream_service_logger.exception(f"Song HLS data not found: {name}")
+        raise SongDataNotFoundError from exception
+    except InvalidContentRangeStreamError as exception:
+        stream_service_logger.exception(
+            f"Invalid content range {range_header} for song {name} HLS data"
+        )
+        raise InvalidContentRangeStreamError from exception
+    except (SongRepositoryError, SongServiceError) as exception:
+        stream_service_logger.exception(
+            f"Unexpected error in Song Service getting song HLS data: {name}"
+        )
+        raise StreamServiceError from exception
+    except Exception as exception:
+        stream_service_logger.exception(
+            f"Unexpected error in Stream Service streaming song HLS data: {name}"
+        )
+        raise StreamServiceError from exception
+
+
+def _get_stream_content(  # noqa: PLR0913
+    song_data_file: SongDataFileDAO,
+    range_header: str | None,
+    if_none_match_header: str | None,
+    if_range_header: str | None,
+    *,
+    content_type: str,
+    cache_control: str | None = None,
+) -> StreamAudioContent:
+    """Get the content for streaming a file according to the request headers
+
+    Args:
+        song_data_file: file to stream
+        range_header: range content header
+        if_none_match_header: If-None-Match header, the file is not sent if it matches
+        if_range_header: If-Range header, the range is ignored if it doesn't match
+        content_type: content type of the file
+        cache_control: Cache-Control header, not sent if None
+
+    Returns:
+        the content for streaming the file
+    """
+    name = song_data_file.name
+    file_size = song_data_file.length
+    entity_tag = _get_entity_tag(song_data_file)
+
+    headers = {
+        "content-type": content_type,
+        "accept-ranges": "bytes",
+        "content-encoding": "identity",
+        "etag": entity_tag,
+        "last-modified": format_datetime(_get_upload_date(song_data_file), usegmt=True),
+        "access-control-expose-headers": (
+            "Content-type, Accept-ranges, Content-length, Content-range, "
+            "Content-encoding, ETag, Last-Modified"
+        ),
+    }
+    if cache_control is not None:
+        headers["cache-control"] = cache_control
+
+    if if_none_match_header is not None and is_entity_tag_matched(
+        if_none_match_header, entity_tag
+    ):
+        stream_service_logger.info(f"File {name} not modified")
+        return StreamAudioContent(
+            song_data_file=song_data_file,
+            headers=headers,
+            ranges=[],
+            status_code=HTTP_304_NOT_MODIFIED,
+            content_type=content_type,
+        )
+
+    if range_header is None or (
+        if_range_header is not None
+        and not _is_if_range_satisfied(if_range_header, entity_tag, song_data_file)
+    ):
+        stream_service_logger.info(f"Streaming whole file {name}")
+        headers["Content-length"] = str(file_size)
+        return StreamAudioContent(
+            song_data_file=song_data_file,
+            headers=headers,
+            ranges=[(0, file_size - 1)] if file_size > 0 else [],
+            status_code=HTTP_200_OK,
+            content_type=content_type,
+        )
+
+    stream_service_logger.info(f"Streaming file {name}")
+    ranges = _get_ranges(range_header, file_size)
+
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        headers["Content-length"] = str(end - start + 1)
+        headers["Content-range"] = f"bytes {start}-{end}/{file_size}"
+        return StreamAudioContent(
+            song_data_file=song_data_file,
+            headers=headers,
+            ranges=ranges,
+            status_code=HTTP_206_PARTIAL_CONTENT,
+            content_type=content_type,
+        )
+
+    boundary = secrets.token_hex(16)
+    content_length = len(_get_multipart_end(boundary)) + sum(
+        len(_get_multipart_part_header(boundary, start, end, file_size, content_type))
+        + end
+        - start
+        + 1
+        + len(MULTIPART_LINE_BREAK)
+        for start, end in ranges
+    )
+    headers["content-type"] = f"multipart/byteranges; boundary={boundary}"
+    headers["Content-length"] = str(content_length)
+    return StreamAudioContent(
+        song_data_file=song_data_file,
+        headers=headers,
+        ranges=ranges,
+        status_code=HTTP_206_PARTIAL_CONTENT,
+        boundary=boundary,
+        content_type=content_type,
+    )
+
+
+def _prefetch_upcoming_songs_in_background(
+    user_name: str, playlist: str | None, name: str, quality: SongQuality | None
+) -> None:
+    """Prefetch the upcoming songs of the playlist the user is streaming from,\
+        cancelling the running prefetch of the user if the context changed
+
+    Args:
+        user_name: name of the user streaming the song
+        playlist: name of the playlist the song is streamed from, None cancels\
+            the running prefetch of the user
+        name: name of the streamed song
+        quality: rendition quality of the streamed song
+    """
+    prefetch_songs = get_song_prefetch_songs()
+    if prefetch_songs <= 0:
+        return
+    if playlist is None:
+        get_song_prefetch_scheduler().cancel(user_name)
+        return
+    get_song_prefetch_scheduler().schedule(
+        user_name,
+        f"{playlist}/{name}/{quality}",
+        _prefetch_upcoming_songs(user_name, playlist, name, quality, prefetch_songs),
+    )
+
+
+async def _prefetch_upcoming_songs(
+    user_name: str,
+    playlist: str,
+    name: str,
+    quality: SongQuality | None,
+    prefetch_songs: int,
+) -> None:
+    """Load the upcoming songs of a playlist into the song data caches one by one.\
+        Errors are logged since no request is waiting for the prefetch
+
+    Args:
+        user_name: name of the user streaming the song
+        playlist: name of the playlist the song is streamed from
+        name: name of the streamed song
+        quality: rendition quality of the streamed song
+        prefetch_songs: max number of songs to prefetch
+    """
+    try:
+        playlist_dto = await playlist_service.get_playlist(playlist)
+        playback_history = await base_user_service.get_user_playback_history_names(user_name)
+        upcoming_song_names = _get_upcoming_song_names(
+            playlist_dto.song_names, playback_history, name, prefetch_songs
+        )
+        for upcoming_song_name in upcoming_song_names:
+            await song_service.prefetch_song_data(upcoming_song_name, quality)
+    except Exception:
+        stream_service_logger.exception(
+            f"Unexpected error prefetching upcoming songs of playlist {playlist} "
+            f"for {user_name}"
+        )
+    else:
+        stream_service_logger.info(
+            f"Prefetched upcoming songs {upcoming_song_names} of playlist {playlist} "
+            f"for {user_name}"
+        )
+
+
+def _get_upcoming_song_names(
+    song_names: list[str], playback_history: list[str], name: str, count: int
+) -> list[str]:
+    """Get the songs most likely to be streamed after a song of a playlist.\
+        Songs following the streamed song come first in playlist order, wrapping around\
+        the end of the playlist. Songs the user played recently are moved last\
+        since a shuffled playlist doesn't repeat them until every song is played
+
+    Args:
+        song_names: playlist song names
+        playback_history: names of the songs recently played by the user
+        name: name of the streamed song
+        count: max number of songs
+
+    Returns:
+        the upcoming song names
+    """
+    if name in song_names:
+        index = song_names.index(name)
+        following_song_names = song_names[index + 1 :] + song_names[:index]
+    else:
+        following_song_names = song_names
+
+    recently_played = set(playback_history)
+    upcoming_song_names = [
+        song_name for song_name in dict.fromkeys(following_song_names) if song_name != name
+    ]
+    upcoming_song_names.sort(key=lambda song_name: song_name in recently_played)
+    return upcoming_song_names[:count]
@@ -193,6 +193,34 @@ async def add_song_to_artist(artist_name: str, song_name: str) -> None:
         raise ArtistRepositoryError from exception
 
 
+async def add_songs_to_artist(artist_name: str, song_names: list[str]) -> None:
+    """Add songs to artist in a single update
+
+    Args:
+        artist_name: artist name
+        song_names: song names
+
+    Raises:
+        ArtistRepositoryError: adding songs to artist
+    """
+    try:
+        collection = provider.get_artist_collection()
+        result = await collection.update_one(
+            {"name": artist_name}, {"$push": {"uploaded_songs": {"$each": song_names}}}
+        )
+        validate_user_update(result)
+    except BaseUserUpdateError as exception:
+        artist_repository_logger.exception(
+            f"Error updating artist {artist_name} with songs {song_names} in database"
+        )
+        raise ArtistRepositoryError from exception
+    except (ArtistRepositoryError, Exception) as exception:
+        artist_repository_logger.exception(
+            f"Unexpected error adding songs {song_names} to artist {artist_name} in database"
+        )
+        raise ArtistRepositoryError from exception
+
+
 async def delete_song_from_artist(artist_name: str, song_name: str) -> None:
     """Delete song from artist
 
@@ -379,6 +379,31 @@ async def add_song_to_artist(artist_name: str, song_name: str) -> None:
         raise ArtistServiceError from exception
 
 
+async def add_songs_to_artist(artist_name: str, song_names: list[str]) -> None:
+    """Add stored songs to an already validated artist in a single update
+
+    Args:
+        artist_name: artist name, already validated as an artist
+        song_names: song names of songs already stored
+
+    Raises:
+        ArtistServiceError: unexpected error adding songs to artist
+    """
+    try:
+        await artist_repository.add_songs_to_artist(artist_name, song_names)
+    except ArtistRepositoryError as exception:
+        artist_service_logger.exception(
+            f"Unexpected error adding songs {song_names} to artist {artist_name}"
+        )
+        raise ArtistServiceError from exception
+    except Exception as exception:
+        artist_service_logger.exception(
+            f"Unexpected error in Artist service adding songs {song_names} "
+            f"to artist {artist_name}"
+        )
+        raise ArtistServiceError from exception
+
+
 async def delete_song_from_artist(artist_name: str, song_name: str) -> None:
     """Remove song from artist
 
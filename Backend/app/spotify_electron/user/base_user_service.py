@@ -594,6 +594,50 @@ async def get_user_playlist_names(user_name: str) -> list[str]:
         return user_playlist_names
 
 
+async def get_user_playback_history_names(user_name: str) -> list[str]:
+    """Get user song playback history names
+
+    Args:
+        user_name: user name
+
+    Raises:
+        BaseUserBadNameError: name
+        BaseUserNotFoundError: user not found
+        BaseUserServiceError: unexpected error getting playback history from user
+
+    Returns:
+        the song names of the user playback history, from oldest to newest
+    """
+    try:
+        await base_user_service_validations.validate_user_name_parameter(user_name)
+
+        collection = await provider.get_user_associated_collection(user_name)
+
+        playback_history_names = await base_user_repository.get_user_playback_history_names(
+            user_name=user_name, collection=collection
+        )
+    except BaseUserBadNameError as exception:
+        base_users_service_logger.exception(f"Bad user Parameter: {user_name}")
+        raise BaseUserBadNameError from exception
+    except BaseUserNotFoundError as exception:
+        base_users_service_logger.exception(f"User not found: {user_name}")
+        raise BaseUserNotFoundError from exception
+    except BaseUserRepositoryError as exception:
+        base_users_service_logger.exception(
+            f"Unexpected error in User Repository getting playback history names "
+            f"from owner {user_name}"
+        )
+        raise BaseUserServiceError from exception
+    except Exception as exception:
+        base_users_service_logger.exception(
+            f"Unexpected error in User Service getting playback history names "
+            f"from owner {user_name}"
+        )
+        raise BaseUserServiceError from exception
+    else:
+        return playback_history_names
+
+
 async def get_user_playback_history(user_name: str) -> list[SongMetadataDTO]:
     """Get user song playback history
 
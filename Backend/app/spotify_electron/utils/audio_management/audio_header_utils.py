@@ -0,0 +1,126 @@
+"""Audio header utils for reading the duration of audio files from their headers\
+    without decoding them. Supports WAV, FLAC and MP3 files with a Xing, Info or VBRI frame
+"""
+
+from app.spotify_electron.utils.audio_management.mp3_utils import (
+    get_id3v2_tag_size,
+    get_mp3_info_frame_count,
+    is_mp3_info_frame,
+    iterate_mp3_frames,
+)
+
+AUDIO_HEADER_SIZE = 64 * 1024
+"""Bytes from the start of the file needed to read its duration from its headers"""
+
+RIFF_HEADER_SIZE = 12
+RIFF_CHUNK_HEADER_SIZE = 8
+WAV_BYTE_RATE_OFFSET = 8
+WAV_BYTE_RATE_SIZE = 4
+
+FLAC_TAG = b"fLaC"
+FLAC_METADATA_BLOCK_HEADER_SIZE = 4
+FLAC_STREAMINFO_BLOCK_TYPE = 0
+FLAC_STREAMINFO_SIZE = 34
+FLAC_STREAMINFO_SAMPLES_OFFSET = 10
+
+
+def get_audio_duration_from_header(header: bytes, file_size: int) -> float | None:
+    """Get the duration of an audio file from its headers
+
+    Args:
+        header: first bytes of the file, `AUDIO_HEADER_SIZE` bytes are enough\
+            for most files
+        file_size: file size in bytes
+
+    Returns:
+        the duration in seconds or None if the headers don't store it
+    """
+    if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+        return get_wav_duration(header, file_size)
+    id3v2_tag_size = get_id3v2_tag_size(header)
+    if header[id3v2_tag_size : id3v2_tag_size + 4] == FLAC_TAG:
+        return get_flac_duration(header, id3v2_tag_size)
+    return get_mp3_info_duration(header)
+
+
+def get_wav_duration(header: bytes, file_size: int) -> float | None:
+    """Get WAV file duration from the size of its data chunk and its byte rate
+
+    Args:
+        header: first bytes of the file
+        file_size: file size in bytes
+
+    Returns:
+        the duration in seconds or None if the headers are not complete
+    """
+    byte_rate = 0
+    offset = RIFF_HEADER_SIZE
+    while offset + RIFF_CHUNK_HEADER_SIZE <= len(header):
+        chunk_id = header[offset : offset + 4]
+        chunk_size = int.from_bytes(header[offset + 4 : offset + 8], "little")
+        chunk_start = offset + RIFF_CHUNK_HEADER_SIZE
+        if chunk_id == b"fmt ":
+            byte_rate_offset = chunk_start + WAV_BYTE_RATE_OFFSET
+            byte_rate = int.from_bytes(
+                header[byte_rate_offset : byte_rate_offset + WAV_BYTE_RATE_SIZE], "little"
+            )
+        elif chunk_id == b"data":
+            if byte_rate == 0:
+                return None
+            # Streamed WAV files may not know their data size when the header is written
+            data_size = min(chunk_size, file_size - chunk_start)
+            return data_size / byte_rate
+        offset = chunk_start + chunk_size + chunk_size % 2
+    return None
+
+
+def get_flac_duration(header: bytes, offset: int = 0) -> float | None:
+    """Get FLAC file duration from the sample rate and total samples of its\
+        STREAMINFO metadata block
+
+    Args:
+        header: first bytes of the file
+        offset: start byte of the FLAC stream
+
+    Returns:
+        the duration in seconds or None if the total samples are unknown
+    """
+    block_offset = offset + len(FLAC_TAG)
+    block_header = header[block_offset : block_offset + FLAC_METADATA_BLOCK_HEADER_SIZE]
+    if len(block_header) < FLAC_METADATA_BLOCK_HEADER_SIZE or (
+        block_header[0] & 0x7F != FLAC_STREAMINFO_BLOCK_TYPE
+    ):
+        return None
+
+    streaminfo_offset = block_offset + FLAC_METADATA_BLOCK_HEADER_SIZE
+    streaminfo = header[streaminfo_offset : streaminfo_offset + FLAC_STREAMINFO_SIZE]
+    if len(streaminfo) < FLAC_STREAMINFO_SIZE:
+        return None
+
+    # Sample rate (20 bits), channels (3 bits), bits per sample (5 bits), samples (36 bits)
+    fields = int.from_bytes(
+        streaminfo[FLAC_STREAMINFO_SAMPLES_OFFSET : FLAC_STREAMINFO_SAMPLES_OFFSET + 8], "big"
+    )
+    sample_rate = fields >> 44
+    total_samples = fields & 0xFFFFFFFFF
+    if sample_rate == 0 or total_samples == 0:
+        return None
+    return total_samples / sample_rate
+
+
+def get_mp3_info_duration(header: bytes) -> float | None:
+    """Get MP3 file duration from the frame count stored in its Xing, Info or VBRI frame
+
+    Args:
+        header: first bytes of the file
+
+    Returns:
+        the duration in seconds or None if the file has no information frame
+    """
+    first_frame = next(iterate_mp3_frames(header), None)
+    if first_frame is None or not is_mp3_info_frame(header, first_frame):
+        return None
+    frame_count = get_mp3_info_frame_count(header, first_frame)
+    if not frame_count:
+        return None
+    return frame_count * first_frame.duration
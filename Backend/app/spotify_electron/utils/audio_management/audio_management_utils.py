@@ -1,65 +1,398 @@
 """Audio management utils"""
 
-import base64
+import hashlib
 import io
+from asyncio import sleep, to_thread
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass
+from typing import BinaryIO
 
 import librosa
+import numpy as np
+import soundfile
 
 from app.exceptions.base_exceptions_schema import SpotifyElectronError
 from app.logging.logging_constants import LOGGING_AUDIO_MANAGEMENT_UTILS
 from app.logging.logging_schema import SpotifyElectronLogger
+from app.spotify_electron.utils.audio_management.audio_header_utils import (
+    AUDIO_HEADER_SIZE,
+    get_audio_duration_from_header,
+)
+from app.spotify_electron.utils.audio_management.hls_utils import (
+    HlsSegment,
+    get_hls_segments,
+)
+from app.spotify_electron.utils.audio_management.loudness_utils import (
+    SongLoudness,
+    get_loudness,
+)
+from app.spotify_electron.utils.audio_management.mp3_utils import Mp3DurationReader
+from app.spotify_electron.utils.audio_management.waveform_utils import (
+    WAVEFORM_PEAKS,
+    get_waveform_peaks,
+)
+from app.spotify_electron.utils.process_pool.process_pool_utils import BoundedProcessPool
 
 audio_management_utils_logger = SpotifyElectronLogger(
     LOGGING_AUDIO_MANAGEMENT_UTILS
 ).get_logger()
 
+FILE_CHUNK_SIZE = 1024 * 1024
+"""Bytes read at once from uploaded files"""
 
-def get_song_duration_seconds(name: str, file: bytes) -> int:
-    """Get song duration
+DURATION_READER_SLICE_SIZE = 64 * 1024
+"""Bytes of a chunk read by the song duration reader before letting other tasks run"""
+
+
+class SongDurationReader:
+    """Reads the duration of a song file while its chunks are read. The duration is read\
+        from the file headers when they store it and MP3 files without an information\
+        frame are measured by reading their frame headers. Only the file headers and\
+        the MP3 frame being read are kept, so the memory used doesn't depend on the\
+        file size
+    """
+
+    def __init__(self) -> None:
+        """Init song duration reader"""
+        self._header = bytearray()
+        self._mp3_duration_reader: Mp3DurationReader | None = Mp3DurationReader()
+        self._size = 0
+
+    @property
+    def needs_chunks(self) -> bool:
+        """Whether the content of the next chunks is needed to read the duration"""
+        return len(self._header) < AUDIO_HEADER_SIZE or self._mp3_duration_reader is not None
+
+    def update(self, chunk: bytes) -> None:
+        """Add the next chunk of the file
+
+        Args:
+            chunk: file chunk
+        """
+        self._size += len(chunk)
+        if len(self._header) < AUDIO_HEADER_SIZE:
+            self._header += chunk[: AUDIO_HEADER_SIZE - len(self._header)]
+            if len(self._header) == AUDIO_HEADER_SIZE and self._get_header_duration():
+                # Headers store the duration, reading the frames is not needed anymore
+                self._mp3_duration_reader = None
+        if self._mp3_duration_reader is not None:
+            self._mp3_duration_reader.update(chunk)
+
+    def get_duration(self) -> float | None:
+        """Get the file duration once every chunk was read
+
+        Returns:
+            the duration in seconds, 0 for empty files or None if the file has to be\
+                decoded to know it
+        """
+        if header_duration := self._get_header_duration():
+            return header_duration
+        if self._mp3_duration_reader is not None and (
+            mp3_duration := self._mp3_duration_reader.get_duration()
+        ):
+            return mp3_duration
+        if self._size:
+            return None
+        return 0
+
+    def _get_header_duration(self) -> float | None:
+        """Get the duration from the file headers read so far
+
+        Returns:
+            the duration in seconds or None if the headers don't store it
+        """
+        return get_audio_duration_from_header(bytes(self._header), self._size)
+
+
+def decode_song_duration(name: str, file: bytes) -> float:
+    """Get song duration decoding the song file.\
+        Runs CPU bound work so it's meant to be executed in a separate process
 
     Args:
         name: song name
         file: song file
 
     Returns:
-        the duration in seconds, defaulted to 0 if not a song file
+        the duration in seconds, 0 if not a song file
     """
     try:
-        audio_data, sample_rate = librosa.load(io.BytesIO(file), sr=None)
-        duration = librosa.get_duration(y=audio_data, sr=sample_rate)
-
+        return soundfile.info(io.BytesIO(file)).duration
     except Exception:
         # If it's not a sound file
         audio_management_utils_logger.warning(
             f"Cannot get song {name} duration, setting duration to default"
         )
-        duration = 0
+        return 0
+
+
+class SongFileDigest:
+    """Computes the SHA-256 hash and the duration of a song file while its chunks\
+        are read, so the file is processed in a single pass without loading it in memory.\
+        File headers are read on the event loop by small slices so other requests aren't\
+        delayed, only the files whose duration cannot be read from their chunks are read\
+        whole and decoded in the given process pool as last resort
+    """
+
+    def __init__(
+        self, name: str, file: BinaryIO, analysis_pool: BoundedProcessPool | None = None
+    ) -> None:
+        """Init song file digest
+
+        Args:
+            name: song name
+            file: song file, read again only if its duration cannot be computed\
+                from its chunks
+            analysis_pool: process pool decoding the files whose duration cannot be\
+                read from their chunks, None decodes them in the calling thread
+        """
+        self._name = name
+        self._file = file
+        self._analysis_pool = analysis_pool
+        self._sha256 = hashlib.sha256()
+        self._duration_reader = SongDurationReader()
+        self._size = 0
+
+    @property
+    def sha256(self) -> str:
+        """Hex SHA-256 hash of the chunks read"""
+        return self._sha256.hexdigest()
+
+    @property
+    def size(self) -> int:
+        """Size in bytes of the chunks read"""
+        return self._size
+
+    async def update(self, chunk: bytes) -> None:
+        """Add the next chunk of the file
+
+        Args:
+            chunk: file chunk
+        """
+        self._size += len(chunk)
+        self._sha256.update(chunk)
+        if not self._duration_reader.needs_chunks:
+            self._duration_reader.update(chunk)
+            return
+        for start in range(0, len(chunk), DURATION_READER_SLICE_SIZE):
+            self._duration_reader.update(chunk[start : start + DURATION_READER_SLICE_SIZE])
+            await sleep(0)
+
+    async def get_duration_seconds(self) -> int:
+        """Get song duration once every chunk was read
+
+        Returns:
+            the duration in seconds, defaulted to 0 if not a song file
+        """
+        duration = self._duration_reader.get_duration()
+        if duration is None:
+            file = await to_thread(self._read_file)
+            duration = await self._decode_duration(file)
+
+        audio_management_utils_logger.debug(
+            f"Song file {self._name} has a {duration} seconds duration"
+        )
+        return int(duration)
+
+    async def _decode_duration(self, file: bytes) -> float:
+        """Decode the song duration in the analysis process pool if there's one
+
+        Args:
+            file: song file
+
+        Returns:
+            the duration in seconds, 0 if not a song file
+        """
+        if self._analysis_pool is None:
+            return decode_song_duration(self._name, file)
+        return await self._analysis_pool.run(decode_song_duration, self._name, file)
+
+    def _read_file(self) -> bytes:
+        """Read the whole song file
+
+        Returns:
+            the song file bytes
+        """
+        self._file.seek(0)
+        return self._file.read()
+
+
+async def iterate_file_chunks(
+    file: BinaryIO, chunk_size: int = FILE_CHUNK_SIZE
+) -> AsyncGenerator[bytes, None]:
+    """Iterate over the chunks of a file from its start. Blocking reads run outside\
+        the event loop
+
+    Args:
+        file: file
+        chunk_size: max bytes of each chunk
+
+    Yields:
+        the file chunks
+    """
+    await to_thread(file.seek, 0)
+    while chunk := await to_thread(file.read, chunk_size):
+        yield chunk
+
+
+@dataclass
+class SongAnalysis:
+    """Song features computed from its decoded audio"""
+
+    waveform: bytes
+    """Waveform peaks, empty if the song file cannot be decoded"""
+    loudness: SongLoudness | None
+    """Loudness measures, None if the song file cannot be decoded or is silent"""
+
+
+@dataclass
+class SongProcessing:
+    """Song analysis along with its renditions and HLS segments"""
 
-    audio_management_utils_logger.debug(f"Song file {name} has a {duration} seconds duration")
-    return int(duration)
+    analysis: SongAnalysis
+    """Song analysis"""
+    renditions: dict[str, bytes]
+    """Encoded renditions by name, empty if they were not requested or the song file\
+        cannot be decoded"""
+    hls_segments: list[HlsSegment]
+    """HLS segments, empty if they were not requested or the song file is not an MP3 file"""
 
 
-def encode_file(name: str, file: bytes) -> str:
-    """Encode file into a string
+def analyze_song(name: str, file: bytes) -> SongAnalysis:
+    """Decode song once and compute its waveform peaks and loudness.\
+        Runs CPU bound work so it's meant to be executed in a separate process
 
     Args:
-        name: file name
-        file: file bytes
+        name: song name
+        file: song file
+
+    Returns:
+        the song analysis
+    """
+    decoded_song = _decode_song(name, file)
+    if decoded_song is None:
+        return SongAnalysis(waveform=b"", loudness=None)
+    return _analyze_audio_data(name, *decoded_song)
+
+
+def process_song(
+    name: str, file: bytes, compression_levels: dict[str, float], hls_segment_seconds: float
+) -> SongProcessing:
+    """Decode song once to analyze it and transcode it into MP3 renditions with\
+        different compression levels, then split it into HLS segments.\
+        Runs CPU bound work so it's meant to be executed in a separate process
+
+    Args:
+        name: song name
+        file: song file
+        compression_levels: compression level between 0 and 1 of each rendition,\
+            higher levels produce lower bitrates. Empty to not create renditions
+        hls_segment_seconds: target duration of each HLS segment, 0 to not create them
 
-    Raises:
-        EncodingFileError: encoding file
+    Returns:
+        the song processing, renditions that are not smaller than the song file\
+            are discarded
+    """
+    analysis = SongAnalysis(waveform=b"", loudness=None)
+    renditions: dict[str, bytes] = {}
+    decoded_song = _decode_song(name, file)
+    if decoded_song is not None:
+        analysis = _analyze_audio_data(name, *decoded_song)
+        renditions = _get_song_renditions(name, file, *decoded_song, compression_levels)
+
+    hls_segments: list[HlsSegment] = []
+    if hls_segment_seconds > 0:
+        hls_segments = get_hls_segments(name, file, hls_segment_seconds)
+
+    return SongProcessing(analysis=analysis, renditions=renditions, hls_segments=hls_segments)
+
+
+def _decode_song(name: str, file: bytes) -> tuple[np.ndarray, int] | None:
+    """Decode song keeping its channels and sample rate
+
+    Args:
+        name: song name
+        file: song file
 
     Returns:
-        the encoded str
+        the audio data with a row per channel and its sample rate, None if the song\
+            file cannot be decoded
     """
-    # b'ZGF0YSB0byBiZSBlbmNvZGVk'
     try:
-        return str(base64.b64encode(file))
-    except Exception as exception:
-        audio_management_utils_logger.exception(
-            f"Song File with name {name} cannot be encoded"
+        audio_data, sample_rate = librosa.load(io.BytesIO(file), sr=None, mono=False)
+    except Exception:
+        audio_management_utils_logger.warning(
+            f"Cannot decode song {name}, waveform, loudness and renditions won't be created"
+        )
+        return None
+    return audio_data, int(sample_rate)
+
+
+def _analyze_audio_data(name: str, audio_data: np.ndarray, sample_rate: int) -> SongAnalysis:
+    """Compute waveform peaks and loudness of decoded audio
+
+    Args:
+        name: song name
+        audio_data: audio data with a row per channel
+        sample_rate: audio sample rate
+
+    Returns:
+        the song analysis
+    """
+    mono_audio_data = audio_data if audio_data.ndim == 1 else audio_data.mean(axis=0)
+    song_analysis = SongAnalysis(
+        waveform=get_waveform_peaks(mono_audio_data, WAVEFORM_PEAKS).tobytes(),
+        loudness=get_loudness(audio_data, sample_rate),
+    )
+    audio_management_utils_logger.debug(f"Song {name} analyzed: {song_analysis.loudness}")
+    return song_analysis
+
+
+def _get_song_renditions(
+    name: str,
+    file: bytes,
+    audio_data: np.ndarray,
+    sample_rate: int,
+    compression_levels: dict[str, float],
+) -> dict[str, bytes]:
+    """Encode decoded audio into MP3 renditions with different compression levels
+
+    Args:
+        name: song name
+        file: song file
+        audio_data: audio data with a row per channel
+        sample_rate: audio sample rate
+        compression_levels: compression level between 0 and 1 of each rendition,\
+            higher levels produce lower bitrates
+
+    Returns:
+        the encoded renditions, renditions that are not smaller than the song file\
+            are discarded
+    """
+    renditions: dict[str, bytes] = {}
+    for rendition_name, compression_level in compression_levels.items():
+        rendition_file = io.BytesIO()
+        soundfile.write(
+            rendition_file,
+            audio_data.T,
+            sample_rate,
+            format="MP3",
+            subtype="MPEG_LAYER_III",
+            compression_level=compression_level,
+            bitrate_mode="CONSTANT",
+        )
+        rendition = rendition_file.getvalue()
+        if len(rendition) >= len(file):
+            audio_management_utils_logger.debug(
+                f"Discarding song {name} rendition {rendition_name} bigger than the song file"
+            )
+            continue
+        renditions[rendition_name] = rendition
+
+    if compression_levels:
+        audio_management_utils_logger.debug(
+            f"Song file {name} transcoded into renditions {list(renditions)}"
         )
-        raise EncodingFileError from exception
+    return renditions
 
 
 class EncodingFileError(SpotifyElectronError):
@@ -0,0 +1,150 @@
+"""HLS utils for packaging MP3 files into HTTP Live Streaming segments and playlists.\
+    See https://datatracker.ietf.org/doc/html/rfc8216
+"""
+
+import math
+from dataclasses import dataclass
+
+from app.logging.logging_constants import LOGGING_HLS_UTILS
+from app.logging.logging_schema import SpotifyElectronLogger
+from app.spotify_electron.utils.audio_management.mp3_utils import (
+    is_mp3_info_frame,
+    iterate_mp3_frames,
+)
+
+hls_utils_logger = SpotifyElectronLogger(LOGGING_HLS_UTILS).get_logger()
+
+HLS_PLAYLIST_CONTENT_TYPE = "application/vnd.apple.mpegurl"
+HLS_TIMESTAMP_OWNER = b"com.apple.streaming.transportStreamTimestamp\x00"
+HLS_TIMESTAMP_CLOCK_RATE = 90_000
+HLS_TIMESTAMP_MAX = 2**33
+
+
+@dataclass
+class HlsSegment:
+    """HLS packed audio segment"""
+
+    duration: float
+    """Segment duration in seconds"""
+    data: bytes
+    """Segment data"""
+
+
+def get_hls_segments(name: str, file: bytes, segment_seconds: float) -> list[HlsSegment]:
+    """Split an MP3 file into packed audio segments of about the same duration.\
+        Segments are cut on frame boundaries so they don't need to be encoded again.\
+        Each segment starts with the ID3 timestamp tag required by HLS packed audio
+
+    Args:
+        name: song name
+        file: song file
+        segment_seconds: target duration of each segment
+
+    Returns:
+        the segments, empty if the file is not an MP3 file
+    """
+    data = memoryview(file)
+    segments: list[HlsSegment] = []
+    segment_start_seconds = 0.0
+    segment_duration = 0.0
+    segment_start = segment_end = -1
+
+    for frame in iterate_mp3_frames(file):
+        if is_mp3_info_frame(file, frame):
+            continue
+        if segment_start == -1:
+            segment_start = frame.offset
+        elif frame.offset != segment_end or segment_duration >= segment_seconds:
+            segments.append(
+                _get_hls_segment(
+                    data, segment_start, segment_end, segment_start_seconds, segment_duration
+                )
+            )
+            segment_start_seconds += segment_duration
+            segment_duration = 0.0
+            segment_start = frame.offset
+        segment_end = frame.offset + frame.length
+        segment_duration += frame.duration
+
+    if segment_start != -1:
+        segments.append(
+            _get_hls_segment(
+                data, segment_start, segment_end, segment_start_seconds, segment_duration
+            )
+        )
+
+    hls_utils_logger.debug(f"Song file {name} split into {len(segments)} HLS segments")
+    return segments
+
+
+def get_hls_playlist(segment_durations: list[float], segment_uris: list[str]) -> str:
+    """Get the media playlist of a whole song
+
+    Args:
+        segment_durations: duration in seconds of each segment
+        segment_uris: URI of each segment relative to the playlist
+
+    Returns:
+        the M3U8 playlist
+    """
+    target_duration = math.ceil(max(segment_durations, default=0))
+    lines = [
+        "#EXTM3U",
+        "#EXT-X-VERSION:3",
+        f"#EXT-X-TARGETDURATION:{target_duration}",
+        "#EXT-X-MEDIA-SEQUENCE:0",
+        "#EXT-X-PLAYLIST-TYPE:VOD",
+        "#EXT-X-INDEPENDENT-SEGMENTS",
+    ]
+    for segment_duration, segment_uri in zip(segment_durations, segment_uris, strict=True):
+        lines.extend((f"#EXTINF:{segment_duration:.3f},", segment_uri))
+    lines.append("#EXT-X-ENDLIST")
+    return "\n".join(lines) + "\n"
+
+
+def _get_hls_segment(
+    data: memoryview, start: int, end: int, start_seconds: float, duration: float
+) -> HlsSegment:
+    """Get segment with the frames between start and end bytes
+
+    Args:
+        data: song file
+        start: first frame start byte
+        end: last frame end byte
+        start_seconds: segment start time in the song
+        duration: segment duration in seconds
+
+    Returns:
+        the segment
+    """
+    return HlsSegment(
+        duration=duration, data=_get_hls_timestamp_tag(start_seconds) + bytes(data[start:end])
+    )
+
+
+def _get_hls_timestamp_tag(start_seconds: float) -> bytes:
+    """Get the ID3 tag with the segment start timestamp used to synchronize\
+        HLS packed audio segments
+
+    Args:
+        start_seconds: segment start time in the song
+
+    Returns:
+        the ID3v2.4 tag
+    """
+    timestamp = round(start_seconds * HLS_TIMESTAMP_CLOCK_RATE) % HLS_TIMESTAMP_MAX
+    frame_data = HLS_TIMESTAMP_OWNER + timestamp.to_bytes(8, "big")
+    frame = b"PRIV" + _get_syncsafe_integer(len(frame_data)) + b"\x00\x00" + frame_data
+    return b"ID3\x04\x00\x00" + _get_syncsafe_integer(len(frame)) + frame
+
+
+def _get_syncsafe_integer(value: int) -> bytes:
+    """Get ID3 syncsafe integer, an integer that uses 7 bits per byte
+
+    Args:
+        value: integer
+
+    Returns:
+        the 4 bytes syncsafe integer
+    """
+    return bytes((value >> shift) & 0x7F for shift in (21, 14, 7, 0))
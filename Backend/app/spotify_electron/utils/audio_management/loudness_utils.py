@@ -0,0 +1,181 @@
+"""Loudness utils for measuring the integrated loudness and peak of songs and the gain\
+    players apply to normalize them. Loudness is measured as in ITU-R BS.1770 and\
+    EBU R128, see https://www.itu.int/rec/R-REC-BS.1770
+"""
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.signal import lfilter
+
+LOUDNESS_TARGET_LUFS = -14.0
+"""Loudness songs are normalized to"""
+LOUDNESS_MAX_PEAK_DBFS = -1.0
+"""Max peak of a normalized song, the gain is reduced so songs don't clip"""
+LOUDNESS_BLOCK_SECONDS = 0.4
+"""Duration of the gating blocks"""
+LOUDNESS_BLOCK_STEP_SECONDS = 0.1
+"""Distance between the start of consecutive gating blocks, 75% overlap"""
+LOUDNESS_ABSOLUTE_GATE_LUFS = -70.0
+"""Blocks quieter than the absolute gate are ignored"""
+LOUDNESS_RELATIVE_GATE_LU = -10.0
+"""Blocks quieter than the relative gate below the ungated loudness are ignored"""
+LOUDNESS_OFFSET = -0.691
+"""Offset of the loudness of a block from the energy of its K-weighted signal"""
+
+
+@dataclass
+class SongLoudness:
+    """Song loudness measures"""
+
+    integrated_lufs: float
+    """Integrated loudness in LUFS"""
+    peak_dbfs: float
+    """Sample peak in dBFS"""
+    gain_db: float
+    """Gain in dB that normalizes the song loudness without clipping"""
+
+
+def get_loudness(signal: np.ndarray, sample_rate: int) -> SongLoudness | None:
+    """Measure the integrated loudness and sample peak of a signal and its\
+        normalization gain
+
+    Args:
+        signal: signal with shape (channels, samples) or (samples,) for mono signals,\
+            with samples between -1 and 1
+        sample_rate: signal sample rate
+
+    Returns:
+        the loudness measures, None if the signal is silent
+    """
+    channels = np.atleast_2d(signal).astype(np.float64)
+    peak = float(np.max(np.abs(channels), initial=0))
+    if peak == 0:
+        return None
+
+    block_energies = _get_block_energies(_k_weight(channels, sample_rate), sample_rate)
+    block_loudness = _get_loudness_from_energy(block_energies)
+    gated_energies = block_energies[block_loudness > LOUDNESS_ABSOLUTE_GATE_LUFS]
+    if gated_energies.size == 0:
+        return None
+
+    relative_gate = _get_loudness_from_energy(gated_energies.mean()) + (
+        LOUDNESS_RELATIVE_GATE_LU
+    )
+    gated_energies = gated_energies[_get_loudness_from_energy(gated_energies) > relative_gate]
+    integrated_lufs = float(_get_loudness_from_energy(gated_energies.mean()))
+
+    peak_dbfs = 20 * math.log10(peak)
+    gain_db = min(
+        LOUDNESS_TARGET_LUFS - integrated_lufs,
+        LOUDNESS_MAX_PEAK_DBFS - peak_dbfs,
+    )
+    return SongLoudness(
+        integrated_lufs=round(integrated_lufs, 2),
+        peak_dbfs=round(peak_dbfs, 2),
+        gain_db=round(gain_db, 2),
+    )
+
+
+def _k_weight(channels: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Apply the K-weighting filter of BS.1770 to every channel, a high shelf that\
+        models the head followed by a high pass
+
+    Args:
+        channels: signal with shape (channels, samples)
+        sample_rate: signal sample rate
+
+    Returns:
+        the K-weighted signal
+    """
+    shelf_b, shelf_a = _get_high_shelf_coefficients(sample_rate)
+    high_pass_b, high_pass_a = _get_high_pass_coefficients(sample_rate)
+    shelved = lfilter(shelf_b, shelf_a, channels, axis=-1)
+    k_weighted = lfilter(high_pass_b, high_pass_a, shelved, axis=-1)
+    # lfilter only returns the filter state along with the signal when it's given one
+    assert isinstance(k_weighted, np.ndarray)
+    return k_weighted
+
+
+def _get_block_energies(channels: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Get the mean square of every gating block summed over the channels. Signals\
+        shorter than a block are measured as a single block
+
+    Args:
+        channels: K-weighted signal with shape (channels, samples)
+        sample_rate: signal sample rate
+
+    Returns:
+        the energy of each block
+    """
+    samples = channels.shape[-1]
+    block_size = min(round(LOUDNESS_BLOCK_SECONDS * sample_rate), samples)
+    block_step = max(round(LOUDNESS_BLOCK_STEP_SECONDS * sample_rate), 1)
+    cumulative_energy = np.zeros((channels.shape[0], samples + 1))
+    np.cumsum(channels**2, axis=-1, out=cumulative_energy[:, 1:])
+
+    block_starts = np.arange(0, samples - block_size + 1, block_step)
+    block_energies = (
+        cumulative_energy[:, block_starts + block_size] - cumulative_energy[:, block_starts]
+    ) / block_size
+    return block_energies.sum(axis=0)
+
+
+def _get_loudness_from_energy(energy: np.ndarray | float) -> np.ndarray:
+    """Get the loudness of K-weighted energies
+
+    Args:
+        energy: K-weighted energies summed over the channels
+
+    Returns:
+        the loudness in LUFS, -inf for silence
+    """
+    with np.errstate(divide="ignore"):
+        return LOUDNESS_OFFSET + 10 * np.log10(energy)
+
+
+def _get_high_shelf_coefficients(sample_rate: int) -> tuple[list[float], list[float]]:
+    """Get the biquad coefficients of the K-weighting high shelf for a sample rate.\
+        Shelf parameters reproduce the 48 kHz coefficients of BS.1770
+
+    Args:
+        sample_rate: signal sample rate
+
+    Returns:
+        the numerator and denominator coefficients
+    """
+    gain_db = 3.999843853973347
+    quality = 0.7071752369554196
+    center_frequency = 1681.974450955533
+
+    k = math.tan(math.pi * center_frequency / sample_rate)
+    high_gain = 10 ** (gain_db / 20)
+    band_gain = high_gain**0.4996667741545416
+    numerator = [
+        high_gain + band_gain * k / quality + k * k,
+        2 * (k * k - high_gain),
+        high_gain - band_gain * k / quality + k * k,
+    ]
+    denominator = [1 + k / quality + k * k, 2 * (k * k - 1), 1 - k / quality + k * k]
+    return numerator, denominator
+
+
+def _get_high_pass_coefficients(sample_rate: int) -> tuple[list[float], list[float]]:
+    """Get the biquad coefficients of the K-weighting high pass for a sample rate.\
+        Filter parameters reproduce the 48 kHz coefficients of BS.1770
+
+    Args:
+        sample_rate: signal sample rate
+
+    Returns:
+        the numerator and denominator coefficients
+    """
+    quality = 0.5003270373238773
+    center_frequency = 38.13547087602444
+
+    k = math.tan(math.pi * center_frequency / sample_rate)
+    numerator = [1.0, -2.0, 1.0]
+    denominator = [1 + k / quality + k * k, 2 * (k * k - 1), 1 - k / quality + k * k]
+    # The numerator isn't scaled by the first denominator coefficient as in BS.1770
+    return numerator, [coefficient / denominator[0] for coefficient in denominator]
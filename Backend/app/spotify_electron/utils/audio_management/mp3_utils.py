@@ -0,0 +1,372 @@
+"""MP3 utils for reading the MPEG audio frames of a file without decoding them"""
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+ID3V2_HEADER_SIZE = 10
+ID3V2_FOOTER_FLAG = 0x10
+ID3V1_TAG = b"TAG"
+ID3V1_TAG_SIZE = 128
+FRAME_HEADER_SIZE = 4
+FRAME_SYNC = 0xFFE00000
+
+MPEG_VERSION_1 = 0b11
+MPEG_VERSION_2 = 0b10
+MPEG_VERSION_2_5 = 0b00
+LAYER_1 = 0b11
+LAYER_2 = 0b10
+LAYER_3 = 0b01
+MONO_CHANNEL_MODE = 0b11
+RESERVED_SAMPLE_RATE_INDEX = 0b11
+FREE_BITRATE_INDEX = 0
+BAD_BITRATE_INDEX = 0b1111
+
+BITRATES_KBPS: dict[tuple[bool, int], tuple[int, ...]] = {
+    (True, LAYER_1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, LAYER_2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, LAYER_3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, LAYER_1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, LAYER_2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, LAYER_3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+"""Bitrates by (is MPEG version 1, layer) and bitrate index"""
+SAMPLE_RATES: dict[int, tuple[int, int, int]] = {
+    MPEG_VERSION_1: (44100, 48000, 32000),
+    MPEG_VERSION_2: (22050, 24000, 16000),
+    MPEG_VERSION_2_5: (11025, 12000, 8000),
+}
+"""Sample rates by MPEG version and sample rate index"""
+LAYER_3_SIDE_INFO_SIZES: dict[tuple[bool, bool], int] = {
+    (True, False): 32,
+    (True, True): 17,
+    (False, False): 17,
+    (False, True): 9,
+}
+"""Layer III side information sizes by (is MPEG version 1, is mono)"""
+INFO_FRAME_TAGS = (b"Xing", b"Info")
+VBRI_FRAME_TAG = b"VBRI"
+VBRI_FRAME_TAG_OFFSET = 36
+VBRI_FRAME_COUNT_OFFSET = 14
+XING_FRAME_COUNT_FLAG = 0x1
+FRAME_COUNT_SIZE = 4
+
+
+@dataclass
+class Mp3Frame:
+    """MPEG audio frame"""
+
+    offset: int
+    """Frame start byte in the file"""
+    length: int
+    """Frame size in bytes"""
+    sample_rate: int
+    """Sample rate of the frame"""
+    samples: int
+    """Number of samples per channel of the frame"""
+    side_info_size: int
+    """Size in bytes of the Layer III side information after the header, 0 for\
+        other layers"""
+
+    @property
+    def duration(self) -> float:
+        """Frame duration in seconds"""
+        return self.samples / self.sample_rate
+
+
+def get_id3v2_tag_size(data: bytes | bytearray | memoryview) -> int:
+    """Get size of the ID3v2 tag at the start of the file
+
+    Args:
+        data: file data
+
+    Returns:
+        the tag size in bytes, 0 if the file doesn't start with an ID3v2 tag
+    """
+    if len(data) < ID3V2_HEADER_SIZE or bytes(data[:3]) != b"ID3":
+        return 0
+    size = 0
+    for byte in data[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    if data[5] & ID3V2_FOOTER_FLAG:
+        size += ID3V2_HEADER_SIZE
+    return ID3V2_HEADER_SIZE + size
+
+
+def parse_mp3_frame_header(
+    data: bytes | bytearray | memoryview, offset: int
+) -> Mp3Frame | None:
+    """Parse the MPEG audio frame header at an offset
+
+    Args:
+        data: file data
+        offset: header start byte
+
+    Returns:
+        the frame or None if there is no valid frame header at the offset
+    """
+    if offset + FRAME_HEADER_SIZE > len(data):
+        return None
+    header = int.from_bytes(data[offset : offset + FRAME_HEADER_SIZE], "big")
+    if header & FRAME_SYNC != FRAME_SYNC:
+        return None
+
+    version = (header >> 19) & 0b11
+    layer = (header >> 17) & 0b11
+    bitrate_index = (header >> 12) & 0b1111
+    sample_rate_index = (header >> 10) & 0b11
+    padding = (header >> 9) & 0b1
+    channel_mode = (header >> 6) & 0b11
+    if (
+        version not in SAMPLE_RATES
+        or layer == 0
+        or sample_rate_index == RESERVED_SAMPLE_RATE_INDEX
+        or bitrate_index in {FREE_BITRATE_INDEX, BAD_BITRATE_INDEX}
+    ):
+        return None
+
+    is_version_1 = version == MPEG_VERSION_1
+    bitrate = BITRATES_KBPS[is_version_1, layer][bitrate_index] * 1000
+    sample_rate = SAMPLE_RATES[version][sample_rate_index]
+
+    if layer == LAYER_1:
+        samples = 384
+        length = (12 * bitrate // sample_rate + padding) * 4
+    elif layer == LAYER_2 or is_version_1:
+        samples = 1152
+        length = 144 * bitrate // sample_rate + padding
+    else:
+        samples = 576
+        length = 72 * bitrate // sample_rate + padding
+
+    side_info_size = 0
+    if layer == LAYER_3:
+        is_mono = channel_mode == MONO_CHANNEL_MODE
+        side_info_size = LAYER_3_SIDE_INFO_SIZES[is_version_1, is_mono]
+
+    return Mp3Frame(
+        offset=offset,
+        length=length,
+        sample_rate=sample_rate,
+        samples=samples,
+        side_info_size=side_info_size,
+    )
+
+
+def iterate_mp3_frames(data: bytes | bytearray) -> Iterator[Mp3Frame]:
+    """Iterate over the MPEG audio frames of a file. Leading tags and junk bytes\
+        between frames are skipped, a frame is only accepted when the next frame\
+        is valid too or the file ends after it
+
+    Args:
+        data: file data
+
+    Yields:
+        the frames in order
+    """
+    offset = get_id3v2_tag_size(data)
+    data_size = len(data)
+    while offset + FRAME_HEADER_SIZE <= data_size:
+        if (
+            bytes(data[offset : offset + 3]) == ID3V1_TAG
+            and data_size - offset <= ID3V1_TAG_SIZE
+        ):
+            return
+
+        frame = parse_mp3_frame_header(data, offset)
+        if frame is None or offset + frame.length > data_size:
+            offset = _find_frame_sync(data, offset + 1)
+            continue
+
+        next_offset = offset + frame.length
+        if (
+            next_offset + FRAME_HEADER_SIZE <= data_size
+            and bytes(data[next_offset : next_offset + 3]) != ID3V1_TAG
+            and parse_mp3_frame_header(data, next_offset) is None
+        ):
+            offset = _find_frame_sync(data, offset + 1)
+            continue
+
+        yield frame
+        offset = next_offset
+
+
+def is_mp3_info_frame(data: bytes | bytearray | memoryview, frame: Mp3Frame) -> bool:
+    """Check if a frame is a Xing, Info or VBRI frame. These frames don't carry audio,\
+        they store information about the whole file
+
+    Args:
+        data: file data
+        frame: frame
+
+    Returns:
+        if the frame is an information frame
+    """
+    if frame.side_info_size == 0:
+        return False
+    tag_offset = frame.offset + FRAME_HEADER_SIZE + frame.side_info_size
+    if bytes(data[tag_offset : tag_offset + 4]) in INFO_FRAME_TAGS:
+        return True
+    vbri_offset = frame.offset + VBRI_FRAME_TAG_OFFSET
+    return bytes(data[vbri_offset : vbri_offset + 4]) == VBRI_FRAME_TAG
+
+
+def get_mp3_info_frame_count(
+    data: bytes | bytearray | memoryview, frame: Mp3Frame
+) -> int | None:
+    """Get the number of audio frames of the file stored in a Xing, Info or VBRI frame
+
+    Args:
+        data: file data
+        frame: first frame of the file
+
+    Returns:
+        the number of audio frames or None if the frame doesn't store it
+    """
+    if frame.side_info_size == 0:
+        return None
+    tag_offset = frame.offset + FRAME_HEADER_SIZE + frame.side_info_size
+    if bytes(data[tag_offset : tag_offset + 4]) in INFO_FRAME_TAGS:
+        flags = int.from_bytes(data[tag_offset + 4 : tag_offset + 8], "big")
+        if not flags & XING_FRAME_COUNT_FLAG:
+            return None
+        return _read_frame_count(data, tag_offset + 8)
+    vbri_offset = frame.offset + VBRI_FRAME_TAG_OFFSET
+    if bytes(data[vbri_offset : vbri_offset + 4]) == VBRI_FRAME_TAG:
+        return _read_frame_count(data, vbri_offset + VBRI_FRAME_COUNT_OFFSET)
+    return None
+
+
+def _read_frame_count(data: bytes | bytearray | memoryview, offset: int) -> int | None:
+    """Read the frame count field of an information frame
+
+    Args:
+        data: file data
+        offset: field start byte
+
+    Returns:
+        the frame count or None if the data ends before the field
+    """
+    frame_count = data[offset : offset + FRAME_COUNT_SIZE]
+    if len(frame_count) < FRAME_COUNT_SIZE:
+        return None
+    return int.from_bytes(frame_count, "big")
+
+
+class Mp3DurationReader:
+    """Reads the duration of an MP3 file from its frames while the file is received\
+        in chunks. Only the bytes of the frame being read are kept in memory, so\
+        the memory used doesn't depend on the file size
+    """
+
+    def __init__(self) -> None:
+        """Init MP3 duration reader"""
+        self._buffer = bytearray()
+        self._id3v2_tag_checked = False
+        self._pending_skip = 0
+        self._first_frame_read = False
+        self._duration = 0.0
+        self._frames_size = 0
+        self._file_size = 0
+
+    def update(self, chunk: bytes) -> None:
+        """Read the frames completed by a new chunk of the file
+
+        Args:
+            chunk: next file chunk
+        """
+        self._file_size += len(chunk)
+        self._buffer += chunk
+        self._read_frames(is_file_end=False)
+
+    def get_duration(self) -> float:
+        """Read the remaining frames and get the file duration
+
+        Returns:
+            the duration in seconds, 0 if most of the file is not made of MPEG audio frames
+        """
+        self._read_frames(is_file_end=True)
+        if self._frames_size * 2 < self._file_size:
+            return 0.0
+        return self._duration
+
+    def _read_frames(self, is_file_end: bool) -> None:
+        """Read the complete frames of the buffer and discard their bytes.\
+            A frame is only accepted when the next frame is valid too or the file ends\
+            after it, as done by `iterate_mp3_frames`
+
+        Args:
+            is_file_end: whether the buffer holds the end of the file
+        """
+        if not self._skip_id3v2_tag(is_file_end):
+            return
+
+        data = self._buffer
+        data_size = len(data)
+        offset = 0
+        while offset + FRAME_HEADER_SIZE <= data_size:
+            if data[offset : offset + 3] == ID3V1_TAG and (
+                data_size - offset <= ID3V1_TAG_SIZE
+            ):
+                if is_file_end:
+                    self._frames_size += data_size - offset
+                    offset = data_size
+                break
+
+            frame = parse_mp3_frame_header(data, offset)
+            if frame is None:
+                offset = _find_frame_sync(data, offset + 1)
+                continue
+            next_offset = offset + frame.length
+            if next_offset + FRAME_HEADER_SIZE > data_size and not is_file_end:
+                break
+            if next_offset > data_size or (
+                next_offset + FRAME_HEADER_SIZE <= data_size
+                and data[next_offset : next_offset + 3] != ID3V1_TAG
+                and parse_mp3_frame_header(data, next_offset) is None
+            ):
+                offset = _find_frame_sync(data, offset + 1)
+                continue
+
+            if self._first_frame_read or not is_mp3_info_frame(data, frame):
+                self._duration += frame.duration
+            self._first_frame_read = True
+            self._frames_size += frame.length
+            offset = next_offset
+
+        del data[: min(offset, data_size)]
+
+    def _skip_id3v2_tag(self, is_file_end: bool) -> bool:
+        """Discard the bytes of the ID3v2 tag at the start of the file
+
+        Args:
+            is_file_end: whether the buffer holds the end of the file
+
+        Returns:
+            if the whole tag was discarded and frames can be read
+        """
+        data = self._buffer
+        if not self._id3v2_tag_checked:
+            if len(data) < ID3V2_HEADER_SIZE and not is_file_end:
+                return False
+            self._pending_skip = get_id3v2_tag_size(data)
+            self._id3v2_tag_checked = True
+        if self._pending_skip:
+            skipped = min(self._pending_skip, len(data))
+            del data[:skipped]
+            self._pending_skip -= skipped
+            self._frames_size += skipped
+        return self._pending_skip == 0
+
+
+def _find_frame_sync(data: bytes | bytearray, start: int) -> int:
+    """Find the next byte that can start a frame header
+
+    Args:
+        data: file data
+        start: search start byte
+
+    Returns:
+        the offset of the next candidate byte, the data size if there is none
+    """
+    offset = data.find(b"\xff", start)
+    return len(data) if offset == -1 else offset
@@ -0,0 +1,34 @@
+"""Waveform utils for computing the peaks song players draw their waveform with,\
+    so players don't need to download the whole song before drawing it
+"""
+
+import numpy as np
+
+WAVEFORM_PEAKS = 1000
+"""Number of min/max pairs of a song waveform"""
+WAVEFORM_PEAK_SCALE = 127
+"""Value of a full scale sample in the waveform peaks"""
+
+
+def get_waveform_peaks(signal: np.ndarray, peaks: int) -> np.ndarray:
+    """Get the min and max samples of a signal split into windows of about the same size
+
+    Args:
+        signal: mono signal with samples between -1 and 1
+        peaks: number of windows, signals with fewer samples get a window per sample
+
+    Returns:
+        the min and max sample of each window interleaved and scaled to int8,\
+            as in [min_0, max_0, min_1, max_1, ...]
+    """
+    windows = min(peaks, signal.size)
+    if windows == 0:
+        return np.zeros(0, dtype=np.int8)
+
+    window_starts = np.arange(windows) * signal.size // windows
+    waveform = np.empty(windows * 2, dtype=np.float32)
+    waveform[0::2] = np.minimum.reduceat(signal, window_starts)
+    waveform[1::2] = np.maximum.reduceat(signal, window_starts)
+    return np.clip(
+        np.rint(waveform * WAVEFORM_PEAK_SCALE), -WAVEFORM_PEAK_SCALE, WAVEFORM_PEAK_SCALE
+    ).astype(np.int8)
@@ -0,0 +1,148 @@
+"""Counter buffer utils for collecting increments in memory and persisting them\
+    in batches instead of writing on every increment
+"""
+
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+
+from app.logging.logging_constants import LOGGING_COUNTER_BUFFER_UTILS
+from app.logging.logging_schema import SpotifyElectronLogger
+
+counter_buffer_utils_logger = SpotifyElectronLogger(LOGGING_COUNTER_BUFFER_UTILS).get_logger()
+
+
+class CounterBuffer:
+    """Write-behind buffer of counters. Increments are collected per key and flushed\
+        together every interval or when the pending increments reach a threshold.
+        Each key belongs to a group so pending increments can be read per key or per group.
+        Increments not flushed yet are lost if the process dies, the loss is bounded by\
+        the flush interval and threshold
+    """
+
+    def __init__(
+        self,
+        flush_interval_seconds: float,
+        max_pending: int,
+        flush_counts: Callable[[dict[str, int]], Awaitable[None]],
+    ) -> None:
+        """Init counter buffer
+
+        Args:
+            flush_interval_seconds: seconds between periodic flushes
+            max_pending: pending increments that trigger a flush, 0 or less\
+                flushes on every increment
+            flush_counts: function that persists the increments of every key
+        """
+        self._flush_interval_seconds = flush_interval_seconds
+        self._max_pending = max(max_pending, 0)
+        self._flush_counts = flush_counts
+        self._pending: Counter[str] = Counter()
+        self._flushing: Counter[str] = Counter()
+        self._groups: dict[str, str] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task | None = None
+        self._periodic_flush_task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start flushing the buffer periodically"""
+        if self._periodic_flush_task is None and self._flush_interval_seconds > 0:
+            self._periodic_flush_task = asyncio.create_task(self._flush_periodically())
+
+    async def close(self) -> None:
+        """Stop periodic flushes and flush the pending increments"""
+        if self._periodic_flush_task is not None:
+            self._periodic_flush_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._periodic_flush_task
+            self._periodic_flush_task = None
+        if self._flush_task is not None:
+            await self._flush_task
+        await self.flush()
+
+    async def add(self, key: str, group: str, amount: int = 1) -> None:
+        """Increase the counter of a key
+
+        Args:
+            key: counter key
+            group: group of the key
+            amount: amount to increase
+        """
+        self._pending[key] += amount
+        self._groups[key] = group
+
+        if self._max_pending == 0:
+            await self.flush()
+        elif self._pending.total() >= self._max_pending and (
+            self._flush_task is None or self._flush_task.done()
+        ):
+            self._flush_task = asyncio.create_task(self.flush())
+
+    def get_pending(self, key: str) -> int:
+        """Get increments of a key that are not persisted yet
+
+        Args:
+            key: counter key
+
+        Returns:
+            the pending increments of the key
+        """
+        return self._pending[key] + self._flushing[key]
+
+    def get_pending_by_group(self, group: str) -> int:
+        """Get increments of all the keys of a group that are not persisted yet
+
+        Args:
+            group: keys group
+
+        Returns:
+            the pending increments of the group
+        """
+        return sum(
+            self.get_pending(key)
+            for key, key_group in self._groups.items()
+            if key_group == group
+        )
+
+    def discard(self, key: str) -> None:
+        """Discard pending increments of a key
+
+        Args:
+            key: counter key
+        """
+        self._pending.pop(key, None)
+        if key not in self._flushing:
+            self._groups.pop(key, None)
+
+    async def flush(self) -> None:
+        """Persist pending increments. Increments stay readable as pending until\
+            persisted and are kept for the next flush if persisting them fails
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return
+
+            self._flushing, self._pending = self._pending, Counter()
+            try:
+                await self._flush_counts(dict(self._flushing))
+            except Exception:
+                counter_buffer_utils_logger.exception(
+                    f"Error flushing {self._flushing.total()} buffered increments"
+                )
+                self._pending.update(self._flushing)
+            else:
+                counter_buffer_utils_logger.debug(
+                    f"Flushed {self._flushing.total()} buffered increments"
+                )
+            finally:
+                flushed_keys = self._flushing.keys() - self._pending.keys()
+                self._flushing = Counter()
+                for key in flushed_keys:
+                    self._groups.pop(key, None)
+
+    async def _flush_periodically(self) -> None:
+        """Flush the buffer every interval"""
+        while True:
+            await asyncio.sleep(self._flush_interval_seconds)
+            await self.flush()
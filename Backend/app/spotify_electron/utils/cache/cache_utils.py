@@ -0,0 +1,167 @@
+"""Cache utils for keeping frequently accessed items in process memory"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+
+@dataclass
+class CacheStats:
+    """Cache usage counters"""
+
+    hits: int
+    """Number of lookups that found the item in cache"""
+    misses: int
+    """Number of lookups that didn't find the item in cache"""
+    evictions: int
+    """Number of items evicted to keep the cache inside its budget"""
+    entries: int
+    """Number of items currently stored"""
+    size_bytes: int
+    """Bytes currently used by stored items"""
+    max_bytes: int
+    """Max bytes the cache can hold"""
+    hit_rate: float
+    """Fraction of lookups that found the item in cache, 0 without lookups"""
+
+
+class LRUCache[V]:
+    """In-memory Least Recently Used cache bounded by a budget of bytes.\
+        Every entry is accounted with its own size, when adding an entry exceeds\
+        the budget the least recently used entries are evicted. Entries can also expire\
+        after a time to live
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        max_entry_bytes: int,
+        get_size: Callable[[V], int],
+        ttl_seconds: float = 0,
+    ) -> None:
+        """Init cache
+
+        Args:
+            max_bytes: max bytes stored in the cache, 0 disables the cache
+            max_entry_bytes: max bytes of a single entry
+            get_size: function that returns the size in bytes of an entry
+            ttl_seconds: seconds an entry is kept since it was stored, 0 never expires
+        """
+        self._max_bytes = max(max_bytes, 0)
+        self._max_entry_bytes = min(max(max_entry_bytes, 0), self._max_bytes)
+        self._get_size = get_size
+        self._ttl_seconds = max(ttl_seconds, 0)
+        self._entries: OrderedDict[str, tuple[V, int, float]] = OrderedDict()
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache can store items"""
+        return self._max_bytes > 0
+
+    def fits(self, size: int) -> bool:
+        """Check if an entry with the given size can be stored
+
+        Args:
+            size: entry size in bytes
+
+        Returns:
+            if an entry with the given size can be stored
+        """
+        return self.enabled and size <= self._max_entry_bytes
+
+    def get(self, key: str) -> V | None:
+        """Get item from cache and mark it as the most recently used
+
+        Args:
+            key: item key
+
+        Returns:
+            the item or None if it's not cached or expired
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[2] <= time.monotonic():
+            self.invalidate(key)
+            entry = None
+        if entry is None:
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry[0]
+
+    def put(self, key: str, value: V) -> bool:
+        """Store item in cache evicting least recently used items if needed
+
+        Args:
+            key: item key
+            value: item
+
+        Returns:
+            if the item was stored
+        """
+        size = self._get_size(value)
+        if not self.fits(size):
+            return False
+
+        self.invalidate(key)
+        while self._entries and self._size_bytes + size > self._max_bytes:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._size_bytes -= evicted_size
+            self._evictions += 1
+
+        expires_at = (
+            time.monotonic() + self._ttl_seconds if self._ttl_seconds else float("inf")
+        )
+        self._entries[key] = (value, size, expires_at)
+        self._size_bytes += size
+        return True
+
+    def invalidate(self, key: str) -> None:
+        """Remove item from cache
+
+        Args:
+            key: item key
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size_bytes -= entry[1]
+
+    def clear(self) -> None:
+        """Remove all items from cache"""
+        self._entries.clear()
+        self._size_bytes = 0
+
+    def get_stats(self) -> CacheStats:
+        """Get cache usage counters
+
+        Returns:
+            the cache stats
+        """
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            entries=len(self._entries),
+            size_bytes=self._size_bytes,
+            max_bytes=self._max_bytes,
+            hit_rate=get_hit_rate(self._hits, self._misses),
+        )
+
+
+def get_hit_rate(hits: int, misses: int) -> float:
+    """Get the fraction of lookups that found the item in cache
+
+    Args:
+        hits: lookups that found the item
+        misses: lookups that didn't find the item
+
+    Returns:
+        the hit rate, 0 without lookups
+    """
+    lookups = hits + misses
+    return hits / lookups if lookups else 0
@@ -0,0 +1,364 @@
+"""Disk cache utils for keeping items in local files that can be served\
+    through memory maps without copying them into process memory
+"""
+
+import hashlib
+import mmap
+import os
+import sys
+import uuid
+from asyncio import to_thread
+from collections import OrderedDict
+from collections.abc import AsyncIterable
+from contextlib import suppress
+from typing import BinaryIO
+
+from app.logging.logging_constants import LOGGING_DISK_CACHE_UTILS
+from app.logging.logging_schema import SpotifyElectronLogger
+from app.spotify_electron.utils.cache.cache_utils import CacheStats, get_hit_rate
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+disk_cache_utils_logger = SpotifyElectronLogger(LOGGING_DISK_CACHE_UTILS).get_logger()
+
+ENTRY_FILE_EXTENSION = ".cache"
+PARTIAL_FILE_EXTENSION = ".partial"
+TAG_SEPARATOR = "_"
+WORKER_DIRECTORY_PREFIX = "worker-"
+WORKER_LOCK_FILE = ".lock"
+
+
+class DiskCache:
+    """Least Recently Used cache of files stored in a local directory and bounded\
+        by a budget of bytes. Entries are written into a partial file and atomically\
+        renamed once complete, so readers never see half-written entries.
+        Each entry has a tag, an entry is only valid if looked up with the same tag.
+        Every worker sharing the directory claims its own subdirectory, so workers never\
+        index, evict or clean up the entries of each other. Subdirectories are reused\
+        by the workers started after their previous owner exited
+    """
+
+    def __init__(self, directory: str | None, max_bytes: int, max_entry_bytes: int) -> None:
+        """Init disk cache
+
+        Args:
+            directory: directory shared by the workers where entries are stored,\
+                None disables the cache
+            max_bytes: max bytes stored in the cache of this worker, 0 disables the cache
+            max_entry_bytes: max bytes of a single entry
+        """
+        self._directory = directory
+        self._worker_directory: str | None = None
+        self._worker_lock_file: BinaryIO | None = None
+        self._max_bytes = max(max_bytes, 0) if directory else 0
+        self._max_entry_bytes = min(max(max_entry_bytes, 0), self._max_bytes)
+        self._entries: OrderedDict[str, tuple[str, int]] = OrderedDict()
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache can store items"""
+        return self._max_bytes > 0
+
+    def init_directory(self) -> None:
+        """Claim a worker subdirectory of the cache directory, remove half-written entries\
+            left by its previous owner and index the complete ones
+        """
+        if not self.enabled or self._directory is None:
+            return
+
+        self._worker_directory = self._claim_worker_directory(self._directory)
+        entry_files: list[os.DirEntry] = []
+        with os.scandir(self._worker_directory) as directory_entries:
+            for directory_entry in directory_entries:
+                if directory_entry.name.endswith(PARTIAL_FILE_EXTENSION):
+                    os.remove(directory_entry.path)
+                    disk_cache_utils_logger.info(
+                        f"Removed half-written cache entry {directory_entry.path}"
+                    )
+                elif directory_entry.name.endswith(ENTRY_FILE_EXTENSION):
+                    entry_files.append(directory_entry)
+
+        entry_files.sort(key=lambda entry_file: entry_file.stat().st_mtime)
+        for entry_file in entry_files:
+            key_hash, _, tag = entry_file.name.removesuffix(ENTRY_FILE_EXTENSION).partition(
+                TAG_SEPARATOR
+            )
+            self._remove_entry_files(self._add_entry(key_hash, tag, entry_file.stat().st_size))
+
+        disk_cache_utils_logger.info(
+            f"Disk cache {self._worker_directory} loaded with {len(self._entries)} entries "
+            f"and {self._size_bytes} bytes"
+        )
+
+    def close(self) -> None:
+        """Release the worker subdirectory so another worker can claim it.\
+            The cache is disabled afterwards
+        """
+        self._max_bytes = 0
+        self._entries.clear()
+        self._size_bytes = 0
+        if self._worker_lock_file is not None:
+            self._worker_lock_file.close()
+            self._worker_lock_file = None
+
+    def fits(self, size: int) -> bool:
+        """Check if an entry with the given size can be stored
+
+        Args:
+            size: entry size in bytes
+
+        Returns:
+            if an entry with the given size can be stored
+        """
+        return self.enabled and 0 < size <= self._max_entry_bytes
+
+    async def open(self, key: str, tag: str) -> mmap.mmap | None:
+        """Open a read only memory map of an entry and mark it as the most recently used.\
+            Blocking file operations run outside the event loop
+
+        Args:
+            key: entry key
+            tag: entry tag
+
+        Returns:
+            the memory map of the entry or None if it's not cached
+        """
+        key_hash = self._get_key_hash(key)
+        entry = self._entries.get(key_hash)
+        if entry is None or entry[0] != tag:
+            self._misses += 1
+            return None
+
+        try:
+            entry_mmap = await to_thread(self._open_entry_mmap, key_hash, tag)
+        except OSError:
+            disk_cache_utils_logger.exception(f"Error opening cache entry for {key}")
+            await self._remove_entry(key_hash)
+            self._misses += 1
+            return None
+
+        # The entry may have been evicted while it was opened, its memory map stays valid
+        if key_hash in self._entries:
+            self._entries.move_to_end(key_hash)
+        self._hits += 1
+        return entry_mmap
+
+    async def put(self, key: str, tag: str, chunks: AsyncIterable[bytes]) -> bool:
+        """Store an entry writing its chunks into a partial file that is renamed\
+            once complete. Blocking file operations run outside the event loop
+
+        Args:
+            key: entry key
+            tag: entry tag
+            chunks: entry data chunks
+
+        Returns:
+            if the entry was stored
+        """
+        if not self.enabled:
+            return False
+
+        key_hash = self._get_key_hash(key)
+        entry_path = self._get_entry_path(key_hash, tag)
+        partial_path = f"{entry_path}.{uuid.uuid4().hex}{PARTIAL_FILE_EXTENSION}"
+        size = 0
+        try:
+            entry_file = await to_thread(open, partial_path, "wb")
+            try:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > self._max_entry_bytes:
+                        break
+                    await to_thread(entry_file.write, chunk)
+            finally:
+                await to_thread(entry_file.close)
+
+            if size > self._max_entry_bytes or size == 0:
+                await to_thread(os.remove, partial_path)
+                return False
+
+            await to_thread(os.replace, partial_path, entry_path)
+        except Exception:
+            disk_cache_utils_logger.exception(f"Error storing cache entry for {key}")
+            with suppress(FileNotFoundError):
+                await to_thread(os.remove, partial_path)
+            return False
+
+        removed_entries: list[tuple[str, str]] = []
+        previous_entry = self._unindex_entry(key_hash)
+        if previous_entry is not None and previous_entry[0] != tag:
+            removed_entries.append((key_hash, previous_entry[0]))
+        removed_entries.extend(self._add_entry(key_hash, tag, size))
+        await to_thread(self._remove_entry_files, removed_entries)
+        return True
+
+    async def invalidate(self, key: str) -> None:
+        """Remove entry from cache
+
+        Args:
+            key: entry key
+        """
+        await self._remove_entry(self._get_key_hash(key))
+
+    def get_stats(self) -> CacheStats:
+        """Get cache usage counters
+
+        Returns:
+            the cache stats
+        """
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            entries=len(self._entries),
+            size_bytes=self._size_bytes,
+            max_bytes=self._max_bytes,
+            hit_rate=get_hit_rate(self._hits, self._misses),
+        )
+
+    def _add_entry(self, key_hash: str, tag: str, size: int) -> list[tuple[str, str]]:
+        """Index a stored entry evicting least recently used entries if needed
+
+        Args:
+            key_hash: entry key hash
+            tag: entry tag
+            size: entry size in bytes
+
+        Returns:
+            the key hash and tag of the evicted entries, whose files have to be removed
+        """
+        evicted_entries: list[tuple[str, str]] = []
+        while self._entries and self._size_bytes + size > self._max_bytes:
+            evicted_key_hash = next(iter(self._entries))
+            evicted_entry = self._unindex_entry(evicted_key_hash)
+            assert evicted_entry
+            evicted_entries.append((evicted_key_hash, evicted_entry[0]))
+            self._evictions += 1
+
+        self._entries[key_hash] = (tag, size)
+        self._size_bytes += size
+        return evicted_entries
+
+    async def _remove_entry(self, key_hash: str) -> None:
+        """Remove entry from index and disk. Open memory maps of the entry remain valid
+
+        Args:
+            key_hash: entry key hash
+        """
+        entry = self._unindex_entry(key_hash)
+        if entry is not None:
+            await to_thread(self._remove_entry_files, [(key_hash, entry[0])])
+
+    def _unindex_entry(self, key_hash: str) -> tuple[str, int] | None:
+        """Remove entry from index keeping its file
+
+        Args:
+            key_hash: entry key hash
+
+        Returns:
+            the removed entry tag and size or None if it wasn't indexed
+        """
+        entry = self._entries.pop(key_hash, None)
+        if entry is not None:
+            self._size_bytes -= entry[1]
+        return entry
+
+    def _open_entry_mmap(self, key_hash: str, tag: str) -> mmap.mmap:
+        """Open a read only memory map of an entry file
+
+        Args:
+            key_hash: entry key hash
+            tag: entry tag
+
+        Returns:
+            the memory map of the entry file
+        """
+        with open(self._get_entry_path(key_hash, tag), "rb") as entry_file:
+            return mmap.mmap(entry_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _remove_entry_files(self, entries: list[tuple[str, str]]) -> None:
+        """Remove entry files from disk
+
+        Args:
+            entries: key hash and tag of the entries
+        """
+        for key_hash, tag in entries:
+            with suppress(FileNotFoundError):
+                os.remove(self._get_entry_path(key_hash, tag))
+
+    def _claim_worker_directory(self, directory: str) -> str:
+        """Claim the first worker subdirectory of the cache directory not claimed\
+            by another worker. The claim lasts until the cache is closed or the\
+            worker exits
+
+        Args:
+            directory: cache directory
+
+        Returns:
+            the worker subdirectory path
+        """
+        slot = 0
+        while True:
+            worker_directory = os.path.join(directory, f"{WORKER_DIRECTORY_PREFIX}{slot}")
+            os.makedirs(worker_directory, exist_ok=True)
+            lock_file = open(os.path.join(worker_directory, WORKER_LOCK_FILE), "a+b")  # noqa: SIM115
+            if _try_lock_file(lock_file):
+                self._worker_lock_file = lock_file
+                return worker_directory
+            lock_file.close()
+            slot += 1
+
+    def _get_entry_path(self, key_hash: str, tag: str) -> str:
+        """Get entry file path
+
+        Args:
+            key_hash: entry key hash
+            tag: entry tag
+
+        Returns:
+            the entry file path
+        """
+        assert self._worker_directory
+        return os.path.join(
+            self._worker_directory, f"{key_hash}{TAG_SEPARATOR}{tag}{ENTRY_FILE_EXTENSION}"
+        )
+
+    @staticmethod
+    def _get_key_hash(key: str) -> str:
+        """Get a file name safe hash of the key
+
+        Args:
+            key: entry key
+
+        Returns:
+            the key hash
+        """
+        return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _try_lock_file(file: BinaryIO) -> bool:
+    """Take an exclusive lock of a file without waiting. The lock is released\
+        when the file is closed or the process exits
+
+    Args:
+        file: file to lock
+
+    Returns:
+        if the lock was taken
+    """
+    try:
+        file.seek(0)
+        if sys.platform == "win32":
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
@@ -0,0 +1,96 @@
+"""CloudFront utils for building the urls of the files served by a CloudFront distribution\
+    without calling AWS. Urls can be signed with a canned policy so they're only valid\
+    until they expire
+"""
+
+import base64
+import json
+import time
+from dataclasses import dataclass
+from urllib.parse import quote, urlencode
+
+import rsa
+
+CLOUDFRONT_SIGNATURE_HASH_METHOD = "SHA-1"
+"""Hash method CloudFront requires for url signatures"""
+
+
+@dataclass
+class CloudFrontUrlSigner:
+    """Key used to sign CloudFront urls"""
+
+    key_pair_id: str
+    """Id of the CloudFront public key matching the private key"""
+    private_key: rsa.PrivateKey
+    """Private key of the CloudFront key pair"""
+    expiration_seconds: int
+    """Seconds a signed url is valid since it was signed"""
+
+
+def load_cloudfront_private_key(private_key_file: str) -> rsa.PrivateKey:
+    """Load a CloudFront private key
+
+    Args:
+        private_key_file: path of the PEM encoded PKCS#1 RSA private key
+
+    Returns:
+        the private key
+    """
+    with open(private_key_file, "rb") as file:
+        return rsa.PrivateKey.load_pkcs1(file.read())
+
+
+def get_cloudfront_url(domain: str, resource_path: str) -> str:
+    """Get the url of a resource served by a CloudFront distribution
+
+    Args:
+        domain: distribution domain
+        resource_path: path of the resource inside the distribution
+
+    Returns:
+        the resource url
+    """
+    return f"https://{domain}/{quote(resource_path)}"
+
+
+def sign_cloudfront_url(url: str, signer: CloudFrontUrlSigner) -> str:
+    """Sign a CloudFront url with a canned policy valid until the url expires
+
+    Args:
+        url: CloudFront url
+        signer: key used to sign the url
+
+    Returns:
+        the signed url
+    """
+    expires = int(time.time()) + signer.expiration_seconds
+    policy = json.dumps(
+        {
+            "Statement": [
+                {"Resource": url, "Condition": {"DateLessThan": {"AWS:EpochTime": expires}}}
+            ]
+        },
+        separators=(",", ":"),
+    )
+    signature = rsa.sign(policy.encode(), signer.private_key, CLOUDFRONT_SIGNATURE_HASH_METHOD)
+    query = urlencode(
+        {
+            "Expires": expires,
+            "Signature": _encode_cloudfront_signature(signature),
+            "Key-Pair-Id": signer.key_pair_id,
+        }
+    )
+    return f"{url}?{query}"
+
+
+def _encode_cloudfront_signature(signature: bytes) -> str:
+    """Encode a signature with the url safe base64 variant used by CloudFront
+
+    Args:
+        signature: signature bytes
+
+    Returns:
+        the encoded signature
+    """
+    encoded_signature = base64.b64encode(signature).decode()
+    return encoded_signature.replace("+", "-").replace("=", "_").replace("/", "~")
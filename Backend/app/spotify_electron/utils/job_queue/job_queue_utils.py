@@ -0,0 +1,286 @@
+"""Job queue utils for running long tasks in background with a bounded number\
+    of workers and reporting their status
+"""
+
+import asyncio
+import uuid
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from enum import StrEnum
+
+from app.exceptions.base_exceptions_schema import SpotifyElectronError
+from app.logging.logging_constants import LOGGING_JOB_QUEUE_UTILS
+from app.logging.logging_schema import SpotifyElectronLogger
+
+job_queue_utils_logger = SpotifyElectronLogger(LOGGING_JOB_QUEUE_UTILS).get_logger()
+
+
+class JobStatus(StrEnum):
+    """Job status"""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+@dataclass
+class Job:
+    """Background job"""
+
+    id: str
+    """Job id"""
+    owner: str
+    """User that submitted the job"""
+    name: str
+    """Name of the item processed by the job"""
+    status: JobStatus
+    """Job status"""
+    progress: float
+    """Completed fraction of the job between 0 and 1"""
+    error: str | None
+    """Error of a failed job"""
+
+
+@dataclass
+class JobQueueStats:
+    """Job queue usage counters"""
+
+    submitted: int
+    """Number of jobs accepted"""
+    rejected: int
+    """Number of jobs not accepted because the queue was full"""
+    failed: int
+    """Number of jobs that failed"""
+    pending: int
+    """Number of jobs waiting for a worker"""
+    running: int
+    """Number of jobs currently running"""
+
+
+type JobFunction = Callable[[Job], Awaitable[None]]
+"""Job work, it receives the job to report its progress"""
+
+type JobCleanup = Callable[[], None]
+"""Releases the resources held by a job, it runs once the job is rejected or finished\
+    whatever its final status"""
+
+type JobListener = Callable[[Job], Awaitable[None]]
+"""Records the status of a job, it's awaited once the job starts running and once it's\
+    finished whatever its final status"""
+
+
+class JobQueue:
+    """Queue of jobs run in background by a bounded number of workers. Jobs over the\
+        workers limit wait in a bounded queue and new jobs are rejected when it's full,\
+        so a burst of submissions can't exhaust the process resources.
+        Only unfinished jobs are kept, their status is reported to the job listener\
+        so it can be stored where every process can query it
+    """
+
+    def __init__(self, max_running: int, max_pending: int) -> None:
+        """Init job queue
+
+        Args:
+            max_running: max jobs running at once, 0 disables the queue
+            max_pending: max jobs waiting for a worker
+        """
+        self._max_running = max(max_running, 0)
+        self._max_pending = max(max_pending, 0)
+        self._pending: deque[tuple[Job, JobFunction]] = deque()
+        self._running: dict[str, tuple[Job, asyncio.Task[None]]] = {}
+        self._cleanups: dict[str, JobCleanup] = {}
+        self._listeners: dict[str, JobListener] = {}
+        self._submitted = 0
+        self._rejected = 0
+        self._failed = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the queue can run jobs"""
+        return self._max_running > 0
+
+    def submit(  # noqa: PLR0913, PLR0917
+        self,
+        owner: str,
+        name: str,
+        function: JobFunction,
+        cleanup: JobCleanup | None = None,
+        listener: JobListener | None = None,
+        job_id: str | None = None,
+    ) -> Job:
+        """Submit a job that starts as soon as a worker is free
+
+        Args:
+            owner: user that submits the job
+            name: name of the item processed by the job
+            function: job work
+            cleanup: releases the resources held by the job once it's rejected\
+                or finished, including jobs discarded when the queue is closed
+            listener: records the status of the job once it starts running and once\
+                it's finished, including jobs discarded when the queue is closed
+            job_id: job id, a new one is generated if not given
+
+        Raises:
+            JobQueueFullError: the queue cannot accept more jobs
+
+        Returns:
+            the submitted job
+        """
+        if not self.enabled or (
+            len(self._running) >= self._max_running and len(self._pending) >= self._max_pending
+        ):
+            self._rejected += 1
+            if cleanup is not None:
+                self._run_cleanup(name, cleanup)
+            raise JobQueueFullError
+
+        job = Job(
+            id=job_id or uuid.uuid4().hex,
+            owner=owner,
+            name=name,
+            status=JobStatus.PENDING,
+            progress=0,
+            error=None,
+        )
+        if cleanup is not None:
+            self._cleanups[job.id] = cleanup
+        if listener is not None:
+            self._listeners[job.id] = listener
+        self._pending.append((job, function))
+        self._submitted += 1
+        self._start_pending_jobs()
+        return job
+
+    async def close(self) -> None:
+        """Discard pending jobs and cancel running ones, reporting them as failed"""
+        jobs = [job for job, _ in self._pending]
+        for job in jobs:
+            self._finish(job, JobStatus.FAILED, "Job queue closed")
+        self._pending.clear()
+        tasks = []
+        for job, task in self._running.values():
+            jobs.append(job)
+            tasks.append(task)
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in jobs:
+            await self._notify_finished(job)
+
+    def get_stats(self) -> JobQueueStats:
+        """Get job queue usage counters
+
+        Returns:
+            the job queue stats
+        """
+        return JobQueueStats(
+            submitted=self._submitted,
+            rejected=self._rejected,
+            failed=self._failed,
+            pending=len(self._pending),
+            running=len(self._running),
+        )
+
+    def _start_pending_jobs(self) -> None:
+        """Start pending jobs while there are free workers"""
+        while self._pending and len(self._running) < self._max_running:
+            job, function = self._pending.popleft()
+            job.status = JobStatus.RUNNING
+            task = asyncio.create_task(self._run(job, function))
+            self._running[job.id] = (job, task)
+            task.add_done_callback(lambda _, job=job: self._on_job_done(job))
+
+    async def _run(self, job: Job, function: JobFunction) -> None:
+        """Run a job and record its result. Errors are logged since no request\
+            is waiting for the job
+
+        Args:
+            job: job
+            function: job work
+        """
+        try:
+            listener = self._listeners.get(job.id)
+            if listener is not None:
+                await self._run_listener(job, listener)
+            await function(job)
+        except Exception as exception:
+            job_queue_utils_logger.exception(f"Job {job.id} for {job.name} failed")
+            self._finish(job, JobStatus.FAILED, str(exception))
+        else:
+            job.progress = 1
+            self._finish(job, JobStatus.COMPLETED)
+        await self._notify_finished(job)
+
+    def _on_job_done(self, job: Job) -> None:
+        """Free the worker of a finished job and start the next pending job.\
+            Jobs that didn't finish by themselves were cancelled
+
+        Args:
+            job: finished job
+        """
+        if job.status == JobStatus.RUNNING:
+            self._finish(job, JobStatus.FAILED, "Job cancelled")
+        self._running.pop(job.id, None)
+        self._start_pending_jobs()
+
+    def _finish(self, job: Job, status: JobStatus, error: str | None = None) -> None:
+        """Mark a job as finished releasing its resources
+
+        Args:
+            job: job
+            status: final status
+            error: error of a failed job
+        """
+        job.status = status
+        job.error = error
+        if status == JobStatus.FAILED:
+            self._failed += 1
+        cleanup = self._cleanups.pop(job.id, None)
+        if cleanup is not None:
+            self._run_cleanup(job.name, cleanup)
+
+    async def _notify_finished(self, job: Job) -> None:
+        """Report the final status of a job to its listener if it wasn't reported yet
+
+        Args:
+            job: finished job
+        """
+        listener = self._listeners.pop(job.id, None)
+        if listener is not None:
+            await self._run_listener(job, listener)
+
+    @staticmethod
+    def _run_cleanup(name: str, cleanup: JobCleanup) -> None:
+        """Release the resources held by a job. Errors are logged so they don't\
+            change the job result
+
+        Args:
+            name: name of the item processed by the job
+            cleanup: releases the resources held by the job
+        """
+        try:
+            cleanup()
+        except Exception:
+            job_queue_utils_logger.exception(f"Error releasing the job resources for {name}")
+
+    @staticmethod
+    async def _run_listener(job: Job, listener: JobListener) -> None:
+        """Report the status of a job. Errors are logged so they don't change\
+            the job result
+
+        Args:
+            job: job
+            listener: records the status of the job
+        """
+        try:
+            await listener(job)
+        except Exception:
+            job_queue_utils_logger.exception(f"Error recording the job {job.id} status")
+
+
+class JobQueueFullError(SpotifyElectronError):
+    """Job queue cannot accept more jobs"""
+
+    def __init__(self):
+        super().__init__("Job queue is full")
@@ -0,0 +1,120 @@
+"""Prefetch utils for loading items in background ahead of their use"""
+
+import asyncio
+from collections.abc import Coroutine
+from dataclasses import dataclass
+from typing import Any
+
+from app.logging.logging_constants import LOGGING_PREFETCH_UTILS
+from app.logging.logging_schema import SpotifyElectronLogger
+
+prefetch_utils_logger = SpotifyElectronLogger(LOGGING_PREFETCH_UTILS).get_logger()
+
+
+@dataclass
+class PrefetchStats:
+    """Prefetch usage counters"""
+
+    scheduled: int
+    """Number of prefetches started"""
+    cancelled: int
+    """Number of prefetches cancelled before finishing"""
+    rejected: int
+    """Number of prefetches not started because too many were running"""
+    running: int
+    """Number of prefetches currently running"""
+
+
+class PrefetchScheduler:
+    """Runs at most one background prefetch per owner. Scheduling a prefetch for an owner\
+        cancels its running prefetch unless both have the same key, so a prefetch never\
+        outlives the context it was started for. The number of owners prefetching\
+        at once is bounded, prefetches over the limit are not started
+    """
+
+    def __init__(self, max_running: int) -> None:
+        """Init prefetch scheduler
+
+        Args:
+            max_running: max prefetches running at once, 0 disables prefetching
+        """
+        self._max_running = max(max_running, 0)
+        self._running: dict[str, tuple[str, asyncio.Task[None]]] = {}
+        self._scheduled = 0
+        self._cancelled = 0
+        self._rejected = 0
+
+    def schedule(self, owner: str, key: str, coroutine: Coroutine[Any, Any, None]) -> bool:
+        """Run a prefetch for an owner in background
+
+        Args:
+            owner: prefetch owner
+            key: prefetch key, a running prefetch of the owner with the same key is kept
+            coroutine: prefetch coroutine
+
+        Returns:
+            if the prefetch was started
+        """
+        running_prefetch = self._running.get(owner)
+        if running_prefetch is not None and running_prefetch[0] == key:
+            coroutine.close()
+            return False
+
+        self.cancel(owner)
+        if len(self._running) >= self._max_running:
+            coroutine.close()
+            self._rejected += 1
+            return False
+
+        task = asyncio.create_task(coroutine)
+        self._running[owner] = (key, task)
+        task.add_done_callback(lambda done_task: self._remove_running(owner, done_task))
+        self._scheduled += 1
+        prefetch_utils_logger.debug(f"Prefetch {key} started for {owner}")
+        return True
+
+    def cancel(self, owner: str) -> None:
+        """Cancel the running prefetch of an owner
+
+        Args:
+            owner: prefetch owner
+        """
+        running_prefetch = self._running.pop(owner, None)
+        if running_prefetch is not None and running_prefetch[1].cancel():
+            self._cancelled += 1
+            prefetch_utils_logger.debug(
+                f"Prefetch {running_prefetch[0]} cancelled for {owner}"
+            )
+
+    async def close(self) -> None:
+        """Cancel every running prefetch and wait for them to stop"""
+        tasks = [task for _, task in self._running.values()]
+        for owner in list(self._running):
+            self.cancel(owner)
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_stats(self) -> PrefetchStats:
+        """Get prefetch usage counters
+
+        Returns:
+            the prefetch stats
+        """
+        return PrefetchStats(
+            scheduled=self._scheduled,
+            cancelled=self._cancelled,
+            rejected=self._rejected,
+            running=len(self._running),
+        )
+
+    def _remove_running(self, owner: str, task: asyncio.Task[None]) -> None:
+        """Remove a finished prefetch of an owner
+
+        Args:
+            owner: prefetch owner
+            task: finished prefetch
+        """
+        running_prefetch = self._running.get(owner)
+        if running_prefetch is not None and running_prefetch[1] is task:
+            del self._running[owner]
+        if not task.cancelled() and task.exception() is not None:
+            prefetch_utils_logger.error(f"Prefetch failed for {owner}: {task.exception()!r}")
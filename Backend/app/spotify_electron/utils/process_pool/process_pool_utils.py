@@ -0,0 +1,215 @@
+"""Process pool utils for running CPU bound work outside the event loop with a bounded\
+    number of queued calls
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any
+
+from app.logging.logging_constants import LOGGING_PROCESS_POOL_UTILS
+from app.logging.logging_schema import SpotifyElectronLogger
+
+process_pool_utils_logger = SpotifyElectronLogger(LOGGING_PROCESS_POOL_UTILS).get_logger()
+
+
+@dataclass
+class ProcessPoolStats:
+    """Process pool usage counters"""
+
+    completed: int
+    """Number of calls finished"""
+    running: int
+    """Number of calls running or queued in the pool"""
+    waiting: int
+    """Number of calls waiting for room in the pool queue"""
+
+
+class BoundedProcessPool:
+    """Pool of worker processes with a bounded queue. Calls over the workers limit are\
+        queued in the pool and once the queue is full new calls wait until a running\
+        call finishes, so a burst of calls applies backpressure to their callers instead\
+        of piling up their arguments in memory.
+        Background calls can't take every worker, so long background work doesn't delay\
+        the calls requests are waiting for. A pool without workers runs the calls\
+        in the default thread pool
+    """
+
+    def __init__(self, max_workers: int, max_queued: int) -> None:
+        """Init process pool
+
+        Args:
+            max_workers: worker processes, 0 runs the calls in threads
+            max_queued: max calls queued for a free worker
+        """
+        max_workers = max(max_workers, 0)
+        self._slots = _Slots(max_workers + max(max_queued, 0))
+        self._background_slots = _Slots(max(max_workers - 1, 1))
+        self._executor: ProcessPoolExecutor | None = None
+        if max_workers > 0:
+            self._executor = ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        self._completed = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the calls run in worker processes"""
+        return self._executor is not None
+
+    async def run[T](
+        self, function: Callable[..., T], *args: Any, background: bool = False
+    ) -> T:
+        """Run a function in a worker process waiting for room in the pool queue first.\
+            Function and arguments must be picklable
+
+        Args:
+            function: function
+            args: function arguments
+            background: whether no request is waiting for the call, background calls\
+                leave a worker free for the other calls when the pool has more than one
+
+        Returns:
+            the function result
+        """
+        loop = asyncio.get_running_loop()
+        if self._executor is None:
+            return await loop.run_in_executor(None, function, *args)
+
+        if background:
+            await self._background_slots.acquire()
+        try:
+            await self._slots.acquire()
+        except BaseException:
+            if background:
+                self._background_slots.release()
+            raise
+
+        try:
+            future = self._executor.submit(function, *args)
+        except BaseException:
+            self._on_call_done(background)
+            raise
+        # Slots are freed once the call finishes even if the caller was cancelled
+        future.add_done_callback(lambda _: self._on_call_done(background))
+        return await asyncio.wrap_future(future)
+
+    def close(self) -> None:
+        """Cancel waiting and queued calls and stop the worker processes"""
+        self._slots.close()
+        self._background_slots.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def get_stats(self) -> ProcessPoolStats:
+        """Get process pool usage counters
+
+        Returns:
+            the process pool stats
+        """
+        return ProcessPoolStats(
+            completed=self._completed,
+            running=self._slots.taken,
+            waiting=self._slots.waiting + self._background_slots.waiting,
+        )
+
+    def _on_call_done(self, background: bool) -> None:
+        """Count a finished call and release its slots. Called from the thread that\
+            completes the pool calls
+
+        Args:
+            background: whether it was a background call
+        """
+        self._completed += 1
+        self._slots.release()
+        if background:
+            self._background_slots.release()
+
+
+class _Slots:
+    """Bounded number of slots handed over to waiters in arrival order. Slots can be\
+        released from any thread and waiters of any event loop are woken up in their loop
+    """
+
+    def __init__(self, max_slots: int) -> None:
+        """Init slots
+
+        Args:
+            max_slots: number of slots
+        """
+        self._max_slots = max_slots
+        self._taken = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def taken(self) -> int:
+        """Number of slots taken"""
+        return self._taken
+
+    @property
+    def waiting(self) -> int:
+        """Number of callers waiting for a slot"""
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        """Take a slot waiting for one if all of them are taken"""
+        with self._lock:
+            if self._taken < self._max_slots and not self._waiters:
+                self._taken += 1
+                return
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+
+        acquired = False
+        try:
+            await waiter
+            acquired = True
+        finally:
+            if not acquired:
+                if waiter.done() and not waiter.cancelled():
+                    # The slot was handed over but the waiter was cancelled meanwhile
+                    self.release()
+                else:
+                    with self._lock, suppress(ValueError):
+                        self._waiters.remove(waiter)
+
+    def release(self) -> None:
+        """Hand over a slot to the next waiter or free it"""
+        with self._lock:
+            if not self._waiters:
+                self._taken -= 1
+                return
+            waiter = self._waiters.popleft()
+        try:
+            waiter.get_loop().call_soon_threadsafe(self._wake, waiter)
+        except RuntimeError:
+            # Event loop of the waiter closed, hand over the slot to the next one
+            self.release()
+
+    def close(self) -> None:
+        """Cancel the waiters"""
+        with self._lock:
+            waiters = list(self._waiters)
+            self._waiters.clear()
+        for waiter in waiters:
+            with suppress(RuntimeError):
+                waiter.get_loop().call_soon_threadsafe(waiter.cancel)
+
+    def _wake(self, waiter: asyncio.Future[None]) -> None:
+        """Hand over a slot to a waiter in its event loop
+
+        Args:
+            waiter: waiter
+        """
+        if waiter.done():
+            # Cancelled before the slot was handed over
+            self.release()
+            return
+        waiter.set_result(None)
@@ -0,0 +1,102 @@
+"""Single flight utils for coalescing concurrent loads of the same item\
+    into a single load
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from app.logging.logging_constants import LOGGING_SINGLE_FLIGHT_UTILS
+from app.logging.logging_schema import SpotifyElectronLogger
+
+single_flight_utils_logger = SpotifyElectronLogger(LOGGING_SINGLE_FLIGHT_UTILS).get_logger()
+
+
+@dataclass
+class SingleFlightStats:
+    """Single flight usage counters"""
+
+    loads: int
+    """Number of loads started"""
+    coalesced: int
+    """Number of calls that awaited a load started by another call"""
+    in_flight: int
+    """Number of loads currently running"""
+
+
+class SingleFlight[V]:
+    """Coalesces concurrent loads of the same key. The first call for a key starts\
+        the load and calls made while it runs await the same load instead of starting\
+        their own. Every waiting call gets the loaded value or the raised exception.\
+        Cancelling a waiting call doesn't cancel the load for the other calls.\
+        Loads exceeding the timeout are cancelled and raise TimeoutError to every call
+    """
+
+    def __init__(self, timeout_seconds: float | None) -> None:
+        """Init single flight
+
+        Args:
+            timeout_seconds: max seconds a load can run, None or 0 for no limit
+        """
+        self._timeout_seconds = timeout_seconds or None
+        self._in_flight: dict[str, asyncio.Task[V]] = {}
+        self._loads = 0
+        self._coalesced = 0
+
+    async def do(self, key: str, load: Callable[[], Awaitable[V]]) -> V:
+        """Get the value of a key, joining the running load of the key if there is one
+
+        Args:
+            key: item key
+            load: function that loads the item, only called if no load of the key\
+                is running
+
+        Returns:
+            the loaded value
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(load))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done_task: self._remove_in_flight(key, done_task))
+            self._loads += 1
+        else:
+            self._coalesced += 1
+            single_flight_utils_logger.debug(f"Joined in flight load of {key}")
+        return await asyncio.shield(task)
+
+    def get_stats(self) -> SingleFlightStats:
+        """Get single flight usage counters
+
+        Returns:
+            the single flight stats
+        """
+        return SingleFlightStats(
+            loads=self._loads, coalesced=self._coalesced, in_flight=len(self._in_flight)
+        )
+
+    async def _load(self, load: Callable[[], Awaitable[V]]) -> V:
+        """Run a load bounded by the timeout
+
+        Args:
+            load: function that loads the item
+
+        Returns:
+            the loaded value
+        """
+        async with asyncio.timeout(self._timeout_seconds):
+            return await load()
+
+    def _remove_in_flight(self, key: str, task: asyncio.Task[V]) -> None:
+        """Remove a finished load so the next call of the key starts a new one.\
+            The load exception is retrieved so it isn't reported as unhandled when\
+            every waiting call was cancelled
+
+        Args:
+            key: item key
+            task: finished load
+        """
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled() and task.exception() is not None:
+            single_flight_utils_logger.debug(f"Load of {key} failed: {task.exception()!r}")
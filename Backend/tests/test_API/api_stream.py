@@ -6,5 +6,17 @@ from app.__main__ import app
 client = TestClient(app)
 
 
-def stream_song(name: str, headers: dict[str, str]) -> Response:
-    return client.get(f"/stream/{name}", headers=headers)
+def stream_song(name: str, headers: dict[str, str], quality: str | None = None) -> Response:
+    params = {"quality": quality} if quality is not None else None
+    return client.get(f"/stream/{name}", headers=headers, params=params)
+
+
+def stream_song_hls_playlist(name: str, headers: dict[str, str]) -> Response:
+    return client.get(f"/stream/{name}/index.m3u8", headers=headers)
+
+
+def stream_song_hls_segment(
+    name: str, segment: int, headers: dict[str, str], version: str | None = None
+) -> Response:
+    params = {"version": version} if version is not None else None
+    return client.get(f"/stream/{name}/seg/{segment}", headers=headers, params=params)
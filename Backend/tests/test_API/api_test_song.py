@@ -15,6 +15,63 @@ def create_song(
         return client.post(url, files={"file": file}, headers=headers)
 
 
+def create_song_in_background(
+    name: str, file_path: str, genre: str, photo: str, headers: dict[str, str]
+) -> Response:
+    url = f"/songs/?name={name}&genre={genre}&photo={photo}&background=true"
+
+    with open(file_path, "rb") as file:
+        return client.post(url, files={"file": file}, headers=headers)
+
+
+def create_album_songs(
+    names: list[str],
+    file_paths: list[str],
+    genres: list[str],
+    photos: list[str],
+    headers: dict[str, str],
+) -> Response:
+    data = {"names": names, "genres": genres, "photos": photos}
+    files = []
+    try:
+        for file_path in file_paths:
+            files.append(("files", open(file_path, "rb")))  # noqa: SIM115
+        return client.post("/songs/album", data=data, files=files, headers=headers)
+    finally:
+        for _, file in files:
+            file.close()
+
+
+def create_song_upload(
+    name: str, genre: str, photo: str, size: int, headers: dict[str, str]
+) -> Response:
+    url = f"/songs/uploads?name={name}&genre={genre}&photo={photo}&size={size}"
+
+    return client.post(url, headers=headers)
+
+
+def get_song_upload(upload_id: str, headers: dict[str, str]) -> Response:
+    return client.get(f"/songs/uploads/{upload_id}", headers=headers)
+
+
+def upload_song_chunk(
+    upload_id: str, offset: int, chunk: bytes, headers: dict[str, str]
+) -> Response:
+    return client.patch(
+        f"/songs/uploads/{upload_id}",
+        content=chunk,
+        headers={**headers, "Upload-Offset": str(offset)},
+    )
+
+
+def finalize_song_upload(upload_id: str, headers: dict[str, str]) -> Response:
+    return client.post(f"/songs/uploads/{upload_id}/finalize", headers=headers)
+
+
+def get_song_job(job_id: str, headers: dict[str, str]) -> Response:
+    return client.get(f"/songs/jobs/{job_id}", headers=headers)
+
+
 def get_song(name: str, headers: dict[str, str]) -> Response:
     return client.get(f"/songs/{name}", headers=headers)
 
@@ -27,6 +84,10 @@ def get_songs(headers: dict[str, str]) -> Response:
     return client.get("/songs/", headers=headers)
 
 
+def get_song_waveform(name: str, headers: dict[str, str]) -> Response:
+    return client.get(f"/songs/{name}/waveform", headers=headers)
+
+
 def increase_song_streams(name: str, headers: dict[str, str]) -> Response:
     patch_url = f"/songs/{name}/streams"
 
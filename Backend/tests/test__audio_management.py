@@ -0,0 +1,208 @@
+import io
+
+import anyio
+import numpy
+import soundfile
+from pytest import mark
+
+from app.spotify_electron.utils.audio_management.audio_header_utils import (
+    AUDIO_HEADER_SIZE,
+    get_audio_duration_from_header,
+)
+from app.spotify_electron.utils.audio_management.audio_management_utils import (
+    FILE_CHUNK_SIZE,
+    SongFileDigest,
+    analyze_song,
+    process_song,
+)
+from app.spotify_electron.utils.audio_management.loudness_utils import (
+    LOUDNESS_MAX_PEAK_DBFS,
+    LOUDNESS_TARGET_LUFS,
+    get_loudness,
+)
+from app.spotify_electron.utils.audio_management.mp3_utils import (
+    is_mp3_info_frame,
+    iterate_mp3_frames,
+)
+from app.spotify_electron.utils.audio_management.waveform_utils import (
+    WAVEFORM_PEAKS,
+    get_waveform_peaks,
+)
+from app.spotify_electron.utils.process_pool.process_pool_utils import BoundedProcessPool
+
+SONG_PATH = "tests/assets/song_4_seconds.mp3"
+SONG_INFO_FRAME_COUNT = 176
+SAMPLES_PER_FRAME = 1152
+SAMPLE_RATE = 8000
+DURATION_SECONDS = 10
+MP3_SAMPLE_RATE = 44100
+SONG_COPIES = 20
+LOUDNESS_TOLERANCE = 0.05
+
+
+def get_audio_file(audio_format: str) -> bytes:
+    audio_file = io.BytesIO()
+    audio_data = numpy.random.default_rng(0).uniform(-1, 1, SAMPLE_RATE * DURATION_SECONDS)
+    soundfile.write(audio_file, audio_data, SAMPLE_RATE, format=audio_format)
+    return audio_file.getvalue()
+
+
+async def get_song_file_digest(file: bytes) -> SongFileDigest:
+    song_file_digest = SongFileDigest("song", io.BytesIO(file))
+    await song_file_digest.update(file)
+    return song_file_digest
+
+
+def test_get_audio_duration_from_header_mp3_info_frame():
+    with open(SONG_PATH, "rb") as song_file:
+        song = song_file.read()
+
+    duration = get_audio_duration_from_header(song[:AUDIO_HEADER_SIZE], len(song))
+
+    assert duration == SONG_INFO_FRAME_COUNT * SAMPLES_PER_FRAME / MP3_SAMPLE_RATE
+
+
+def test_get_audio_duration_from_header_wav_and_flac():
+    for audio_format in ("WAV", "FLAC"):
+        audio_file = get_audio_file(audio_format)
+
+        duration = get_audio_duration_from_header(
+            audio_file[:AUDIO_HEADER_SIZE], len(audio_file)
+        )
+
+        assert duration == DURATION_SECONDS
+
+
+def test_get_audio_duration_from_header_unknown():
+    assert get_audio_duration_from_header(b"", 0) is None
+    assert get_audio_duration_from_header(b"not an audio file", 17) is None
+    assert get_audio_duration_from_header(b"RIFF\x00\x00\x00\x00WAVE", 12) is None
+
+
+@mark.asyncio
+async def test_song_file_digest_duration():
+    wav_file = get_audio_file("WAV")
+    wav_digest = await get_song_file_digest(wav_file)
+    assert not wav_digest._duration_reader.needs_chunks
+    assert await wav_digest.get_duration_seconds() == DURATION_SECONDS
+
+    ogg_digest = await get_song_file_digest(get_audio_file("OGG"))
+    assert await ogg_digest.get_duration_seconds() == DURATION_SECONDS
+
+    assert await (await get_song_file_digest(b"")).get_duration_seconds() == 0
+    not_audio_digest = await get_song_file_digest(b"not an audio file")
+    assert await not_audio_digest.get_duration_seconds() == 0
+
+
+@mark.asyncio
+async def test_song_file_digest_duration_in_process_pool():
+    song = await anyio.Path(SONG_PATH).read_bytes()
+    # Audio frames only, so the duration is read from every frame of every chunk
+    audio_frames = [
+        frame for frame in iterate_mp3_frames(song) if not is_mp3_info_frame(song, frame)
+    ]
+    frames = b"".join(
+        song[frame.offset : frame.offset + frame.length] for frame in audio_frames
+    )
+    frames *= SONG_COPIES
+    expected_duration = sum(frame.duration for frame in audio_frames) * SONG_COPIES
+    ogg_file = get_audio_file("OGG")
+
+    analysis_pool = BoundedProcessPool(max_workers=1, max_queued=1)
+    try:
+        mp3_digest = SongFileDigest("song", io.BytesIO(frames), analysis_pool)
+        for start in range(0, len(frames), FILE_CHUNK_SIZE):
+            await mp3_digest.update(frames[start : start + FILE_CHUNK_SIZE])
+        ogg_digest = SongFileDigest("song", io.BytesIO(ogg_file), analysis_pool)
+        await ogg_digest.update(ogg_file)
+
+        assert mp3_digest._duration_reader.needs_chunks
+        assert await mp3_digest.get_duration_seconds() == int(expected_duration)
+        # Frame headers are read outside the pool, only files that must be decoded use it
+        assert analysis_pool.get_stats().completed == 0
+        assert await ogg_digest.get_duration_seconds() == DURATION_SECONDS
+        assert analysis_pool.get_stats().completed == 1
+    finally:
+        analysis_pool.close()
+
+
+def test_waveform_peaks():
+    signal = numpy.array([0, 1, -1, 0.5, -0.5, 0, 0.25], dtype=numpy.float32)
+
+    peaks = get_waveform_peaks(signal, 3)
+
+    assert peaks.dtype == numpy.int8
+    assert peaks.tolist() == [0, 127, -127, 64, -64, 32]
+    assert get_waveform_peaks(signal, 100).tolist() == [
+        sample for value in [0, 127, -127, 64, -64, 0, 32] for sample in (value, value)
+    ]
+    assert get_waveform_peaks(numpy.zeros(0, dtype=numpy.float32), 3).size == 0
+
+
+def test_loudness_of_sine():
+    sample_rate = 48000
+    time = numpy.arange(sample_rate * 5) / sample_rate
+    # -20 dBFS 1 kHz sine in both channels is measured as -20 LUFS by EBU R128
+    sine = 0.1 * numpy.sin(2 * numpy.pi * 1000 * time)
+
+    loudness = get_loudness(numpy.stack([sine, sine]), sample_rate)
+
+    assert loudness is not None
+    assert abs(loudness.integrated_lufs - -20) < LOUDNESS_TOLERANCE
+    assert abs(loudness.peak_dbfs - -20) < LOUDNESS_TOLERANCE
+    assert loudness.gain_db == round(LOUDNESS_TARGET_LUFS - loudness.integrated_lufs, 2)
+
+    # A quiet song with a loud click is only amplified up to the max peak
+    clicked_sine = 0.01 * sine
+    clicked_sine[sample_rate] = 0.9
+    clicked_loudness = get_loudness(clicked_sine, sample_rate)
+    assert clicked_loudness is not None
+    assert clicked_loudness.gain_db == round(
+        LOUDNESS_MAX_PEAK_DBFS - clicked_loudness.peak_dbfs, 2
+    )
+
+
+def test_loudness_of_silence():
+    assert get_loudness(numpy.zeros(48000), 48000) is None
+    assert get_loudness(numpy.full(48000, 1e-6), 48000) is None
+
+
+@mark.asyncio
+async def test_analyze_song():
+    song_bytes = await anyio.Path(SONG_PATH).read_bytes()
+
+    song_analysis = analyze_song("song", song_bytes)
+
+    waveform = numpy.frombuffer(song_analysis.waveform, dtype=numpy.int8)
+    assert waveform.size == WAVEFORM_PEAKS * 2
+    assert numpy.all(waveform[0::2] <= waveform[1::2])
+    assert waveform.max() > 0
+    assert song_analysis.loudness is not None
+    assert song_analysis.loudness.gain_db <= LOUDNESS_MAX_PEAK_DBFS - (
+        song_analysis.loudness.peak_dbfs
+    )
+
+    song_analysis = analyze_song("song", b"not a song")
+    assert song_analysis.waveform == b""
+    assert song_analysis.loudness is None
+
+
+@mark.asyncio
+async def test_process_song():
+    song_bytes = await anyio.Path(SONG_PATH).read_bytes()
+
+    song_processing = process_song("song", song_bytes, {"low": 0.9}, 2)
+
+    assert song_processing.analysis == analyze_song("song", song_bytes)
+    assert 0 < len(song_processing.renditions["low"]) < len(song_bytes)
+    assert song_processing.hls_segments
+
+    song_processing = process_song("song", song_bytes, {}, 0)
+    assert song_processing.analysis.waveform
+    assert song_processing.renditions == {}
+    assert song_processing.hls_segments == []
+
+    song_processing = process_song("song", b"not a song", {"low": 0.9}, 2)
+    assert song_processing.analysis.waveform == b""
+    assert song_processing.renditions == {}
+    assert song_processing.hls_segments == []
@@ -0,0 +1,98 @@
+import asyncio
+
+from pytest import mark
+
+from app.spotify_electron.utils.buffer.counter_buffer_utils import CounterBuffer
+
+
+class FlushRecorder:
+    """Records flushed counts instead of persisting them"""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.flushes: list[dict[str, int]] = []
+
+    async def __call__(self, counts: dict[str, int]) -> None:
+        """Record flushed counts
+
+        Raises:
+            ConnectionError: if failing is requested
+        """
+        if self.fail:
+            raise ConnectionError
+        self.flushes.append(counts)
+
+
+@mark.asyncio
+async def test_counter_buffer_flushes_in_batches():
+    recorder = FlushRecorder()
+    buffer = CounterBuffer(flush_interval_seconds=60, max_pending=3, flush_counts=recorder)
+
+    await buffer.add("song-1", "artist-1")
+    await buffer.add("song-1", "artist-1")
+    assert recorder.flushes == []
+    assert buffer.get_pending("song-1") == 2  # noqa: PLR2004
+
+    await buffer.add("song-2", "artist-2")
+    await asyncio.sleep(0)
+
+    assert recorder.flushes == [{"song-1": 2, "song-2": 1}]
+    assert buffer.get_pending("song-1") == 0
+    assert buffer.get_pending_by_group("artist-1") == 0
+
+
+@mark.asyncio
+async def test_counter_buffer_pending_by_group():
+    recorder = FlushRecorder()
+    buffer = CounterBuffer(flush_interval_seconds=60, max_pending=100, flush_counts=recorder)
+
+    await buffer.add("song-1", "artist-1")
+    await buffer.add("song-2", "artist-1")
+    await buffer.add("song-3", "artist-2")
+
+    assert buffer.get_pending_by_group("artist-1") == 2  # noqa: PLR2004
+    assert buffer.get_pending_by_group("artist-2") == 1
+
+    buffer.discard("song-2")
+    assert buffer.get_pending_by_group("artist-1") == 1
+
+
+@mark.asyncio
+async def test_counter_buffer_keeps_increments_when_flush_fails():
+    recorder = FlushRecorder(fail=True)
+    buffer = CounterBuffer(flush_interval_seconds=60, max_pending=100, flush_counts=recorder)
+
+    await buffer.add("song-1", "artist-1")
+    await buffer.flush()
+    assert buffer.get_pending("song-1") == 1
+
+    recorder.fail = False
+    await buffer.close()
+    assert recorder.flushes == [{"song-1": 1}]
+    assert buffer.get_pending("song-1") == 0
+
+
+@mark.asyncio
+async def test_counter_buffer_flushes_periodically_and_on_close():
+    recorder = FlushRecorder()
+    buffer = CounterBuffer(flush_interval_seconds=0.01, max_pending=100, flush_counts=recorder)
+    buffer.start()
+
+    await buffer.add("song-1", "artist-1")
+    await asyncio.sleep(0.05)
+    assert recorder.flushes == [{"song-1": 1}]
+
+    await buffer.add("song-2", "artist-1")
+    await buffer.close()
+    assert recorder.flushes == [{"song-1": 1}, {"song-2": 1}]
+
+
+@mark.asyncio
+async def test_counter_buffer_without_threshold_flushes_every_increment():
+    recorder = FlushRecorder()
+    buffer = CounterBuffer(flush_interval_seconds=0, max_pending=0, flush_counts=recorder)
+
+    await buffer.add("song-1", "artist-1")
+    await buffer.add("song-1", "artist-1")
+
+    assert recorder.flushes == [{"song-1": 1}, {"song-1": 1}]
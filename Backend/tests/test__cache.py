@@ -0,0 +1,191 @@
+import os
+import time
+
+from pytest import mark
+
+from app.spotify_electron.utils.cache.cache_utils import LRUCache
+from app.spotify_electron.utils.cache.disk_cache_utils import DiskCache
+
+
+def test_lru_cache_get_put():
+    cache: LRUCache[bytes] = LRUCache(max_bytes=100, max_entry_bytes=100, get_size=len)
+
+    assert cache.get("song") is None
+    assert cache.put("song", b"1234")
+    assert cache.get("song") == b"1234"
+
+    stats = cache.get_stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.entries == 1
+    assert stats.size_bytes == len(b"1234")
+
+
+def test_lru_cache_evicts_least_recently_used():
+    max_bytes = 30
+    cache: LRUCache[bytes] = LRUCache(
+        max_bytes=max_bytes, max_entry_bytes=max_bytes, get_size=len
+    )
+
+    cache.put("song-1", b"a" * 10)
+    cache.put("song-2", b"b" * 10)
+    cache.put("song-3", b"c" * 10)
+    cache.get("song-1")
+    cache.put("song-4", b"d" * 10)
+
+    assert cache.get("song-2") is None
+    assert cache.get("song-1") is not None
+    assert cache.get("song-3") is not None
+    assert cache.get("song-4") is not None
+
+    stats = cache.get_stats()
+    assert stats.evictions == 1
+    assert stats.size_bytes == max_bytes
+
+
+def test_lru_cache_entry_bigger_than_budget_not_stored():
+    cache: LRUCache[bytes] = LRUCache(max_bytes=100, max_entry_bytes=10, get_size=len)
+
+    assert not cache.put("song", b"a" * 11)
+    assert cache.get("song") is None
+    assert cache.get_stats().size_bytes == 0
+
+
+def test_lru_cache_disabled():
+    cache: LRUCache[bytes] = LRUCache(max_bytes=0, max_entry_bytes=10, get_size=len)
+
+    assert not cache.enabled
+    assert not cache.put("song", b"a")
+
+
+def test_lru_cache_invalidate():
+    cache: LRUCache[bytes] = LRUCache(max_bytes=100, max_entry_bytes=100, get_size=len)
+
+    song_data = b"a" * 20
+    cache.put("song", b"a" * 10)
+    cache.put("song", song_data)
+    assert cache.get_stats().size_bytes == len(song_data)
+
+    cache.invalidate("song")
+    assert cache.get("song") is None
+    assert cache.get_stats().size_bytes == 0
+
+
+def test_lru_cache_entries_expire():
+    ttl_seconds = 0.05
+    cache: LRUCache[str] = LRUCache(
+        max_bytes=100, max_entry_bytes=100, get_size=len, ttl_seconds=ttl_seconds
+    )
+
+    cache.put("song", "https://cdn/song")
+    assert cache.get("song") == "https://cdn/song"
+
+    time.sleep(ttl_seconds * 2)
+    assert cache.get("song") is None
+
+    stats = cache.get_stats()
+    assert stats.entries == 0
+    assert stats.size_bytes == 0
+    assert stats.hit_rate == 1 / 2
+
+
+async def _iterate_chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+def _list_entry_files(directory):
+    return [path for path in os.listdir(directory) if path.endswith(".cache")]
+
+
+@mark.asyncio
+async def test_disk_cache_put_open(tmp_path):
+    cache = DiskCache(directory=str(tmp_path), max_bytes=100, max_entry_bytes=100)
+    cache.init_directory()
+
+    assert await cache.open("song", "tag") is None
+    assert await cache.put("song", "tag", _iterate_chunks(b"1234", b"5678"))
+
+    song_mmap = await cache.open("song", "tag")
+    assert song_mmap is not None
+    assert song_mmap[:] == b"12345678"
+    song_mmap.close()
+
+    assert await cache.open("song", "other-tag") is None
+    assert not [
+        path for path in os.listdir(tmp_path / "worker-0") if path.endswith(".partial")
+    ]
+
+    stats = cache.get_stats()
+    assert stats.hits == 1
+    assert stats.misses == 2  # noqa: PLR2004
+    assert stats.entries == 1
+
+
+@mark.asyncio
+async def test_disk_cache_evicts_least_recently_used(tmp_path):
+    entry_size = 10
+    cache = DiskCache(
+        directory=str(tmp_path), max_bytes=entry_size * 2, max_entry_bytes=entry_size
+    )
+    cache.init_directory()
+
+    await cache.put("song-1", "tag", _iterate_chunks(b"a" * entry_size))
+    await cache.put("song-2", "tag", _iterate_chunks(b"b" * entry_size))
+    await cache.put("song-3", "tag", _iterate_chunks(b"c" * entry_size))
+
+    assert await cache.open("song-1", "tag") is None
+    assert cache.get_stats().evictions == 1
+    assert len(_list_entry_files(tmp_path / "worker-0")) == cache.get_stats().entries
+
+
+@mark.asyncio
+async def test_disk_cache_entry_bigger_than_budget_not_stored(tmp_path):
+    cache = DiskCache(directory=str(tmp_path), max_bytes=100, max_entry_bytes=5)
+    cache.init_directory()
+
+    assert not await cache.put("song", "tag", _iterate_chunks(b"123", b"456"))
+    assert await cache.open("song", "tag") is None
+    assert _list_entry_files(tmp_path / "worker-0") == []
+
+
+@mark.asyncio
+async def test_disk_cache_init_directory_cleans_partial_entries(tmp_path):
+    cache = DiskCache(directory=str(tmp_path), max_bytes=100, max_entry_bytes=100)
+    cache.init_directory()
+    await cache.put("song", "tag", _iterate_chunks(b"1234"))
+
+    partial_path = tmp_path / "worker-0" / "half-written.cache.1234.partial"
+    partial_path.write_bytes(b"12")
+    cache.close()
+
+    restarted_cache = DiskCache(directory=str(tmp_path), max_bytes=100, max_entry_bytes=100)
+    restarted_cache.init_directory()
+
+    assert not partial_path.exists()
+    song_mmap = await restarted_cache.open("song", "tag")
+    assert song_mmap is not None
+    assert song_mmap[:] == b"1234"
+    song_mmap.close()
+    restarted_cache.close()
+
+
+@mark.asyncio
+async def test_disk_cache_workers_use_their_own_directory(tmp_path):
+    cache = DiskCache(directory=str(tmp_path), max_bytes=100, max_entry_bytes=100)
+    cache.init_directory()
+    await cache.put("song", "tag", _iterate_chunks(b"1234"))
+    partial_path = tmp_path / "worker-0" / "being-written.cache.1234.partial"
+    partial_path.write_bytes(b"12")
+
+    other_worker_cache = DiskCache(directory=str(tmp_path), max_bytes=100, max_entry_bytes=100)
+    other_worker_cache.init_directory()
+
+    assert partial_path.exists()
+    assert other_worker_cache.get_stats().entries == 0
+    assert await other_worker_cache.open("song", "tag") is None
+    assert await other_worker_cache.put("song", "tag", _iterate_chunks(b"5678"))
+    assert len(_list_entry_files(tmp_path / "worker-1")) == 1
+
+    cache.close()
+    other_worker_cache.close()
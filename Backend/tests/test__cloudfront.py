@@ -0,0 +1,60 @@
+import base64
+import json
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import rsa
+
+from app.spotify_electron.utils.cloudfront.cloudfront_utils import (
+    CloudFrontUrlSigner,
+    get_cloudfront_url,
+    load_cloudfront_private_key,
+    sign_cloudfront_url,
+)
+
+KEY_BITS = 512
+KEY_PAIR_ID = "K2JCJMDEHXQW5F"
+EXPIRATION_SECONDS = 60
+
+
+def _decode_cloudfront_signature(signature: str) -> bytes:
+    return base64.b64decode(signature.replace("-", "+").replace("_", "=").replace("~", "/"))
+
+
+def test_get_cloudfront_url():
+    assert (
+        get_cloudfront_url("d111111abcdef8.cloudfront.net", "canciones/song name.mp3")
+        == "https://d111111abcdef8.cloudfront.net/canciones/song%20name.mp3"
+    )
+
+
+def test_sign_cloudfront_url(tmp_path):
+    public_key, private_key = rsa.newkeys(KEY_BITS)
+    private_key_file = tmp_path / "private_key.pem"
+    private_key_file.write_bytes(private_key.save_pkcs1())
+    signer = CloudFrontUrlSigner(
+        key_pair_id=KEY_PAIR_ID,
+        private_key=load_cloudfront_private_key(str(private_key_file)),
+        expiration_seconds=EXPIRATION_SECONDS,
+    )
+    url = get_cloudfront_url("d111111abcdef8.cloudfront.net", "canciones/song.mp3")
+
+    signed_url = sign_cloudfront_url(url, signer)
+
+    split_url = urlsplit(signed_url)
+    assert signed_url.startswith(f"{url}?")
+    query = {key: values[0] for key, values in parse_qs(split_url.query).items()}
+    assert query["Key-Pair-Id"] == KEY_PAIR_ID
+    expires = int(query["Expires"])
+    assert 0 < expires - time.time() <= EXPIRATION_SECONDS
+    policy = json.dumps(
+        {
+            "Statement": [
+                {"Resource": url, "Condition": {"DateLessThan": {"AWS:EpochTime": expires}}}
+            ]
+        },
+        separators=(",", ":"),
+    )
+    assert rsa.verify(
+        policy.encode(), _decode_cloudfront_signature(query["Signature"]), public_key
+    )
@@ -16,3 +16,20 @@ def test_health_check():
     response = client.get("/health/")
     assert response.status_code == HTTP_200_OK
     assert response.text == "OK"
+
+
+def test_cache_stats():
+    response = client.get("/health/cache")
+    assert response.status_code == HTTP_200_OK
+    for cache_name in ("song_data", "song_data_disk", "song_streaming_url"):
+        cache_stats = response.json()[cache_name]
+        for counter in (
+            "hits",
+            "misses",
+            "evictions",
+            "entries",
+            "size_bytes",
+            "max_bytes",
+            "hit_rate",
+        ):
+            assert counter in cache_stats
@@ -0,0 +1,94 @@
+import io
+
+import soundfile
+
+from app.spotify_electron.utils.audio_management.hls_utils import (
+    get_hls_playlist,
+    get_hls_segments,
+)
+from app.spotify_electron.utils.audio_management.mp3_utils import (
+    FRAME_HEADER_SIZE,
+    Mp3DurationReader,
+    get_id3v2_tag_size,
+    is_mp3_info_frame,
+    iterate_mp3_frames,
+)
+
+SONG_PATH = "tests/assets/song_4_seconds.mp3"
+SONG_DURATION_SECONDS = 4.6
+DURATION_TOLERANCE_SECONDS = 0.1
+SEGMENT_SECONDS = 1
+MAX_MP3_FRAME_SIZE = 1441 + FRAME_HEADER_SIZE
+
+
+def read_song() -> bytes:
+    with open(SONG_PATH, "rb") as song_file:
+        return song_file.read()
+
+
+def test_iterate_mp3_frames():
+    song = read_song()
+    frames = list(iterate_mp3_frames(song))
+    audio_frames = [frame for frame in frames if not is_mp3_info_frame(song, frame)]
+
+    assert frames[0].offset >= get_id3v2_tag_size(song)
+    assert is_mp3_info_frame(song, frames[0])
+    assert len(audio_frames) == len(frames) - 1
+    assert all(
+        previous.offset + previous.length <= frame.offset
+        for previous, frame in zip(frames, frames[1:], strict=False)
+    )
+    duration = sum(frame.duration for frame in audio_frames)
+    assert abs(duration - SONG_DURATION_SECONDS) < DURATION_TOLERANCE_SECONDS
+
+
+def test_iterate_mp3_frames_not_mp3():
+    assert list(iterate_mp3_frames(b"RIFF" + bytes(1000))) == []
+    assert get_hls_segments("song", b"not an mp3 file", SEGMENT_SECONDS) == []
+
+
+def test_mp3_duration_reader():
+    song = read_song()
+    expected_duration = sum(
+        frame.duration
+        for frame in iterate_mp3_frames(song)
+        if not is_mp3_info_frame(song, frame)
+    )
+
+    for chunk_size in (1, 7, 4096, len(song)):
+        mp3_duration_reader = Mp3DurationReader()
+        for start in range(0, len(song), chunk_size):
+            mp3_duration_reader.update(song[start : start + chunk_size])
+            assert len(mp3_duration_reader._buffer) <= MAX_MP3_FRAME_SIZE
+        assert mp3_duration_reader.get_duration() == expected_duration
+
+    not_mp3_reader = Mp3DurationReader()
+    not_mp3_reader.update(b"RIFF" + bytes(1000))
+    assert not_mp3_reader.get_duration() == 0
+    assert Mp3DurationReader().get_duration() == 0
+
+
+def test_get_hls_segments():
+    song = read_song()
+    segments = get_hls_segments("song", song, SEGMENT_SECONDS)
+
+    assert len(segments) > 1
+    assert all(segment.duration >= SEGMENT_SECONDS for segment in segments[:-1])
+    total_duration = sum(segment.duration for segment in segments)
+    assert abs(total_duration - SONG_DURATION_SECONDS) < DURATION_TOLERANCE_SECONDS
+
+    for segment in segments:
+        assert segment.data.startswith(b"ID3")
+        audio, sample_rate = soundfile.read(io.BytesIO(segment.data))
+        assert abs(len(audio) / sample_rate - segment.duration) < DURATION_TOLERANCE_SECONDS
+
+
+def test_get_hls_playlist():
+    playlist = get_hls_playlist([6.0, 5.5, 2.25], ["seg/0", "seg/1", "seg/2"])
+    lines = playlist.splitlines()
+
+    assert lines[0] == "#EXTM3U"
+    assert "#EXT-X-TARGETDURATION:6" in lines
+    assert "#EXT-X-PLAYLIST-TYPE:VOD" in lines
+    assert lines[-1] == "#EXT-X-ENDLIST"
+    assert lines.index("#EXTINF:5.500,") + 1 == lines.index("seg/1")
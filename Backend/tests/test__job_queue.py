@@ -0,0 +1,156 @@
+import asyncio
+
+from pytest import mark, raises
+
+from app.spotify_electron.utils.job_queue.job_queue_utils import (
+    Job,
+    JobQueue,
+    JobQueueFullError,
+    JobStatus,
+)
+
+JOB_ERROR = "job error"
+
+
+class JobRecorder:
+    """Records started jobs and finishes them once released"""
+
+    def __init__(self) -> None:
+        self.started: list[str] = []
+        self.release = asyncio.Event()
+
+    async def run(self, job: Job) -> None:
+        """Run a job once released"""
+        self.started.append(job.name)
+        job.progress = 0.5
+        await self.release.wait()
+
+
+async def fail(job: Job) -> None:
+    raise ValueError(JOB_ERROR)
+
+
+async def wait_jobs() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@mark.asyncio
+async def test_job_queue_runs_jobs_with_bounded_workers():
+    job_queue = JobQueue(max_running=1, max_pending=1)
+    recorder = JobRecorder()
+
+    first_job = job_queue.submit("user", "first", recorder.run)
+    second_job = job_queue.submit("user", "second", recorder.run)
+    with raises(JobQueueFullError):
+        job_queue.submit("user", "third", recorder.run)
+    await wait_jobs()
+
+    assert recorder.started == ["first"]
+    assert first_job.status == JobStatus.RUNNING
+    assert first_job.progress == 0.5  # noqa: PLR2004
+    assert second_job.status == JobStatus.PENDING
+
+    recorder.release.set()
+    await wait_jobs()
+
+    assert recorder.started == ["first", "second"]
+    assert first_job.status == second_job.status == JobStatus.COMPLETED
+    assert first_job.progress == 1
+    stats = job_queue.get_stats()
+    assert stats.submitted == 2  # noqa: PLR2004
+    assert stats.rejected == 1
+    assert stats.running == stats.pending == 0
+
+
+@mark.asyncio
+async def test_job_queue_records_failed_jobs():
+    job_queue = JobQueue(max_running=1, max_pending=0)
+
+    failed_job = job_queue.submit("user", "failed", fail)
+    await wait_jobs()
+
+    assert failed_job.status == JobStatus.FAILED
+    assert failed_job.error == JOB_ERROR
+    assert job_queue.get_stats().failed == 1
+
+    running_job = job_queue.submit("user", "running", JobRecorder().run)
+    await job_queue.close()
+
+    assert running_job.status == JobStatus.FAILED
+
+
+def test_job_queue_disabled():
+    job_queue = JobQueue(max_running=0, max_pending=10)
+
+    assert not job_queue.enabled
+    with raises(JobQueueFullError):
+        job_queue.submit("user", "job", fail)
+
+
+@mark.asyncio
+async def test_job_queue_cleans_up_jobs_in_every_final_state():
+    job_queue = JobQueue(max_running=1, max_pending=1)
+    recorder = JobRecorder()
+    cleaned_up: list[str] = []
+
+    def cleanup(name: str):
+        return lambda: cleaned_up.append(name)
+
+    completed_job = job_queue.submit("user", "completed", recorder.run, cleanup("completed"))
+    failed_job = job_queue.submit("user", "failed", fail, cleanup("failed"))
+    with raises(JobQueueFullError):
+        job_queue.submit("user", "rejected", recorder.run, cleanup("rejected"))
+    assert cleaned_up == ["rejected"]
+
+    recorder.release.set()
+    await wait_jobs()
+
+    assert completed_job.status == JobStatus.COMPLETED
+    assert failed_job.status == JobStatus.FAILED
+    assert cleaned_up == ["rejected", "completed", "failed"]
+
+    running_job = job_queue.submit(
+        "user", "cancelled", JobRecorder().run, cleanup("cancelled")
+    )
+    discarded_job = job_queue.submit("user", "discarded", fail, cleanup("discarded"))
+    await wait_jobs()
+    await job_queue.close()
+
+    assert running_job.status == discarded_job.status == JobStatus.FAILED
+    assert sorted(cleaned_up[3:]) == ["cancelled", "discarded"]
+
+
+@mark.asyncio
+async def test_job_queue_reports_job_status_to_listener():
+    job_queue = JobQueue(max_running=1, max_pending=1)
+    recorder = JobRecorder()
+    reported: list[tuple[str, JobStatus, str | None]] = []
+
+    async def listener(job: Job) -> None:
+        reported.append((job.name, job.status, job.error))
+
+    job_queue.submit("user", "completed", recorder.run, listener=listener, job_id="job-id")
+    failed_job = job_queue.submit("user", "failed", fail, listener=listener)
+    recorder.release.set()
+    await wait_jobs()
+
+    assert failed_job.id != "job-id"
+    assert reported == [
+        ("completed", JobStatus.RUNNING, None),
+        ("completed", JobStatus.COMPLETED, None),
+        ("failed", JobStatus.RUNNING, None),
+        ("failed", JobStatus.FAILED, JOB_ERROR),
+    ]
+
+    reported.clear()
+    job_queue.submit("user", "cancelled", JobRecorder().run, listener=listener)
+    job_queue.submit("user", "discarded", fail, listener=listener)
+    await wait_jobs()
+    await job_queue.close()
+
+    assert reported == [
+        ("cancelled", JobStatus.RUNNING, None),
+        ("discarded", JobStatus.FAILED, "Job queue closed"),
+        ("cancelled", JobStatus.FAILED, "Job cancelled"),
+    ]
@@ -0,0 +1,88 @@
+import asyncio
+
+from pytest import mark
+
+from app.spotify_electron.utils.prefetch.prefetch_utils import PrefetchScheduler
+
+
+class PrefetchRecorder:
+    """Records started and finished prefetches"""
+
+    def __init__(self) -> None:
+        self.started: list[str] = []
+        self.finished: list[str] = []
+        self.release = asyncio.Event()
+
+    async def prefetch(self, key: str) -> None:
+        """Prefetch a key once released"""
+        self.started.append(key)
+        await self.release.wait()
+        self.finished.append(key)
+
+
+@mark.asyncio
+async def test_prefetch_scheduler_runs_prefetch():
+    scheduler = PrefetchScheduler(max_running=1)
+    recorder = PrefetchRecorder()
+
+    assert scheduler.schedule("user", "key", recorder.prefetch("key"))
+    await asyncio.sleep(0)
+    recorder.release.set()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert recorder.finished == ["key"]
+    stats = scheduler.get_stats()
+    assert stats.scheduled == 1
+    assert stats.running == 0
+
+
+@mark.asyncio
+async def test_prefetch_scheduler_cancels_previous_prefetch_of_owner():
+    scheduler = PrefetchScheduler(max_running=1)
+    recorder = PrefetchRecorder()
+
+    assert scheduler.schedule("user", "first", recorder.prefetch("first"))
+    await asyncio.sleep(0)
+    assert not scheduler.schedule("user", "first", recorder.prefetch("first"))
+    assert scheduler.schedule("user", "second", recorder.prefetch("second"))
+    await asyncio.sleep(0)
+    recorder.release.set()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert recorder.started == ["first", "second"]
+    assert recorder.finished == ["second"]
+    assert scheduler.get_stats().cancelled == 1
+
+
+@mark.asyncio
+async def test_prefetch_scheduler_cancel():
+    scheduler = PrefetchScheduler(max_running=1)
+    recorder = PrefetchRecorder()
+
+    scheduler.schedule("user", "key", recorder.prefetch("key"))
+    await asyncio.sleep(0)
+    scheduler.cancel("user")
+    recorder.release.set()
+    await asyncio.sleep(0)
+
+    assert recorder.finished == []
+    stats = scheduler.get_stats()
+    assert stats.cancelled == 1
+    assert stats.running == 0
+
+
+@mark.asyncio
+async def test_prefetch_scheduler_max_running():
+    scheduler = PrefetchScheduler(max_running=1)
+    recorder = PrefetchRecorder()
+
+    assert scheduler.schedule("user", "key", recorder.prefetch("key"))
+    assert not scheduler.schedule("other-user", "key", recorder.prefetch("key"))
+    await scheduler.close()
+
+    assert scheduler.get_stats().rejected == 1
+    assert not PrefetchScheduler(max_running=0).schedule(
+        "user", "key", recorder.prefetch("key")
+    )
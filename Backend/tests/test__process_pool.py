@@ -0,0 +1,90 @@
+import asyncio
+import operator
+import threading
+import time
+
+from pytest import mark, raises
+
+from app.spotify_electron.utils.process_pool.process_pool_utils import BoundedProcessPool
+
+CALL_SECONDS = 0.5
+
+
+async def wait_calls() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@mark.asyncio
+async def test_process_pool_waits_when_queue_is_full():
+    process_pool = BoundedProcessPool(max_workers=1, max_queued=1)
+    try:
+        assert process_pool.enabled
+        assert await process_pool.run(operator.add, 1, 2) == 3  # noqa: PLR2004
+
+        calls = [
+            asyncio.create_task(process_pool.run(time.sleep, CALL_SECONDS)) for _ in range(3)
+        ]
+        await wait_calls()
+        stats = process_pool.get_stats()
+        assert stats.running == 2  # noqa: PLR2004
+        assert stats.waiting == 1
+
+        await asyncio.gather(*calls)
+        stats = process_pool.get_stats()
+        assert stats.completed == 4  # noqa: PLR2004
+        assert stats.running == stats.waiting == 0
+    finally:
+        process_pool.close()
+
+
+@mark.asyncio
+async def test_process_pool_cancelled_waiting_call():
+    process_pool = BoundedProcessPool(max_workers=1, max_queued=0)
+    try:
+        running_call = asyncio.create_task(process_pool.run(time.sleep, CALL_SECONDS))
+        waiting_call = asyncio.create_task(process_pool.run(operator.add, 1, 2))
+        await wait_calls()
+        assert process_pool.get_stats().waiting == 1
+
+        waiting_call.cancel()
+        with raises(asyncio.CancelledError):
+            await waiting_call
+        assert process_pool.get_stats().waiting == 0
+
+        await running_call
+        assert await process_pool.run(operator.add, 1, 2) == 3  # noqa: PLR2004
+        assert process_pool.get_stats().running == 0
+    finally:
+        process_pool.close()
+
+
+@mark.asyncio
+async def test_process_pool_without_workers_runs_in_threads():
+    process_pool = BoundedProcessPool(max_workers=0, max_queued=0)
+
+    thread_id = await process_pool.run(threading.get_ident)
+
+    assert not process_pool.enabled
+    assert thread_id != threading.get_ident()
+
+
+@mark.asyncio
+async def test_process_pool_background_calls_leave_a_worker_free():
+    process_pool = BoundedProcessPool(max_workers=2, max_queued=0)
+    try:
+        background_calls = [
+            asyncio.create_task(process_pool.run(time.sleep, CALL_SECONDS, background=True))
+            for _ in range(2)
+        ]
+        await wait_calls()
+        stats = process_pool.get_stats()
+        assert stats.running == stats.waiting == 1
+
+        assert await process_pool.run(operator.add, 1, 2) == 3  # noqa: PLR2004
+        assert not any(call.done() for call in background_calls)
+
+        await asyncio.gather(*background_calls)
+        assert process_pool.get_stats().completed == 3  # noqa: PLR2004
+    finally:
+        process_pool.close()
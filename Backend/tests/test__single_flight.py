@@ -0,0 +1,98 @@
+import asyncio
+
+from pytest import mark, raises
+
+from app.spotify_electron.utils.single_flight.single_flight_utils import SingleFlight
+
+CONCURRENT_CALLS = 10
+LOAD_SECONDS = 0.05
+
+
+class LoadRecorder:
+    """Counts loads and returns a value after a delay"""
+
+    def __init__(self, value: str = "value", error: Exception | None = None) -> None:
+        self.value = value
+        self.error = error
+        self.loads = 0
+
+    async def __call__(self) -> str:
+        """Load the value or raise the requested error"""
+        self.loads += 1
+        await asyncio.sleep(LOAD_SECONDS)
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+@mark.asyncio
+async def test_single_flight_coalesces_concurrent_loads():
+    single_flight: SingleFlight[str] = SingleFlight(timeout_seconds=None)
+    recorder = LoadRecorder()
+
+    values = await asyncio.gather(
+        *[single_flight.do("key", recorder) for _ in range(CONCURRENT_CALLS)]
+    )
+
+    assert values == ["value"] * CONCURRENT_CALLS
+    assert recorder.loads == 1
+    stats = single_flight.get_stats()
+    assert stats.loads == 1
+    assert stats.coalesced == CONCURRENT_CALLS - 1
+    assert stats.in_flight == 0
+
+    assert await single_flight.do("key", recorder) == "value"
+    assert recorder.loads == 2  # noqa: PLR2004
+
+
+@mark.asyncio
+async def test_single_flight_loads_different_keys_separately():
+    single_flight: SingleFlight[str] = SingleFlight(timeout_seconds=None)
+    recorder = LoadRecorder()
+
+    await asyncio.gather(
+        single_flight.do("key", recorder), single_flight.do("other", recorder)
+    )
+
+    assert recorder.loads == 2  # noqa: PLR2004
+
+
+@mark.asyncio
+async def test_single_flight_propagates_errors_to_every_call():
+    single_flight: SingleFlight[str] = SingleFlight(timeout_seconds=None)
+    recorder = LoadRecorder(error=ConnectionError())
+
+    results = await asyncio.gather(
+        *[single_flight.do("key", recorder) for _ in range(CONCURRENT_CALLS)],
+        return_exceptions=True,
+    )
+
+    assert recorder.loads == 1
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert single_flight.get_stats().in_flight == 0
+
+
+@mark.asyncio
+async def test_single_flight_timeout():
+    single_flight: SingleFlight[str] = SingleFlight(timeout_seconds=LOAD_SECONDS / 10)
+    recorder = LoadRecorder()
+
+    with raises(TimeoutError):
+        await single_flight.do("key", recorder)
+    assert single_flight.get_stats().in_flight == 0
+
+
+@mark.asyncio
+async def test_single_flight_cancelled_call_doesnt_cancel_load():
+    single_flight: SingleFlight[str] = SingleFlight(timeout_seconds=None)
+    recorder = LoadRecorder()
+
+    cancelled_call = asyncio.create_task(single_flight.do("key", recorder))
+    await asyncio.sleep(0)
+    waiting_call = asyncio.create_task(single_flight.do("key", recorder))
+    await asyncio.sleep(0)
+    cancelled_call.cancel()
+
+    assert await waiting_call == "value"
+    assert cancelled_call.cancelled()
+    assert recorder.loads == 1
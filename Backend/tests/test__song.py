@@ -1,23 +1,84 @@
-from pytest import fixture
+import asyncio
+import hashlib
+import io
+import json
+import os
+from datetime import UTC, datetime
+
+import anyio
+from fastapi import UploadFile
+from pytest import fixture, mark, raises
 from starlette.status import (
     HTTP_200_OK,
     HTTP_201_CREATED,
     HTTP_202_ACCEPTED,
     HTTP_204_NO_CONTENT,
+    HTTP_207_MULTI_STATUS,
+    HTTP_304_NOT_MODIFIED,
     HTTP_400_BAD_REQUEST,
     HTTP_403_FORBIDDEN,
     HTTP_404_NOT_FOUND,
+    HTTP_409_CONFLICT,
     HTTP_422_UNPROCESSABLE_ENTITY,
+    HTTP_503_SERVICE_UNAVAILABLE,
 )
 
+import app.spotify_electron.song.base_song_repository as base_song_repository
+import app.spotify_electron.song.base_song_service as base_song_service
+import app.spotify_electron.song.blob.providers.song_collection_provider as song_collection_provider  # noqa: E501
+import app.spotify_electron.song.blob.song_repository as song_repository
+import app.spotify_electron.song.blob.song_service as song_service
+import app.spotify_electron.song.song_controller as song_controller
+import app.spotify_electron.song.song_ingest_service as song_ingest_service
+import app.spotify_electron.song.song_upload_service as song_upload_service
+import app.spotify_electron.song.validations.base_song_service_validations as base_song_service_validations  # noqa: E501
+import app.spotify_electron.user.artist.artist_repository as artist_repository
+from app.auth.auth_schema import TokenData
+from app.common.app_schema import AppArchitecture, AppEnvironment
+from app.common.PropertiesManager import PropertiesManager
 from app.spotify_electron.genre.genre_schema import Genre
+from app.spotify_electron.song.base_song_schema import (
+    SongJobDTO,
+    SongJobNotFoundError,
+    SongServiceError,
+    SongUploadBadSizeError,
+    SongUploadNotFoundError,
+)
+from app.spotify_electron.song.providers.song_collection_provider import (
+    get_song_upload_collection,
+)
+from app.spotify_electron.song.providers.song_ingest_provider import SongIngestProvider
+from app.spotify_electron.song.providers.song_upload_provider import (
+    SongUploadProvider,
+    get_song_upload_directory,
+)
+from app.spotify_electron.user.artist.artist_schema import ArtistRepositoryError
+from app.spotify_electron.user.user.user_schema import UserType
+from app.spotify_electron.utils.audio_management.audio_management_utils import (
+    FILE_CHUNK_SIZE,
+)
+from app.spotify_electron.utils.audio_management.mp3_utils import (
+    is_mp3_info_frame,
+    iterate_mp3_frames,
+)
+from app.spotify_electron.utils.audio_management.waveform_utils import WAVEFORM_PEAKS
+from app.spotify_electron.utils.job_queue.job_queue_utils import JobQueue, JobStatus
 from tests.test_API.api_test_artist import create_artist, get_artist
 from tests.test_API.api_test_song import (
+    create_album_songs,
     create_song,
+    create_song_in_background,
+    create_song_upload,
     delete_song,
+    finalize_song_upload,
     get_song,
+    get_song_job,
+    get_song_metadata,
+    get_song_upload,
+    get_song_waveform,
     get_songs_by_genre,
     increase_song_streams,
+    upload_song_chunk,
 )
 from tests.test_API.api_test_user import create_user, delete_user
 from tests.test_API.api_token import get_user_jwt_header
@@ -481,6 +542,7 @@ def test_get_cancion_by_genre(clear_test_data_db):
     res_get_song_by_genre = get_songs_by_genre(genre=genre, headers=jwt_headers)
     assert res_get_song_by_genre.status_code == HTTP_200_OK
     assert len(res_get_song_by_genre.json()["songs"]) == 1
+    assert res_get_song_by_genre.json()["songs"][0]["url"] is None
 
     res_delete_song = delete_song(song_name)
     assert res_delete_song.status_code == HTTP_202_ACCEPTED
@@ -522,3 +584,817 @@ def clear_test_data_db():
     delete_song(song_name)
     delete_user(artista)
     delete_user(artista)
+
+
+@mark.asyncio
+async def test_concurrent_song_metadata_requests_read_database_once(monkeypatch):
+    song_name = "song-name"
+    file_path = "tests/assets/song.mp3"
+    artist_name = "artist-name"
+    genre = "Pop"
+    photo = "https://photo"
+    password = "artist-pass"
+    concurrent_requests = 20
+
+    res_create_artist = create_artist(name=artist_name, password=password, photo=photo)
+    assert res_create_artist.status_code == HTTP_201_CREATED
+
+    jwt_headers = get_user_jwt_header(username=artist_name, password=password)
+
+    res_create_song = create_song(
+        name=song_name,
+        file_path=file_path,
+        genre=genre,
+        photo=photo,
+        headers=jwt_headers,
+    )
+    assert res_create_song.status_code == HTTP_201_CREATED
+
+    database_reads: list[str] = []
+    get_song_metadata = base_song_repository.get_song_metadata
+    check_song_exists = base_song_service_validations.check_song_exists
+
+    async def counted_get_song_metadata(name):
+        database_reads.append("metadata")
+        await asyncio.sleep(0.01)
+        return await get_song_metadata(name)
+
+    async def counted_check_song_exists(name):
+        database_reads.append("exists")
+        await asyncio.sleep(0.01)
+        return await check_song_exists(name)
+
+    monkeypatch.setattr(base_song_repository, "get_song_metadata", counted_get_song_metadata)
+    monkeypatch.setattr(
+        base_song_service_validations, "check_song_exists", counted_check_song_exists
+    )
+
+    songs_metadata = await asyncio.gather(
+        *[base_song_service.get_song_metadata(song_name) for _ in range(concurrent_requests)]
+    )
+    await asyncio.gather(
+        *[
+            base_song_service_validations.validate_song_should_exists(song_name)
+            for _ in range(concurrent_requests)
+        ]
+    )
+
+    assert all(song_metadata.name == song_name for song_metadata in songs_metadata)
+    assert database_reads == ["metadata", "exists"]
+
+    res_delete_song = delete_song(song_name)
+    assert res_delete_song.status_code == HTTP_202_ACCEPTED
+
+    res_delete_artist = delete_user(artist_name)
+    assert res_delete_artist.status_code == HTTP_202_ACCEPTED
+
+
+@mark.asyncio
+async def test_get_songs_metadata_single_query(monkeypatch):
+    song_names = ["song-name-1", "song-name-2"]
+    file_path = "tests/assets/song.mp3"
+    artist_name = "artist-name"
+    genre = "Pop"
+    photo = "https://photo"
+    password = "artist-pass"
+
+    res_create_artist = create_artist(name=artist_name, password=password, photo=photo)
+    assert res_create_artist.status_code == HTTP_201_CREATED
+
+    jwt_headers = get_user_jwt_header(username=artist_name, password=password)
+
+    for song_name in song_names:
+        res_create_song = create_song(
+            name=song_name,
+            file_path=file_path,
+            genre=genre,
+            photo=photo,
+            headers=jwt_headers,
+        )
+        assert res_create_song.status_code == HTTP_201_CREATED
+
+    requested_names = [song_names[1], "missing-song", song_names[0], song_names[1]]
+    songs_dao, missing_names = await base_song_repository.get_songs_metadata_by_names(
+        requested_names
+    )
+    assert [song_dao.name for song_dao in songs_dao] == [
+        song_names[1],
+        song_names[0],
+        song_names[1],
+    ]
+    assert missing_names == ["missing-song"]
+
+    database_reads: list[list[str]] = []
+    get_songs_metadata_by_names = base_song_repository.get_songs_metadata_by_names
+
+    async def counted_get_songs_metadata_by_names(names):
+        database_reads.append(names)
+        return await get_songs_metadata_by_names(names)
+
+    async def failing_get_song_metadata(name):
+        raise AssertionError
+
+    monkeypatch.setattr(
+        base_song_repository,
+        "get_songs_metadata_by_names",
+        counted_get_songs_metadata_by_names,
+    )
+    monkeypatch.setattr(base_song_repository, "get_song_metadata", failing_get_song_metadata)
+
+    found_names = [song_names[1], song_names[0], song_names[1]]
+    songs_metadata = await base_song_service.get_songs_metadata(found_names)
+
+    assert [song_metadata.name for song_metadata in songs_metadata] == found_names
+    assert all(song_metadata.artist == artist_name for song_metadata in songs_metadata)
+    assert database_reads == [found_names]
+
+    with raises(SongServiceError) as exception_info:
+        await base_song_service.get_songs_metadata(requested_names)
+    assert exception_info.value.__cause__ is None
+    assert database_reads == [found_names, requested_names]
+
+    for song_name in song_names:
+        res_delete_song = delete_song(song_name)
+        assert res_delete_song.status_code == HTTP_202_ACCEPTED
+
+    res_delete_artist = delete_user(artist_name)
+    assert res_delete_artist.status_code == HTTP_202_ACCEPTED
+
+
+@mark.asyncio
+async def test_create_song_reads_file_by_chunks():
+    song_name = "song-name"
+    artist_name = "artist-name"
+    photo = "https://photo"
+    password = "artist-pass"
+    song_copies = 20
+
+    song = await anyio.Path("tests/assets/song_4_seconds.mp3").read_bytes()
+    audio_frames = [
+        frame for frame in iterate_mp3_frames(song) if not is_mp3_info_frame(song, frame)
+    ]
+    song_data = (
+        b"".join(song[frame.offset : frame.offset + frame.length] for frame in audio_frames)
+        * song_copies
+    )
+    expected_duration = sum(frame.duration for frame in audio_frames) * song_copies
+
+    class ReadSizesFile(io.BytesIO):
+        read_sizes: list[int] = []
+
+        def read(self, size=-1):
+            self.read_sizes.append(size)
+            return super().read(size)
+
+    res_create_artist = create_artist(name=artist_name, password=password, photo=photo)
+    assert res_create_artist.status_code == HTTP_201_CREATED
+
+    token = TokenData(username=artist_name, role=UserType.ARTIST, token_type="bearer")
+    file = ReadSizesFile(song_data)
+    await song_service.create_song(song_name, Genre.POP, photo, file, token)
+
+    song_document = await song_collection_provider.get_blob_song_collection().find_one(
+        {"filename": song_name}
+    )
+    assert song_document
+    song_data_file = await song_repository.get_song_data_file(song_name)
+    assert song_data_file.length == len(song_data)
+    assert song_document["metadata"]["sha256"] == hashlib.sha256(song_data).hexdigest()
+    assert song_document["metadata"]["seconds_duration"] == int(expected_duration)
+    assert len(file.read_sizes) > 1
+    assert all(0 < read_size <= FILE_CHUNK_SIZE for read_size in file.read_sizes)
+
+    await song_service.delete_song(song_name)
+
+    res_delete_artist = delete_user(artist_name)
+    assert res_delete_artist.status_code == HTTP_202_ACCEPTED
+
+
+@mark.asyncio
+async def test_create_song_job_creates_song_in_background(monkeypatch):
+    song_name = "song-name"
+    artist_name = "artist-name"
+    photo = "https://photo"
+    password = "artist-pass"
+
+    monkeypatch.setattr(
+        SongIngestProvider,
+        "song_ingest_queue",
+        JobQueue(max_running=1, max_pending=1),
+    )
+    res_create_artist = create_artist(name=artist_name, password=password, photo=photo)
+    assert res_create_artist.status_code == HTTP_201_CREATED
+
+    token = TokenData(username=artist_name, role=UserType.ARTIST, token_type="bearer")
+    other_token = TokenData(username="other-user", role=UserType.USER, token_type="bearer")
+    song_data = await anyio.Path("tests/assets/song_4_seconds.mp3").read_bytes()
+    file = io.BytesIO(song_data)
+
+    song_job = await song_ingest_service.create_song_job(
+        song_name, Genre.POP, photo, file, token
+    )
+    assert song_job.status == JobStatus.PENDING
+    while song_job.status in {JobStatus.PENDING, JobStatus.RUNNING}:  # noqa: ASYNC110
+        await asyncio.sleep(0.01)
+        song_job = await song_ingest_service.get_song_job(song_job.id, token)
+
+    assert song_job.name == song_name
+    assert song_job.status == JobStatus.COMPLETED
+    assert song_job.progress == 1
+    assert file.closed
+    assert (await base_song_service.get_song_metadata(song_name)).seconds_duration == 4  # noqa: PLR2004
+    with raises(SongJobNotFoundError):
+        await song_ingest_service.get_song_job(song_job.id, other_token)
+
+    await song_service.delete_song(song_name)
+
+    res_delete_artist = delete_user(artist_name)
+    assert res_delete_artist.status_code == HTTP_202_ACCEPTED
+
+
+@mark.asyncio
+async def test_create_song_job_closes_song_files_of_discarded_jobs(monkeypatch):
+    song_names = ["running-song", "pending-song"]
+    artist_name = "artist-name"
+    photo = "https://photo"
+    password = "artist-pass"
+
+    song_ingest_queue = JobQueue(max_running=1, max_pending=1)
+    monkeypatch.setattr(SongIngestProvider, "song_ingest_queue", song_ingest_queue)
+
+    class BlockedSongService:
+        @staticmethod
+        async def create_song(*args, **kwargs):
+            await asyncio.Event().wait()
+
+    monkeypatch.setattr(song_ingest_service, "get_song_service", BlockedSongService)
+    res_create_artist = create_artist(name=artist_name, password=password, photo=photo)
+    assert res_create_artist.status_code == HTTP_201_CREATED
+
+    token = TokenData(username=artist_name, role=UserType.ARTIST, token_type="bearer")
+    song_data = await anyio.Path("tests/assets/song_4_seconds.mp3").read_bytes()
+    song_files = [io.BytesIO(song_data) for _ in song_names]
+    song_jobs = [
+        await song_ingest_service.create_song_job(
+            song_name, Genre.POP, photo, song_file, token
+        )
+        for song_name, song_file in zip(song_names, song_files, strict=True)
+    ]
+    await asyncio.sleep(0)
+    song_jobs = [
+        await song_ingest_service.get_song_job(song_job.id, token) for song_job in song_jobs
+    ]
+    assert [song_job.status for song_job in song_jobs] == [
+        JobStatus.RUNNING,
+        JobStatus.PENDING,
+    ]
+    assert not any(song_file.closed for song_file in song_files)
+
+    await song_ingest_queue.close()
+
+    assert all(song_file.closed for song_file in song_files)
+    for song_job in song_jobs:
+        song_job_after_close = await song_ingest_service.get_song_job(song_job.id, token)
+        assert song_job_after_close.status == JobStatus.FAILED
+
+    res_delete_artist = delete_user(artist_name)
+    assert res_delete_artist.status_code == HTTP_202_ACCEPTED
+
+
+@mark.asyncio
+async def test_create_song_in_background_keeps_spooled_file_after_request(monkeypatch):
+    song_name = "song-name"
+    artist_name = "artist-name"
+    photo = "https://photo"
+    password = "artist-pass"
+
+    monkeypatch.setattr(
+        SongIngestProvider, "song_ingest_queue", JobQueue(max_running=1, max_pending=1)
+    )
+    res_create_artist = create_artist(name=artist_name, password=password, photo=photo)
+    assert res_create_artist.status_code == HTTP_201_CREATED
+
+    token = TokenData(username=artist_name, role=UserType.ARTIST, token_type="bearer")
+    song_data = await anyio.Path("tests/assets/song_4_seconds.mp3").read_bytes()
+    song_file = io.BytesIO(song_data)
+    upload_file = UploadFile(song_file)
+
+    res_create_song = await song_controller.create_song(
+        song_name, Genre.POP, photo, upload_file, token, background=True
+    )
+    await upload_file.close()
+    assert res_create_song.status_code == HTTP_202_ACCEPTED
+    assert not song_file.closed
+
+    song_job = SongJobDTO(**json.loads(bytes(res_create_song.body)))
+    while song_job.status in {JobStatus.PENDING, JobStatus.RUNNING}:  # noqa: ASYNC110
+        await asyncio.sleep(0.01)
+        song_job = await song_ingest_service.get_song_job(song_job.id, token)
+
+    assert song_job.status == JobStatus.COMPLETED
+    assert song_file.closed
+    assert (await base_song_service.get_song_metadata(song_name)).seconds_duration == 4  # noqa: PLR2004
+
+    await song_service.delete_song(song_name)
+
+    res_delete_artist = delete_user(artist_name)
+    assert res_delete_artist.status_code == HTTP_202_ACCEPTED
+
+
+def test_post_song_in_background_queue_full_and_job_not_found(monkeypatch):
+    song_name = "song-name"
+    file_path = "tests/assets/song_4_seconds.mp3"
+    artist_name = "artist-name"
+    genre = "Pop"
+    photo = "https://photo"
+    password = "artist-pass"
+
+    monkeypatch.setattr(
+        SongIngestProvider,
+        "song_ingest_queue",
+        JobQueue(max_running=0, max_pending=0),
+    )
+    res_create_artist = create_artist(name=artist_name, password=password, photo=photo)
+    assert res_create_artist.status_code == HTTP_201_CREATED
+
+    jwt_headers = get_user_jwt_header(username=artist_name, password=password)
+
+    res_create_song = create_song_in_background(
+        name=song_name,
+        file_path=file_path,
+        genre=genre,
+        photo=photo,
+        headers=jwt_headers,
+    )
+    assert res_create_song.status_code == HTTP_503_SERVICE_UNAVAILABLE
+
+    res_get_song_job = get_song_job("job-id", headers=jwt_headers)
+    assert res_get_song_job.status_code == HTTP_404_NOT_FOUND
+
+    res_get_song = get_song(name=song_name, headers=jwt_headers)
+    assert res_get_song.status_code == HTTP_404_NOT_FOUND
+
+    res_delete_artist = delete_user(artist_name)
+    assert res_delete_artist.status_code == HTTP_202_ACCEPTED
+
+
+def test_post_album_songs_correct(clear_test_data_db):
+    song_names = ["album-song-1", "album-song-2", "album-song-3"]
+    file_path = "tests/assets/song_4_seconds.mp3"
+    artist_name = "artist-name"
+    genre = "Pop"
+    photo = "https://photo"
+    password = "artist-pass"
+
+    res_create_artist = create_artist(name=artist_name, password=password, photo=photo)
+    assert res_create_artist.status_code == HTTP_201_CREATED
+
+    jwt_headers = get_user_jwt_header(username=artist_name, password=password)
+
+    res_create_album = create_album_songs(
+        names=song_names,
+        file_paths=[file_path] * len(song_names),
+        genres=[genre] * len(song_names),
+        photos=[photo] * len(song_names),
+        headers=jwt_headers,
+    )
+    assert res_create_album.status_code == HTTP_201_CREATED
+    tracks = res_create_album.json()["tracks"]
+    assert [track["name"] for track in tracks] == song_names
+    assert all(track["created"] for track in tracks)
+
+    res_get_artist = get_artist(name=artist_name, headers=jwt_headers)
+    assert res_get_artist.status_code == HTTP_200_OK
+    assert res_get_artist.json()["uploaded_songs"] == song_names
+
+    for song_name in song_names:
+        res_get_song = get_song(name=song_name, headers=jwt_headers)
+        assert res_get_song.status_code == HTTP_200_OK
+        assert res_get_song.json()["artist"] == artist_name
+
+        res_delete_song = delete_song(song_name)
+        assert res_delete_song.status_code == HTTP_202_ACCEPTED
+
+    res_delete_artist = delete_user(artist_name)
+    assert res_delete_artist.status_code == HTTP_202_ACCEPTED
+
+
+def test_post_album_songs_partially_created(clear_test_data_db):
+    existing_song_name = "album-existing-song"
+    song_names = ["album-song-1", existing_song_name, "album-song-1"]
+    file_path = "tests/assets/song_4_seconds.mp3"
+    artist_name = "artist-name"
+    genre = "Pop"
+    photo = "https://photo"
+    password = "artist-pass"
+
+    res_create_artist = create_artist(name=artist_name, password=password, photo=photo)
+    assert res_create_artist.status_code == HTTP_201_CREATED
+
+    jwt_headers = get_user_jwt_header(username=artist_name, password=password)
+
+    res_create_song = create_song(
+        name=existing_song_name,
+        file_path=file_path,
+        genre=genre,
+        photo=photo,
+        headers=jwt_headers,
+    )
+    assert res_create_song.status_code == HTTP_201_CREATED
+
+    res_create_album = create_album_songs(
+        names=song_names,
+        file_paths=[file_path] * len(song_names),
+        genres=[genre] * len(song_names),
+        photos=[photo] * len(song_names),
+        headers=jwt_headers,
+    )
+    assert res_create_album.status_code == HTTP_207_MULTI_STATUS
+    tracks = res_create_album.json()["tracks"]
+    assert [track["created"] for track in tracks] == [True, False, False]
+    assert tracks[0]["error"] is None
+    assert tracks[1]["error"]
+    assert tracks[2]["error"]
+
+    res_get_artist = get_artist(name=artist_name, headers=jwt_headers)
+    assert res_get_artist.status_code == HTTP_200_OK
+    assert res_get_artist.json()["uploaded_songs"] == [existing_song_name, "album-song-1"]
+
+    for song_name in (existing_song_name, "album-song-1"):
+        res_delete_song = delete_song(song_name)
+        assert res_delete_song.status_code == HTTP_202_ACCEPTED
+
+    res_delete_artist = delete_user(artist_name)
+    assert res_delete_artist.status_code == HTTP_202_ACCEPTED
+
+
+def test_post_album_songs_not_added_to_artist(clear_test_data_db, monkeypatch):
+    song_names = ["album-song-1", "album-song-2"]
+    file_path = "tests/assets/song_4_seconds.mp3"
+    artist_name = "artist-name"
+    genre = "Pop"
+    photo = "https://photo"
+    password = "artist-pass"
+
+    res_create_artist = create_artist(name=artist_name, password=password, photo=photo)
+    assert res_create_artist.status_code == HTTP_201_CREATED
+
+    jwt_headers = get_user_jwt_header(username=artist_name, password=password)
+
+    async def failing_add_songs_to_artist(artist_name: str, song_names: list[str]) -> None:
+        raise ArtistRepositoryError
+
+    monkeypatch.setattr(artist_repository, "add_songs_to_artist", failing_add_songs_to_artist)
+
+    res_create_album = create_album_songs(
+        names=song_names,
+        file_paths=[file_path] * len(song_names),
+        genres=[genre] * len(song_names),
+        photos=[photo] * len(song_names),
+        headers=jwt_headers,
+    )
+    assert res_create_album.status_code == HTTP_207_MULTI_STATUS
+    tracks = res_create_album.json()["tracks"]
+    assert [track["created"] for track in tracks] == [False, False]
+    assert all(track["error"] for track in tracks)
+
+    for song_name in song_names:
+        res_get_song = get_song(name=song_name, headers=jwt_headers)
+        assert res_get_song.status_code == HTTP_404_NOT_FOUND
+
+    res_get_artist = get_artist(name=artist_name, headers=jwt_headers)
+    assert res_get_artist.status_code == HTTP_200_OK
+    assert res_get_artist.json()["uploaded_songs"] == []
+
+    res_delete_artist = delete_user(artist_name)
+    assert res_delete_artist.status_code == HTTP_202_ACCEPTED
+
+
+def test_post_album_songs_bad_tracks_and_not_artist(clear_test_data_db):
+    song_names = ["album-song-1", "album-song-2"]
+    file_path = "tests/assets/song_4_seconds.mp3"
+    user_name = "user-name"
+    genre = "Pop"
+    photo = "https://photo"
+    password = "user-pass"
+
+    res_create_artist = create_artist(name=user_name, password=password, photo=photo)
+    assert res_create_artist.status_code == HTTP_201_CREATED
+
+    jwt_headers = get_user_jwt_header(username=user_name, password=password)
+
+    res_create_album = create_album_songs(
+        names=song_names,
+        file_paths=[file_path],
+        genres=[genre] * len(song_names),
+        photos=[photo] * len(song_names),
+        headers=jwt_headers,
+    )
+    assert res_create_album.status_code == HTTP_400_BAD_REQUEST
+
+    res_delete_artist = delete_user(user_name)
+    assert res_delete_artist.status_code == HTTP_202_ACCEPTED
+
+    res_create_user = create_user(name=user_name, password=password, photo=photo)
+    assert res_create_user.status_code == HTTP_201_CREATED
+
+    jwt_headers = get_user_jwt_header(username=user_name, password=password)
+
+    res_create_album = create_album_songs(
+        names=song_names,
+        file_paths=[file_path] * len(song_names),
+        genres=[genre] * len(song_names),
+        photos=[photo] * len(song_names),
+        headers=jwt_headers,
+    )
+    assert res_create_album.status_code == HTTP_403_FORBIDDEN
+
+    for song_name in song_names:
+        res_get_song = get_song(name=song_name, headers=jwt_headers)
+        assert res_get_song.status_code == HTTP_404_NOT_FOUND
+
+    res_delete_user = delete_user(user_name)
+    assert res_delete_user.status_code == HTTP_202_ACCEPTED
+
+
+@mark.asyncio
+async def test_songs_with_same_content_share_their_data(clear_test_data_db):
+    song_names = ["first-song", "second-song"]
+    file_path = "tests/assets/song_4_seconds.mp3"
+    artist_name = "artist-name"
+    genre = "Pop"
+    photo = "https://photo"
+    password = "artist-pass"
+
+    res_create_artist = create_artist(name=artist_name, password=password, photo=photo)
+    assert res_create_artist.status_code == HTTP_201_CREATED
+
+    jwt_headers = get_user_jwt_header(username=artist_name, password=password)
+
+    for song_name in song_names:
+        res_create_song = create_song(
+            name=song_name,
+            file_path=file_path,
+            genre=genre,
+            photo=photo,
+            headers=jwt_headers,
+        )
+        assert res_create_song.status_code == HTTP_201_CREATED
+
+    song_bytes = await anyio.Path(file_path).read_bytes()
+    chunks_collection = song_collection_provider.get_blob_song_chunks_collection()
+    content_collection = song_collection_provider.get_blob_song_content_collection()
+    first_data_file = await song_repository.get_song_data_file(song_names[0])
+    second_data_file = await song_repository.get_song_data_file(song_names[1])
+    assert first_data_file.file_id == second_data_file.file_id
+    file_id = first_data_file.file_id
+    song_documents = song_collection_provider.get_blob_song_collection().find(
+        {"filename": {"$in": song_names}}, {"_id": 1}
+    )
+    song_file_ids = [song_document["_id"] async for song_document in song_documents]
+    assert (
+        await chunks_collection.count_documents({"files_id": {"$in": song_file_ids}})
+        == (len(song_bytes) - 1) // first_data_file.chunk_size + 1
+    )
+    content = await content_collection.find_one({"file_id": file_id})
+    assert content
+    assert content["sha256"] == hashlib.sha256(song_bytes).hexdigest()
+    assert content["references"] == len(song_names)
+
+    res_delete_song = delete_song(song_names[0])
+    assert res_delete_song.status_code == HTTP_202_ACCEPTED
+
+    assert await song_service.get_song_data(song_names[1]) == song_bytes
+    content = await content_collection.find_one({"file_id": file_id})
+    assert content
+    assert content["references"] == 1
+
+    res_delete_song = delete_song(song_names[1])
+    assert res_delete_song.status_code == HTTP_202_ACCEPTED
+
+    assert await chunks_collection.count_documents({"files_id": file_id}) == 0
+    assert await content_collection.count_documents({"file_id": file_id}) == 0
+
+    res_delete_artist = delete_user(artist_name)
+    assert res_delete_artist.status_code == HTTP_202_ACCEPTED
+
+
+@mark.asyncio
+async def test_song_content_index_only_created_in_blob_architecture(monkeypatch):
+    def failing_get_blob_song_content_collection():
+        raise AssertionError
+
+    monkeypatch.setattr(
+        PropertiesManager,
+        AppEnvironment.ARCHITECTURE_ENV_NAME,
+        AppArchitecture.ARCH_SERVERLESS,
+    )
+    monkeypatch.setattr(
+        song_collection_provider,
+        "get_blob_song_content_collection",
+        failing_get_blob_song_content_collection,
+    )
+
+    await song_collection_provider.init_blob_song_content_collection()
+
+
+@mark.asyncio
+async def test_get_song_waveform(clear_test_data_db):
+    song_name = "song-name"
+    file_path = "tests/assets/song_4_seconds.mp3"
+    artist_name = "artist-name"
+    genre = "Pop"
+    photo = "https://photo"
+    password = "artist-pass"
+
+    res_create_artist = create_artist(name=artist_name, password=password, photo=photo)
+    assert res_create_artist.status_code == HTTP_201_CREATED
+
+    jwt_headers = get_user_jwt_header(username=artist_name, password=password)
+
+    res_get_song_waveform = get_song_waveform(song_name, headers=jwt_headers)
+    assert res_get_song_waveform.status_code == HTTP_404_NOT_FOUND
+
+    res_create_song = create_song(
+        name=song_name,
+        file_path=file_path,
+        genre=genre,
+        photo=photo,
+        headers=jwt_headers,
+    )
+    assert res_create_song.status_code == HTTP_201_CREATED
+
+    song_data_file = await song_repository.get_song_data_file(song_name)
+    await song_service._process_song(
+        song_name, song_data_file.file_id, create_renditions=False, create_hls=False
+    )
+
+    res_get_song_waveform = get_song_waveform(song_name, headers=jwt_headers)
+    assert res_get_song_waveform.status_code == HTTP_200_OK
+    assert res_get_song_waveform.headers["content-type"] == "application/octet-stream"
+    assert "max-age" in res_get_song_waveform.headers["cache-control"]
+    assert len(res_get_song_waveform.content) == WAVEFORM_PEAKS * 2
+
+    res_get_song_metadata = get_song_metadata(song_name, headers=jwt_headers)
+    assert res_get_song_metadata.status_code == HTTP_200_OK
+    assert isinstance(res_get_song_metadata.json()["gain_db"], float)
+
+    entity_tag = res_get_song_waveform.headers["etag"]
+    res_get_song_waveform = get_song_waveform(
+        song_name, headers={**jwt_headers, "If-None-Match": entity_tag}
+    )
+    assert res_get_song_waveform.status_code == HTTP_304_NOT_MODIFIED
+    assert not res_get_song_waveform.content
+
+    res_get_song_waveform = get_song_waveform(
+        song_name, headers={**jwt_headers, "If-None-Match": f'"other", W/{entity_tag}'}
+    )
+    assert res_get_song_waveform.status_code == HTTP_304_NOT_MODIFIED
+
+    res_delete_song = delete_song(song_name)
+    assert res_delete_song.status_code == HTTP_202_ACCEPTED
+
+    res_delete_artist = delete_user(artist_name)
+    assert res_delete_artist.status_code == HTTP_202_ACCEPTED
+
+
+def test_song_upload_resumed_and_finalized(clear_test_data_db):
+    song_name = "song-name"
+    artist_name = "artist-name"
+    genre = "Pop"
+    photo = "https://photo"
+    password = "artist-pass"
+    with open("tests/assets/song_4_seconds.mp3", "rb") as file:
+        song_data = file.read()
+    half = len(song_data) // 2
+
+    res_create_artist = create_artist(name=artist_name, password=password, photo=photo)
+    assert res_create_artist.status_code == HTTP_201_CREATED
+
+    jwt_headers = get_user_jwt_header(username=artist_name, password=password)
+
+    res_create_song_upload = create_song_upload(
+        song_name, genre, photo, len(song_data), headers=jwt_headers
+    )
+    assert res_create_song_upload.status_code == HTTP_201_CREATED
+    upload_id = res_create_song_upload.json()["id"]
+    assert res_create_song_upload.json()["offset"] == 0
+
+    res_upload_song_chunk = upload_song_chunk(
+        upload_id, 0, song_data[:half], headers=jwt_headers
+    )
+    assert res_upload_song_chunk.status_code == HTTP_204_NO_CONTENT
+    assert res_upload_song_chunk.headers["upload-offset"] == str(half)
+
+    res_upload_song_chunk = upload_song_chunk(
+        upload_id, 0, song_data[:half], headers=jwt_headers
+    )
+    assert res_upload_song_chunk.status_code == HTTP_409_CONFLICT
+
+    res_finalize_song_upload = finalize_song_upload(upload_id, headers=jwt_headers)
+    assert res_finalize_song_upload.status_code == HTTP_409_CONFLICT
+
+    res_get_song_upload = get_song_upload(upload_id, headers=jwt_headers)
+    assert res_get_song_upload.status_code == HTTP_200_OK
+    assert res_get_song_upload.json()["offset"] == half
+
+    res_upload_song_chunk = upload_song_chunk(
+        upload_id, half, song_data[half:], headers=jwt_headers
+    )
+    assert res_upload_song_chunk.status_code == HTTP_204_NO_CONTENT
+    assert res_upload_song_chunk.headers["upload-offset"] == str(len(song_data))
+
+    res_finalize_song_upload = finalize_song_upload(upload_id, headers=jwt_headers)
+    assert res_finalize_song_upload.status_code == HTTP_201_CREATED
+
+    res_get_song = get_song(name=song_name, headers=jwt_headers)
+    assert res_get_song.status_code == HTTP_200_OK
+    assert res_get_song.json()["seconds_duration"] == 4  # noqa: PLR2004
+
+    res_get_song_upload = get_song_upload(upload_id, headers=jwt_headers)
+    assert res_get_song_upload.status_code == HTTP_404_NOT_FOUND
+    assert not os.path.exists(get_song_upload_directory(upload_id))
+
+    res_delete_song = delete_song(song_name)
+    assert res_delete_song.status_code == HTTP_202_ACCEPTED
+
+    res_delete_artist = delete_user(artist_name)
+    assert res_delete_artist.status_code == HTTP_202_ACCEPTED
+
+
+@mark.asyncio
+async def test_song_upload_interrupted_chunk_keeps_received_bytes(clear_test_data_db):
+    artist_name = "artist-name"
+    photo = "https://photo"
+    password = "artist-pass"
+    chunk = b"a" * 1000
+
+    res_create_artist = create_artist(name=artist_name, password=password, photo=photo)
+    assert res_create_artist.status_code == HTTP_201_CREATED
+
+    token = TokenData(username=artist_name, role=UserType.ARTIST, token_type="bearer")
+    other_token = TokenData(username="other-user", role=UserType.USER, token_type="bearer")
+    song_upload = await song_upload_service.create_song_upload(
+        "song-name", Genre.POP, photo, 3 * len(chunk), token
+    )
+
+    async def get_interrupted_chunks():
+        yield chunk
+        raise ConnectionResetError
+
+    offset = await song_upload_service.upload_song_chunk(
+        song_upload.id, 0, get_interrupted_chunks(), token
+    )
+    assert offset == len(chunk)
+    assert (await song_upload_service.get_song_upload(song_upload.id, token)).offset == offset
+    with raises(SongUploadNotFoundError):
+        await song_upload_service.get_song_upload(song_upload.id, other_token)
+
+    async def get_chunks():
+        yield 3 * chunk
+
+    with raises(SongUploadBadSizeError):
+        await song_upload_service.upload_song_chunk(
+            song_upload.id, offset, get_chunks(), token
+        )
+    assert len(os.listdir(get_song_upload_directory(song_upload.id))) == 1
+
+    await get_song_upload_collection().update_one(
+        {"_id": song_upload.id}, {"$set": {"expires_at": datetime.now(UTC)}}
+    )
+    await SongUploadProvider.cleanup()
+
+    with raises(SongUploadNotFoundError):
+        await song_upload_service.get_song_upload(song_upload.id, token)
+    assert not os.path.exists(get_song_upload_directory(song_upload.id))
+
+    res_delete_artist = delete_user(artist_name)
+    assert res_delete_artist.status_code == HTTP_202_ACCEPTED
+
+
+def test_song_upload_bad_size_and_not_found(clear_test_data_db):
+    artist_name = "artist-name"
+    photo = "https://photo"
+    password = "artist-pass"
+
+    res_create_artist = create_artist(name=artist_name, password=password, photo=photo)
+    assert res_create_artist.status_code == HTTP_201_CREATED
+
+    jwt_headers = get_user_jwt_header(username=artist_name, password=password)
+
+    res_create_song_upload = create_song_upload("song-name", "Pop", photo, 0, jwt_headers)
+    assert res_create_song_upload.status_code == HTTP_400_BAD_REQUEST
+
+    res_create_song_upload = create_song_upload(
+        "song-name", "Pop", photo, SongUploadProvider.max_bytes + 1, jwt_headers
+    )
+    assert res_create_song_upload.status_code == HTTP_400_BAD_REQUEST
+
+    res_upload_song_chunk = upload_song_chunk("upload-id", 0, b"chunk", jwt_headers)
+    assert res_upload_song_chunk.status_code == HTTP_404_NOT_FOUND
+
+    res_finalize_song_upload = finalize_song_upload("upload-id", jwt_headers)
+    assert res_finalize_song_upload.status_code == HTTP_404_NOT_FOUND
+
+    res_delete_artist = delete_user(artist_name)
+    assert res_delete_artist.status_code == HTTP_202_ACCEPTED
@@ -0,0 +1,258 @@
+import asyncio
+import json
+
+import httpx
+from pytest import fixture, mark, raises
+from starlette.status import (
+    HTTP_200_OK,
+    HTTP_201_CREATED,
+    HTTP_202_ACCEPTED,
+    HTTP_403_FORBIDDEN,
+    HTTP_503_SERVICE_UNAVAILABLE,
+)
+
+import app.spotify_electron.song.serverless.song_serverless_api as song_serverless_api
+import app.spotify_electron.song.serverless.song_service as song_service
+from app.spotify_electron.song.serverless.providers.song_serverless_client_provider import (
+    SongServerlessClientProvider,
+)
+from app.spotify_electron.song.serverless.providers.song_streaming_url_cache_provider import (
+    SongStreamingUrlCacheProvider,
+)
+from app.spotify_electron.song.serverless.providers.song_streaming_url_provider import (
+    SongStreamingUrlProvider,
+)
+from app.spotify_electron.song.serverless.song_schema import SongCreateSongStreamingError
+from app.spotify_electron.utils.cache.cache_utils import LRUCache
+
+SERVERLESS_URL = "http://serverless"
+BUCKET_URL = "http://bucket"
+CONCURRENT_REQUESTS = 10
+RESPONSE_SECONDS = 0.1
+CONNECTION_RESET = "connection reset"
+URL_CACHE_MAX_BYTES = 1024
+URL_CACHE_TTL_SECONDS = 60
+UPLOAD_MAX_BODY_BYTES = 16
+UPLOAD_PART_BYTES = 10
+URL_BATCH_SIZE = 2
+
+
+class ServerlessStub:
+    """Answers serverless function and bucket requests failing the first ones"""
+
+    def __init__(self, failures: int = 0, connection_failures: int = 0) -> None:
+        self.failures = failures
+        self.connection_failures = connection_failures
+        self.forbidden_parts = 0
+        self.requests: list[httpx.Request] = []
+        self.parts: dict[int, bytes] = {}
+        self.completed_etags: list[str] | None = None
+        self.aborted = False
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        """Answer a request
+
+        Raises:
+            ReadError: while there are connection failures left
+        """
+        self.requests.append(request)
+        if self.connection_failures > 0:
+            self.connection_failures -= 1
+            raise httpx.ReadError(CONNECTION_RESET, request=request)
+        await asyncio.sleep(RESPONSE_SECONDS)
+        if self.failures > 0:
+            self.failures -= 1
+            return httpx.Response(HTTP_503_SERVICE_UNAVAILABLE)
+        if request.method == "PUT":
+            return self._upload_part(request)
+        if request.method == "POST" and "parts" in request.url.params:
+            parts = int(request.url.params["parts"])
+            urls = [f"{BUCKET_URL}/{part_number}" for part_number in range(1, parts + 1)]
+            return httpx.Response(HTTP_200_OK, json={"uploadId": "upload", "urls": urls})
+        if request.method == "POST" and "uploadId" in request.url.params:
+            self.completed_etags = json.loads(request.content)["etags"]
+            return httpx.Response(HTTP_201_CREATED)
+        if request.method == "POST":
+            return httpx.Response(HTTP_201_CREATED)
+        if request.method == "DELETE":
+            self.aborted = "uploadId" in request.url.params
+            return httpx.Response(HTTP_202_ACCEPTED)
+        if "nombres" in request.url.params:
+            names = json.loads(request.url.params["nombres"])
+            urls = {name: f"https://cdn/{name}" for name in names}
+            return httpx.Response(HTTP_200_OK, json={"urls": urls})
+        name = request.url.params["nombre"]
+        return httpx.Response(HTTP_200_OK, json={"url": f"https://cdn/{name}"})
+
+    def _upload_part(self, request: httpx.Request) -> httpx.Response:
+        """Store an uploaded part answering its entity tag"""
+        if self.forbidden_parts > 0:
+            self.forbidden_parts -= 1
+            return httpx.Response(HTTP_403_FORBIDDEN)
+        part_number = int(request.url.path.strip("/"))
+        self.parts[part_number] = request.read()
+        return httpx.Response(HTTP_200_OK, headers={"etag": f'"etag-{part_number}"'})
+
+
+@fixture()
+def serverless_stub(monkeypatch):
+    stub = ServerlessStub()
+    monkeypatch.setattr(
+        SongServerlessClientProvider,
+        "client",
+        httpx.AsyncClient(base_url=SERVERLESS_URL, transport=httpx.MockTransport(stub)),
+    )
+    monkeypatch.setattr(SongServerlessClientProvider, "retries", 2)
+    monkeypatch.setattr(SongServerlessClientProvider, "retry_backoff_seconds", 0)
+    monkeypatch.setattr(
+        SongServerlessClientProvider, "upload_max_body_bytes", UPLOAD_MAX_BODY_BYTES
+    )
+    monkeypatch.setattr(SongServerlessClientProvider, "upload_part_bytes", UPLOAD_PART_BYTES)
+    monkeypatch.setattr(SongServerlessClientProvider, "upload_concurrency", 2)
+    monkeypatch.setattr(SongServerlessClientProvider, "url_batch_size", URL_BATCH_SIZE)
+    monkeypatch.setattr(
+        SongStreamingUrlCacheProvider,
+        "song_streaming_url_cache",
+        LRUCache(
+            max_bytes=URL_CACHE_MAX_BYTES,
+            max_entry_bytes=URL_CACHE_MAX_BYTES,
+            get_size=len,
+            ttl_seconds=URL_CACHE_TTL_SECONDS,
+        ),
+    )
+    monkeypatch.setattr(SongStreamingUrlProvider, "domain", None)
+    return stub
+
+
+@mark.asyncio
+async def test_concurrent_streaming_url_requests_are_not_serialized(serverless_stub):
+    start = asyncio.get_running_loop().time()
+
+    streaming_urls = await asyncio.gather(
+        *[song_service.get_song_streaming_url(f"song-{i}") for i in range(CONCURRENT_REQUESTS)]
+    )
+
+    elapsed_seconds = asyncio.get_running_loop().time() - start
+    assert streaming_urls == [f"https://cdn/song-{i}" for i in range(CONCURRENT_REQUESTS)]
+    assert elapsed_seconds < RESPONSE_SECONDS * CONCURRENT_REQUESTS / 2
+    assert all(
+        str(request.url).startswith(SERVERLESS_URL) for request in serverless_stub.requests
+    )
+
+
+@mark.asyncio
+async def test_safe_requests_are_retried(serverless_stub):
+    serverless_stub.failures = 1
+    serverless_stub.connection_failures = 1
+
+    response = await song_serverless_api.get_song("song")
+    assert response.status_code == HTTP_200_OK
+    assert len(serverless_stub.requests) == 3  # noqa: PLR2004
+
+    serverless_stub.failures = 3
+    response = await song_serverless_api.delete_song("song")
+    assert response.status_code == HTTP_503_SERVICE_UNAVAILABLE
+
+    serverless_stub.connection_failures = 3
+    with raises(httpx.ReadError):
+        await song_serverless_api.get_song("song")
+
+
+@mark.asyncio
+async def test_create_song_is_not_retried_once_sent(serverless_stub):
+    serverless_stub.failures = 1
+
+    response = await song_serverless_api.create_song("song", b"song")
+
+    assert response.status_code == HTTP_503_SERVICE_UNAVAILABLE
+    assert len(serverless_stub.requests) == 1
+
+
+@mark.asyncio
+async def test_streaming_urls_are_cached(serverless_stub):
+    assert await song_service.get_song_streaming_url("song") == "https://cdn/song"
+    assert await song_service.get_song_streaming_url("song") == "https://cdn/song"
+    assert len(serverless_stub.requests) == 1
+
+    SongStreamingUrlCacheProvider.song_streaming_url_cache.invalidate("song")
+    assert await song_service.get_song_streaming_url("song") == "https://cdn/song"
+    assert len(serverless_stub.requests) == 2  # noqa: PLR2004
+
+    stats = SongStreamingUrlCacheProvider.song_streaming_url_cache.get_stats()
+    assert stats.hits == 1
+    assert stats.misses == 2  # noqa: PLR2004
+
+
+@mark.asyncio
+async def test_failed_streaming_urls_are_not_cached(serverless_stub):
+    serverless_stub.failures = 3
+
+    with raises(song_service.SongGetUrlStreamingError):
+        await song_service.get_song_streaming_url("song")
+
+    assert await song_service.get_song_streaming_url("song") == "https://cdn/song"
+
+
+@mark.asyncio
+async def test_streaming_urls_are_built_locally_with_distribution(
+    serverless_stub, monkeypatch
+):
+    monkeypatch.setattr(SongStreamingUrlProvider, "domain", "cdn.test")
+    monkeypatch.setattr(SongStreamingUrlProvider, "base_path", "canciones/")
+
+    streaming_url = await song_service.get_song_streaming_url("song")
+
+    assert streaming_url == "https://cdn.test/canciones/song.mp3"
+    assert not serverless_stub.requests
+
+
+@mark.asyncio
+async def test_small_songs_are_sent_as_raw_body(serverless_stub):
+    file_bytes = b"a" * UPLOAD_MAX_BODY_BYTES
+
+    await song_service._upload_song_file("song", file_bytes)
+
+    [request] = serverless_stub.requests
+    assert request.method == "POST"
+    assert request.headers["content-type"] == "application/octet-stream"
+    assert request.content == file_bytes
+
+
+@mark.asyncio
+async def test_big_songs_are_uploaded_in_parts(serverless_stub):
+    file_bytes = bytes(range(UPLOAD_PART_BYTES * 2 + 5))
+
+    await song_service._upload_song_file("song", file_bytes)
+
+    assert b"".join(serverless_stub.parts[number] for number in (1, 2, 3)) == file_bytes
+    assert serverless_stub.completed_etags == ['"etag-1"', '"etag-2"', '"etag-3"']
+    assert not serverless_stub.aborted
+
+
+@mark.asyncio
+async def test_failed_song_part_aborts_upload(serverless_stub):
+    serverless_stub.forbidden_parts = 1
+
+    with raises(SongCreateSongStreamingError):
+        await song_service._upload_song_file("song", bytes(UPLOAD_PART_BYTES * 3))
+
+    assert serverless_stub.completed_etags is None
+    assert serverless_stub.aborted
+
+
+@mark.asyncio
+async def test_songs_streaming_urls_are_requested_in_batches(serverless_stub):
+    await song_service.get_song_streaming_url("song-0")
+    names = [f"song-{i}" for i in range(5)] + ["song-1"]
+
+    streaming_urls = await song_service.get_songs_streaming_urls(names)
+
+    assert streaming_urls == {f"song-{i}": f"https://cdn/song-{i}" for i in range(5)}
+    batch_requests = serverless_stub.requests[1:]
+    assert [json.loads(request.url.params["nombres"]) for request in batch_requests] == [
+        ["song-1", "song-2"],
+        ["song-3", "song-4"],
+    ]
+
+    await song_service.get_songs_streaming_urls(names)
+    assert len(serverless_stub.requests) == 1 + len(batch_requests)
@@ -1,16 +1,50 @@
+import asyncio
 import os
+from datetime import UTC, datetime
 
-from pytest import fixture
+import anyio
+from pytest import fixture, mark
 from starlette.status import (
+    HTTP_200_OK,
     HTTP_201_CREATED,
     HTTP_202_ACCEPTED,
+    HTTP_204_NO_CONTENT,
     HTTP_206_PARTIAL_CONTENT,
+    HTTP_304_NOT_MODIFIED,
     HTTP_404_NOT_FOUND,
     HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+    HTTP_422_UNPROCESSABLE_ENTITY,
 )
 
-from tests.test_API.api_stream import stream_song
+import app.spotify_electron.song.blob.song_repository as song_repository
+import app.spotify_electron.song.blob.song_service as song_service
+import app.spotify_electron.stream.stream_service as stream_service
+from app.spotify_electron.song.blob.providers.song_data_cache_provider import (
+    SongDataCacheProvider,
+    get_song_data_cache,
+)
+from app.spotify_electron.song.blob.providers.song_prefetch_provider import (
+    SongPrefetchProvider,
+)
+from app.spotify_electron.song.blob.song_schema import (
+    CachedSongData,
+    SongDataFileDAO,
+    SongQuality,
+)
+from app.spotify_electron.utils.cache.cache_utils import LRUCache
+from app.spotify_electron.utils.cache.disk_cache_utils import DiskCache
+from app.spotify_electron.utils.prefetch.prefetch_utils import PrefetchScheduler
+from tests.test_API.api_stream import (
+    stream_song,
+    stream_song_hls_playlist,
+    stream_song_hls_segment,
+)
 from tests.test_API.api_test_artist import create_artist
+from tests.test_API.api_test_playlist import (
+    add_songs_to_playlist,
+    create_playlist,
+    delete_playlist,
+)
 from tests.test_API.api_test_song import create_song, delete_song
 from tests.test_API.api_test_user import create_user, delete_user
 from tests.test_API.api_token import get_user_jwt_header
@@ -25,7 +59,7 @@ SONG_PATH = "tests/assets/song_4_seconds.mp3"
 SONG_BYTES_SIZE = os.path.getsize(SONG_PATH)
 
 
-def test_stream_controller_song_invalid_range_no_range_header():
+def test_stream_controller_song_no_range_header_streams_whole_song():
     song_name = "song-name"
     artist_name = "artist-name"
     genre = "Pop"
@@ -47,7 +81,11 @@ def test_stream_controller_song_invalid_range_no_range_header():
     assert res_create_song.status_code == HTTP_201_CREATED
 
     res_stream_song = stream_song(song_name, jwt_headers)
-    assert res_stream_song.status_code == HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+    assert res_stream_song.status_code == HTTP_200_OK
+    assert res_stream_song.headers["content-length"] == str(SONG_BYTES_SIZE)
+    assert "content-range" not in res_stream_song.headers
+    with open(SONG_PATH, "rb") as song_file:
+        assert res_stream_song.content == song_file.read()
 
     res_delete_song = delete_song(song_name)
     assert res_delete_song.status_code == HTTP_202_ACCEPTED
@@ -183,3 +221,677 @@ def test_stream_controller_song_range_correct():
 
     res_delete_artist = delete_user(artist_name)
     assert res_delete_artist.status_code == HTTP_202_ACCEPTED
+
+
+def test_stream_controller_song_range_content_correct():
+    song_name = "song-name"
+    artist_name = "artist-name"
+    genre = "Pop"
+    photo = "https://photo"
+    password = "artist-pass"
+
+    start_requested_bytes = 1000
+    end_requested_bytes = SONG_BYTES_SIZE - 1000
+
+    with open(SONG_PATH, "rb") as file:
+        song_bytes = file.read()
+
+    res_create_artist = create_artist(name=artist_name, password=password, photo=photo)
+    assert res_create_artist.status_code == HTTP_201_CREATED
+
+    jwt_headers = get_user_jwt_header(username=artist_name, password=password)
+
+    res_create_song = create_song(
+        name=song_name,
+        file_path=SONG_PATH,
+        genre=genre,
+        photo=photo,
+        headers=jwt_headers,
+    )
+    assert res_create_song.status_code == HTTP_201_CREATED
+
+    byte_range_headers = {"Range": f"bytes={start_requested_bytes}-{end_requested_bytes}"}
+
+    res_stream_song = stream_song(song_name, {**jwt_headers, **byte_range_headers})
+    assert res_stream_song.status_code == HTTP_206_PARTIAL_CONTENT
+    expected_song_bytes = song_bytes[start_requested_bytes : end_requested_bytes + 1]
+    assert res_stream_song.content == expected_song_bytes
+
+    res_delete_song = delete_song(song_name)
+    assert res_delete_song.status_code == HTTP_202_ACCEPTED
+
+    res_delete_artist = delete_user(artist_name)
+    assert res_delete_artist.status_code == HTTP_202_ACCEPTED
+
+
+@mark.asyncio
+async def test_get_song_data_range_only_reads_overlapping_chunks(monkeypatch):
+    chunk_size = 10
+    song_bytes = bytes(range(95))
+    chunks = [song_bytes[i : i + chunk_size] for i in range(0, len(song_bytes), chunk_size)]
+    requested_chunks: list[tuple[int, int]] = []
+
+    async def get_song_data_chunks(file_id, first_chunk, last_chunk, bucket=None):
+        requested_chunks.append((first_chunk, last_chunk))
+        for chunk in chunks[first_chunk : last_chunk + 1]:
+            yield chunk
+
+    monkeypatch.setattr(song_repository, "get_song_data_chunks", get_song_data_chunks)
+    monkeypatch.setattr(
+        SongDataCacheProvider,
+        "song_data_cache",
+        LRUCache(max_bytes=0, max_entry_bytes=0, get_size=len),
+    )
+
+    song_data_file = SongDataFileDAO(
+        name="song-name",
+        file_id="file-id",
+        length=len(song_bytes),
+        chunk_size=chunk_size,
+        upload_date=datetime.now(UTC),
+    )
+
+    start, end = 25, 61
+    data = b"".join(
+        [chunk async for chunk in song_service.get_song_data_range(song_data_file, start, end)]
+    )
+
+    assert data == song_bytes[start : end + 1]
+    assert requested_chunks == [(2, 6)]
+
+
+def test_stream_controller_song_served_from_cache():
+    song_name = "song-name"
+    artist_name = "artist-name"
+    genre = "Pop"
+    photo = "https://photo"
+    password = "artist-pass"
+
+    with open(SONG_PATH, "rb") as file:
+        song_bytes = file.read()
+
+    res_create_artist = create_artist(name=artist_name, password=password, photo=photo)
+    assert res_create_artist.status_code == HTTP_201_CREATED
+
+    jwt_headers = get_user_jwt_header(username=artist_name, password=password)
+
+    res_create_song = create_song(
+        name=song_name,
+        file_path=SONG_PATH,
+        genre=genre,
+        photo=photo,
+        headers=jwt_headers,
+    )
+    assert res_create_song.status_code == HTTP_201_CREATED
+
+    song_data_cache = get_song_data_cache()
+    stats_before = song_data_cache.get_stats()
+
+    byte_range_headers = {"Range": "bytes=0-"}
+
+    res_stream_song = stream_song(song_name, {**jwt_headers, **byte_range_headers})
+    assert res_stream_song.status_code == HTTP_206_PARTIAL_CONTENT
+    assert res_stream_song.content == song_bytes
+
+    res_stream_song = stream_song(song_name, {**jwt_headers, **byte_range_headers})
+    assert res_stream_song.status_code == HTTP_206_PARTIAL_CONTENT
+    assert res_stream_song.content == song_bytes
+
+    stats_after = song_data_cache.get_stats()
+    assert stats_after.misses == stats_before.misses + 1
+    assert stats_after.hits == stats_before.hits + 1
+    song_file_id = res_stream_song.headers["etag"].strip('"').split("-")[0]
+    cache_key = song_service._get_song_content_cache_key(song_file_id)
+    assert song_data_cache.get(cache_key) is not None
+
+    res_delete_song = delete_song(song_name)
+    assert res_delete_song.status_code == HTTP_202_ACCEPTED
+    assert song_data_cache.get(cache_key) is None
+
+    res_delete_artist = delete_user(artist_name)
+    assert res_delete_artist.status_code == HTTP_202_ACCEPTED
+
+
+def test_stream_controller_song_served_from_disk_cache(monkeypatch, tmp_path):
+    song_name = "song-name"
+    artist_name = "artist-name"
+    genre = "Pop"
+    photo = "https://photo"
+    password = "artist-pass"
+
+    with open(SONG_PATH, "rb") as file:
+        song_bytes = file.read()
+
+    song_data_disk_cache = DiskCache(
+        directory=str(tmp_path), max_bytes=SONG_BYTES_SIZE, max_entry_bytes=SONG_BYTES_SIZE
+    )
+    song_data_disk_cache.init_directory()
+    monkeypatch.setattr(
+        SongDataCacheProvider,
+        "song_data_cache",
+        LRUCache(max_bytes=0, max_entry_bytes=0, get_size=len),
+    )
+    monkeypatch.setattr(SongDataCacheProvider, "song_data_disk_cache", song_data_disk_cache)
+
+    res_create_artist = create_artist(name=artist_name, password=password, photo=photo)
+    assert res_create_artist.status_code == HTTP_201_CREATED
+
+    jwt_headers = get_user_jwt_header(username=artist_name, password=password)
+
+    res_create_song = create_song(
+        name=song_name,
+        file_path=SONG_PATH,
+        genre=genre,
+        photo=photo,
+        headers=jwt_headers,
+    )
+    assert res_create_song.status_code == HTTP_201_CREATED
+
+    byte_range_headers = {"Range": "bytes=100-"}
+
+    res_stream_song = stream_song(song_name, {**jwt_headers, **byte_range_headers})
+    assert res_stream_song.status_code == HTTP_206_PARTIAL_CONTENT
+    assert res_stream_song.content == song_bytes[100:]
+
+    res_stream_song = stream_song(song_name, {**jwt_headers, **byte_range_headers})
+    assert res_stream_song.status_code == HTTP_206_PARTIAL_CONTENT
+    assert res_stream_song.content == song_bytes[100:]
+
+    stats = song_data_disk_cache.get_stats()
+    assert stats.entries == 1
+    assert stats.hits == 2  # noqa: PLR2004
+
+    res_delete_song = delete_song(song_name)
+    assert res_delete_song.status_code == HTTP_202_ACCEPTED
+    assert song_data_disk_cache.get_stats().entries == 0
+    song_data_disk_cache.close()
+
+    res_delete_artist = delete_user(artist_name)
+    assert res_delete_artist.status_code == HTTP_202_ACCEPTED
+
+
+def test_stream_controller_song_conditional_requests():
+    song_name = "song-name"
+    artist_name = "artist-name"
+    genre = "Pop"
+    photo = "https://photo"
+    password = "artist-pass"
+
+    res_create_artist = create_artist(name=artist_name, password=password, photo=photo)
+    assert res_create_artist.status_code == HTTP_201_CREATED
+
+    jwt_headers = get_user_jwt_header(username=artist_name, password=password)
+
+    res_create_song = create_song(
+        name=song_name,
+        file_path=SONG_PATH,
+        genre=genre,
+        photo=photo,
+        headers=jwt_headers,
+    )
+    assert res_create_song.status_code == HTTP_201_CREATED
+
+    byte_range_headers = {"Range": "bytes=0-99"}
+
+    res_stream_song = stream_song(song_name, {**jwt_headers, **byte_range_headers})
+    assert res_stream_song.status_code == HTTP_206_PARTIAL_CONTENT
+    entity_tag = res_stream_song.headers["etag"]
+    last_modified = res_stream_song.headers["last-modified"]
+    assert entity_tag
+    assert last_modified
+
+    res_not_modified = stream_song(song_name, {**jwt_headers, "If-None-Match": entity_tag})
+    assert res_not_modified.status_code == HTTP_304_NOT_MODIFIED
+    assert res_not_modified.headers["etag"] == entity_tag
+    assert res_not_modified.content == b""
+
+    res_weak_not_modified = stream_song(
+        song_name, {**jwt_headers, "If-None-Match": f'"other", W/{entity_tag}'}
+    )
+    assert res_weak_not_modified.status_code == HTTP_304_NOT_MODIFIED
+
+    res_modified = stream_song(song_name, {**jwt_headers, "If-None-Match": '"other"'})
+    assert res_modified.status_code == HTTP_200_OK
+
+    res_if_range_matched = stream_song(
+        song_name, {**jwt_headers, **byte_range_headers, "If-Range": entity_tag}
+    )
+    assert res_if_range_matched.status_code == HTTP_206_PARTIAL_CONTENT
+
+    res_if_range_date_matched = stream_song(
+        song_name, {**jwt_headers, **byte_range_headers, "If-Range": last_modified}
+    )
+    assert res_if_range_date_matched.status_code == HTTP_206_PARTIAL_CONTENT
+
+    res_if_range_not_matched = stream_song(
+        song_name, {**jwt_headers, **byte_range_headers, "If-Range": '"other"'}
+    )
+    assert res_if_range_not_matched.status_code == HTTP_200_OK
+    assert res_if_range_not_matched.headers["content-length"] == str(SONG_BYTES_SIZE)
+
+    res_delete_song = delete_song(song_name)
+    assert res_delete_song.status_code == HTTP_202_ACCEPTED
+
+    res_delete_artist = delete_user(artist_name)
+    assert res_delete_artist.status_code == HTTP_202_ACCEPTED
+
+
+def test_stream_controller_song_multiple_ranges():
+    song_name = "song-name"
+    artist_name = "artist-name"
+    genre = "Pop"
+    photo = "https://photo"
+    password = "artist-pass"
+
+    res_create_artist = create_artist(name=artist_name, password=password, photo=photo)
+    assert res_create_artist.status_code == HTTP_201_CREATED
+
+    jwt_headers = get_user_jwt_header(username=artist_name, password=password)
+
+    res_create_song = create_song(
+        name=song_name,
+        file_path=SONG_PATH,
+        genre=genre,
+        photo=photo,
+        headers=jwt_headers,
+    )
+    assert res_create_song.status_code == HTTP_201_CREATED
+
+    with open(SONG_PATH, "rb") as song_file:
+        song_bytes = song_file.read()
+
+    byte_range_headers = {"Range": "bytes=0-99, 60000-60099, -50"}
+
+    res_stream_song = stream_song(song_name, {**jwt_headers, **byte_range_headers})
+    assert res_stream_song.status_code == HTTP_206_PARTIAL_CONTENT
+
+    content_type = res_stream_song.headers["content-type"]
+    assert content_type.startswith("multipart/byteranges; boundary=")
+    boundary = content_type.split("boundary=")[1]
+    assert res_stream_song.headers["content-length"] == str(len(res_stream_song.content))
+
+    expected_ranges = [(0, 99), (60000, 60099), (SONG_BYTES_SIZE - 50, SONG_BYTES_SIZE - 1)]
+    expected_content = b"".join(
+        f"--{boundary}\r\nContent-Type: audio/mp3\r\n"
+        f"Content-Range: bytes {start}-{end}/{SONG_BYTES_SIZE}\r\n\r\n".encode()
+        + song_bytes[start : end + 1]
+        + b"\r\n"
+        for start, end in expected_ranges
+    )
+    expected_content += f"--{boundary}--\r\n".encode()
+    assert res_stream_song.content == expected_content
+
+    res_delete_song = delete_song(song_name)
+    assert res_delete_song.status_code == HTTP_202_ACCEPTED
+
+    res_delete_artist = delete_user(artist_name)
+    assert res_delete_artist.status_code == HTTP_202_ACCEPTED
+
+
+@mark.asyncio
+async def test_stream_song_quality_renditions():
+    song_name = "song-name"
+    artist_name = "artist-name"
+    genre = "Pop"
+    photo = "https://photo"
+    password = "artist-pass"
+
+    res_create_artist = create_artist(name=artist_name, password=password, photo=photo)
+    assert res_create_artist.status_code == HTTP_201_CREATED
+
+    jwt_headers = get_user_jwt_header(username=artist_name, password=password)
+
+    res_create_song = create_song(
+        name=song_name,
+        file_path=SONG_PATH,
+        genre=genre,
+        photo=photo,
+        headers=jwt_headers,
+    )
+    assert res_create_song.status_code == HTTP_201_CREATED
+
+    res_stream_song = stream_song(song_name, jwt_headers, quality=SongQuality.LOW)
+    assert res_stream_song.status_code == HTTP_200_OK
+    assert res_stream_song.headers["content-length"] == str(SONG_BYTES_SIZE)
+
+    song_data_file = await song_repository.get_song_data_file(song_name)
+    await song_service._process_song(
+        song_name, song_data_file.file_id, create_renditions=True, create_hls=False
+    )
+
+    res_stream_low_song = stream_song(song_name, jwt_headers, quality=SongQuality.LOW)
+    assert res_stream_low_song.status_code == HTTP_200_OK
+    assert int(res_stream_low_song.headers["content-length"]) < SONG_BYTES_SIZE
+    assert res_stream_low_song.headers["etag"] != res_stream_song.headers["etag"]
+
+    res_stream_medium_song = stream_song(song_name, jwt_headers, quality=SongQuality.MEDIUM)
+    assert res_stream_medium_song.status_code == HTTP_200_OK
+    assert len(res_stream_low_song.content) < len(res_stream_medium_song.content)
+
+    res_stream_invalid_quality = stream_song(song_name, jwt_headers, quality="invalid")
+    assert res_stream_invalid_quality.status_code == HTTP_422_UNPROCESSABLE_ENTITY
+
+    res_delete_song = delete_song(song_name)
+    assert res_delete_song.status_code == HTTP_202_ACCEPTED
+    assert (
+        await song_repository.get_song_rendition_data_file(
+            song_name, song_data_file.file_id, SongQuality.LOW
+        )
+        is None
+    )
+
+    res_delete_artist = delete_user(artist_name)
+    assert res_delete_artist.status_code == HTTP_202_ACCEPTED
+
+
+@mark.asyncio
+async def test_stream_song_hls():
+    song_name = "song-name"
+    artist_name = "artist-name"
+    genre = "Pop"
+    photo = "https://photo"
+    password = "artist-pass"
+
+    res_create_artist = create_artist(name=artist_name, password=password, photo=photo)
+    assert res_create_artist.status_code == HTTP_201_CREATED
+
+    jwt_headers = get_user_jwt_header(username=artist_name, password=password)
+
+    res_create_song = create_song(
+        name=song_name,
+        file_path=SONG_PATH,
+        genre=genre,
+        photo=photo,
+        headers=jwt_headers,
+    )
+    assert res_create_song.status_code == HTTP_201_CREATED
+
+    res_playlist_not_packaged = stream_song_hls_playlist(song_name, jwt_headers)
+    assert res_playlist_not_packaged.status_code == HTTP_404_NOT_FOUND
+
+    song_data_file = await song_repository.get_song_data_file(song_name)
+    version = str(song_data_file.file_id)
+    await song_service._process_song(
+        song_name, song_data_file.file_id, create_renditions=False, create_hls=True
+    )
+
+    res_playlist = stream_song_hls_playlist(song_name, jwt_headers)
+    assert res_playlist.status_code == HTTP_200_OK
+    assert res_playlist.headers["content-type"] == "application/vnd.apple.mpegurl"
+    assert res_playlist.headers["cache-control"] == "no-cache"
+    playlist = res_playlist.text
+    assert playlist.startswith("#EXTM3U")
+    assert playlist.rstrip().endswith("#EXT-X-ENDLIST")
+    assert f"seg/0?version={version}" in playlist
+    segments_count = playlist.count("#EXTINF:")
+    assert segments_count > 0
+
+    res_segment = stream_song_hls_segment(song_name, 0, jwt_headers, version=version)
+    assert res_segment.status_code == HTTP_200_OK
+    assert res_segment.headers["content-type"] == "audio/mpeg"
+    assert "immutable" in res_segment.headers["cache-control"]
+    assert res_segment.content.startswith(b"ID3")
+
+    res_segment_range = stream_song_hls_segment(
+        song_name, 0, {**jwt_headers, "Range": "bytes=0-9"}, version=version
+    )
+    assert res_segment_range.status_code == HTTP_206_PARTIAL_CONTENT
+    assert res_segment_range.content == res_segment.content[:10]
+
+    res_segment_not_modified = stream_song_hls_segment(
+        song_name,
+        0,
+        {**jwt_headers, "If-None-Match": res_segment.headers["etag"]},
+        version=version,
+    )
+    assert res_segment_not_modified.status_code == HTTP_304_NOT_MODIFIED
+
+    res_unversioned_segment = stream_song_hls_segment(song_name, 0, jwt_headers)
+    assert res_unversioned_segment.status_code == HTTP_200_OK
+    assert res_unversioned_segment.headers["cache-control"] == "no-cache"
+
+    res_segment_old_version = stream_song_hls_segment(
+        song_name, 0, jwt_headers, version="old-version"
+    )
+    assert res_segment_old_version.status_code == HTTP_404_NOT_FOUND
+
+    res_segment_not_found = stream_song_hls_segment(
+        song_name, segments_count, jwt_headers, version=version
+    )
+    assert res_segment_not_found.status_code == HTTP_404_NOT_FOUND
+
+    res_delete_song = delete_song(song_name)
+    assert res_delete_song.status_code == HTTP_202_ACCEPTED
+    assert (
+        await song_repository.get_song_hls_data_file(
+            f"{song_name}/index.m3u8", song_data_file.file_id
+        )
+        is None
+    )
+
+    res_playlist_song_not_found = stream_song_hls_playlist(song_name, jwt_headers)
+    assert res_playlist_song_not_found.status_code == HTTP_404_NOT_FOUND
+
+    res_delete_artist = delete_user(artist_name)
+    assert res_delete_artist.status_code == HTTP_202_ACCEPTED
+
+
+@mark.asyncio
+async def test_delete_song_invalidates_cached_hls_segments():
+    song_name = "song-name"
+    artist_name = "artist-name"
+    genre = "Pop"
+    photo = "https://photo"
+    password = "artist-pass"
+
+    res_create_artist = create_artist(name=artist_name, password=password, photo=photo)
+    assert res_create_artist.status_code == HTTP_201_CREATED
+
+    jwt_headers = get_user_jwt_header(username=artist_name, password=password)
+
+    res_create_song = create_song(
+        name=song_name,
+        file_path=SONG_PATH,
+        genre=genre,
+        photo=photo,
+        headers=jwt_headers,
+    )
+    assert res_create_song.status_code == HTTP_201_CREATED
+
+    song_data_file = await song_repository.get_song_data_file(song_name)
+    version = str(song_data_file.file_id)
+    await song_service._process_song(
+        song_name, song_data_file.file_id, create_renditions=False, create_hls=True
+    )
+
+    res_segment = stream_song_hls_segment(song_name, 0, jwt_headers, version=version)
+    assert res_segment.status_code == HTTP_200_OK
+
+    segment_data_file = await song_repository.get_song_hls_data_file(
+        f"{song_name}/seg/0", song_data_file.file_id
+    )
+    assert segment_data_file
+    segment_cache_key = song_service._get_song_data_cache_key(segment_data_file)
+    assert get_song_data_cache().get(segment_cache_key)
+
+    res_delete_song = delete_song(song_name)
+    assert res_delete_song.status_code == HTTP_202_ACCEPTED
+    assert get_song_data_cache().get(segment_cache_key) is None
+
+    res_delete_artist = delete_user(artist_name)
+    assert res_delete_artist.status_code == HTTP_202_ACCEPTED
+
+
+@mark.asyncio
+async def test_concurrent_stream_requests_read_database_once(monkeypatch):
+    song_name = "song-name"
+    artist_name = "artist-name"
+    genre = "Pop"
+    photo = "https://photo"
+    password = "artist-pass"
+    concurrent_requests = 20
+
+    song_bytes = await anyio.Path(SONG_PATH).read_bytes()
+
+    res_create_artist = create_artist(name=artist_name, password=password, photo=photo)
+    assert res_create_artist.status_code == HTTP_201_CREATED
+
+    jwt_headers = get_user_jwt_header(username=artist_name, password=password)
+
+    res_create_song = create_song(
+        name=song_name,
+        file_path=SONG_PATH,
+        genre=genre,
+        photo=photo,
+        headers=jwt_headers,
+    )
+    assert res_create_song.status_code == HTTP_201_CREATED
+
+    monkeypatch.setattr(
+        SongDataCacheProvider,
+        "song_data_cache",
+        LRUCache[CachedSongData](
+            max_bytes=SONG_BYTES_SIZE,
+            max_entry_bytes=SONG_BYTES_SIZE,
+            get_size=lambda cached_song_data: len(cached_song_data.data),
+        ),
+    )
+    database_reads: list[str] = []
+    get_song_data_file = song_repository.get_song_data_file
+    get_song_data_chunks = song_repository.get_song_data_chunks
+
+    async def counted_get_song_data_file(name):
+        database_reads.append("file")
+        await asyncio.sleep(0.01)
+        return await get_song_data_file(name)
+
+    async def counted_get_song_data_chunks(file_id, first_chunk, last_chunk, bucket):
+        database_reads.append("data")
+        await asyncio.sleep(0.01)
+        async for chunk in get_song_data_chunks(file_id, first_chunk, last_chunk, bucket):
+            yield chunk
+
+    monkeypatch.setattr(song_repository, "get_song_data_file", counted_get_song_data_file)
+    monkeypatch.setattr(song_repository, "get_song_data_chunks", counted_get_song_data_chunks)
+
+    async def stream(name: str) -> bytes:
+        content = await stream_service.get_stream_audio_data(None, name)
+        return b"".join(
+            [chunk async for chunk in stream_service.stream_audio_content(content)]
+        )
+
+    songs_data = await asyncio.gather(*[stream(song_name) for _ in range(concurrent_requests)])
+
+    assert all(song_data == song_bytes for song_data in songs_data)
+    assert database_reads == ["file", "data"]
+
+    res_delete_song = delete_song(song_name)
+    assert res_delete_song.status_code == HTTP_202_ACCEPTED
+
+    res_delete_artist = delete_user(artist_name)
+    assert res_delete_artist.status_code == HTTP_202_ACCEPTED
+
+
+def test_get_upcoming_song_names():
+    song_names = ["first", "second", "third", "fourth", "fifth"]
+
+    assert stream_service._get_upcoming_song_names(song_names, [], "second", 3) == [
+        "third",
+        "fourth",
+        "fifth",
+    ]
+    assert stream_service._get_upcoming_song_names(song_names, [], "fifth", 2) == [
+        "first",
+        "second",
+    ]
+    assert stream_service._get_upcoming_song_names(song_names, ["third"], "second", 3) == [
+        "fourth",
+        "fifth",
+        "first",
+    ]
+    assert stream_service._get_upcoming_song_names(song_names, [], "other", 1) == ["first"]
+    assert stream_service._get_upcoming_song_names([], [], "other", 1) == []
+
+
+@mark.asyncio
+async def test_stream_song_from_playlist_prefetches_upcoming_songs(monkeypatch, tmp_path):
+    song_names = ["first-song", "second-song", "third-song"]
+    playlist_name = "playlist-name"
+    artist_name = "artist-name"
+    genre = "Pop"
+    photo = "https://photo"
+    password = "artist-pass"
+
+    res_create_artist = create_artist(name=artist_name, password=password, photo=photo)
+    assert res_create_artist.status_code == HTTP_201_CREATED
+
+    jwt_headers = get_user_jwt_header(username=artist_name, password=password)
+
+    song_bytes = await anyio.Path(SONG_PATH).read_bytes()
+    for number, song_name in enumerate(song_names):
+        # Songs with the same content share their cached data
+        song_path = anyio.Path(tmp_path / f"{song_name}.mp3")
+        await song_path.write_bytes(song_bytes[:-100] + bytes([number]) + song_bytes[-99:])
+        res_create_song = create_song(
+            name=song_name,
+            file_path=str(song_path),
+            genre=genre,
+            photo=photo,
+            headers=jwt_headers,
+        )
+        assert res_create_song.status_code == HTTP_201_CREATED
+    cache_keys = [
+        song_service._get_song_data_cache_key(
+            await song_repository.get_song_data_file(song_name)
+        )
+        for song_name in song_names
+    ]
+
+    res_create_playlist = create_playlist(
+        name=playlist_name, descripcion="description", photo=photo, headers=jwt_headers
+    )
+    assert res_create_playlist.status_code == HTTP_201_CREATED
+    res_add_songs = add_songs_to_playlist(playlist_name, song_names, jwt_headers)
+    assert res_add_songs.status_code == HTTP_204_NO_CONTENT
+
+    song_data_cache = LRUCache[CachedSongData](
+        max_bytes=SONG_BYTES_SIZE * len(song_names),
+        max_entry_bytes=SONG_BYTES_SIZE,
+        get_size=lambda cached_song_data: len(cached_song_data.data),
+    )
+    monkeypatch.setattr(SongDataCacheProvider, "song_data_cache", song_data_cache)
+
+    scheduler = PrefetchScheduler(max_running=1)
+    monkeypatch.setattr(SongPrefetchProvider, "song_prefetch_scheduler", scheduler)
+    monkeypatch.setattr(SongPrefetchProvider, "prefetch_songs", 1)
+
+    await stream_service.get_stream_audio_data(
+        None, song_names[0], user_name=artist_name, playlist=playlist_name
+    )
+    async with asyncio.timeout(5):
+        while scheduler.get_stats().running > 0:  # noqa: ASYNC110
+            await asyncio.sleep(0.01)
+
+    assert scheduler.get_stats().scheduled == 1
+    assert song_data_cache.get(cache_keys[1]) is not None
+    assert song_data_cache.get(cache_keys[2]) is None
+
+    stats_before = song_data_cache.get_stats()
+    content = await stream_service.get_stream_audio_data(
+        None, song_names[1], user_name=artist_name
+    )
+    song_data = b"".join(
+        [chunk async for chunk in stream_service.stream_audio_content(content)]
+    )
+    assert len(song_data) == SONG_BYTES_SIZE
+    assert song_data_cache.get_stats().hits == stats_before.hits + 1
+
+    res_delete_playlist = delete_playlist(playlist_name)
+    assert res_delete_playlist.status_code == HTTP_202_ACCEPTED
+
+    for song_name in song_names:
+        res_delete_song = delete_song(song_name)
+        assert res_delete_song.status_code == HTTP_202_ACCEPTED
+
+    res_delete_artist = delete_user(artist_name)
+    assert res_delete_artist.status_code == HTTP_202_ACCEPTED
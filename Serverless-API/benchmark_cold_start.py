@@ -0,0 +1,122 @@
+"""
+Benchmark the cold start of the Lambda function with stubbed AWS clients
+
+Every run imports the function in a new process with a stub of boto3 whose clients\
+take as long to create and answer as real ones, and measures the time from the import\
+until the first request is answered. Runs are repeated for every scenario:
+
+- eager: every AWS client is created and the distribution is looked up before the\
+  first request, as the function did at import time
+- lookup: no CloudFront domain is configured so the first GET looks it up
+- configured: the CloudFront domain is read from the environment
+
+Steps:
+    1. Go to Serverless-API/
+    2. Run `python benchmark_cold_start.py [rounds]`
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import types
+
+DEFAULT_ROUNDS = 5
+CLIENT_CREATION_SECONDS = 0.15
+API_CALL_SECONDS = 0.08
+SCENARIOS = ("eager", "lookup", "configured")
+METHODS = ("GET", "DELETE")
+STUB_DOMAIN = "d111111abcdef8.cloudfront.net"
+
+
+class StubClient:
+    """AWS client answering every operation after the latency of an API call"""
+
+    def get_distribution(self, Id: str) -> dict:  # noqa: N803
+        time.sleep(API_CALL_SECONDS)
+        return {"Distribution": {"DomainName": STUB_DOMAIN}}
+
+    def delete_object(self, **kwargs) -> dict:
+        time.sleep(API_CALL_SECONDS)
+        return {}
+
+
+def stub_client(service_name: str) -> StubClient:
+    """Create a stub client taking as long as creating a real one
+
+    Args:
+        service_name (str): AWS service name
+
+    Returns:
+        StubClient: the stub client
+    """
+    time.sleep(CLIENT_CREATION_SECONDS)
+    return StubClient()
+
+
+def run_cold_start(scenario: str, method: str) -> float:
+    """Import the function and answer its first request
+
+    Args:
+        scenario (str): cold start scenario
+        method (str): HTTP method of the first request
+
+    Returns:
+        float: milliseconds from the import until the first response
+    """
+    sys.modules["boto3"] = types.SimpleNamespace(client=stub_client)
+    os.environ["BUCKET_NAME"] = "bucket"
+    os.environ["DISTRIBUTION_ID"] = "distribution"
+    if scenario == "configured":
+        os.environ["CLOUDFRONT_DOMAIN"] = STUB_DOMAIN
+    else:
+        os.environ.pop("CLOUDFRONT_DOMAIN", None)
+
+    start = time.perf_counter()
+    import lambda_function
+
+    if scenario == "eager":
+        lambda_function.get_s3_client()
+        lambda_function.get_cloudfront_domain_name()
+    response = lambda_function.lambda_handler(
+        {"httpMethod": method, "queryStringParameters": {"nombre": "song"}}, None
+    )
+    elapsed_milliseconds = (time.perf_counter() - start) * 1000
+    assert response["statusCode"] < 500, response
+    return elapsed_milliseconds
+
+
+def benchmark_cold_start(rounds: int) -> None:
+    """Print the median cold start of every scenario and first request method
+
+    Args:
+        rounds (int): cold starts measured per scenario and method
+    """
+    print(
+        f"> Clients created in {CLIENT_CREATION_SECONDS * 1000:.0f} ms, "
+        f"API calls answered in {API_CALL_SECONDS * 1000:.0f} ms"
+    )
+    for scenario in SCENARIOS:
+        for method in METHODS:
+            elapsed = [
+                json.loads(
+                    subprocess.check_output(
+                        [sys.executable, __file__, "--run", scenario, method],
+                        cwd=os.path.dirname(os.path.abspath(__file__)),
+                    )
+                )
+                for _ in range(rounds)
+            ]
+            print(
+                f"> {scenario} first {method}: {statistics.median(elapsed):.0f} ms "
+                f"median of {rounds}"
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--run":
+        print(json.dumps(run_cold_start(sys.argv[2], sys.argv[3])))
+    else:
+        benchmark_cold_start(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROUNDS)
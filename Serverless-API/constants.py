@@ -3,6 +3,7 @@
 # ENV PATHS
 BUCKET_NAME_ENV_PATH = "BUCKET_NAME"
 DISTRIBUTION_ID_ENV_PATH = "DISTRIBUTION_ID"
+CLOUDFRONT_DOMAIN_ENV_PATH = "CLOUDFRONT_DOMAIN"
 
 # AWS
 
@@ -14,3 +15,14 @@ CLOUDFRONT_DISTRIBUTION_DOMAIN_NAME = "DomainName"
 # SPOTIFY ELECTRON
 
 BUCKET_BASE_PATH = "canciones/"
+
+# QUERY PARAMETERS
+
+SONG_NAME_PARAMETER = "nombre"
+SONG_NAMES_PARAMETER = "nombres"
+UPLOAD_PARTS_PARAMETER = "parts"
+UPLOAD_ID_PARAMETER = "uploadId"
+
+# MULTIPART UPLOADS
+
+UPLOAD_PART_URL_EXPIRATION_SECONDS = 3600
@@ -1,10 +1,15 @@
 """
 Lambda function for handling Song Cloud resources
+
+AWS clients are created the first time an operation needs them and the CloudFront\
+domain is read from the environment, so cold starts don't wait for AWS before\
+handling the first request
 """
 
 import base64
 import json
 import os
+from functools import cache
 
 import boto3
 
@@ -14,19 +19,45 @@ from constants import (
     CLOUDFRONT,
     CLOUDFRONT_DISTRIBUTION,
     CLOUDFRONT_DISTRIBUTION_DOMAIN_NAME,
+    CLOUDFRONT_DOMAIN_ENV_PATH,
     DISTRIBUTION_ID_ENV_PATH,
     S3,
+    SONG_NAME_PARAMETER,
+    SONG_NAMES_PARAMETER,
+    UPLOAD_ID_PARAMETER,
+    UPLOAD_PART_URL_EXPIRATION_SECONDS,
+    UPLOAD_PARTS_PARAMETER,
 )
 
-s3 = boto3.resource(S3)
-s3_client = boto3.client(S3)
-song_bucket = s3.Bucket(os.getenv(BUCKET_NAME_ENV_PATH))
+bucket_name = os.getenv(BUCKET_NAME_ENV_PATH)
 distribution_id = os.getenv(DISTRIBUTION_ID_ENV_PATH)
-cloudfront_client = boto3.client(CLOUDFRONT)
+cloudfront_domain_name = os.getenv(CLOUDFRONT_DOMAIN_ENV_PATH)
+
+
+@cache
+def get_s3_client():
+    """Get S3 client, created on first use
+
+    Returns:
+        the S3 client
+    """
+    return boto3.client(S3)
+
+
+@cache
+def get_cloudfront_domain_name() -> str:
+    """Get CloudFront distribution domain, looked up once from the distribution\
+    if it's not configured
 
-cloudfront_domain_name = cloudfront_client.get_distribution(Id=distribution_id)[
-    CLOUDFRONT_DISTRIBUTION
-][CLOUDFRONT_DISTRIBUTION_DOMAIN_NAME]
+    Returns:
+        str: the CloudFront distribution domain
+    """
+    if cloudfront_domain_name:
+        return cloudfront_domain_name
+    cloudfront_client = boto3.client(CLOUDFRONT)
+    return cloudfront_client.get_distribution(Id=distribution_id)[
+        CLOUDFRONT_DISTRIBUTION
+    ][CLOUDFRONT_DISTRIBUTION_DOMAIN_NAME]
 
 
 def get_cloudfront_url(resource_path: str) -> str:
@@ -39,11 +70,26 @@ def get_cloudfront_url(resource_path: str) -> str:
         str: the cloudfront streaming URL associated with the given resource
     """
     cloudfront_url = (
-        f"https://{cloudfront_domain_name}/{BUCKET_BASE_PATH}{resource_path}.mp3"
+        f"https://{get_cloudfront_domain_name()}/{BUCKET_BASE_PATH}{resource_path}.mp3"
     )
     return cloudfront_url
 
 
+def get_cloudfront_urls(resource_paths: list[str]) -> dict[str, str]:
+    """Get cloudfront URLs for many resources
+
+    Args:
+        resource_paths (list[str]): the resources
+
+    Returns:
+        dict[str, str]: the cloudfront streaming URL of each resource
+    """
+    return {
+        resource_path: get_cloudfront_url(resource_path)
+        for resource_path in resource_paths
+    }
+
+
 def get_http_method_from_event(event) -> str:
     """Get HTTP method ( GET, POST...) from incoming event.
 
@@ -61,9 +107,86 @@ def get_http_method_from_event(event) -> str:
     return http_method
 
 
+def get_body_bytes_from_event(event) -> bytes:
+    """Get raw body bytes from incoming event.
+
+    Args:
+        event : incoming event
+
+    Returns:
+        bytes: the body bytes
+    """
+    body = event.get("body") or ""
+    if event.get("isBase64Encoded"):
+        return base64.b64decode(body)
+    return body.encode()
+
+
+def create_song_upload(song_key: str, parts: int) -> dict:
+    """Start a multipart upload of a song and presign the upload of its parts\
+        so they're sent directly to the bucket
+
+    Args:
+        song_key (str): the song key in the bucket
+        parts (int): number of parts of the song
+
+    Returns:
+        dict: the upload id and the presigned url of each part
+    """
+    s3_client = get_s3_client()
+    upload_id = s3_client.create_multipart_upload(Bucket=bucket_name, Key=song_key)[
+        "UploadId"
+    ]
+    urls = [
+        s3_client.generate_presigned_url(
+            "upload_part",
+            Params={
+                "Bucket": bucket_name,
+                "Key": song_key,
+                "UploadId": upload_id,
+                "PartNumber": part_number,
+            },
+            ExpiresIn=UPLOAD_PART_URL_EXPIRATION_SECONDS,
+        )
+        for part_number in range(1, parts + 1)
+    ]
+    return {"uploadId": upload_id, "urls": urls}
+
+
+def complete_song_upload(song_key: str, upload_id: str, etags: list[str]) -> None:
+    """Complete a multipart upload of a song with the uploaded parts
+
+    Args:
+        song_key (str): the song key in the bucket
+        upload_id (str): the multipart upload id
+        etags (list[str]): the entity tag of each uploaded part in order
+    """
+    get_s3_client().complete_multipart_upload(
+        Bucket=bucket_name,
+        Key=song_key,
+        UploadId=upload_id,
+        MultipartUpload={
+            "Parts": [
+                {"ETag": etag, "PartNumber": part_number}
+                for part_number, etag in enumerate(etags, start=1)
+            ]
+        },
+    )
+
+
 def lambda_handler(event, context) -> dict:
     """Handles the incoming requests
 
+    Songs are uploaded as the raw request body or, when they don't fit in a request,\
+    with a multipart upload whose parts are sent directly to the bucket:
+
+    - POST ?nombre=name&parts=N starts the upload and returns the part urls
+    - POST ?nombre=name&uploadId=id with the part entity tags completes it
+    - DELETE ?nombre=name&uploadId=id aborts it
+
+    The streaming URLs of many songs are obtained at once with\
+    GET ?nombres=["name", ...], answering a map of song name to URL
+
     Args:
         event (_type_): info about the incoming request
         context (_type_):
@@ -73,7 +196,18 @@ def lambda_handler(event, context) -> dict:
     """
     try:
         http_method = get_http_method_from_event(event)
-        song_name = event["queryStringParameters"]["nombre"]
+        query_parameters = event["queryStringParameters"]
+
+        if http_method == "GET" and SONG_NAMES_PARAMETER in query_parameters:
+            song_names = json.loads(query_parameters[SONG_NAMES_PARAMETER])
+            return {
+                "statusCode": 200,
+                "body": json.dumps({"urls": get_cloudfront_urls(song_names)}),
+            }
+
+        song_name = query_parameters[SONG_NAME_PARAMETER]
+        song_key = f"{BUCKET_BASE_PATH}{song_name}.mp3"
+        upload_id = query_parameters.get(UPLOAD_ID_PARAMETER)
 
         if http_method == "GET":
             return {
@@ -81,26 +215,42 @@ def lambda_handler(event, context) -> dict:
                 "body": json.dumps({"url": str(get_cloudfront_url(song_name))}),
             }
 
-        elif http_method == "DELETE":
-            s3_client.delete_object(
-                Bucket=song_bucket.name, Key=f"{BUCKET_BASE_PATH}{song_name}.mp3"
+        elif http_method == "DELETE" and upload_id:
+            get_s3_client().abort_multipart_upload(
+                Bucket=bucket_name, Key=song_key, UploadId=upload_id
             )
+            return {
+                "statusCode": 202,
+                "body": json.dumps({"details": "Song upload aborted successfully"}),
+            }
+
+        elif http_method == "DELETE":
+            get_s3_client().delete_object(Bucket=bucket_name, Key=song_key)
             return {
                 "statusCode": 202,
                 "body": json.dumps({"details": "Song deleted successfully"}),
             }
 
-        elif http_method == "POST":
-            song_key = f"{BUCKET_BASE_PATH}{song_name}.mp3"
-            body_str = event["body"]
-            body_dict = json.loads(body_str)
-            song_data = body_dict.get("file")
-            encoded_data = song_data.split("'")[1]
+        elif http_method == "POST" and UPLOAD_PARTS_PARAMETER in query_parameters:
+            parts = int(query_parameters[UPLOAD_PARTS_PARAMETER])
+            return {
+                "statusCode": 200,
+                "body": json.dumps(create_song_upload(song_key, parts)),
+            }
 
-            decoded_bytes = base64.b64decode(encoded_data)
+        elif http_method == "POST" and upload_id:
+            etags = json.loads(get_body_bytes_from_event(event))["etags"]
+            complete_song_upload(song_key, upload_id, etags)
+            return {
+                "statusCode": 201,
+                "body": json.dumps({"details": "Song upload successfully"}),
+            }
 
-            s3_client.put_object(
-                Body=decoded_bytes, Bucket=song_bucket.name, Key=song_key
+        elif http_method == "POST":
+            get_s3_client().put_object(
+                Body=get_body_bytes_from_event(event),
+                Bucket=bucket_name,
+                Key=song_key,
             )
             return {
                 "statusCode": 201,